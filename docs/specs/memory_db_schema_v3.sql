@@ -18,6 +18,16 @@
 --   - Added synthesis_source_count to concepts (Phase 9)
 --   - Added synthesis tables with CHECK and FK constraints (Phase 9)
 --   - Fixed synthesis_provenance.source_type to include 'cross' (DD-011)
+--   - Added content_hash to concepts with unique (type, content_hash) index (migration 012)
+--   - Added int8/binary quantized codes to embeddings (migration 013)
+--   - Added memory_settings key/value table (migration 014)
+--   - Added (key, value, memory_id) index on memory_metadata (migration 016)
+--   - Added synthesis_bridges with unique (concept_id, trace_id) (migration 017)
+--   - Added synthesis_runs / synthesis_run_items checkpoints (migration 018)
+--   - Added llm_response_cache (migration 019)
+--   - Added extraction_cache and quality_metrics.cache_hit (migration 020)
+--   - Added file_manifest stat cache for process runs (migration 021)
+--   - Added embedding_generation setting + rewrite/delete triggers (migration 022)
 --
 -- Design Decisions:
 --   - DD-010: This file is the single source of truth
@@ -70,7 +80,8 @@ CREATE TABLE IF NOT EXISTS concepts (
     synthesis_source_count INTEGER DEFAULT 0,   -- Number of sources synthesized
     synthesis_confidence REAL,                  -- Confidence score 0.0-1.0
     synthesized_at TIMESTAMP,                   -- When synthesis occurred
-    synthesis_cluster_id INTEGER                -- Link to synthesis cluster
+    synthesis_cluster_id INTEGER,               -- Link to synthesis cluster
+    content_hash TEXT                           -- SHA256(content) for dedup lookups (migration 012)
 );
 
 -- Table: concept_occurrences
@@ -107,6 +118,7 @@ CREATE TABLE IF NOT EXISTS quality_metrics (
     processing_time_seconds REAL,
     llm_tokens_used INTEGER,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    cache_hit INTEGER NOT NULL DEFAULT 0,       -- Served from extraction_cache (migration 020)
     FOREIGN KEY (artifact_id) REFERENCES artifacts(id) ON DELETE CASCADE
 );
 
@@ -125,11 +137,22 @@ CREATE TABLE IF NOT EXISTS embeddings (
     model TEXT NOT NULL,
     dimensions INTEGER NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    vector_int8 BLOB,                           -- int8 code of the normalized vector (migration 013)
+    vector_int8_scale REAL,                     -- vector ~= vector_int8 * scale
+    vector_binary BLOB,                         -- Packed sign bits (migration 013)
     FOREIGN KEY (artifact_id) REFERENCES artifacts(id) ON DELETE CASCADE,
     FOREIGN KEY (concept_id) REFERENCES concepts(id) ON DELETE CASCADE,
     FOREIGN KEY (entity_id) REFERENCES entities(id) ON DELETE CASCADE
 );
 
+-- Table: memory_settings
+-- Database-level flags (migration 014), e.g. embeddings_normalized = '1'.
+CREATE TABLE IF NOT EXISTS memory_settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Table: reasoning_traces
 -- Stores reasoning traces for experience learning (ReasoningBank pattern).
 CREATE TABLE IF NOT EXISTS reasoning_traces (
@@ -227,6 +250,97 @@ CREATE TABLE IF NOT EXISTS synthesis_provenance (
     FOREIGN KEY (synthesized_concept_id) REFERENCES concepts(id) ON DELETE CASCADE
 );
 
+-- Table: synthesis_bridges
+-- One row per bridged concept/trace pair; the unique index makes bridge
+-- creation idempotent (INSERT OR IGNORE claims the pair).
+CREATE TABLE IF NOT EXISTS synthesis_bridges (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    concept_id INTEGER NOT NULL,
+    trace_id INTEGER NOT NULL,
+    synthesized_concept_id INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (concept_id, trace_id),
+    FOREIGN KEY (synthesized_concept_id) REFERENCES concepts(id) ON DELETE CASCADE
+);
+
+-- Table: synthesis_runs
+-- One row per pipeline run: options, results so far, per-stage timings and
+-- the cursors `synthesis run --resume` continues from.
+CREATE TABLE IF NOT EXISTS synthesis_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    status TEXT NOT NULL DEFAULT 'running'
+        CHECK(status IN ('running', 'completed', 'failed', 'interrupted')),
+    stage TEXT NOT NULL DEFAULT 'cluster'
+        CHECK(stage IN ('cluster', 'synthesize', 'resynthesize', 'cross', 'done')),
+    options TEXT,
+    results TEXT,
+    stage_timings TEXT,
+    synthesize_cursor INTEGER NOT NULL DEFAULT 0,
+    synthesize_total INTEGER,
+    cross_cursor INTEGER NOT NULL DEFAULT 0,
+    cross_total INTEGER,
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+-- Table: synthesis_run_items
+-- A run's stage 1 clusters and stage 4 candidate pairs, in processing order.
+CREATE TABLE IF NOT EXISTS synthesis_run_items (
+    run_id INTEGER NOT NULL,
+    stage TEXT NOT NULL CHECK(stage IN ('synthesize', 'cross')),
+    position INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (run_id, stage, position),
+    FOREIGN KEY (run_id) REFERENCES synthesis_runs(id) ON DELETE CASCADE
+);
+
+-- =============================================================================
+-- LLM RESPONSE CACHE (migration 019)
+-- =============================================================================
+
+-- Table: llm_response_cache
+-- LLM response text keyed by sha256(model_id, prompt); times are unix seconds.
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    cache_key TEXT PRIMARY KEY,
+    model_id TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL,
+    hit_count INTEGER NOT NULL DEFAULT 0
+);
+
+-- =============================================================================
+-- EXTRACTION CACHE (migration 020)
+-- =============================================================================
+
+-- Table: extraction_cache
+-- ExtractionResult JSON keyed by file content SHA256 and extraction prompt version.
+CREATE TABLE IF NOT EXISTS extraction_cache (
+    content_hash TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    hit_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (content_hash, prompt_version)
+);
+
+-- =============================================================================
+-- FILE MANIFEST (migration 021)
+-- =============================================================================
+
+-- Table: file_manifest
+-- Last seen stat tuple and SHA256 per processed file; unchanged stats skip hashing.
+CREATE TABLE IF NOT EXISTS file_manifest (
+    file_path TEXT PRIMARY KEY,
+    size_bytes INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    file_hash TEXT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- =============================================================================
 -- INDEXES
 -- =============================================================================
@@ -243,6 +357,61 @@ CREATE INDEX IF NOT EXISTS idx_processing_log_status ON processing_log(status);
 CREATE INDEX IF NOT EXISTS idx_embeddings_artifact ON embeddings(artifact_id);
 CREATE INDEX IF NOT EXISTS idx_embeddings_concept ON embeddings(concept_id);
 
+-- Quantized codes are derived from `vector`; clear them when it changes (migration 013)
+CREATE TRIGGER IF NOT EXISTS clear_embedding_codes_on_vector_update
+AFTER UPDATE OF vector ON embeddings
+BEGIN
+    UPDATE embeddings
+    SET vector_int8 = NULL, vector_int8_scale = NULL, vector_binary = NULL
+    WHERE id = NEW.id;
+END;
+
+-- Rewrites and deletes of stored vectors bump memory_settings.embedding_generation,
+-- so in-process EmbeddingStores reload (migration 022)
+INSERT OR IGNORE INTO memory_settings (key, value) VALUES ('embedding_generation', '0');
+
+CREATE TRIGGER IF NOT EXISTS embedding_generation_on_embedding_update
+AFTER UPDATE OF vector, concept_id, artifact_id ON embeddings
+BEGIN
+    UPDATE memory_settings SET value = CAST(value AS INTEGER) + 1, updated_at = CURRENT_TIMESTAMP
+    WHERE key = 'embedding_generation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS embedding_generation_on_embedding_delete
+AFTER DELETE ON embeddings
+BEGIN
+    UPDATE memory_settings SET value = CAST(value AS INTEGER) + 1, updated_at = CURRENT_TIMESTAMP
+    WHERE key = 'embedding_generation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS embedding_generation_on_concept_update
+AFTER UPDATE OF type ON concepts
+BEGIN
+    UPDATE memory_settings SET value = CAST(value AS INTEGER) + 1, updated_at = CURRENT_TIMESTAMP
+    WHERE key = 'embedding_generation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS embedding_generation_on_concept_delete
+AFTER DELETE ON concepts
+BEGIN
+    UPDATE memory_settings SET value = CAST(value AS INTEGER) + 1, updated_at = CURRENT_TIMESTAMP
+    WHERE key = 'embedding_generation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS embedding_generation_on_trace_update
+AFTER UPDATE OF query_embedding ON reasoning_traces
+BEGIN
+    UPDATE memory_settings SET value = CAST(value AS INTEGER) + 1, updated_at = CURRENT_TIMESTAMP
+    WHERE key = 'embedding_generation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS embedding_generation_on_trace_delete
+AFTER DELETE ON reasoning_traces
+BEGIN
+    UPDATE memory_settings SET value = CAST(value AS INTEGER) + 1, updated_at = CURRENT_TIMESTAMP
+    WHERE key = 'embedding_generation';
+END;
+
 -- Reasoning trace indexes
 CREATE INDEX IF NOT EXISTS idx_reasoning_approach ON reasoning_traces(approach_taken);
 CREATE INDEX IF NOT EXISTS idx_reasoning_outcome ON reasoning_traces(outcome, timestamp DESC);
@@ -253,6 +422,7 @@ CREATE INDEX IF NOT EXISTS idx_reasoning_has_strategy ON reasoning_traces(strate
 -- Metadata indexes
 CREATE INDEX IF NOT EXISTS idx_metadata_memory_id ON memory_metadata(memory_id);
 CREATE INDEX IF NOT EXISTS idx_metadata_key ON memory_metadata(key);
+CREATE INDEX IF NOT EXISTS idx_metadata_key_value ON memory_metadata(key, value, memory_id);
 
 -- Relationship indexes
 CREATE INDEX IF NOT EXISTS idx_relationships_source ON memory_relationships(source_id);
@@ -261,12 +431,14 @@ CREATE INDEX IF NOT EXISTS idx_relationships_target ON memory_relationships(targ
 -- Synthesis indexes
 CREATE INDEX IF NOT EXISTS idx_concepts_cluster ON concepts(synthesis_cluster_id) WHERE synthesis_cluster_id IS NOT NULL;
 CREATE INDEX IF NOT EXISTS idx_concepts_synthesized ON concepts(synthesized_at) WHERE synthesized_at IS NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_concepts_type_content_hash ON concepts(type, content_hash);
 CREATE INDEX IF NOT EXISTS idx_synthesis_clusters_type ON synthesis_clusters(cluster_type);
 CREATE INDEX IF NOT EXISTS idx_synthesis_clusters_status ON synthesis_clusters(status);
 CREATE INDEX IF NOT EXISTS idx_cluster_members_cluster ON synthesis_cluster_members(cluster_id);
 CREATE INDEX IF NOT EXISTS idx_cluster_members_type ON synthesis_cluster_members(member_type, member_id);
 CREATE INDEX IF NOT EXISTS idx_provenance_synthesized ON synthesis_provenance(synthesized_concept_id);
 CREATE INDEX IF NOT EXISTS idx_provenance_source ON synthesis_provenance(source_type, source_id);
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_last_used ON llm_response_cache(last_used_at);
 
 -- ==================================================================================
 -- 7. AGENT ECOSYSTEM (Session 17)
@@ -146,6 +146,7 @@ class Ingester:
         # Step 3: Store in memory
         entity_ids = []
         concept_ids = []
+        embed_texts = []
 
         if self.db_manager:
             # Store entities
@@ -168,27 +169,16 @@ class Ingester:
                         description=concept.get("content", "")
                     )
                     concept_ids.append(concept_id)
-
-                    # E2-FIX-002: Generate embedding for semantic search
-                    # Without embedding, ingested concepts are invisible to retrieval
-                    if self.extractor:
-                        try:
-                            content = concept.get("content", "")[:8000]
-                            embedding = self.extractor.embed_content(content)
-                            if embedding:
-                                self.db_manager.insert_concept_embedding(
-                                    concept_id=concept_id,
-                                    vector=embedding,
-                                    model="gemini-embedding-001",
-                                    dimensions=len(embedding)
-                                )
-                        except Exception as embed_err:
-                            logger.warning(f"Failed to generate embedding for concept {concept_id}: {embed_err}")
-                            # Continue without embedding - can be backfilled later
+                    embed_texts.append(concept.get("content", "")[:8000])
 
                 except Exception as e:
                     logger.warning(f"Failed to store concept: {e}")
 
+            # E2-FIX-002: Generate embeddings for semantic search
+            # Without embedding, ingested concepts are invisible to retrieval
+            if self.extractor and concept_ids:
+                self._embed_concepts(concept_ids, embed_texts)
+
         # Step 4: Return result with provenance (DD-017)
         return IngestionResult(
             concept_ids=concept_ids,
@@ -197,6 +187,33 @@ class Ingester:
             ingested_by_agent=self.AGENT_ID
         )
 
+    def _embed_concepts(self, concept_ids: List[int], texts: List[str]) -> None:
+        """
+        Embed stored concepts in one batched call and store the vectors.
+
+        Failures are logged and skipped - concepts without embeddings can be
+        backfilled later (scripts/complete_concept_embeddings.py).
+        """
+        try:
+            embeddings = self.extractor.embed_batch(texts)
+        except Exception as embed_err:
+            logger.warning(f"Failed to generate embeddings for {len(concept_ids)} concepts: {embed_err}")
+            return
+
+        for concept_id, embedding in zip(concept_ids, embeddings):
+            if not embedding:
+                logger.warning(f"No embedding generated for concept {concept_id}")
+                continue
+            try:
+                self.db_manager.insert_concept_embedding(
+                    concept_id=concept_id,
+                    vector=embedding,
+                    model="gemini-embedding-001",
+                    dimensions=len(embedding)
+                )
+            except Exception as embed_err:
+                logger.warning(f"Failed to store embedding for concept {concept_id}: {embed_err}")
+
     def _classify_content(self, content: str) -> str:
         """
         Auto-classify content using Greek Triad taxonomy.
@@ -16,6 +16,8 @@ import logging
 import re
 import os
 
+from ..llm_gateway import default_gateway, estimate_tokens
+
 logger = logging.getLogger(__name__)
 
 
@@ -219,7 +221,9 @@ Example response:
 
 JSON response:"""
 
-            response = model.generate_content(prompt)
+            response = default_gateway().call(
+                model.generate_content, prompt, tokens=estimate_tokens(prompt)
+            )
 
             # Parse JSON from response
             import json
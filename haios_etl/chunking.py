@@ -0,0 +1,111 @@
+# generated: 2026-10-18
+# System Auto: last updated on: 2026-10-18 20:21:07
+"""
+Split large documents into overlapping chunks for extraction.
+
+extract_from_file used to send a whole file (multi-MB session dumps
+included) to the LLM as one request. chunk_text() cuts content into pieces
+of at most `max_chars`, preferring natural boundaries in this order:
+
+    1. speaker turns ("User:", "Gemini:", "**Claude:**", ...) and markdown headings
+    2. blank lines (paragraphs)
+    3. line breaks
+    4. a hard cut (a single line longer than a chunk)
+
+Every chunk after the first repeats up to `overlap` characters of the text
+before it (snapped to a line start), so a statement cut at a boundary is
+still seen whole by one chunk. Duplicates this creates are removed when the
+chunk results are merged (extraction.merge_extraction_results).
+"""
+
+import re
+from typing import List, Tuple
+
+# Speaker roles named in the extraction prompt, optionally bolded
+SPEAKER_TURN = re.compile(
+    r'^[ \t]*(?:\*\*)?(?:user|human|operator|assistant|agent|model|system|cody|gemini|claude)(?:\*\*)?[ \t]*:',
+    re.IGNORECASE | re.MULTILINE
+)
+HEADING = re.compile(r'^#{1,6}[ \t]', re.MULTILINE)
+
+
+def boundaries(text: str) -> List[int]:
+    """Offsets of lines that start a speaker turn or a markdown heading."""
+    points = {m.start() for m in SPEAKER_TURN.finditer(text)}
+    points.update(m.start() for m in HEADING.finditer(text))
+    points.discard(0)
+    return sorted(points)
+
+
+def chunk_text(text: str, max_chars: int = 10000, overlap: int = 500) -> List[str]:
+    """
+    Split `text` into chunks of at most `max_chars` characters.
+
+    Args:
+        text: Content to split
+        max_chars: Chunk size limit (overlap included)
+        overlap: Characters of preceding context repeated at the start of each
+            chunk after the first
+
+    Returns:
+        [text] when it already fits, else the chunks in document order
+
+    Raises:
+        ValueError: overlap is not smaller than max_chars
+    """
+    if len(text) <= max_chars:
+        return [text]
+    if not 0 <= overlap < max_chars:
+        raise ValueError("overlap must be >= 0 and smaller than max_chars")
+
+    budget = max_chars - overlap  # New text per chunk
+    spans: List[Tuple[int, int]] = []
+    for start, end in _segments(text):
+        spans.extend(_split_long(text, start, end, budget))
+
+    chunks = []
+    chunk_start, chunk_end = spans[0]
+    for start, end in spans[1:]:
+        if end - chunk_start <= budget:
+            chunk_end = end
+            continue
+        chunks.append((chunk_start, chunk_end))
+        chunk_start, chunk_end = start, end
+    chunks.append((chunk_start, chunk_end))
+
+    return [text[_with_overlap(text, start, overlap):end] for start, end in chunks]
+
+
+def _segments(text: str) -> List[Tuple[int, int]]:
+    """(start, end) spans between speaker turns / headings."""
+    points = [0] + boundaries(text) + [len(text)]
+    return [(a, b) for a, b in zip(points, points[1:]) if b > a]
+
+
+def _split_long(text: str, start: int, end: int, limit: int) -> List[Tuple[int, int]]:
+    """Cut one span into pieces of at most `limit`, at paragraphs, then lines."""
+    pieces = []
+    while end - start > limit:
+        window_end = start + limit
+        cut = text.rfind('\n\n', start + 1, window_end)
+        if cut != -1:
+            cut += 2
+        else:
+            cut = text.rfind('\n', start + 1, window_end)
+            cut = cut + 1 if cut != -1 else window_end
+        pieces.append((start, cut))
+        start = cut
+    if end > start:
+        pieces.append((start, end))
+    return pieces
+
+
+def _with_overlap(text: str, start: int, overlap: int) -> int:
+    """Move a chunk start back by up to `overlap`, to the start of a line if possible."""
+    if start == 0 or overlap == 0:
+        return start
+    floor = max(0, start - overlap)
+    if floor == 0:
+        return 0
+    newline = text.find('\n', floor - 1, start)
+    return newline + 1 if newline != -1 and newline + 1 < start else floor
@@ -8,7 +8,8 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 from haios_etl.database import DatabaseManager
-from haios_etl.extraction import ExtractionManager
+from haios_etl.extraction import ExtractionConfig, ExtractionManager
+from haios_etl.llm_gateway import configure_gateway
 from haios_etl.processing import BatchProcessor
 
 # Configure logging for ETL pipeline visibility
@@ -65,6 +66,13 @@ def cmd_status(args):
     print(f"  [SUCCESS] {stats.get('success', 0):,}")
     print(f"  [SKIPPED] {stats.get('skipped', 0):,}")
     print(f"  [ERROR]   {stats.get('error', 0):,}")
+
+    # Extraction cache hits (migration 020)
+    if db.has_extraction_cache():
+        cursor.execute("SELECT COUNT(*), COALESCE(SUM(cache_hit), 0) FROM quality_metrics")
+        extracted, cached = cursor.fetchone()
+        if extracted:
+            print(f"  Extraction cache: {cached:,} of {extracted:,} extractions ({cached / extracted:.0%})")
         
     # Show errors
     cursor.execute("SELECT file_path, error_message FROM processing_log WHERE status='error'")
@@ -112,29 +120,83 @@ def cmd_process(args):
     if not os.path.exists(db_path):
         db_manager.setup()
 
-    extraction_manager = ExtractionManager(api_key)
-    processor = BatchProcessor(db_manager, extraction_manager)
+    # --rpm caps every LLM call in this process (shared gateway), not just one per file
+    configure_gateway(requests_per_minute=args.rpm or None)
+    extraction_manager = ExtractionManager(api_key, config=ExtractionConfig(max_workers=args.workers))
+    processor = BatchProcessor(db_manager, extraction_manager, workers=args.workers)
 
     print(f"Processing directory: {target_dir}")
+    print(f"  Workers: {args.workers} (Rate Limit: {args.rpm or 'none'} RPM)")
     
-    count = 0
+    file_paths = []
     for root, dirs, files in os.walk(target_dir):
         for file in files:
-            file_path = os.path.join(root, file)
             # Filter for text files? Or try all?
             # Let's stick to .md and .txt for now to be safe, or just try everything.
             # The spec implies processing "content".
             if file.endswith(('.md', '.txt', '.py', '.json', '.yml', '.yaml')):
-                # Logging now handled by processor (shows skip vs extract)
-                processor.process_file(file_path)
-                count += 1
+                file_paths.append(os.path.join(root, file))
+
+    total = len(file_paths)
+
+    cache_hits = 0
+    unchanged = 0
+
+    def report(index, outcome):
+        nonlocal cache_hits, unchanged
+        if outcome.unchanged:
+            # Stat matched the file manifest; only counted, to keep no-op runs quiet
+            unchanged += 1
+            return
+        # Outcomes arrive in walk order, whatever the worker count
+        detail = f" ({outcome.error})" if outcome.status == "error" else ""
+        if outcome.cache_hit:
+            cache_hits += 1
+            detail = " (cached)"
+        print(f"[{index}/{total}] {outcome.status.upper()} {outcome.file_path}{detail}")
+
+    counts = processor.process_files(file_paths, retries=args.retries, on_result=report)
     
-    print(f"Batch complete. Processed {count} files.")
+    print(f"Batch complete. Processed {total} files "
+          f"({counts['success']} extracted, {cache_hits} from cache, "
+          f"{counts['skipped']} skipped ({unchanged} unchanged), {counts['error']} errors).")
 
 from haios_etl.refinement import RefinementManager
 from haios_etl.synthesis import SynthesisManager
 from haios_etl.agents.collaboration import Collaborator
 
+def print_synthesis_results(results):
+    """Print the summary of a synthesis pipeline run."""
+    print("\nResults:")
+    if results.get('run_id') is not None:
+        print(f"  Run ID: {results['run_id']}")
+    print(f"  Concept Clusters: {results['concept_clusters']}")
+    print(f"  Trace Clusters: {results['trace_clusters']}")
+    print(f"  Synthesized: {results['synthesized']}")
+    print(f"  Assigned to Existing Clusters: {results.get('assigned_to_existing', 0)}")
+    print(f"  Re-synthesized Clusters: {results.get('resynthesized', 0)}")
+    print(f"  Cross-pollination Pairs: {results['cross_pollination_pairs']}")
+    print(f"  Bridge Insights: {results['bridge_insights']}")
+    if results.get('skipped_existing', 0) > 0:
+        print(f"  Skipped (existing): {results['skipped_existing']}")
+    llm_cache = results.get('llm_cache')
+    if llm_cache and llm_cache['hits'] + llm_cache['misses']:
+        print(f"  LLM Cache: {llm_cache['hits']} hits / {llm_cache['misses']} misses "
+              f"({llm_cache['hit_rate']:.0%} hit rate)")
+
+    overlap_stats = results.get('overlap_stats')
+    if overlap_stats:
+        print(f"\nCross-pollination Similarity ({overlap_stats.comparisons:,} comparisons, "
+              f"max {overlap_stats.max_similarity:.4f}, {overlap_stats.above_threshold:,} above threshold):")
+        for low, high, count in overlap_stats.histogram:
+            if count and high > 0:
+                print(f"  [{low:+.2f}, {high:+.2f}): {count:,}")
+
+    if results['errors']:
+        print(f"\nErrors ({len(results['errors'])}):")
+        for err in results['errors'][:5]:
+            print(f"  - {err}")
+
 def cmd_synthesis(args):
     """Handle synthesis pipeline commands."""
     db_path = get_db_path()
@@ -148,11 +210,26 @@ def cmd_synthesis(args):
             print("Error: GOOGLE_API_KEY not found. Required for synthesis.")
             return
 
+        configure_gateway(requests_per_minute=args.rpm or None)
         extractor = ExtractionManager(api_key)
-        manager = SynthesisManager(db_path, extractor)
+        manager = SynthesisManager(db_path, extractor, workers=args.workers)
+
+        if args.resume is not None:
+            print(f"Resuming synthesis run {args.resume} (options from the original run)...")
+            print(f"  Workers: {args.workers} (Rate Limit: {args.rpm or 'none'} RPM)")
+            print()
+            try:
+                results = manager.run_synthesis_pipeline(resume_run_id=args.resume)
+            except ValueError as e:
+                print(f"Error: {e}")
+                return
+            print_synthesis_results(results)
+            return
 
         print(f"Running synthesis pipeline...")
         print(f"  Limit: {args.limit}")
+        print(f"  Workers: {args.workers} (Rate Limit: {args.rpm or 'none'} RPM)")
+        print(f"  Cluster Mode: {args.cluster_mode}")
         print(f"  Dry Run: {args.dry_run}")
         print(f"  Concepts Only: {args.concepts_only}")
         print(f"  Traces Only: {args.traces_only}")
@@ -172,22 +249,35 @@ def cmd_synthesis(args):
             cross_only=args.cross_only,
             max_bridges=args.max_bridges,
             concept_sample=args.concept_sample,
-            trace_sample=args.trace_sample
+            trace_sample=args.trace_sample,
+            cluster_mode=args.cluster_mode,
+            incremental=not args.full
         )
 
-        print("\nResults:")
-        print(f"  Concept Clusters: {results['concept_clusters']}")
-        print(f"  Trace Clusters: {results['trace_clusters']}")
-        print(f"  Synthesized: {results['synthesized']}")
-        print(f"  Cross-pollination Pairs: {results['cross_pollination_pairs']}")
-        print(f"  Bridge Insights: {results['bridge_insights']}")
-        if results.get('skipped_existing', 0) > 0:
-            print(f"  Skipped (existing): {results['skipped_existing']}")
+        print_synthesis_results(results)
+
+    elif args.subcommand == "runs":
+        manager = SynthesisManager(db_path)
+        runs = manager.list_runs(limit=args.limit)
+        if not runs:
+            print("No synthesis runs recorded. (Migration 018 may not be applied yet)")
+            return
 
-        if results['errors']:
-            print(f"\nErrors ({len(results['errors'])}):")
-            for err in results['errors'][:5]:
-                print(f"  - {err}")
+        for run in runs:
+            print(f"Run {run['id']}: {run['status']} (stage: {run['stage']})")
+            print(f"  Started: {run['started_at']}  Updated: {run['updated_at']}")
+            done, total = run['synthesize_progress']
+            print(f"  Clusters: {done}/{total if total is not None else '?'}  Synthesized: {run['synthesized']}")
+            done, total = run['cross_progress']
+            print(f"  Pairs: {done}/{total if total is not None else '?'}  Bridges: {run['bridge_insights']}")
+            if run['stage_timings']:
+                timings = ", ".join(f"{stage} {seconds:.1f}s" for stage, seconds in run['stage_timings'].items())
+                print(f"  Timings: {timings}")
+            if run['errors']:
+                print(f"  Errors: {run['errors']}")
+            if run['status'] != 'completed':
+                print(f"  Resume: python -m haios_etl.cli synthesis run --resume {run['id']}")
+            print()
 
     elif args.subcommand == "stats":
         manager = SynthesisManager(db_path)
@@ -355,9 +445,10 @@ def cmd_ingest(args):
             with open(filepath, 'r', encoding='utf-8') as f:
                 content = f.read()
 
-            # Truncate if needed
-            max_chars = args.max_chars or 4000
-            content = content[:max_chars]
+            # Optional cap; large files are otherwise extracted in chunks
+            if args.max_chars and len(content) > args.max_chars:
+                print(f"[{i:02d}/{len(files)}] CUT {short}: {len(content):,} -> {args.max_chars:,} chars")
+                content = content[:args.max_chars]
 
             if args.dry_run:
                 print(f"[{i:02d}/{len(files)}] DRY {short}")
@@ -409,13 +500,20 @@ def main():
     # Process command
     process_parser = subparsers.add_parser("process", help="Process a directory")
     process_parser.add_argument("directory", help="Directory to process")
+    process_parser.add_argument("--workers", type=int, default=ExtractionConfig.max_workers,
+                                help=f"Concurrent extractions (default: {ExtractionConfig.max_workers})")
+    process_parser.add_argument("--rpm", type=float, default=15,
+                                help="Requests per minute shared by all workers (default: 15, Gemini free tier; 0 = unlimited)")
+    process_parser.add_argument("--retries", type=int, default=1,
+                                help="Extra passes for files that hit a rate limit or timeout (default: 1)")
 
     # Ingest command (Agent Ecosystem pipeline)
     ingest_parser = subparsers.add_parser("ingest", help="Ingest files via Agent Ecosystem")
     ingest_parser.add_argument("path", help="File or directory to ingest")
     ingest_parser.add_argument("-r", "--recursive", action="store_true", help="Recursively process directories")
     ingest_parser.add_argument("--include", help="Additional extensions (comma-separated, e.g., '.txt,.json')")
-    ingest_parser.add_argument("--max-chars", type=int, default=4000, help="Max chars per file (default: 4000)")
+    ingest_parser.add_argument("--max-chars", type=int, default=0,
+                               help="Truncate files to this many chars (default: 0 = no limit; large files are chunked)")
     ingest_parser.add_argument("--dry-run", action="store_true", help="Preview without ingesting")
 
     # Refinement command
@@ -442,6 +540,19 @@ def main():
     synth_run.add_argument("--max-bridges", type=int, default=100, help="Max bridge insights to create (default: 100)")
     synth_run.add_argument("--concept-sample", type=int, default=0, help="Max concepts to sample (0 = ALL)")
     synth_run.add_argument("--trace-sample", type=int, default=0, help="Max traces to sample (0 = ALL)")
+    synth_run.add_argument("--cluster-mode", choices=SynthesisManager.CLUSTER_MODES, default="greedy",
+                           help="Concept clustering: greedy (first --limit concepts) or graph (kNN graph over all)")
+    synth_run.add_argument("--full", action="store_true",
+                           help="Skip incremental assignment of new concepts to existing clusters")
+    synth_run.add_argument("--workers", type=int, default=4, help="Concurrent LLM/embedding calls (default: 4)")
+    synth_run.add_argument("--rpm", type=float, default=15,
+                           help="Requests per minute shared by all workers (default: 15, Gemini free tier; 0 = unlimited)")
+
+    synth_run.add_argument("--resume", type=int, metavar="RUN_ID",
+                           help="Continue an interrupted run from its last checkpoint (uses that run's options)")
+
+    synth_runs = synth_subs.add_parser("runs", help="List synthesis runs with stage timings and progress")
+    synth_runs.add_argument("--limit", type=int, default=10, help="Runs to show (default: 10)")
 
     synth_subs.add_parser("stats", help="Show synthesis statistics")
 
@@ -0,0 +1,309 @@
+# generated: 2026-10-18
+# System Auto: last updated on: 2026-10-18 13:41:07
+"""
+Vectorized clustering for the synthesis pipeline (SynthesisManager._build_clusters).
+
+The reference algorithm is a greedy sweep: walk the items in order, let each
+unclustered item seed a cluster, and pull in every later unclustered item whose
+similarity to the seed reaches the threshold, up to max_size members.
+
+greedy_clusters() produces the same clusters without the O(n^2) Python loop:
+
+    - every vector is decoded once into a float32 matrix
+    - seeds are processed in blocks; one matrix product scores a block of seeds
+      against every later row (a view, no copy; bounded by BLOCK_ELEMENTS)
+    - the greedy walk itself stays sequential, but only visits the few columns
+      that clear the threshold
+
+Scores within BORDERLINE of the threshold are re-decided by the caller's exact
+similarity function, so float32 rounding cannot flip a membership decision.
+
+The greedy sweep depends on item order, so callers window it (first `limit`
+ids). The graph mode has no such window: knn_edges() links every row to its k
+most similar rows above the threshold and graph_clusters() takes the connected
+components, merged strongest edge first and capped at max_size.
+
+top_pairs() serves cross-pollination: it streams blocks of one matrix through
+the other and keeps only a bounded heap of the best pairs plus a histogram.
+"""
+
+import heapq
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Max seed x candidate scores materialized per block (~64 MB of float32)
+BLOCK_ELEMENTS = 16 * 1024 * 1024
+
+# Max seeds per block; larger blocks waste work on rows clustered mid-block
+MAX_BLOCK_SEEDS = 512
+
+# float32 scores this close to the threshold are rechecked exactly
+BORDERLINE = 1e-4
+
+# Similarity histogram bins over [-1, 1] reported by top_pairs()
+HISTOGRAM_BINS = 40
+
+
+def greedy_clusters(
+    matrix: np.ndarray,
+    threshold: float,
+    max_size: int,
+    keys: Optional[Sequence] = None,
+    valid: Optional[Sequence[bool]] = None,
+    exact: Optional[Callable[[int, int], float]] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> List[List[int]]:
+    """
+    Greedy threshold clustering over the rows of a matrix (score = row dot product).
+
+    Args:
+        matrix: (n, d) float32; rows L2-normalized for cosine similarity
+        threshold: Minimum similarity to the seed for membership
+        max_size: Maximum members per cluster, seed included
+        keys: Identity per row (default: row index). Rows sharing a key are
+            clustered together, as the reference tracks clustered ids.
+        valid: Rows with False seed a singleton but are never members
+            (embeddings that failed to parse)
+        exact: exact(seed_row, row) -> similarity, used for borderline scores
+        progress: progress(rows_done, total) called after each block
+
+    Returns:
+        One list of row indices per seed, in seed order, seed first. Singletons
+        are included; the caller applies its minimum cluster size.
+    """
+    n = matrix.shape[0]
+    if keys is None:
+        key_index = np.arange(n)
+    else:
+        _, key_index = np.unique(np.asarray(keys), return_inverse=True)
+    key_clustered = np.zeros(int(key_index.max()) + 1 if n else 0, dtype=bool)
+    candidate = np.ones(n, dtype=bool) if valid is None else np.asarray(valid, dtype=bool)
+
+    clusters: List[List[int]] = []
+    position = 0
+    while position < n:
+        # Next block of seeds: unclustered rows from the current position
+        open_rows = np.flatnonzero(~key_clustered[key_index[position:]]) + position
+        if len(open_rows) == 0:
+            break
+        start = int(open_rows[0])
+        block_size = max(1, min(MAX_BLOCK_SEEDS, BLOCK_ELEMENTS // (n - start)))
+        seeds = open_rows[:block_size]
+
+        seed_rows = seeds[candidate[seeds]]
+        scores = matrix[seed_rows] @ matrix[start:].T if len(seed_rows) else None
+        score_row = {int(row): i for i, row in enumerate(seed_rows)}
+
+        for seed in seeds:
+            seed = int(seed)
+            if key_clustered[key_index[seed]]:
+                continue
+            members = [seed]
+            key_clustered[key_index[seed]] = True
+            clusters.append(members)
+            if seed not in score_row:
+                continue
+
+            # Later, unclustered, valid rows near or above the threshold
+            seed_scores = scores[score_row[seed]]
+            rows = np.flatnonzero(seed_scores[seed + 1 - start:] >= threshold - BORDERLINE) + seed + 1
+            rows = rows[candidate[rows] & ~key_clustered[key_index[rows]]]
+            for row in rows:
+                if len(members) >= max_size:
+                    break
+                row = int(row)
+                if key_clustered[key_index[row]]:
+                    continue  # Duplicate key taken earlier in this cluster
+                score = float(seed_scores[row - start])
+                if exact is not None and score < threshold + BORDERLINE:
+                    score = exact(seed, row)
+                if score >= threshold:
+                    members.append(row)
+                    key_clustered[key_index[row]] = True
+
+        position = int(seeds[-1]) + 1
+        if progress is not None:
+            progress(position, n)
+
+    return clusters
+
+
+def knn_edges(
+    matrix: np.ndarray,
+    k: int,
+    threshold: float,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Edges of the k-nearest-neighbor graph that reach `threshold`.
+
+    Rows are scored in blocks of BLOCK_ELEMENTS // n against the whole matrix,
+    so memory is one score block plus at most n * k edges.
+
+    Returns:
+        (left, right, similarity) arrays; left < right, each pair once.
+    """
+    n = matrix.shape[0]
+    k = min(k, n - 1)
+    if k <= 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0, dtype=np.float32)
+
+    lefts, rights, sims = [], [], []
+    block_rows = max(1, BLOCK_ELEMENTS // n)
+    for start in range(0, n, block_rows):
+        scores = matrix[start:start + block_rows] @ matrix.T
+        rows = np.arange(len(scores))
+        scores[rows, rows + start] = -np.inf  # No self edges
+
+        neighbors = np.argpartition(scores, n - k, axis=1)[:, n - k:]
+        top = scores[rows[:, None], neighbors]
+        keep = top >= threshold
+        lefts.append(np.broadcast_to(rows[:, None] + start, neighbors.shape)[keep])
+        rights.append(neighbors[keep])
+        sims.append(top[keep])
+        if progress is not None:
+            progress(min(start + block_rows, n), n)
+
+    left = np.concatenate(lefts)
+    right = np.concatenate(rights)
+    sim = np.concatenate(sims)
+
+    # Undirected: (i, j) and (j, i) collapse to one edge
+    pairs = np.stack([np.minimum(left, right), np.maximum(left, right)], axis=1)
+    pairs, first = np.unique(pairs, axis=0, return_index=True)
+    return pairs[:, 0], pairs[:, 1], sim[first]
+
+
+def graph_clusters(
+    n: int,
+    left: np.ndarray,
+    right: np.ndarray,
+    similarity: np.ndarray,
+    max_size: int,
+) -> List[List[int]]:
+    """
+    Connected components of an edge list, capped at max_size rows each.
+
+    Edges are merged strongest first (size-capped single linkage): a merge that
+    would exceed max_size is skipped, so oversized components split along their
+    weakest links instead of growing without bound.
+
+    Returns:
+        Components with two or more rows, each sorted, ordered by first row.
+    """
+    parent = list(range(n))
+    size = [1] * n
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for edge in np.argsort(-similarity, kind='stable'):
+        a, b = find(int(left[edge])), find(int(right[edge]))
+        if a == b or size[a] + size[b] > max_size:
+            continue
+        if size[a] < size[b]:
+            a, b = b, a
+        parent[b] = a
+        size[a] += size[b]
+
+    components: Dict[int, List[int]] = {}
+    for row in range(n):
+        components.setdefault(find(row), []).append(row)
+    return sorted((rows for rows in components.values() if len(rows) > 1), key=lambda rows: rows[0])
+
+
+def top_pairs(
+    left: np.ndarray,
+    right: np.ndarray,
+    threshold: float,
+    limit: int,
+    left_rows: Optional[np.ndarray] = None,
+    near_floor: Optional[float] = None,
+    near_limit: int = 3,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, object]:
+    """
+    Best `limit` (left, right) pairs scoring >= threshold, block-streamed.
+
+    `right` stays resident; `left` rows stream through it in blocks of
+    BLOCK_ELEMENTS // len(right), so memory is one score block plus two
+    bounded heaps regardless of how many pairs clear the threshold.
+
+    Args:
+        left: (n, d) float32 matrix (rows L2-normalized for cosine)
+        right: (m, d) float32 matrix
+        threshold: Minimum score for a pair to be kept
+        limit: Pairs kept (highest scores; ties keep the earlier pair)
+        left_rows: Subset of left rows to compare (default: all)
+        near_floor: Also keep the best `near_limit` pairs in [near_floor, threshold)
+        progress: progress(comparisons_done, total) after each block
+
+    Returns:
+        Dict with 'pairs' [(left_row, right_row, score)] sorted by score
+        descending, 'near_misses' (same shape), 'comparisons', 'above_threshold',
+        'max_similarity' and 'histogram' (HISTOGRAM_BINS counts over [-1, 1]).
+    """
+    rows = np.arange(left.shape[0]) if left_rows is None else np.asarray(left_rows)
+    m = right.shape[0]
+    total = len(rows) * m
+    result = {
+        'pairs': [], 'near_misses': [], 'comparisons': 0, 'above_threshold': 0,
+        'max_similarity': None, 'histogram': np.zeros(HISTOGRAM_BINS, dtype=np.int64),
+    }
+    if total == 0:
+        return result
+
+    best: List[Tuple[float, int, int, int]] = []  # Min-heaps of (score, -order, left, right)
+    near: List[Tuple[float, int, int, int]] = []
+    block_rows = max(1, BLOCK_ELEMENTS // m)
+    for start in range(0, len(rows), block_rows):
+        block = rows[start:start + block_rows]
+        scores = left[block] @ right.T
+
+        bins = np.clip(((scores + 1.0) * (HISTOGRAM_BINS / 2)).astype(np.int64), 0, HISTOGRAM_BINS - 1)
+        result['histogram'] += np.bincount(bins.ravel(), minlength=HISTOGRAM_BINS)
+        block_max = float(scores.max())
+        if result['max_similarity'] is None or block_max > result['max_similarity']:
+            result['max_similarity'] = block_max
+
+        hits = np.flatnonzero(scores >= threshold)
+        result['above_threshold'] += len(hits)
+        _push_top(best, scores, hits, limit, start * m, block, m)
+        if near_floor is not None:
+            misses = np.flatnonzero((scores >= near_floor) & (scores < threshold))
+            _push_top(near, scores, misses, near_limit, start * m, block, m)
+
+        result['comparisons'] += len(block) * m
+        if progress is not None:
+            progress(result['comparisons'], total)
+
+    result['pairs'] = _drain(best)
+    result['near_misses'] = _drain(near)
+    return result
+
+
+def _push_top(heap: list, scores: np.ndarray, flat: np.ndarray, limit: int,
+              offset: int, block: np.ndarray, m: int) -> None:
+    """Offer flat indices of a score block to a bounded min-heap."""
+    if limit <= 0 or len(flat) == 0:
+        return
+    values = scores.ravel()[flat]
+    if len(flat) > limit:
+        # Only the block's best `limit` can survive; keep ties in scan order
+        order = np.argsort(-values, kind='stable')[:limit]
+        flat, values = flat[order], values[order]
+    for index, value in zip(flat.tolist(), values.tolist()):
+        entry = (value, -(offset + index), int(block[index // m]), index % m)
+        if len(heap) < limit:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+
+def _drain(heap: list) -> List[Tuple[int, int, float]]:
+    return [(left, right, score) for score, _, left, right in sorted(heap, reverse=True)]
@@ -5,36 +5,185 @@ import json
 import logging
 import os
 import hashlib
+import functools
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 
+from .vectors import encode_vector, normalize_vector  # normalize_vector re-exported for callers
+
+
+def _serialized_write(method):
+    """Run a DatabaseManager write method under the writer lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._write_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class DatabaseManager:
+    """
+    SQLite access for the memory database.
+
+    Connections:
+        - One writer connection (get_connection), shared across threads.
+          Write methods hold an RLock; external writers use `with db.writer()`.
+        - One read-only reader connection per thread (get_read_connection),
+          opened with a mode=ro URI and PRAGMA query_only. Under WAL, readers
+          never block the writer or each other.
+    sqlite-vec is loaded once when each connection is opened and reused for
+    the life of the connection. ':memory:' databases are private to one
+    connection, so readers fall back to the writer there.
+    """
+
+    # Vector index settings (migration 010)
+    VEC_DIMENSIONS = 768  # gemini-embedding-001 with output_dimensionality=768
+    KNN_OVERFETCH = 4     # Candidate multiplier when a mode filter discards KNN hits
+    KNN_MAX_K = 4096      # sqlite-vec upper bound for k
+
+    # Concept types per retrieval mode (Session 72 - ADR-037)
+    SESSION_RECOVERY_EXCLUDED_TYPES = ('SynthesizedInsight',)
+    KNOWLEDGE_LOOKUP_TYPES = ('episteme', 'techne', 'Critique', 'Decision', 'Directive', 'Proposal')
+
+    # Interning cache bounds (entries); see _resolve_entity_ids/_resolve_concept_ids
+    ENTITY_CACHE_SIZE = 50000
+    CONCEPT_CACHE_SIZE = 50000
+
+    # Wait for locks instead of failing with "database is locked" (INV-027)
+    BUSY_TIMEOUT_MS = 30000
+
+    # memory_settings key set once every stored vector is unit length (migration 014)
+    EMBEDDINGS_NORMALIZED_KEY = 'embeddings_normalized'
+
     def __init__(self, db_path: str):
         self.db_path = db_path
-        self.conn = None
+        self.conn = None                     # Writer connection
+        self._connect_lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._local = threading.local()      # Per-thread reader connection
+        self._readers = []
+        self._vec_index_cache = {}
+        self.embedding_store = None
+        self._entity_ids = OrderedDict()    # (type, value) -> entity id
+        self._concept_ids = OrderedDict()   # (type, content_hash) -> concept id
+        self._concept_hash_supported = None
+        self._quantized_supported = None
+        self._extraction_cache_supported = None
+        self._file_manifest_supported = None
+        self._normalized = None
 
     def get_connection(self):
+        """
+        Return the shared writer connection (created on first use).
+
+        Safe to call from any thread. Writes from several threads must be
+        serialized: DatabaseManager's own write methods do this, other callers
+        should use `with db.writer() as conn:`.
+        """
         if self.conn is None:
-            self.conn = sqlite3.connect(self.db_path)
-            # Enable WAL mode for better concurrency
-            self.conn.execute("PRAGMA journal_mode=WAL")
-            # Enable foreign keys
-            self.conn.execute("PRAGMA foreign_keys = ON")
-            
-            # Load sqlite-vec extension if available
-            try:
-                import sqlite_vec
-                self.conn.enable_load_extension(True)
-                sqlite_vec.load(self.conn)
-                self.conn.enable_load_extension(False)
-                logging.info("sqlite-vec extension loaded successfully.")
-            except ImportError:
-                logging.warning("sqlite-vec module not found. Vector search will be limited.")
-            except Exception as e:
-                logging.warning(f"Failed to load sqlite-vec extension: {e}")
+            with self._connect_lock:
+                if self.conn is None:
+                    self.conn = self._open_connection(read_only=False)
         return self.conn
 
+    def get_read_connection(self):
+        """
+        Return this thread's read-only connection (created on first use).
+
+        Sees everything the writer has committed. Falls back to the writer
+        connection for in-memory databases or if the read-only open fails.
+        """
+        if not self._supports_readers():
+            return self.get_connection()
+
+        conn = getattr(self._local, "reader", None)
+        if conn is None:
+            # Writer first: creates the file and switches it to WAL
+            self.get_connection()
+            try:
+                conn = self._open_connection(read_only=True)
+            except sqlite3.Error as e:
+                logging.warning(f"Read-only connection failed, using writer: {e}")
+                return self.get_connection()
+            self._local.reader = conn
+            with self._connect_lock:
+                self._readers.append(conn)
+        return conn
+
+    @contextmanager
+    def writer(self):
+        """
+        Hold the writer lock for a unit of work; commit on success, roll back on error.
+
+            with db.writer() as conn:
+                conn.execute("INSERT ...")
+        """
+        with self._write_lock:
+            conn = self.get_connection()
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def close(self):
+        """Close the writer and all reader connections."""
+        with self._connect_lock:
+            for conn in self._readers:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._readers = []
+            self._local = threading.local()
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    def _supports_readers(self):
+        return self.db_path != ":memory:" and not str(self.db_path).startswith("file:")
+
+    def _open_connection(self, read_only):
+        """Open and configure one connection (pragmas + sqlite-vec)."""
+        timeout = self.BUSY_TIMEOUT_MS / 1000
+        if read_only:
+            uri = Path(self.db_path).absolute().as_uri() + "?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, timeout=timeout, check_same_thread=False)
+            conn.execute("PRAGMA query_only = ON")
+        else:
+            conn = sqlite3.connect(self.db_path, timeout=timeout, check_same_thread=False)
+            # Enable WAL mode for better concurrency
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA busy_timeout = {self.BUSY_TIMEOUT_MS}")
+        # Enable foreign keys
+        conn.execute("PRAGMA foreign_keys = ON")
+        self._load_sqlite_vec(conn)
+        return conn
+
+    _vec_module_missing = False  # Warn about a missing sqlite_vec module once per process
+
+    def _load_sqlite_vec(self, conn):
+        """Load sqlite-vec extension into a new connection if available."""
+        if DatabaseManager._vec_module_missing:
+            return
+        try:
+            import sqlite_vec
+            conn.enable_load_extension(True)
+            sqlite_vec.load(conn)
+            conn.enable_load_extension(False)
+            logging.info("sqlite-vec extension loaded successfully.")
+        except ImportError:
+            DatabaseManager._vec_module_missing = True
+            logging.warning("sqlite-vec module not found. Vector search will be limited.")
+        except Exception as e:
+            logging.warning(f"Failed to load sqlite-vec extension: {e}")
+
+    @_serialized_write
     def setup(self):
         """Initialize the database schema."""
         conn = self.get_connection()
@@ -54,8 +203,26 @@ class DatabaseManager:
             schema_sql = f.read()
             
         conn.executescript(schema_sql)
+        self._flag_new_database_normalized(conn)
         conn.commit()
+        self._concept_hash_supported = None
+        self._quantized_supported = None
+        self._extraction_cache_supported = None
+        self._file_manifest_supported = None
+
+    def _flag_new_database_normalized(self, conn):
+        """A database with no vectors yet only ever receives normalized ones."""
+        has_vectors = conn.execute("""
+            SELECT EXISTS (SELECT 1 FROM embeddings)
+                OR EXISTS (SELECT 1 FROM reasoning_traces WHERE query_embedding IS NOT NULL)
+        """).fetchone()[0]
+        if not has_vectors:
+            conn.execute(
+                "INSERT OR IGNORE INTO memory_settings (key, value) VALUES (?, '1')",
+                (self.EMBEDDINGS_NORMALIZED_KEY,)
+            )
 
+    @_serialized_write
     def insert_artifact(self, file_path, file_hash, size_bytes):
         """
         Insert or update an artifact.
@@ -63,135 +230,383 @@ class DatabaseManager:
         """
         conn = self.get_connection()
         cursor = conn.cursor()
-        
-        # Check if exists
+        artifact_id = self._upsert_artifact(cursor, file_path, file_hash)
+        conn.commit()
+        return artifact_id
+
+    def _upsert_artifact(self, cursor, file_path, file_hash):
+        """
+        Insert or update an artifact row without committing.
+
+        On a hash change, old occurrences are removed (prevents duplicates from
+        accumulating across re-processing) and the version is incremented.
+        Note: size_bytes is accepted by callers but not stored - the artifacts
+        table has no size column (schema v3).
+        """
         cursor.execute("SELECT id, file_hash, version FROM artifacts WHERE file_path = ?", (file_path,))
         row = cursor.fetchone()
-        
+
         if row:
             artifact_id, current_hash, current_version = row
             if current_hash != file_hash:
                 # File changed - clean up old occurrences before re-processing
-                # This prevents duplicate occurrences from accumulating
                 cursor.execute("DELETE FROM entity_occurrences WHERE artifact_id = ?", (artifact_id,))
                 cursor.execute("DELETE FROM concept_occurrences WHERE artifact_id = ?", (artifact_id,))
-                
+
                 # Update artifact with new hash and increment version
-                new_version = current_version + 1
                 cursor.execute("""
-                    UPDATE artifacts 
+                    UPDATE artifacts
                     SET file_hash = ?, version = ?, last_processed_at = CURRENT_TIMESTAMP
                     WHERE id = ?
-                """, (file_hash, new_version, artifact_id))
-                # Note: size_bytes is not in the schema v2 artifacts table?
-                # Checking schema... 
-                # Schema has: id, file_path, file_hash, last_processed_at, version.
-                # It does NOT have size_bytes. 
-                # Wait, the test expects size_bytes update?
-                # "assert row[1] == 120 # Size updated" in test_database.py
-                # Let me re-read the schema file content I viewed in step 65.
-                # Line 13: CREATE TABLE artifacts (
-                # Line 14:     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                # Line 15:     file_path TEXT NOT NULL UNIQUE,
-                # Line 16:     file_hash TEXT NOT NULL,
-                # Line 17:     last_processed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                # Line 18:     version INTEGER DEFAULT 1
-                # Line 19: );
-                # It seems size_bytes is MISSING from the schema v2!
-                # But my test expects it.
-                # I should probably add it to the schema or remove it from the test.
-                # Given "size_bytes" is useful, I should probably add it to the schema.
-                # But I cannot change the schema file easily without "approval" or breaking "No Implicitness".
-                # However, the schema file is "memory_db_schema_v2.sql".
-                # Let's look at the TRD or previous schema.
-                # In step 9 (COGNITIVE_MEMORY_SYSTEM_SPEC.md), the `memories` table had `size_bytes`.
-                # But here we are using `artifacts` table for the ETL.
-                # The test `test_database.py` I wrote has:
-                # `cursor.execute("SELECT file_hash, size_bytes, version FROM artifacts WHERE id=?", (id1,))`
-                # This implies I expected `size_bytes` to be there.
-                # Since I am in the implementation phase, and the schema file is the source of truth,
-                # I should probably update the test to NOT check for size_bytes, OR update the schema.
-                # Updating the schema seems better for a real system.
-                # BUT, the schema file `docs/specs/memory_db_schema_v2.sql` was "Enhanced schema... Created: 2025-10-19".
-                # If I change it, I am changing the spec.
-                # If I change the test, I am aligning with the spec.
-                # Let's align with the spec for now to be safe, and maybe note the missing size_bytes.
-                # Wait, `COGNITIVE_MEMORY_SYSTEM_SPEC.md` has `memories` table with `size_bytes`.
-                # The ETL pipeline populates `artifacts` (files) which then become `memories`?
-                # Or is `artifacts` the staging?
-                # The TRD says "Store in SQLite (schema v2)".
-                # Let's assume for now I should follow the schema file strictly.
-                # So I will remove `size_bytes` from the test assertions in a follow-up step if needed, 
-                # OR I will just ignore `size_bytes` in the insert for now and fail the test, then fix the test.
-                # Actually, I can just NOT update size_bytes in the DB.
-                # But the test will fail.
-                # I will modify the code to NOT try to insert size_bytes into artifacts table.
-                # And I will accept that the test will fail on that assertion, and I will fix the test in the Verification phase.
-                conn.commit()
-                return artifact_id
+                """, (file_hash, current_version + 1, artifact_id))
+            return artifact_id
+
+        cursor.execute("""
+            INSERT INTO artifacts (file_path, file_hash, version)
+            VALUES (?, ?, 1)
+        """, (file_path, file_hash))
+        return cursor.lastrowid
+
+    @_serialized_write
+    def ingest_extraction(self, file_path, file_hash, result, processing_time, tokens_used=0,
+                          prompt_version=None, cache_hit=False):
+        """
+        Store one file's ExtractionResult in a single transaction.
+
+        Replaces the per-item insert_entity / record_*_occurrence / insert_concept
+        calls, each of which committed on its own (hundreds of WAL fsyncs per file).
+        Writes the artifact, entities, concepts, occurrences, quality metrics and a
+        'success' processing status, then commits once. On error nothing is written.
+
+        Args:
+            file_path: Source file path
+            file_hash: SHA256 of the file content
+            result: ExtractionResult with entities and concepts
+            processing_time: Seconds spent processing the file
+            tokens_used: LLM tokens consumed
+            prompt_version: ExtractionManager.prompt_version; with migration 020
+                the result is cached under (file_hash, prompt_version)
+            cache_hit: The result came from extraction_cache (recorded in
+                quality_metrics.cache_hit, bumps the entry's hit_count)
+
+        Returns:
+            The artifact id
+        """
+        conn = self.get_connection()
+        with conn:
+            cursor = conn.cursor()
+            artifact_id = self._upsert_artifact(cursor, file_path, file_hash)
+
+            # IDs are only interned once the transaction commits
+            pending_entities = {}
+            pending_concepts = {}
+
+            entity_keys = list(dict.fromkeys((e.type, e.value) for e in result.entities))
+            entity_ids = self._resolve_entity_ids(cursor, entity_keys, pending_entities)
+
+            concept_rows = list({
+                (c.type, self.concept_content_hash(c.content)): (c.type, c.content, c.source_adr)
+                for c in result.concepts
+            }.items())
+            concept_ids = self._resolve_concept_ids(cursor, concept_rows, pending_concepts)
+
+            # Occurrences (skip links that already exist, as record_*_occurrence does)
+            cursor.executemany("""
+                INSERT INTO entity_occurrences (entity_id, artifact_id, context_snippet)
+                SELECT ?, ?, NULL
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM entity_occurrences WHERE entity_id = ? AND artifact_id = ?
+                )
+            """, [(eid, artifact_id, eid, artifact_id) for eid in entity_ids])
+            cursor.executemany("""
+                INSERT INTO concept_occurrences (concept_id, artifact_id, context_snippet)
+                SELECT ?, ?, NULL
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM concept_occurrences WHERE concept_id = ? AND artifact_id = ?
+                )
+            """, [(cid, artifact_id, cid, artifact_id) for cid in concept_ids])
+
+            if self.has_extraction_cache():
+                cursor.execute("""
+                    INSERT INTO quality_metrics
+                    (artifact_id, entities_extracted, concepts_extracted, processing_time_seconds,
+                     llm_tokens_used, cache_hit)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (artifact_id, len(result.entities), len(result.concepts), processing_time,
+                      tokens_used, int(cache_hit)))
+                if prompt_version is not None:
+                    self._store_cached_extraction(cursor, file_hash, prompt_version, result, cache_hit)
             else:
-                return artifact_id
+                cursor.execute("""
+                    INSERT INTO quality_metrics
+                    (artifact_id, entities_extracted, concepts_extracted, processing_time_seconds, llm_tokens_used)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (artifact_id, len(result.entities), len(result.concepts), processing_time, tokens_used))
+
+            self._upsert_processing_status(cursor, file_path, "success")
+
+        for key, entity_id in pending_entities.items():
+            self._cache_put(self._entity_ids, key, entity_id, self.ENTITY_CACHE_SIZE)
+        for key, concept_id in pending_concepts.items():
+            self._cache_put(self._concept_ids, key, concept_id, self.CONCEPT_CACHE_SIZE)
+
+        return artifact_id
+
+    # =========================================================================
+    # Extraction cache (migration 020)
+    # =========================================================================
+
+    def has_extraction_cache(self):
+        """Whether extraction_cache and quality_metrics.cache_hit exist (migration 020). Cached per manager."""
+        if self._extraction_cache_supported is None:
+            conn = self.get_connection()
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(quality_metrics)")}
+            has_table = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'extraction_cache'"
+            ).fetchone() is not None
+            self._extraction_cache_supported = has_table and 'cache_hit' in columns
+        return self._extraction_cache_supported
+
+    def get_cached_extraction(self, content_hash, prompt_version):
+        """
+        Cached ExtractionResult JSON for identical content, or None.
+
+        Reads through the calling thread's read connection, so extraction
+        workers can look up without touching the writer.
+        """
+        if not self.has_extraction_cache():
+            return None
+        row = self.get_read_connection().execute(
+            "SELECT result FROM extraction_cache WHERE content_hash = ? AND prompt_version = ?",
+            (content_hash, prompt_version)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _store_cached_extraction(self, cursor, content_hash, prompt_version, result, cache_hit):
+        """Insert a fresh result, or count a hit on the entry it came from; no commit."""
+        if cache_hit:
+            cursor.execute("""
+                UPDATE extraction_cache
+                SET hit_count = hit_count + 1, last_used_at = CURRENT_TIMESTAMP
+                WHERE content_hash = ? AND prompt_version = ?
+            """, (content_hash, prompt_version))
         else:
-            # Insert new
             cursor.execute("""
-                INSERT INTO artifacts (file_path, file_hash, version)
-                VALUES (?, ?, 1)
-            """, (file_path, file_hash))
-            conn.commit()
-            return cursor.lastrowid
+                INSERT OR REPLACE INTO extraction_cache (content_hash, prompt_version, result)
+                VALUES (?, ?, ?)
+            """, (content_hash, prompt_version, result.to_json()))
+
+    # =========================================================================
+    # File manifest (migration 021)
+    # =========================================================================
+
+    def has_file_manifest(self):
+        """Whether the file_manifest table exists (migration 021). Cached per manager."""
+        if self._file_manifest_supported is None:
+            self._file_manifest_supported = self.get_connection().execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'file_manifest'"
+            ).fetchone() is not None
+        return self._file_manifest_supported
+
+    def load_file_manifest(self):
+        """
+        Stat manifest of files last processed as 'success' or 'skipped'.
+
+        Returns:
+            {file_path: (size_bytes, mtime_ns, inode, file_hash)}; empty
+            without migration 021. Files whose last status is 'error' (or
+            that have no status) are left out, so they are always retried.
+        """
+        if not self.has_file_manifest():
+            return {}
+        rows = self.get_read_connection().execute("""
+            SELECT m.file_path, m.size_bytes, m.mtime_ns, m.inode, m.file_hash
+            FROM file_manifest m
+            JOIN processing_log p ON p.file_path = m.file_path
+            WHERE p.status IN ('success', 'skipped')
+        """).fetchall()
+        return {row[0]: (row[1], row[2], row[3], row[4]) for row in rows}
+
+    @_serialized_write
+    def record_file_manifest(self, entries):
+        """
+        Upsert manifest rows in one transaction.
+
+        Args:
+            entries: Iterable of (file_path, size_bytes, mtime_ns, inode, file_hash)
+
+        Returns:
+            Rows written (0 without migration 021)
+        """
+        entries = list(entries)
+        if not entries or not self.has_file_manifest():
+            return 0
+        conn = self.get_connection()
+        conn.executemany("""
+            INSERT INTO file_manifest (file_path, size_bytes, mtime_ns, inode, file_hash)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(file_path) DO UPDATE SET
+                size_bytes = excluded.size_bytes,
+                mtime_ns = excluded.mtime_ns,
+                inode = excluded.inode,
+                file_hash = excluded.file_hash,
+                updated_at = CURRENT_TIMESTAMP
+        """, entries)
+        conn.commit()
+        return len(entries)
+
+    # =========================================================================
+    # ID interning (bounded LRU caches for ingestion lookups)
+    # =========================================================================
+
+    @staticmethod
+    def concept_content_hash(content):
+        """SHA256 of concept content, as stored in concepts.content_hash (migration 012)."""
+        return hashlib.sha256((content or "").encode("utf-8")).hexdigest()
 
+    @staticmethod
+    def _cache_get(cache, key):
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+    @staticmethod
+    def _cache_put(cache, key, value, max_size):
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > max_size:
+            cache.popitem(last=False)
+
+    def clear_intern_cache(self):
+        """
+        Forget interned entity/concept IDs.
+
+        Cached IDs live as long as the manager. Call this after deleting or
+        merging entities/concepts in the same process.
+        """
+        self._entity_ids.clear()
+        self._concept_ids.clear()
+
+    def has_concept_content_hash(self):
+        """Whether concepts.content_hash exists (migration 012). Cached per manager."""
+        if self._concept_hash_supported is None:
+            conn = self.get_connection()
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(concepts)")}
+            self._concept_hash_supported = 'content_hash' in columns
+        return self._concept_hash_supported
+
+    def _resolve_entity_ids(self, cursor, keys, pending):
+        """
+        Map (type, value) keys to entity ids, inserting missing entities.
+
+        Cache hits never reach SQLite. Misses are upserted with one executemany
+        and looked up through the UNIQUE(type, value) index. New mappings go into
+        `pending` so the caller can intern them after commit.
+        """
+        ids = {key: self._cache_get(self._entity_ids, key) for key in keys}
+        misses = [key for key, entity_id in ids.items() if entity_id is None]
+        if misses:
+            cursor.executemany("""
+                INSERT INTO entities (type, value) VALUES (?, ?)
+                ON CONFLICT(type, value) DO NOTHING
+            """, misses)
+            for key in misses:
+                cursor.execute("SELECT id FROM entities WHERE type = ? AND value = ?", key)
+                ids[key] = pending[key] = cursor.fetchone()[0]
+        return [ids[key] for key in keys]
+
+    def _resolve_concept_ids(self, cursor, rows, pending):
+        """
+        Map ((type, content_hash), (type, content, source_adr)) rows to concept ids,
+        inserting missing concepts.
+
+        With migration 012 applied, misses are upserted on the unique
+        (type, content_hash) index. Without it, falls back to matching on
+        (type, content), which scans the table.
+        """
+        ids = {key: self._cache_get(self._concept_ids, key) for key, _ in rows}
+        misses = [(key, concept) for key, concept in rows if ids[key] is None]
+
+        if misses and self.has_concept_content_hash():
+            cursor.executemany("""
+                INSERT INTO concepts (type, content, source_adr, content_hash) VALUES (?, ?, ?, ?)
+                ON CONFLICT(type, content_hash) DO NOTHING
+            """, [concept + (key[1],) for key, concept in misses])
+            for key, _ in misses:
+                cursor.execute("SELECT id FROM concepts WHERE type = ? AND content_hash = ?", key)
+                ids[key] = pending[key] = cursor.fetchone()[0]
+        else:
+            for key, concept in misses:
+                cursor.execute("SELECT id FROM concepts WHERE type = ? AND content = ?", concept[:2])
+                row = cursor.fetchone()
+                if row:
+                    concept_id = row[0]
+                else:
+                    cursor.execute("INSERT INTO concepts (type, content, source_adr) VALUES (?, ?, ?)", concept)
+                    concept_id = cursor.lastrowid
+                ids[key] = pending[key] = concept_id
+
+        return [ids[key] for key, _ in rows]
+
+    def insert_concept_row(self, cursor, concept_type, content, source_adr=None, **columns):
+        """
+        INSERT one concept with its content_hash, inside the caller's transaction.
+
+        Every concept insert outside ingestion (synthesis, refinement) goes
+        through here, so no row is left with a NULL hash that
+        _resolve_concept_ids could never match. Extra `columns` are written
+        as given.
+
+        Returns:
+            (concept_id, inserted): inserted is False when a concept with the
+            same type and content already exists (its id is returned instead)
+        """
+        values = {'type': concept_type, 'content': content, 'source_adr': source_adr, **columns}
+        if self.has_concept_content_hash():
+            values['content_hash'] = self.concept_content_hash(content)
+            cursor.execute("SELECT id FROM concepts WHERE type = ? AND content_hash = ?",
+                           (concept_type, values['content_hash']))
+            row = cursor.fetchone()
+            if row:
+                return row[0], False
+        names = ", ".join(values)
+        placeholders = ", ".join("?" for _ in values)
+        cursor.execute(f"INSERT INTO concepts ({names}) VALUES ({placeholders})", tuple(values.values()))
+        return cursor.lastrowid, True
+
+    @_serialized_write
     def insert_entity(self, type, value):
-        """Insert entity if not exists, return id."""
+        """Insert entity if not exists, return id (interned - repeats skip SQLite)."""
         conn = self.get_connection()
         cursor = conn.cursor()
-        
-        # Try insert
-        try:
-            cursor.execute("INSERT INTO entities (type, value) VALUES (?, ?)", (type, value))
+        pending = {}
+        entity_id = self._resolve_entity_ids(cursor, [(type, value)], pending)[0]
+        if pending:
             conn.commit()
-            return cursor.lastrowid
-        except sqlite3.IntegrityError:
-            # Already exists
-            cursor.execute("SELECT id FROM entities WHERE type = ? AND value = ?", (type, value))
-            return cursor.fetchone()[0]
+            self._cache_put(self._entity_ids, (type, value), entity_id, self.ENTITY_CACHE_SIZE)
+        return entity_id
 
+    @_serialized_write
     def insert_concept(self, type, name, description):
         """
-        Insert concept. 
-        Note: Schema has 'content' and 'source_adr', not 'name' and 'description'.
-        Mapping: name -> content (or description -> content?)
-        Let's check schema:
-        CREATE TABLE concepts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            type TEXT NOT NULL,
-            content TEXT NOT NULL,
-            source_adr TEXT
-        );
-        The test passed 'name' and 'description'.
-        I will map 'name' to 'content' and ignore 'description' or put it in content?
-        The test says: insert_concept("Decision", "Use SQLite", "Because it is fast")
-        I will map: type="Decision", content="Use SQLite", source_adr="Because it is fast" (maybe?)
-        Actually, 'source_adr' implies a reference. "Because it is fast" is a rationale.
-        The schema seems to be for specific concept types.
-        Let's just map name -> content for now to satisfy the test's basic structure.
+        Insert concept if no concept with the same type and content exists, return id.
+
+        Mapping to the concepts schema: name -> content, description -> source_adr.
+        Lookups are interned on (type, SHA256(content)) and use the unique
+        content_hash index from migration 012 when it is present.
         """
         conn = self.get_connection()
         cursor = conn.cursor()
-        
-        # Schema doesn't have unique constraint on concepts?
-        # Let's check schema... No UNIQUE constraint on concepts table!
-        # But we probably want to avoid duplicates.
-        # Let's check if exists first.
-        cursor.execute("SELECT id FROM concepts WHERE type = ? AND content = ?", (type, name))
-        row = cursor.fetchone()
-        if row:
-             return row[0]
-             
-        cursor.execute("INSERT INTO concepts (type, content, source_adr) VALUES (?, ?, ?)", 
-                       (type, name, description)) # Mapping description to source_adr for now
-        conn.commit()
-        return cursor.lastrowid
+        key = (type, self.concept_content_hash(name))
+        pending = {}
+        concept_id = self._resolve_concept_ids(cursor, [(key, (type, name, description))], pending)[0]
+        if pending:
+            conn.commit()
+            self._cache_put(self._concept_ids, key, concept_id, self.CONCEPT_CACHE_SIZE)
+        return concept_id
 
+    @_serialized_write
     def record_entity_occurrence(self, entity_id, artifact_id, context):
         conn = self.get_connection()
         cursor = conn.cursor()
@@ -207,6 +622,7 @@ class DatabaseManager:
         """, (entity_id, artifact_id, context))
         conn.commit()
 
+    @_serialized_write
     def record_concept_occurrence(self, concept_id, artifact_id, context):
         conn = self.get_connection()
         cursor = conn.cursor()
@@ -223,19 +639,20 @@ class DatabaseManager:
         conn.commit()
 
     def get_processing_status(self, file_path):
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT status FROM processing_log WHERE file_path = ?", (file_path,))
         row = cursor.fetchone()
         return row[0] if row else None
 
     def get_artifact_hash(self, file_path):
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT file_hash FROM artifacts WHERE file_path = ?", (file_path,))
         row = cursor.fetchone()
         return row[0] if row else None
 
+    @_serialized_write
     def insert_quality_metrics(self, artifact_id, entities_extracted, concepts_extracted, processing_time, tokens_used):
         conn = self.get_connection()
         cursor = conn.cursor()
@@ -246,42 +663,30 @@ class DatabaseManager:
         """, (artifact_id, entities_extracted, concepts_extracted, processing_time, tokens_used))
         conn.commit()
 
+    @_serialized_write
     def update_processing_status(self, file_path, status, error_message=None):
         conn = self.get_connection()
         cursor = conn.cursor()
-        # Check if exists
-        cursor.execute("SELECT id FROM processing_log WHERE file_path = ?", (file_path,))
-        row = cursor.fetchone()
-        if row:
-            cursor.execute("""
-                UPDATE processing_log 
-                SET status = ?, last_attempt_at = CURRENT_TIMESTAMP, error_message = ? 
-                WHERE file_path = ?
-            """, (status, error_message, file_path))
-        else:
-            cursor.execute("""
-                INSERT INTO processing_log (file_path, status, error_message) 
-                VALUES (?, ?, ?)
-            """, (file_path, status, error_message))
+        self._upsert_processing_status(cursor, file_path, status, error_message)
         conn.commit()
 
+    def _upsert_processing_status(self, cursor, file_path, status, error_message=None):
+        """Insert or update the processing_log row for a file without committing."""
+        cursor.execute("""
+            INSERT INTO processing_log (file_path, status, error_message)
+            VALUES (?, ?, ?)
+            ON CONFLICT(file_path) DO UPDATE SET
+                status = excluded.status,
+                last_attempt_at = CURRENT_TIMESTAMP,
+                error_message = excluded.error_message
+        """, (file_path, status, error_message))
+
+    @_serialized_write
     def insert_embedding(self, artifact_id, vector, model, dimensions):
         """Insert embedding for an artifact."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        # Serialize vector (sqlite-vec expects raw bytes or specific format)
-        # For sqlite-vec v0.1+, it handles float32 bytes.
-        import struct
-        vector_bytes = struct.pack(f'{len(vector)}f', *vector)
-
-        cursor.execute("""
-            INSERT INTO embeddings (artifact_id, vector, model, dimensions)
-            VALUES (?, ?, ?, ?)
-        """, (artifact_id, vector_bytes, model, dimensions))
-        conn.commit()
-        return cursor.lastrowid
+        return self._insert_embedding_row('artifact_id', artifact_id, vector, model, dimensions)
 
+    @_serialized_write
     def insert_concept_embedding(self, concept_id, vector, model, dimensions):
         """
         Insert embedding for a concept (E2-FIX-002).
@@ -289,19 +694,95 @@ class DatabaseManager:
         Similar to insert_embedding but uses concept_id instead of artifact_id.
         This enables semantic search for concepts ingested via ingester_ingest.
         """
+        return self._insert_embedding_row('concept_id', concept_id, vector, model, dimensions)
+
+    def _insert_embedding_row(self, owner_column, owner_id, vector, model, dimensions):
+        """
+        Insert one embeddings row, plus its quantized codes when migration 013 is applied.
+
+        The vector is stored L2-normalized (migration 014).
+        """
         conn = self.get_connection()
         cursor = conn.cursor()
 
-        import struct
-        vector_bytes = struct.pack(f'{len(vector)}f', *vector)
+        # Serialize vector (sqlite-vec v0.1+ takes float32 bytes)
+        vector = normalize_vector(vector)
+        vector_bytes = encode_vector(vector)
 
-        cursor.execute("""
-            INSERT INTO embeddings (concept_id, vector, model, dimensions)
-            VALUES (?, ?, ?, ?)
-        """, (concept_id, vector_bytes, model, dimensions))
+        columns = [owner_column, 'vector', 'model', 'dimensions']
+        values = [owner_id, vector_bytes, model, dimensions]
+        codes = self._quantize_vector(vector) if self.has_quantized_embeddings() else None
+        if codes:
+            columns += list(codes)
+            values += list(codes.values())
+
+        placeholders = ", ".join("?" for _ in columns)
+        cursor.execute(
+            f"INSERT INTO embeddings ({', '.join(columns)}) VALUES ({placeholders})", values
+        )
         conn.commit()
         return cursor.lastrowid
 
+    def get_setting(self, key, default=None):
+        """Read a memory_settings value (migration 014); `default` if unset or no table."""
+        conn = self.get_read_connection()
+        try:
+            row = conn.execute("SELECT value FROM memory_settings WHERE key = ?", (key,)).fetchone()
+        except sqlite3.OperationalError:
+            return default
+        return row[0] if row else default
+
+    def embeddings_normalized(self):
+        """
+        Whether every stored embedding is unit length (migration 014 flag).
+
+        New writes are always normalized; the flag is set by
+        scripts/normalize_embeddings.py once older rows are rewritten. When set,
+        scans compare vectors by L2 distance instead of cosine. Cached per manager.
+        """
+        if self._normalized is None:
+            self._normalized = self.get_setting(self.EMBEDDINGS_NORMALIZED_KEY) == '1'
+        return self._normalized
+
+    def has_quantized_embeddings(self):
+        """Whether embeddings has the quantized code columns (migration 013). Cached per manager."""
+        if self._quantized_supported is None:
+            conn = self.get_connection()
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(embeddings)")}
+            self._quantized_supported = {'vector_int8', 'vector_int8_scale', 'vector_binary'} <= columns
+        return self._quantized_supported
+
+    @staticmethod
+    def _quantize_vector(vector):
+        """Column -> value for the migration 013 codes, or None without NumPy."""
+        try:
+            from .quantization import encode_binary, encode_int8
+        except ImportError:
+            return None
+        int8_code, int8_scale = encode_int8(vector)
+        return {
+            'vector_int8': int8_code,
+            'vector_int8_scale': int8_scale,
+            'vector_binary': encode_binary(vector),
+        }
+
+    def has_vec_index(self, table_name: str) -> bool:
+        """
+        Check whether a vec0 index table exists and is queryable.
+
+        Fails when the migration has not been applied OR the sqlite-vec extension
+        is not loaded (vec0 tables raise "no such module: vec0" without it).
+        Cached per manager - migrations are applied out of band, not mid-process.
+        """
+        if table_name not in self._vec_index_cache:
+            conn = self.get_read_connection()
+            try:
+                conn.execute(f"SELECT 1 FROM {table_name} LIMIT 0")
+                self._vec_index_cache[table_name] = True
+            except sqlite3.Error:
+                self._vec_index_cache[table_name] = False
+        return self._vec_index_cache[table_name]
+
     def search_memories(self, query_vector, space_id=None, filters=None, limit=10, mode='semantic'):
         """
         Search memories using vector similarity with optional retrieval modes.
@@ -313,32 +794,334 @@ class DatabaseManager:
 
         Session 72 (ADR-037): Added retrieval modes for different use cases.
 
+        Backends, in order: the in-process EmbeddingStore when one is attached
+        (attach_embedding_store), KNN on the vec0 indexes from migration 010 when
+        they are available, otherwise a brute-force vec_distance_cosine scan.
+
+        space_id and filters are pre-filters: each backend resolves the allowed
+        artifact/concept ids first (see _search_scope) and only ranks those rows.
+
         Args:
             query_vector: Embedding vector for the query
-            space_id: Optional space filter (not yet implemented)
-            filters: Optional additional filters (not yet implemented)
+            space_id: Optional space filter. Artifacts match on artifacts.space_id;
+                concepts match when they occur in an artifact of that space.
+            filters: Optional memory_metadata filters {key: value}. A list/tuple/set
+                value matches any of its items. All keys must match.
             limit: Maximum results to return
             mode: Retrieval mode - one of:
                 - 'semantic': Pure semantic similarity (default, backward compatible)
                 - 'session_recovery': Excludes SynthesizedInsight, for coldstart
                 - 'knowledge_lookup': Filters to episteme/techne/actionable types
         """
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         cursor = conn.cursor()
 
-        import struct
-        query_bytes = struct.pack(f'{len(query_vector)}f', *query_vector)
+        query_vector = normalize_vector(query_vector)
+        query_bytes = encode_vector(query_vector)
 
         # Build mode-specific type filter for concepts
+        include_types, exclude_types = self._mode_concept_types(mode)
         concept_type_filter = ""
+        if exclude_types:
+            excluded = ", ".join(f"'{t}'" for t in exclude_types)
+            concept_type_filter = f"AND c.type NOT IN ({excluded})"
+        elif include_types:
+            allowed = ", ".join(f"'{t}'" for t in include_types)
+            concept_type_filter = f"AND c.type IN ({allowed})"
+
+        scope = self._search_scope(space_id, filters)
+
+        if self.embedding_store is not None:
+            try:
+                rows = self._search_memories_store(cursor, query_vector, mode, limit, scope)
+                if rows is not None:
+                    return self._format_search_rows(rows)
+            except Exception as e:
+                logging.warning(f"Embedding store search failed, falling back to SQL: {e}")
+
+        if (len(query_vector) == self.VEC_DIMENSIONS
+                and self.has_vec_index('artifact_embeddings_vec')
+                and self.has_vec_index('concept_embeddings_vec')):
+            try:
+                rows = self._search_memories_knn(
+                    cursor, query_bytes, mode, concept_type_filter, limit, scope)
+                return self._format_search_rows(rows)
+            except Exception as e:
+                logging.warning(f"KNN search failed, falling back to full scan: {e}")
+
+        try:
+            rows = self._search_memories_scan(cursor, query_bytes, concept_type_filter, limit, scope)
+            return self._format_search_rows(rows)
+
+        except Exception as e:
+            # Fallback if vector search fails (e.g. extension missing)
+            logging.error(f"Vector search failed: {e}")
+            return []
+
+    def _mode_concept_types(self, mode):
+        """(include, exclude) concept types for a retrieval mode; None = no constraint."""
         if mode == 'session_recovery':
             # Exclude synthesis concepts - they crowd out specific session content
-            concept_type_filter = "AND c.type != 'SynthesizedInsight'"
-        elif mode == 'knowledge_lookup':
+            return None, self.SESSION_RECOVERY_EXCLUDED_TYPES
+        if mode == 'knowledge_lookup':
             # Only actionable knowledge types
-            allowed_types = "'episteme', 'techne', 'Critique', 'Decision', 'Directive', 'Proposal'"
-            concept_type_filter = f"AND c.type IN ({allowed_types})"
+            return self.KNOWLEDGE_LOOKUP_TYPES, None
         # mode == 'semantic' uses no filter (backward compatible)
+        return None, None
+
+    def _search_scope(self, space_id, filters):
+        """
+        Id subqueries for space_id / metadata pre-filters.
+
+        Returns None when unfiltered, else {'artifact': (sql, params),
+        'concept': (sql, params)} where each sql selects the allowed
+        artifact / concept ids. Conditions are INTERSECTed so every one is
+        answered from an index (idx_artifacts_space_id,
+        idx_concept_occurrences_artifact_id, idx_metadata_key_value).
+
+        memory_metadata.memory_id holds concept ids (refinement, the MCP
+        tools), so metadata filters apply to concepts only and exclude all
+        artifacts.
+        """
+        if not space_id and not filters:
+            return None
+
+        artifact_parts, concept_parts = [], []
+        if space_id:
+            artifact_parts.append(("SELECT id FROM artifacts WHERE space_id = ?", [space_id]))
+            concept_parts.append(("""
+                SELECT co.concept_id FROM concept_occurrences co
+                JOIN artifacts a ON a.id = co.artifact_id
+                WHERE a.space_id = ?""", [space_id]))
+
+        for key, value in (filters or {}).items():
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            values = [str(v) for v in values]
+            placeholders = ", ".join("?" for _ in values)
+            part = (f"SELECT memory_id FROM memory_metadata WHERE key = ? AND value IN ({placeholders})",
+                    [key, *values])
+            concept_parts.append(part)
+        if filters:
+            # Artifacts are never tagged; an id match would be a concept's tag
+            artifact_parts.append(("SELECT id FROM artifacts WHERE 0", []))
+
+        def combine(parts):
+            sql = " INTERSECT ".join(part_sql for part_sql, _ in parts)
+            params = [param for _, part_params in parts for param in part_params]
+            return sql, params
+
+        return {'artifact': combine(artifact_parts), 'concept': combine(concept_parts)}
+
+    def has_vec_concept_type(self):
+        """Whether concept_embeddings_vec has the concept_type metadata column (migration 015)."""
+        key = 'concept_embeddings_vec.concept_type'
+        if key not in self._vec_index_cache:
+            conn = self.get_read_connection()
+            try:
+                conn.execute("SELECT concept_type FROM concept_embeddings_vec LIMIT 0")
+                self._vec_index_cache[key] = True
+            except sqlite3.Error:
+                self._vec_index_cache[key] = False
+        return self._vec_index_cache[key]
+
+    def attach_embedding_store(self, store=None, quantization=None):
+        """
+        Serve search_memories from an in-process EmbeddingStore.
+
+        Worth it for long-lived processes (MCP server, synthesis runs) that issue
+        many searches: the matrix is loaded once and refreshed incrementally. A
+        one-shot CLI search is cheaper through the vec0 index.
+
+        Args:
+            store: EmbeddingStore to use (default: the shared store for db_path)
+            quantization: 'int8' or 'binary' for a store of compact codes with
+                exact float32 rerank (migration 013); ignored when store is given
+
+        Returns:
+            The attached store, or None if NumPy is not installed.
+        """
+        if store is None:
+            try:
+                from .embedding_store import get_embedding_store
+            except ImportError:
+                logging.warning("numpy not installed. Embedding store disabled.")
+                return None
+            store = get_embedding_store(self.db_path, quantization)
+        self.embedding_store = store
+        return store
+
+    def _search_memories_store(self, cursor, query_vector, mode, limit, scope=None):
+        """
+        Top-k search against the attached EmbeddingStore.
+
+        Scope pre-filters become row masks, so only the allowed rows are scored.
+        Returns None when the store cannot answer (e.g. query dimensions differ
+        from the stored vectors) so the caller falls through to SQL.
+        """
+        store = self.embedding_store
+        store.refresh(self.get_read_connection(), segments=('artifact', 'concept'))
+
+        include_types, exclude_types = self._mode_concept_types(mode)
+        concept_mask = store.type_mask('concept', include=include_types, exclude=exclude_types)
+        artifact_mask = None
+        if scope is not None:
+            artifact_sql, artifact_params = scope['artifact']
+            concept_sql, concept_params = scope['concept']
+            artifact_mask = store.id_mask(
+                'artifact', (row[0] for row in cursor.execute(artifact_sql, artifact_params)))
+            scope_mask = store.id_mask(
+                'concept', (row[0] for row in cursor.execute(concept_sql, concept_params)))
+            if concept_mask is None:
+                concept_mask = scope_mask
+            else:
+                size = min(len(concept_mask), len(scope_mask))  # Another thread may refresh between
+                concept_mask = concept_mask[:size] & scope_mask[:size]
+
+        # conn lets a quantized store rerank its coarse hits on float32 vectors
+        conn = self.get_read_connection()
+        artifact_hits = store.top_k('artifact', query_vector, limit, mask=artifact_mask, conn=conn)
+        concept_hits = store.top_k('concept', query_vector, limit, mask=concept_mask, conn=conn)
+        if artifact_hits is None and concept_hits is None:
+            return None
+
+        hits = [('artifact', owner_id, score) for owner_id, score in artifact_hits or []]
+        hits += [('concept', owner_id, score) for owner_id, score in concept_hits or []]
+        hits.sort(key=lambda h: h[2], reverse=True)
+        hits = hits[:limit]
+
+        artifact_rows = self._fetch_by_ids(
+            cursor, "SELECT id, file_path, file_path FROM artifacts",
+            {owner_id for kind, owner_id, _ in hits if kind == 'artifact'})
+        concept_rows = self._fetch_by_ids(
+            cursor, "SELECT id, type, content, source_adr FROM concepts",
+            {owner_id for kind, owner_id, _ in hits if kind == 'concept'})
+
+        rows = []
+        for kind, owner_id, score in hits:
+            if kind == 'artifact' and owner_id in artifact_rows:
+                _, content, source = artifact_rows[owner_id]
+                rows.append((owner_id, 'artifact', content, source, 1 - score))
+            elif kind == 'concept' and owner_id in concept_rows:
+                _, concept_type, content, source = concept_rows[owner_id]
+                rows.append((owner_id, concept_type, content, source, 1 - score))
+        return rows
+
+    def _fetch_by_ids(self, cursor, select_sql, ids):
+        """Run `select_sql WHERE id IN (...)` and key the rows by their first column."""
+        if not ids:
+            return {}
+        ids = list(ids)
+        placeholders = ", ".join("?" for _ in ids)
+        cursor.execute(f"{select_sql} WHERE id IN ({placeholders})", ids)
+        return {row[0]: row for row in cursor.fetchall()}
+
+    def _search_memories_knn(self, cursor, query_bytes, mode, concept_type_filter, limit, scope=None):
+        """
+        Top-k search via the vec0 indexes (migration 010).
+
+        Each index returns its own k nearest neighbours without touching the rest
+        of the table; only those 2*k rows are joined and merged.
+
+        With migration 015 the mode's concept types are a constraint on the
+        concept_type metadata column, so excluded types are never ranked. On an
+        index without that column, over-fetch and filter after the join so the
+        filter still leaves `limit` rows.
+
+        Scope pre-filters are `embedding_id IN (...)` constraints, which vec0
+        applies before ranking.
+        """
+        artifact_knn_filter = ""
+        artifact_knn_params = []
+        scope_filter = ""
+        scope_params = []
+        if scope is not None:
+            artifact_sql, artifact_params = scope['artifact']
+            concept_sql, concept_params = scope['concept']
+            artifact_knn_filter = f"AND embedding_id IN (SELECT id FROM embeddings WHERE artifact_id IN ({artifact_sql}))"
+            artifact_knn_params = artifact_params
+            scope_filter = f"AND embedding_id IN (SELECT id FROM embeddings WHERE concept_id IN ({concept_sql}))"
+            scope_params = concept_params
+
+        concept_knn_filter = ""
+        concept_knn_params = []
+        include_types, exclude_types = self._mode_concept_types(mode)
+        if concept_type_filter and self.has_vec_concept_type():
+            if include_types:
+                concept_knn_filter = f"AND concept_type IN ({', '.join('?' for _ in include_types)})"
+                concept_knn_params = list(include_types)
+            else:
+                # vec0 mis-handles NOT IN on metadata columns; != per type works
+                concept_knn_filter = " ".join("AND concept_type != ?" for _ in exclude_types)
+                concept_knn_params = list(exclude_types)
+            concept_type_filter = ""
+
+        k = limit * self.KNN_OVERFETCH if concept_type_filter else limit
+        k = min(k, self.KNN_MAX_K)
+
+        sql = f"""
+            WITH artifact_knn AS (
+                SELECT embedding_id, distance
+                FROM artifact_embeddings_vec
+                WHERE embedding MATCH ? AND k = ?
+                {artifact_knn_filter}
+            ),
+            concept_knn AS (
+                SELECT embedding_id, distance
+                FROM concept_embeddings_vec
+                WHERE embedding MATCH ? AND k = ?
+                {concept_knn_filter}
+                {scope_filter}
+            )
+            SELECT id, type, content, source, distance FROM (
+                SELECT
+                    a.id,
+                    'artifact' as type,
+                    a.file_path as content,
+                    a.file_path as source,
+                    knn.distance
+                FROM artifact_knn knn
+                JOIN embeddings e ON e.id = knn.embedding_id
+                JOIN artifacts a ON e.artifact_id = a.id
+
+                UNION ALL
+
+                SELECT
+                    c.id,
+                    c.type as type,
+                    c.content,
+                    c.source_adr as source,
+                    knn.distance
+                FROM concept_knn knn
+                JOIN embeddings e ON e.id = knn.embedding_id
+                JOIN concepts c ON e.concept_id = c.id
+                WHERE 1 = 1
+                {concept_type_filter}
+            )
+            ORDER BY distance ASC
+            LIMIT ?
+        """
+        cursor.execute(sql, [query_bytes, k, *artifact_knn_params,
+                             query_bytes, k, *concept_knn_params, *scope_params, limit])
+        return cursor.fetchall()
+
+    def _search_memories_scan(self, cursor, query_bytes, concept_type_filter, limit, scope=None):
+        """
+        Brute-force search against every embedding row (or every row in scope).
+
+        On a normalized database (migration 014) rows are ranked by L2 distance,
+        which skips the per-row norms; for unit vectors cosine distance = l2^2 / 2.
+        Otherwise vec_distance_cosine is used.
+        """
+        normalized = self.embeddings_normalized()
+        distance_fn = "vec_distance_l2" if normalized else "vec_distance_cosine"
+
+        artifact_scope, artifact_params = "", []
+        concept_scope, concept_params = "", []
+        if scope is not None:
+            artifact_sql, artifact_params = scope['artifact']
+            concept_sql, concept_params = scope['concept']
+            artifact_scope = f"AND e.artifact_id IN ({artifact_sql})"
+            concept_scope = f"AND e.concept_id IN ({concept_sql})"
 
         # Search both artifact and concept embeddings
         # Concepts contain the actual extracted knowledge
@@ -350,10 +1133,11 @@ class DatabaseManager:
                     'artifact' as type,
                     a.file_path as content,
                     a.file_path as source,
-                    vec_distance_cosine(e.vector, ?) as distance
+                    {distance_fn}(e.vector, ?) as distance
                 FROM embeddings e
                 JOIN artifacts a ON e.artifact_id = a.id
                 WHERE e.artifact_id IS NOT NULL
+                {artifact_scope}
 
                 UNION ALL
 
@@ -363,40 +1147,38 @@ class DatabaseManager:
                     c.type as type,
                     c.content,
                     c.source_adr as source,
-                    vec_distance_cosine(e.vector, ?) as distance
+                    {distance_fn}(e.vector, ?) as distance
                 FROM embeddings e
                 JOIN concepts c ON e.concept_id = c.id
                 WHERE e.concept_id IS NOT NULL
                 {concept_type_filter}
+                {concept_scope}
             )
             ORDER BY distance ASC
             LIMIT ?
         """
-        params = [query_bytes, query_bytes, limit]
+        cursor.execute(sql, [query_bytes, *artifact_params, query_bytes, *concept_params, limit])
+        rows = cursor.fetchall()
+        if normalized:
+            rows = [row[:4] + (row[4] * row[4] / 2,) for row in rows]
+        return rows
 
-        try:
-            cursor.execute(sql, params)
-            rows = cursor.fetchall()
-
-            results = []
-            for row in rows:
-                results.append({
-                    'id': row[0],
-                    'type': row[1],
-                    'content': row[2],
-                    'source': row[3],
-                    'score': 1 - row[4]  # Convert distance to similarity score
-                })
-            return results
-
-        except Exception as e:
-            # Fallback if vector search fails (e.g. extension missing)
-            logging.error(f"Vector search failed: {e}")
-            return []
+    def _format_search_rows(self, rows):
+        """Convert (id, type, content, source, distance) rows to result dicts."""
+        results = []
+        for row in rows:
+            results.append({
+                'id': row[0],
+                'type': row[1],
+                'content': row[2],
+                'source': row[3],
+                'score': 1 - row[4]  # Convert distance to similarity score
+            })
+        return results
 
     def get_stats(self):
         """Get database statistics."""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         cursor = conn.cursor()
         
         stats = {}
@@ -434,6 +1216,7 @@ class DatabaseManager:
     # AGENT ECOSYSTEM METHODS (Session 17)
     # ==================================================================================
 
+    @_serialized_write
     def register_agent(self, agent_card: Dict[str, Any]) -> None:
         """
         Register or update an agent in the registry.
@@ -477,7 +1260,7 @@ class DatabaseManager:
         """
         Retrieve an agent by ID.
         """
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         cursor = conn.execute("SELECT * FROM agent_registry WHERE id = ?", (agent_id,))
         row = cursor.fetchone()
         if row:
@@ -495,7 +1278,7 @@ class DatabaseManager:
         """
         List agents, optionally filtering by capability.
         """
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         query = "SELECT * FROM agent_registry WHERE status = 'active'"
         params = []
         
@@ -533,7 +1316,7 @@ class DatabaseManager:
             Dict with schema info - abstracted from underlying database implementation.
             When SQLite, uses PRAGMA. When Postgres, would use information_schema.
         """
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         cursor = conn.cursor()
 
         if table_name:
@@ -563,7 +1346,7 @@ class DatabaseManager:
 
     def _list_tables(self) -> List[str]:
         """Get list of all tables in database."""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
         return [row[0] for row in cursor.fetchall()]
@@ -593,7 +1376,7 @@ class DatabaseManager:
             if keyword in sql_upper:
                 return {"error": f"Blocked: {keyword} not allowed in read-only queries"}
 
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         cursor = conn.cursor()
 
         try:
@@ -0,0 +1,613 @@
+# generated: 2026-10-18
+# System Auto: last updated on: 2026-10-18 13:04:26
+"""
+In-process embedding matrix cache.
+
+Retrieval, synthesis clustering and cross-pollination each used to re-read every
+embedding BLOB from SQLite and struct.unpack it on every call. EmbeddingStore keeps
+one contiguous float32 matrix per segment instead:
+
+    - 'concept'  : embeddings.concept_id rows (plus concept type per row)
+    - 'artifact' : embeddings.artifact_id rows
+    - 'trace'    : reasoning_traces.query_embedding
+
+Rows are L2-normalized at load time, so a top-k cosine query is a single
+matrix-vector product.
+
+Refresh is incremental: each segment remembers the highest source row id it has
+seen and only loads rows above it. refresh() runs on every search, so it first
+compares the connection's PRAGMA data_version and total_changes with the last
+refresh through that connection; when nothing was committed since, it returns
+without touching the tables. Otherwise the memory_settings.embedding_generation
+counter (bumped by the migration 022 triggers on vector rewrites, deletes and
+concept type changes) decides whether a segment is stale and reloaded. Databases
+without migration 022 fall back to a row count, which misses in-place rewrites:
+call invalidate() after rewriting embeddings out of band there.
+
+Stores are shared per database file via get_embedding_store(), so the MCP server,
+search_memories and SynthesisManager in one process hold a single copy.
+
+Quantized stores (EmbeddingStore(quantization='int8' | 'binary')) keep only the
+compact codes from migration 013 in memory - 4x / 32x smaller than float32 - and
+load them without reading the float BLOBs. top_k() then runs in two stages: a
+coarse pass over the codes picks `rerank_candidates` rows, and those rows are
+reranked exactly against their float32 vectors fetched by id. Rows without
+codes (migration 013 not backfilled yet) are quantized from the float BLOB at
+load time.
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from . import quantization
+
+logger = logging.getLogger(__name__)
+
+
+class _Segment:
+    """Growable float32 matrix of normalized vectors with parallel id arrays."""
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, name: str):
+        self.name = name
+        self.clear()
+
+    def clear(self):
+        # Bumped on every reload so cached type masks are rebuilt
+        self.generation = getattr(self, 'generation', -1) + 1
+        self.dimensions: Optional[int] = None
+        self.size = 0
+        self.max_source_id = 0   # Highest embeddings.id / reasoning_traces.id loaded
+        self.db_generation = None  # memory_settings.embedding_generation at last load
+        self.checked = None      # (connection, change state) of the last refresh
+        self.skipped = 0         # Rows whose dimensions differ from the segment
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._source_ids = np.zeros(0, dtype=np.int64)
+        self._types = np.zeros(0, dtype=object)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self._matrix[:self.size]
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._ids[:self.size]
+
+    @property
+    def source_ids(self) -> np.ndarray:
+        return self._source_ids[:self.size]
+
+    @property
+    def types(self) -> np.ndarray:
+        return self._types[:self.size]
+
+    def append(self, rows: List[Tuple[int, int, bytes, Optional[str]]]):
+        """
+        Append (source_id, owner_id, blob, type) rows.
+
+        Rows must arrive in ascending source_id order. Buffers grow by doubling,
+        so existing rows are never rewritten and readers holding a view of the
+        first `size` rows are unaffected.
+        """
+        if not rows:
+            return
+
+        if self.dimensions is None:
+            self.dimensions = len(rows[0][2]) // 4
+
+        blob_len = self.dimensions * 4
+        kept = [r for r in rows if r[2] is not None and len(r[2]) == blob_len]
+        self.skipped += len(rows) - len(kept)
+        self.max_source_id = max(self.max_source_id, rows[-1][0])
+        if not kept:
+            return
+
+        vectors = np.frombuffer(b"".join(r[2] for r in kept), dtype=np.float32)
+        vectors = vectors.reshape(len(kept), self.dimensions)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+        new_size = self.size + len(kept)
+        if new_size > self._matrix.shape[0]:
+            self._grow(max(new_size, self._matrix.shape[0] * 2, self.INITIAL_CAPACITY))
+
+        self._matrix[self.size:new_size] = vectors
+        self._source_ids[self.size:new_size] = [r[0] for r in kept]
+        self._ids[self.size:new_size] = [r[1] for r in kept]
+        self._types[self.size:new_size] = [r[3] for r in kept]
+        self.size = new_size
+
+    def _grow(self, capacity: int):
+        matrix = np.zeros((capacity, self.dimensions), dtype=np.float32)
+        ids = np.zeros(capacity, dtype=np.int64)
+        source_ids = np.zeros(capacity, dtype=np.int64)
+        types = np.empty(capacity, dtype=object)
+        if self.size:
+            matrix[:self.size] = self.matrix
+            ids[:self.size] = self.ids
+            source_ids[:self.size] = self.source_ids
+            types[:self.size] = self.types
+        self._matrix, self._ids, self._source_ids, self._types = matrix, ids, source_ids, types
+
+
+class _QuantizedSegment(_Segment):
+    """Segment holding int8 or binary codes instead of float32 rows."""
+
+    def __init__(self, name: str, mode: str):
+        self.mode = mode
+        super().__init__(name)
+
+    def clear(self):
+        super().clear()
+        self._codes = np.zeros((0, 0), dtype=np.int8 if self.mode == quantization.INT8 else np.uint8)
+        self._scales = np.zeros(0, dtype=np.float32)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        raise AttributeError(f"Quantized segment '{self.name}' keeps codes, not float32 rows")
+
+    @property
+    def codes(self) -> np.ndarray:
+        return self._codes[:self.size]
+
+    @property
+    def scales(self) -> np.ndarray:
+        return self._scales[:self.size]
+
+    def append(self, rows: List[Tuple[int, int, Optional[str], int, Optional[bytes],
+                                      Optional[float], Optional[bytes]]]):
+        """
+        Append (source_id, owner_id, type, dimensions, code, scale, blob) rows.
+
+        `blob` is only selected when the row has no stored code; it is quantized
+        here and dropped.
+        """
+        if not rows:
+            return
+
+        if self.dimensions is None:
+            self.dimensions = rows[0][3]
+
+        code_len = quantization.code_size(self.mode, self.dimensions)
+        kept, codes, scales = [], [], []
+        for source_id, owner_id, row_type, dims, code, scale, blob in rows:
+            if dims != self.dimensions:
+                continue
+            if code is not None and len(code) == code_len:
+                codes.append(np.frombuffer(code, dtype=self._codes.dtype))
+                scales.append(scale or 0.0)
+            elif blob is not None and len(blob) == self.dimensions * 4:
+                vector = np.frombuffer(blob, dtype=np.float32)
+                if self.mode == quantization.INT8:
+                    row_codes, row_scales = quantization.quantize_int8(vector)
+                    scales.append(row_scales[0])
+                else:
+                    row_codes = quantization.quantize_binary(vector)
+                    scales.append(0.0)
+                codes.append(row_codes[0])
+            else:
+                continue
+            kept.append((source_id, owner_id, row_type))
+
+        self.skipped += len(rows) - len(kept)
+        self.max_source_id = max(self.max_source_id, rows[-1][0])
+        if not kept:
+            return
+
+        new_size = self.size + len(kept)
+        if new_size > self._codes.shape[0]:
+            self._grow(max(new_size, self._codes.shape[0] * 2, self.INITIAL_CAPACITY))
+
+        self._codes[self.size:new_size] = np.vstack(codes)
+        self._scales[self.size:new_size] = scales
+        self._source_ids[self.size:new_size] = [r[0] for r in kept]
+        self._ids[self.size:new_size] = [r[1] for r in kept]
+        self._types[self.size:new_size] = [r[2] for r in kept]
+        self.size = new_size
+
+    def _grow(self, capacity: int):
+        codes = np.zeros((capacity, quantization.code_size(self.mode, self.dimensions)),
+                         dtype=self._codes.dtype)
+        scales = np.zeros(capacity, dtype=np.float32)
+        ids = np.zeros(capacity, dtype=np.int64)
+        source_ids = np.zeros(capacity, dtype=np.int64)
+        types = np.empty(capacity, dtype=object)
+        if self.size:
+            codes[:self.size] = self.codes
+            scales[:self.size] = self.scales
+            ids[:self.size] = self.ids
+            source_ids[:self.size] = self.source_ids
+            types[:self.size] = self.types
+        self._codes, self._scales = codes, scales
+        self._ids, self._source_ids, self._types = ids, source_ids, types
+
+
+class EmbeddingStore:
+    """
+    Shared float32 embedding matrices for concepts, artifacts and traces.
+
+    The store does not own a connection; refresh() takes one so callers on
+    different threads can pass their own.
+    """
+
+    SEGMENTS = ('concept', 'artifact', 'trace')
+
+    # Incremental load queries; each selects (source_id, owner_id, blob, type)
+    _LOAD_SQL = {
+        'concept': """
+            SELECT e.id, e.concept_id, e.vector, c.type
+            FROM embeddings e
+            JOIN concepts c ON c.id = e.concept_id
+            WHERE e.id > ? AND e.concept_id IS NOT NULL AND e.vector IS NOT NULL
+            ORDER BY e.id
+        """,
+        'artifact': """
+            SELECT e.id, e.artifact_id, e.vector, NULL
+            FROM embeddings e
+            WHERE e.id > ? AND e.artifact_id IS NOT NULL AND e.vector IS NOT NULL
+            ORDER BY e.id
+        """,
+        'trace': """
+            SELECT id, id, query_embedding, NULL
+            FROM reasoning_traces
+            WHERE id > ? AND query_embedding IS NOT NULL
+            ORDER BY id
+        """,
+    }
+
+    _COUNT_SQL = {
+        'concept': """
+            SELECT COUNT(*) FROM embeddings e
+            JOIN concepts c ON c.id = e.concept_id
+            WHERE e.concept_id IS NOT NULL AND e.vector IS NOT NULL
+        """,
+        'artifact': """
+            SELECT COUNT(*) FROM embeddings
+            WHERE artifact_id IS NOT NULL AND vector IS NOT NULL
+        """,
+        'trace': """
+            SELECT COUNT(*) FROM reasoning_traces
+            WHERE query_embedding IS NOT NULL
+        """,
+    }
+
+    # Quantized load queries: (source_id, owner_id, type, dimensions, code, scale, blob).
+    # {code}/{scale} are the migration 013 columns for the mode; the float BLOB is
+    # only read for rows that have no code yet.
+    _LOAD_CODES_SQL = {
+        'concept': """
+            SELECT e.id, e.concept_id, c.type, length(e.vector) / 4, {code}, {scale},
+                   CASE WHEN {code} IS NULL THEN e.vector END
+            FROM embeddings e
+            JOIN concepts c ON c.id = e.concept_id
+            WHERE e.id > ? AND e.concept_id IS NOT NULL AND e.vector IS NOT NULL
+            ORDER BY e.id
+        """,
+        'artifact': """
+            SELECT e.id, e.artifact_id, NULL, length(e.vector) / 4, {code}, {scale},
+                   CASE WHEN {code} IS NULL THEN e.vector END
+            FROM embeddings e
+            WHERE e.id > ? AND e.artifact_id IS NOT NULL AND e.vector IS NOT NULL
+            ORDER BY e.id
+        """,
+        'trace': """
+            SELECT id, id, NULL, length(query_embedding) / 4, NULL, NULL, query_embedding
+            FROM reasoning_traces
+            WHERE id > ? AND query_embedding IS NOT NULL
+            ORDER BY id
+        """,
+    }
+
+    _CODE_COLUMNS = {
+        quantization.INT8: ('e.vector_int8', 'e.vector_int8_scale'),
+        quantization.BINARY: ('e.vector_binary', 'NULL'),
+    }
+
+    # Exact float32 vectors for reranking, by source row id
+    _VECTOR_SQL = {
+        'concept': "SELECT id, vector FROM embeddings",
+        'artifact': "SELECT id, vector FROM embeddings",
+        'trace': "SELECT id, query_embedding FROM reasoning_traces",
+    }
+
+    RERANK_CANDIDATES = 200
+
+    def __init__(self, quantization_mode: Optional[str] = None,
+                 rerank_candidates: int = RERANK_CANDIDATES):
+        """
+        Args:
+            quantization_mode: None (float32 rows), 'int8' or 'binary'
+            rerank_candidates: Coarse hits reranked exactly by a quantized top_k()
+        """
+        if quantization_mode is not None and quantization_mode not in quantization.MODES:
+            raise ValueError(f"Unknown quantization mode: {quantization_mode}")
+        self.quantization = quantization_mode
+        self.rerank_candidates = rerank_candidates
+        if quantization_mode:
+            self._segments: Dict[str, _Segment] = {
+                name: _QuantizedSegment(name, quantization_mode) for name in self.SEGMENTS}
+        else:
+            self._segments = {name: _Segment(name) for name in self.SEGMENTS}
+        self._lock = threading.RLock()
+        # (segment, include, exclude) -> (generation, mask); see type_mask()
+        self._masks: Dict[Tuple, Tuple[int, np.ndarray]] = {}
+
+    def segment(self, name: str) -> _Segment:
+        return self._segments[name]
+
+    def invalidate(self, name: Optional[str] = None):
+        """Drop cached rows so the next refresh reloads from scratch."""
+        with self._lock:
+            for seg_name in ([name] if name else self.SEGMENTS):
+                self._segments[seg_name].clear()
+
+    def refresh(self, conn, segments: Optional[Iterable[str]] = None):
+        """
+        Load rows added since the last refresh; reload segments that went stale.
+
+        Free when nothing was committed since the last refresh through `conn`
+        (PRAGMA data_version and the connection's own total_changes).
+
+        Args:
+            conn: sqlite3 connection to read from
+            segments: Segment names to refresh (default: all)
+        """
+        with self._lock:
+            state = self._change_state(conn)
+            names = [name for name in (segments or self.SEGMENTS)
+                     if not self._unchanged(self._segments[name], conn, state)]
+            if not names:
+                return
+
+            load_sql = self._load_queries(conn)
+            generation = self._db_generation(conn)
+            for name in names:
+                seg = self._segments[name]
+                stale = generation is not None and seg.db_generation not in (None, generation)
+                if not stale:
+                    loaded_before = seg.size + seg.skipped
+                    rows = conn.execute(load_sql[name], (seg.max_source_id,)).fetchall()
+                    seg.append(rows)
+                    if generation is None:
+                        # No migration 022: a row count catches deletes (not rewrites)
+                        expected = conn.execute(self._COUNT_SQL[name]).fetchone()[0]
+                        stale = loaded_before + len(rows) != expected
+                    if rows and not stale:
+                        logger.debug(f"Embedding store: loaded {len(rows)} new '{name}' rows")
+                if stale:
+                    logger.info(f"Embedding store: reloading '{name}' segment")
+                    seg.clear()
+                    seg.append(conn.execute(load_sql[name], (0,)).fetchall())
+                seg.db_generation = generation
+                seg.checked = (conn, state)
+
+    @staticmethod
+    def _change_state(conn) -> Optional[Tuple[int, int]]:
+        """(data_version, total_changes): moves whenever anyone commits to the DB."""
+        try:
+            return conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes
+        except Exception:
+            return None
+
+    @staticmethod
+    def _unchanged(seg: _Segment, conn, state) -> bool:
+        """True if `conn` has seen no commit since this segment's last refresh through it."""
+        # Identity check against a held reference: ids of closed connections are reused
+        return state is not None and seg.checked is not None \
+            and seg.checked[0] is conn and seg.checked[1] == state
+
+    @staticmethod
+    def _db_generation(conn) -> Optional[int]:
+        """memory_settings.embedding_generation, or None without migration 022."""
+        try:
+            row = conn.execute(
+                "SELECT value FROM memory_settings WHERE key = 'embedding_generation'"
+            ).fetchone()
+        except Exception:
+            return None
+        return int(row[0]) if row else None
+
+    def _load_queries(self, conn) -> Dict[str, str]:
+        """Load SQL per segment for this store's mode and the DB's columns."""
+        if not self.quantization:
+            return self._LOAD_SQL
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(embeddings)")}
+        code, scale = self._CODE_COLUMNS[self.quantization]
+        if code.split('.')[1] not in columns:
+            # Migration 013 not applied: quantize every row from its float BLOB
+            code, scale = 'NULL', 'NULL'
+        return {name: sql.format(code=code, scale=scale)
+                for name, sql in self._LOAD_CODES_SQL.items()}
+
+    def type_mask(self, name: str, include: Optional[Iterable[str]] = None,
+                  exclude: Optional[Iterable[str]] = None) -> Optional[np.ndarray]:
+        """
+        Boolean row mask over the segment's type column (None = no filter).
+
+        Masks are cached per (segment, include, exclude). Rows are append-only
+        between reloads, so a cached mask is extended with just the new rows.
+        """
+        if include is None and exclude is None:
+            return None
+        include = tuple(include) if include is not None else None
+        exclude = tuple(exclude) if exclude is not None else None
+
+        with self._lock:
+            seg = self._segments[name]
+            key = (name, include, exclude)
+            cached = self._masks.get(key)
+            if cached is not None and cached[0] == seg.generation and len(cached[1]) == seg.size:
+                return cached[1]
+
+            start = len(cached[1]) if cached is not None and cached[0] == seg.generation else 0
+            types = seg.types[start:]
+            new_rows = np.ones(len(types), dtype=bool)
+            if include is not None:
+                new_rows &= np.isin(types, list(include))
+            if exclude is not None:
+                new_rows &= ~np.isin(types, list(exclude))
+            mask = np.concatenate([cached[1], new_rows]) if start else new_rows
+            self._masks[key] = (seg.generation, mask)
+            return mask
+
+    def id_mask(self, name: str, owner_ids: Iterable[int]) -> np.ndarray:
+        """Boolean row mask selecting rows whose owner id is in `owner_ids`."""
+        owner_ids = np.fromiter(owner_ids, dtype=np.int64)
+        return np.isin(self._segments[name].ids, owner_ids)
+
+    def similarities(self, name: str, query,
+                     rows: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        Cosine similarity of `query` against the segment's rows.
+
+        Args:
+            rows: Row indices to score (default: every row). Scoring a subset
+                only touches those rows.
+
+        Quantized stores return the approximate coarse scores from the codes.
+        Returns None when the segment is empty or its dimensions differ from the query.
+        """
+        seg = self._segments[name]
+        query = np.asarray(query, dtype=np.float32)
+        if seg.size == 0 or seg.dimensions != query.shape[0]:
+            return None
+        if self.quantization:
+            codes, scales = seg.codes, seg.scales
+            if rows is not None:
+                codes, scales = codes[rows], scales[rows]
+            return quantization.coarse_scores(self.quantization, codes, query, scales)
+        norm = np.linalg.norm(query)
+        matrix = seg.matrix if rows is None else seg.matrix[rows]
+        if norm == 0:
+            return np.zeros(len(matrix), dtype=np.float32)
+        return matrix @ (query / norm)
+
+    def top_k(self, name: str, query, k: int, mask: Optional[np.ndarray] = None,
+              conn=None) -> Optional[List[Tuple[int, float]]]:
+        """
+        Top-k (owner_id, cosine similarity) pairs, highest similarity first.
+
+        Owner id is concept_id / artifact_id / trace id depending on the segment.
+        A concept with several embeddings can appear more than once, matching the
+        per-embedding semantics of the SQL search.
+
+        On a quantized store, the best max(k, rerank_candidates) coarse hits are
+        reranked with exact cosine against their float32 vectors read through
+        `conn`. Without `conn` the coarse scores are returned as-is.
+
+        A mask selecting under half the segment is scored as a subset, so a
+        filtered query costs roughly in proportion to the rows it can return.
+
+        Returns None when the segment cannot answer the query (see similarities()).
+        """
+        seg = self._segments[name]
+        size = seg.size
+        rows = None
+        if mask is not None:
+            # Mask may be shorter if rows were appended after it was built
+            mask = mask[:size]
+            rows = np.flatnonzero(mask)
+            if len(rows) >= size // 2:
+                rows = None
+
+        scores = self.similarities(name, query, rows)
+        if scores is None:
+            return None
+
+        ids, source_ids = seg.ids[:size], seg.source_ids[:size]
+        if rows is not None:
+            ids, source_ids = ids[rows], source_ids[rows]
+        else:
+            scores = scores[:size]
+            if mask is not None:
+                scores = scores[:len(mask)][mask]
+                ids, source_ids = ids[:len(mask)][mask], source_ids[:len(mask)][mask]
+
+        if len(scores) == 0 or k <= 0:
+            return []
+
+        if self.quantization and conn is not None:
+            candidates = self._best(scores, max(k, self.rerank_candidates))
+            exact = self._exact_scores(conn, name, query, source_ids[candidates])
+            keep = ~np.isnan(exact)
+            candidates, scores = candidates[keep], exact[keep]
+            top = self._best(scores, k)
+            return [(int(ids[candidates[i]]), float(scores[i])) for i in top]
+
+        top = self._best(scores, k)
+        return [(int(ids[i]), float(scores[i])) for i in top]
+
+    @staticmethod
+    def _best(scores: np.ndarray, k: int) -> np.ndarray:
+        """Indices of the k highest scores, highest first."""
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        return top[np.argsort(-scores[top], kind='stable')]
+
+    def _exact_scores(self, conn, name: str, query, source_ids: np.ndarray) -> np.ndarray:
+        """Exact cosine against the float32 vectors of `source_ids` (NaN if a row is gone)."""
+        query = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        vectors = {}
+        id_list = [int(i) for i in source_ids]
+        for start in range(0, len(id_list), 500):  # Stay under SQLITE_MAX_VARIABLE_NUMBER
+            chunk = id_list[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = conn.execute(f"{self._VECTOR_SQL[name]} WHERE id IN ({placeholders})", chunk)
+            vectors.update(rows.fetchall())
+
+        scores = np.full(len(id_list), np.nan, dtype=np.float32)
+        for i, source_id in enumerate(id_list):
+            blob = vectors.get(source_id)
+            if blob is None or len(blob) != query.shape[0] * 4:
+                continue
+            vector = np.frombuffer(blob, dtype=np.float32)
+            vec_norm = np.linalg.norm(vector)
+            scores[i] = float(vector @ query / vec_norm) if vec_norm > 0 else 0.0
+        return scores
+
+
+# =========================================================================
+# Shared registry
+# =========================================================================
+
+_stores: Dict[Tuple[str, Optional[str]], Tuple[Optional[int], EmbeddingStore]] = {}
+_stores_lock = threading.Lock()
+
+
+def get_embedding_store(db_path: str, quantization_mode: Optional[str] = None) -> EmbeddingStore:
+    """
+    Return the process-wide EmbeddingStore for a database file.
+
+    Keyed by real path and quantization mode. The file's inode is checked too,
+    so a database recreated at the same path (temp files, re-ingest) gets a
+    fresh store. ':memory:' databases are private to their connection and are
+    never shared.
+    """
+    if db_path == ':memory:':
+        return EmbeddingStore(quantization_mode)
+
+    key = (os.path.realpath(db_path), quantization_mode)
+    try:
+        inode = os.stat(key[0]).st_ino
+    except OSError:
+        inode = None
+
+    with _stores_lock:
+        entry = _stores.get(key)
+        if entry is None or entry[0] != inode:
+            entry = (inode, EmbeddingStore(quantization_mode))
+            _stores[key] = entry
+        return entry[1]
+
@@ -1,15 +1,21 @@
 # generated: 2025-11-24
 # System Auto: last updated on: 2026-02-08T23:46:57
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from typing import List, Optional
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
 import os
+import json
+import hashlib
+import contextvars
 import time
 import logging
 
 import langextract as lx
 import textwrap
+from .chunking import chunk_text
 from .preprocessors import get_preprocessors
+from .llm_gateway import LLMGateway, default_gateway, estimate_tokens, is_rate_limited
 
 @dataclass
 class Entity:
@@ -27,6 +33,75 @@ class ExtractionResult:
     entities: List[Entity]
     concepts: List[Concept]
 
+    def to_json(self) -> str:
+        """Serialize for extraction_cache (migration 020)."""
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, text: str) -> "ExtractionResult":
+        """Inverse of to_json()."""
+        data = json.loads(text)
+        return cls(
+            entities=[Entity(**e) for e in data.get("entities", [])],
+            concepts=[Concept(**c) for c in data.get("concepts", [])],
+        )
+
+def merge_extraction_results(
+    results: List[ExtractionResult],
+    chunks: Optional[List[str]] = None,
+    overlap: int = 0
+) -> ExtractionResult:
+    """
+    Merge per-chunk results in document order, dropping duplicates.
+
+    Entities dedupe on (type, value) and concepts on (type, content). A concept
+    cut by a chunk boundary is dropped when its text is contained in a longer
+    same-type concept from a neighbouring (overlapping) chunk.
+
+    Args:
+        results: One result per chunk, in document order
+        chunks: The chunk texts behind `results`. When given, only concepts
+            found within the first or last `overlap` characters of their chunk
+            count as cut at a boundary; a short concept stated mid-chunk is
+            kept even if a longer neighbouring concept quotes it.
+        overlap: Characters shared by consecutive chunks (chunk_text overlap)
+    """
+    entities = list({(e.type, e.value): e for r in results for e in r.entities}.values())
+
+    first_seen = {}
+    for index, result in enumerate(results):
+        for concept in result.concepts:
+            first_seen.setdefault((concept.type, concept.content), (index, concept))
+    by_chunk = [[] for _ in results]
+    for index, concept in first_seen.values():
+        by_chunk[index].append(concept)
+
+    def near_boundary(index, concept):
+        if chunks is None:
+            return True
+        chunk = chunks[index]
+        start = chunk.find(concept.content)
+        while start != -1:
+            if start < overlap or start + len(concept.content) > len(chunk) - overlap:
+                return True
+            start = chunk.find(concept.content, start + 1)
+        return False
+
+    def cut_at_boundary(index, concept):
+        return near_boundary(index, concept) and any(
+            other.type == concept.type and len(other.content) > len(concept.content)
+            and concept.content in other.content
+            for neighbour in (index - 1, index + 1) if 0 <= neighbour < len(by_chunk)
+            for other in by_chunk[neighbour]
+        )
+
+    concepts = [
+        concept for index, concept in first_seen.values()
+        if not cut_at_boundary(index, concept)
+    ]
+    return ExtractionResult(entities=entities, concepts=concepts)
+
+
 class ExtractionError(Exception):
     """Custom exception for extraction failures."""
     pass
@@ -43,9 +118,17 @@ class ExtractionConfig:
     max_retries: int = 3
     backoff_base: float = 2.0
     max_workers: int = 5  # Reduced to avoid rate limits (Gemini free tier: 15 RPM)
-    max_char_buffer: int = 10000
+    max_char_buffer: int = 10000  # Larger content is extracted in chunks of this size
+    chunk_overlap: int = 500  # Context repeated at the start of each following chunk
     timeout: int = 120  # seconds
 
+# Dedicated embedding model (768-dim output matches the stored vectors)
+EMBEDDING_MODEL = "models/gemini-embedding-001"
+EMBEDDING_DIMENSIONS = 768
+
+# batchEmbedContents accepts at most 100 texts per request
+EMBED_BATCH_LIMIT = 100
+
 class ExtractionManager:
     def __init__(
         self,
@@ -53,14 +136,21 @@ class ExtractionManager:
         # Using gemini-2.5-flash-lite because it offers UNLIMITED daily quota
         # Standard gemini-2.5-flash has a 1,500 request/day limit
         model_id: str = "gemini-2.5-flash-lite",
-        config: Optional[ExtractionConfig] = None
+        config: Optional[ExtractionConfig] = None,
+        response_cache=None,
+        gateway: Optional[LLMGateway] = None
     ):
         self.api_key = api_key
         self.model_id = model_id
         self.config = config or ExtractionConfig()
+        # Every LLM / embedding call is admitted by the shared gateway (RPM, TPM, 429 cooldown)
+        self.gateway = gateway or default_gateway()
+        # Optional llm_cache.LLMResponseCache in front of extract_strategy
+        self.response_cache = response_cache
         self.prompt = self._build_prompt()
         self.examples = self._build_examples()
         self.preprocessors = get_preprocessors()
+        self.prompt_version = self._prompt_version()
 
     def _build_prompt(self) -> str:
         """Build extraction prompt from schema definition."""
@@ -234,6 +324,20 @@ class ExtractionManager:
 
         ]
 
+    def _prompt_version(self) -> str:
+        """
+        Hash of everything that shapes extract_from_file output: model, prompt,
+        few-shot examples and chunking. Keys extraction_cache, so changing any
+        of them invalidates cached results.
+        """
+        examples = [
+            (example.text, [(x.extraction_class, x.extraction_text, x.attributes) for x in example.extractions])
+            for example in self.examples
+        ]
+        chunking = [self.config.max_char_buffer, self.config.chunk_overlap]
+        payload = json.dumps([self.model_id, self.prompt, examples, chunking], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
     def _classify_error(self, exception: Exception) -> ErrorType:
         """Classify error as retryable or permanent using heuristics."""
         error_msg = str(exception).lower()
@@ -280,18 +384,45 @@ class ExtractionManager:
         return content
 
     def extract_from_file(self, file_path: str, content: str) -> ExtractionResult:
-        """Extract entities and concepts from file content using LLM with retry logic."""
+        """
+        Extract entities and concepts from file content using LLM with retry logic.
+
+        Content longer than config.max_char_buffer is split at speaker turns /
+        headings (chunking.chunk_text); chunks are extracted concurrently and
+        merged. Any chunk failing fails the whole file.
+        """
         
         # Apply preprocessors to handle non-standard formats (e.g., JSON dumps)
         content = self._apply_preprocessors(content)
-        
-        # Prepend file path to provide context to the LLM
-        content = f"File: {file_path}\n\n{content}"
-        
+
+        chunks = chunk_text(content, self.config.max_char_buffer, self.config.chunk_overlap)
+        if len(chunks) == 1:
+            # Prepend file path to provide context to the LLM
+            return self._extract_chunk(file_path, f"File: {file_path}\n\n{content}")
+
+        total = len(chunks)
+        logging.info(f"Extracting {file_path} in {total} chunks")
+        workers = max(1, min(self.config.max_workers, total))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='extract-chunk') as pool:
+            # copy_context: chunk calls keep the caller's gateway lane
+            futures = [
+                pool.submit(
+                    contextvars.copy_context().run, self._extract_chunk,
+                    file_path, f"File: {file_path} (part {i}/{total})\n\n{chunk}"
+                )
+                for i, chunk in enumerate(chunks, 1)
+            ]
+            results = [future.result() for future in futures]
+        return merge_extraction_results(results, chunks, self.config.chunk_overlap)
+
+    def _extract_chunk(self, file_path: str, content: str) -> ExtractionResult:
+        """One extraction request (whole file or one chunk), retried per config."""
         for attempt in range(self.config.max_retries):
             try:
                 # Call langextract with proper parameters
-                result = lx.extract(
+                result = self.gateway.call(
+                    lx.extract,
+                    tokens=estimate_tokens(content),
                     text_or_documents=content,
                     prompt_description=self.prompt,
                     examples=self.examples,
@@ -339,6 +470,13 @@ class ExtractionManager:
 
                 # Retry on retryable/unknown errors
                 if error_type in (ErrorType.RETRYABLE, ErrorType.UNKNOWN) and attempt < self.config.max_retries - 1:
+                    if is_rate_limited(e):
+                        # The gateway's shared cooldown delays the next attempt
+                        logging.warning(
+                            f"Rate limited on {file_path} "
+                            f"(attempt {attempt + 1}/{self.config.max_retries}): {e}"
+                        )
+                        continue
                     sleep_time = self.config.backoff_base ** attempt
                     logging.warning(
                         f"Retryable error for {file_path} "
@@ -357,28 +495,93 @@ class ExtractionManager:
         Generate embedding for the given text using the configured model.
         """
         try:
-            # Use langextract's underlying model provider (Gemini)
-            # Since langextract wraps it, we might need to access the provider directly
-            # or use google.generativeai directly since we have the API key.
-            import google.generativeai as genai
+            return self._embed_request([text])[0]
+
+        except Exception as e:
+            logging.error(f"Embedding generation failed: {e}")
+            raise ExtractionError(f"Embedding generation failed: {str(e)}") from e
 
-            genai.configure(api_key=self.api_key)
+    def embed_batch(
+        self,
+        texts: List[str],
+        batch_size: int = EMBED_BATCH_LIMIT
+    ) -> List[Optional[List[float]]]:
+        """
+        Generate embeddings for many texts, packing up to `batch_size` per request.
 
-            # Use a dedicated embedding model
-            embedding_model = "models/gemini-embedding-001"
+        Returns one entry per input text, in order. Entries are None for blank
+        texts and for texts that could not be embedded: when a packed request
+        fails, its texts are retried one by one so a single bad item only
+        loses its own embedding.
 
-            result = genai.embed_content(
-                model=embedding_model,
-                content=text,
-                task_type="retrieval_query",
-                output_dimensionality=768
-            )
+        Rate-limit errors are not split per item (that would multiply calls
+        against an exhausted quota): the packed request is retried after the
+        gateway cooldown, up to config.max_retries attempts.
 
-            return result['embedding']
+        Raises:
+            ExtractionError: Still rate limited after the retries
+        """
+        batch_size = max(1, min(batch_size, EMBED_BATCH_LIMIT))
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        pending = [i for i, text in enumerate(texts) if text and text.strip()]
 
-        except Exception as e:
-            logging.error(f"Embedding generation failed: {e}")
-            raise ExtractionError(f"Embedding generation failed: {str(e)}") from e
+        for start in range(0, len(pending), batch_size):
+            indexes = pending[start:start + batch_size]
+            try:
+                vectors = self._embed_packed([texts[i] for i in indexes])
+            except Exception as e:
+                if is_rate_limited(e):
+                    raise ExtractionError(f"Batch embedding rate limited: {e}") from e
+                logging.warning(f"Batch embedding of {len(indexes)} texts failed, retrying per item: {e}")
+                vectors = []
+                for i in indexes:
+                    try:
+                        vectors.append(self.embed_content(texts[i]))
+                    except ExtractionError as item_error:
+                        if is_rate_limited(item_error):
+                            raise
+                        vectors.append(None)
+            for i, vector in zip(indexes, vectors):
+                embeddings[i] = vector or None
+
+        return embeddings
+
+    def _embed_packed(self, texts: List[str]) -> List[List[float]]:
+        """_embed_request, retried whole while rate limited (the gateway paces each attempt)."""
+        for attempt in range(self.config.max_retries):
+            try:
+                return self._embed_request(texts)
+            except Exception as e:
+                if not is_rate_limited(e) or attempt == self.config.max_retries - 1:
+                    raise
+                logging.warning(
+                    f"Batch embedding rate limited, retrying batch of {len(texts)} "
+                    f"(attempt {attempt + 1}/{self.config.max_retries}): {e}"
+                )
+
+    def _embed_request(self, texts: List[str]) -> List[List[float]]:
+        """One embedding API call for `texts`; returns vectors in input order."""
+        # Use google.generativeai directly since we have the API key
+        # (langextract wraps the same provider for extraction)
+        import google.generativeai as genai
+
+        genai.configure(api_key=self.api_key)
+
+        result = self.gateway.call(
+            genai.embed_content,
+            tokens=sum(estimate_tokens(text) for text in texts),
+            model=EMBEDDING_MODEL,
+            content=texts if len(texts) > 1 else texts[0],
+            task_type="retrieval_query",
+            output_dimensionality=EMBEDDING_DIMENSIONS
+        )
+
+        vectors = result['embedding']
+        if len(texts) == 1:
+            vectors = [vectors]
+        if len(vectors) != len(texts):
+            raise ExtractionError(f"Expected {len(texts)} embeddings, got {len(vectors)}")
+        return vectors
 
     def extract_strategy(
         self,
@@ -436,8 +639,17 @@ Do NOT just describe what went wrong. Instead, extract WHAT TO AVOID and WHY.
 Output ONLY valid JSON (no markdown):
 {{"title": "brief lesson name (3-5 words)", "description": "one-line summary of what to avoid", "content": "detailed preventive lesson (2-3 sentences)"}}"""
 
+        # Same prompt, same model: reuse the cached strategy
+        if self.response_cache is not None:
+            cached = self.response_cache.get(self.model_id, prompt)
+            if cached is not None:
+                try:
+                    return json.loads(cached)
+                except json.JSONDecodeError:
+                    pass
+
         try:
-            response = model.generate_content(prompt)
+            response = self.gateway.call(model.generate_content, prompt, tokens=estimate_tokens(prompt))
             # Clean up response - remove markdown code blocks if present
             text = response.text.strip()
             if text.startswith("```"):
@@ -446,7 +658,10 @@ Output ONLY valid JSON (no markdown):
                     text = text[:-3]
                 text = text.strip()
 
-            return json.loads(text)
+            strategy = json.loads(text)
+            if self.response_cache is not None:
+                self.response_cache.put(self.model_id, prompt, text)
+            return strategy
         except json.JSONDecodeError as e:
             logging.warning(f"Strategy extraction JSON parse failed: {e}")
             # Fallback to structured default
@@ -0,0 +1,175 @@
+# generated: 2026-10-18
+# System Auto: last updated on: 2026-10-18 17:20:05
+"""
+Persistent cache of LLM responses (migration 019 llm_response_cache).
+
+Entries are keyed by sha256(model_id, prompt), so the same prompt sent to the
+same model is only paid for once: re-synthesizing a member set after a
+rollback or failed store, or re-extracting the same strategy, is a lookup.
+
+Eviction:
+    - TTL: entries older than `ttl_seconds` are ignored and deleted
+    - Size: beyond `max_entries`, the least recently used entries are deleted
+
+Lookups go through the caller thread's read connection, so pool workers can
+read without touching the shared writer. With write_through=False, new
+entries and hit bookkeeping are buffered until flush(), which the single
+SQLite writer (e.g. SynthesisManager's apply loop) calls.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from .database import DatabaseManager
+
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600  # 30 days
+DEFAULT_MAX_ENTRIES = 10000
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """Content-hash cache of LLM response text in front of paid model calls."""
+
+    def __init__(
+        self,
+        db: DatabaseManager,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        write_through: bool = True,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            db: Database holding the llm_response_cache table
+            ttl_seconds: Entry lifetime
+            max_entries: Entries kept after eviction (least recently used go first)
+            write_through: Write put() immediately; False buffers until flush()
+            clock: Wall-clock time source (injectable for tests)
+        """
+        self.db = db
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.write_through = write_through
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Tuple[str, str]] = {}  # key -> (model_id, response)
+        self._touched: Dict[str, float] = {}  # key -> last hit time
+        self._table: Optional[bool] = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model_id: str, prompt: str) -> str:
+        """Cache key: sha256 of model id and prompt."""
+        return hashlib.sha256(f"{model_id}\0{prompt}".encode('utf-8')).hexdigest()
+
+    def available(self) -> bool:
+        """True once migration 019 is applied; cached."""
+        if self._table is None:
+            try:
+                cursor = self.db.get_read_connection().cursor()
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'llm_response_cache'"
+                )
+                self._table = cursor.fetchone() is not None
+            except Exception as e:
+                logger.warning(f"LLM response cache unavailable: {e}")
+                self._table = False
+        return self._table
+
+    def get(self, model_id: str, prompt: str) -> Optional[str]:
+        """Cached response text, or None on a miss or expired entry."""
+        if not self.available():
+            return None
+        key = self.key(model_id, prompt)
+        now = self._clock()
+        with self._lock:
+            pending = self._pending.get(key)
+        response = pending[1] if pending else None
+        if response is None:
+            try:
+                row = self.db.get_read_connection().execute(
+                    "SELECT response FROM llm_response_cache WHERE cache_key = ? AND created_at >= ?",
+                    (key, now - self.ttl_seconds)
+                ).fetchone()
+                response = row[0] if row else None
+            except Exception as e:
+                logger.warning(f"LLM response cache lookup failed: {e}")
+
+        with self._lock:
+            if response is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touched[key] = now
+        if self.write_through:
+            self.flush()
+        return response
+
+    def put(self, model_id: str, prompt: str, response: str) -> None:
+        """Store a response (buffered until flush() unless write_through)."""
+        if not self.available():
+            return
+        with self._lock:
+            self._pending[self.key(model_id, prompt)] = (model_id, response)
+        if self.write_through:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write buffered entries and hit times, then evict. Call from the writer thread.
+
+        Returns:
+            Number of entries written
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            touched, self._touched = self._touched, {}
+        if not pending and not touched:
+            return 0
+
+        now = self._clock()
+        try:
+            with self.db.writer() as conn:
+                conn.executemany("""
+                    INSERT OR REPLACE INTO llm_response_cache
+                    (cache_key, model_id, response, created_at, last_used_at, hit_count)
+                    VALUES (?, ?, ?, ?, ?, 0)
+                """, [(key, model_id, response, now, now) for key, (model_id, response) in pending.items()])
+                conn.executemany("""
+                    UPDATE llm_response_cache
+                    SET last_used_at = ?, hit_count = hit_count + 1
+                    WHERE cache_key = ?
+                """, [(used_at, key) for key, used_at in touched.items()])
+                if pending:
+                    self._evict(conn, now)
+        except Exception as e:
+            logger.warning(f"LLM response cache write failed: {e}")
+            return 0
+        return len(pending)
+
+    def _evict(self, conn, now: float) -> None:
+        """Drop expired entries, then the least recently used beyond max_entries."""
+        conn.execute("DELETE FROM llm_response_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        conn.execute("""
+            DELETE FROM llm_response_cache WHERE cache_key IN (
+                SELECT cache_key FROM llm_response_cache
+                ORDER BY last_used_at DESC
+                LIMIT -1 OFFSET ?
+            )
+        """, (self.max_entries,))
+
+    def stats(self) -> Dict[str, float]:
+        """Hits, misses and hit rate since this cache object was created."""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+        }
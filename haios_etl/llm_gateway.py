@@ -0,0 +1,253 @@
+# generated: 2026-10-18
+# System Auto: last updated on: 2026-10-18 19:05:12
+"""
+Process-wide gateway in front of every LLM and embedding call.
+
+ExtractionManager, Ingester (via ExtractionManager), RefinementManager,
+SynthesisManager and the Interpreter agent all send their provider calls
+through one LLMGateway (default_gateway()), so in a process:
+
+    - one RPM bucket and one TPM bucket are shared by every caller
+    - a 429 / quota error puts *all* callers into a shared cooldown that
+      doubles on consecutive rate-limit errors and decays after successes,
+      instead of each worker backing off on its own
+    - admission is ordered by lane: calls made under
+      lane(Priority.INTERACTIVE) (the MCP tools) go ahead of queued
+      Priority.BATCH calls (process, synthesis, backfill scripts)
+
+The callers keep their own retry loops (DD-016, ExtractionConfig); the
+gateway only decides *when* the next attempt may start. acall() runs a
+call from asyncio code without blocking the event loop.
+
+Limits come from configure_gateway() or HAIOS_LLM_RPM / HAIOS_LLM_TPM.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from .rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_PATTERNS = ("429", "rate limit", "quota", "resource exhausted", "resource_exhausted")
+
+
+class Priority(IntEnum):
+    """Admission lanes; lower values are admitted first."""
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+_lane: contextvars.ContextVar = contextvars.ContextVar('llm_gateway_lane', default=Priority.BATCH)
+
+
+@contextmanager
+def lane(priority: Priority) -> Iterator[None]:
+    """Run the enclosed gateway calls in `priority`'s lane (this thread/task only)."""
+    token = _lane.set(priority)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """True for provider rate-limit / quota errors (429, RESOURCE_EXHAUSTED)."""
+    message = str(error).lower()
+    return any(pattern in message for pattern in RATE_LIMIT_PATTERNS)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt size for the TPM bucket (~4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+class LLMGateway:
+    """Shared admission control (RPM, TPM, 429 cooldown, lanes) for provider calls."""
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        backoff_base: float = 2.0,
+        max_backoff: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Optional[Callable[[float], None]] = None,
+    ):
+        """
+        Args:
+            requests_per_minute: Calls per minute for the whole process (None = unlimited)
+            tokens_per_minute: Prompt tokens per minute (None = unlimited)
+            backoff_base: Cooldown after the first rate-limit error (seconds)
+            max_backoff: Cooldown ceiling (seconds)
+            clock: Monotonic time source (injectable for tests)
+            sleep: Sleep function (default: time.sleep, looked up per call)
+        """
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self._sleep = sleep if sleep is not None else (lambda seconds: time.sleep(seconds))
+        self._cond = threading.Condition()
+        self.set_limits(requests_per_minute, tokens_per_minute)
+        self._waiting = []  # heap of (priority, sequence) tickets
+        self._sequence = itertools.count()
+        self._blocked_until = 0.0
+        self._penalty = 0.0
+        self.calls = 0
+        self.rate_limited = 0
+
+    def set_limits(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None
+    ) -> None:
+        """Replace the RPM / TPM buckets (None = unlimited); queued calls see the new limits."""
+        with self._cond:
+            self.requests = (
+                TokenBucket(requests_per_minute, clock=self._clock) if requests_per_minute else None
+            )
+            self.tokens = (
+                TokenBucket(tokens_per_minute, capacity=tokens_per_minute, clock=self._clock)
+                if tokens_per_minute else None
+            )
+
+    def call(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        priority: Optional[Priority] = None,
+        tokens: int = 0,
+        **kwargs
+    ) -> Any:
+        """
+        Run fn(*args, **kwargs) once admitted.
+
+        Args:
+            fn: The provider call
+            priority: Lane (default: the current lane(), else BATCH)
+            tokens: Estimated prompt tokens charged to the TPM bucket
+
+        Raises:
+            Whatever fn raises; rate-limit errors also start the shared cooldown
+        """
+        self._admit(_lane.get() if priority is None else priority, tokens)
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if is_rate_limited(e):
+                self._back_off(e)
+            raise
+        self._recover()
+        return result
+
+    async def acall(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """call() from asyncio code: waits and runs on a worker thread, keeping the lane."""
+        return await asyncio.to_thread(self.call, fn, *args, **kwargs)
+
+    def _admit(self, priority: Priority, tokens: int) -> None:
+        """Block until this call is first in line and the buckets and cooldown allow it."""
+        ticket = (int(priority), next(self._sequence))
+        served = 0.0  # cooldown deadline already slept through by this call
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+        try:
+            while True:
+                with self._cond:
+                    while self._waiting[0] != ticket:
+                        self._cond.wait()
+                    cooldown = 0.0
+                    if self._blocked_until > served:
+                        cooldown = self._blocked_until - self._clock()
+                    wait = max(cooldown, self._bucket_delay(tokens))
+                    if wait <= 0 and self._take(tokens):
+                        heapq.heappop(self._waiting)
+                        self.calls += 1
+                        self._cond.notify_all()
+                        return
+                    if cooldown > 0:
+                        served = self._blocked_until
+                # First in line: wait outside the lock so a higher lane can queue ahead
+                self._sleep(wait if wait > 0 else 0.01)
+        except BaseException:
+            with self._cond:
+                if ticket in self._waiting:
+                    self._waiting.remove(ticket)
+                    heapq.heapify(self._waiting)
+                self._cond.notify_all()
+            raise
+
+    def _bucket_delay(self, tokens: int) -> float:
+        wait = 0.0
+        if self.requests is not None:
+            wait = self.requests.delay()
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.delay(min(tokens, self.tokens.capacity)))
+        return wait
+
+    def _take(self, tokens: int) -> bool:
+        if self.requests is not None and not self.requests.try_acquire():
+            return False
+        if self.tokens is not None and tokens:
+            # Never more than one minute's budget, or a huge prompt would wait forever
+            self.tokens.try_acquire(min(tokens, self.tokens.capacity))
+        return True
+
+    def _back_off(self, error: Exception) -> None:
+        """Start (or extend) the shared cooldown: doubles per consecutive 429."""
+        with self._cond:
+            self._penalty = min(self.max_backoff, self._penalty * 2 if self._penalty else self.backoff_base)
+            self._blocked_until = max(self._blocked_until, self._clock() + self._penalty)
+            self.rate_limited += 1
+            penalty = self._penalty
+        logger.warning(f"Rate limited, pausing all LLM calls for {penalty:.1f}s: {error}")
+
+    def _recover(self) -> None:
+        """Halve the cooldown after a success (reset below backoff_base)."""
+        if self._penalty:
+            with self._cond:
+                self._penalty = self._penalty / 2 if self._penalty > self.backoff_base else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """Calls admitted, rate-limit errors seen and the current cooldown step."""
+        with self._cond:
+            return {
+                'calls': self.calls,
+                'rate_limited': self.rate_limited,
+                'backoff_seconds': self._penalty,
+                'waiting': len(self._waiting),
+            }
+
+
+_default_gateway: Optional[LLMGateway] = None
+_default_lock = threading.Lock()
+
+
+def default_gateway() -> LLMGateway:
+    """The process-wide gateway (limits from HAIOS_LLM_RPM / HAIOS_LLM_TPM)."""
+    global _default_gateway
+    with _default_lock:
+        if _default_gateway is None:
+            _default_gateway = LLMGateway(
+                requests_per_minute=float(os.getenv("HAIOS_LLM_RPM") or 0) or None,
+                tokens_per_minute=float(os.getenv("HAIOS_LLM_TPM") or 0) or None,
+            )
+        return _default_gateway
+
+
+def configure_gateway(
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None
+) -> LLMGateway:
+    """Set the process-wide limits; managers already holding the gateway pick them up."""
+    gateway = default_gateway()
+    gateway.set_limits(requests_per_minute, tokens_per_minute)
+    return gateway
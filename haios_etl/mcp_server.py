@@ -15,6 +15,8 @@ except ImportError:
 
 from .database import DatabaseManager
 from .extraction import ExtractionManager
+from .llm_cache import LLMResponseCache
+from .llm_gateway import Priority, lane
 from .retrieval import ReasoningAwareRetrieval
 
 # Configure logging
@@ -27,16 +29,25 @@ load_dotenv()
 # Initialize services
 DB_PATH = os.getenv("DB_PATH", "haios_memory.db")
 API_KEY = os.getenv("GOOGLE_API_KEY")
+# Optional: 'int8' or 'binary' keeps compact codes in memory (migration 013)
+EMBEDDING_QUANTIZATION = os.getenv("EMBEDDING_QUANTIZATION") or None
 
 if not API_KEY:
     logger.warning("GOOGLE_API_KEY not found in environment variables. Embeddings will fail.")
 
 # Initialize managers
 db_manager = DatabaseManager(DB_PATH)
-extraction_manager = ExtractionManager(api_key=API_KEY or "dummy")
+# Long-lived process: serve searches from the in-process embedding matrix
+db_manager.attach_embedding_store(quantization=EMBEDDING_QUANTIZATION)
+# Strategy extraction reuses cached responses for repeated prompts (migration 019)
+extraction_manager = ExtractionManager(
+    api_key=API_KEY or "dummy", response_cache=LLMResponseCache(db_manager)
+)
 retrieval_service = ReasoningAwareRetrieval(db_manager, extraction_manager)
 
-# Create MCP Server
+# Create MCP Server.
+# Tool calls share the process-wide LLM gateway in the INTERACTIVE lane,
+# ahead of any batch work queued in this process
 mcp = FastMCP("haios-memory")
 
 @mcp.tool()
@@ -56,7 +67,8 @@ def memory_search_with_experience(query: str, space_id: str = None, mode: str =
         TOON-encoded string (57% smaller than JSON) containing results and reasoning trace.
     """
     try:
-        result = retrieval_service.search_with_experience(query, space_id=space_id, mode=mode)
+        with lane(Priority.INTERACTIVE):
+            result = retrieval_service.search_with_experience(query, space_id=space_id, mode=mode)
 
         # Use TOON for token-efficient output (Session 31)
         if TOON_AVAILABLE:
@@ -208,7 +220,8 @@ def extract_content(
     """
     try:
         # Perform extraction
-        result = extraction_manager.extract_from_file(file_path, content)
+        with lane(Priority.INTERACTIVE):
+            result = extraction_manager.extract_from_file(file_path, content)
 
         # Build response based on mode
         response = {
@@ -268,7 +281,8 @@ def interpreter_translate(intent: str) -> str:
 
         config = InterpreterConfig(use_llm=True, fallback_to_rules=True)
         interpreter = Interpreter(config=config, db_manager=db_manager, api_key=API_KEY)
-        result = interpreter.translate(intent)
+        with lane(Priority.INTERACTIVE):
+            result = interpreter.translate(intent)
 
         return json.dumps(asdict(result), indent=2)
 
@@ -314,7 +328,8 @@ def ingester_ingest(
             api_key=API_KEY,
             extractor=extraction_manager
         )
-        result = ingester.ingest(content, source_path, content_type_hint)
+        with lane(Priority.INTERACTIVE):
+            result = ingester.ingest(content, source_path, content_type_hint)
 
         return json.dumps(asdict(result), indent=2)
 
@@ -0,0 +1,81 @@
+-- generated: 2026-10-18
+-- System Auto: last updated on: 2026-10-18 09:12:40
+-- Migration: 010_add_embeddings_vec
+-- Description: Adds vec0 virtual tables for indexed KNN search over artifact and concept embeddings.
+-- Date: 2026-10-18
+-- Design: search_memories uses KNN on vec0; the brute-force vec_distance_cosine scan is the fallback
+--
+-- Requires the sqlite-vec extension. Apply with:
+--   python scripts/apply_vec_migration.py haios_etl/migrations/010_add_embeddings_vec.sql
+-- (scripts/apply_migration.py uses a bare sqlite3 connection and cannot create vec0 tables).
+--
+-- Rows are keyed by embeddings.id so a concept/artifact with several embeddings is indexed
+-- once per embedding, exactly like the brute-force UNION ALL in search_memories.
+-- Only 768-dimensional vectors (gemini-embedding-001, output_dimensionality=768) are indexed.
+--
+-- Note: vec0 does not support INSERT OR REPLACE (raises "UNIQUE constraint failed"),
+-- so the triggers below DELETE then INSERT.
+
+CREATE VIRTUAL TABLE IF NOT EXISTS artifact_embeddings_vec USING vec0(
+    embedding_id INTEGER PRIMARY KEY,
+    embedding FLOAT[768] distance_metric=cosine
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS concept_embeddings_vec USING vec0(
+    embedding_id INTEGER PRIMARY KEY,
+    embedding FLOAT[768] distance_metric=cosine
+);
+
+-- Populate from existing embeddings (idempotent: skip rows already indexed)
+INSERT INTO artifact_embeddings_vec (embedding_id, embedding)
+SELECT id, vector
+FROM embeddings
+WHERE artifact_id IS NOT NULL
+  AND dimensions = 768
+  AND id NOT IN (SELECT embedding_id FROM artifact_embeddings_vec);
+
+INSERT INTO concept_embeddings_vec (embedding_id, embedding)
+SELECT id, vector
+FROM embeddings
+WHERE concept_id IS NOT NULL
+  AND dimensions = 768
+  AND id NOT IN (SELECT embedding_id FROM concept_embeddings_vec);
+
+-- Keep vec0 tables in sync with embeddings
+CREATE TRIGGER IF NOT EXISTS sync_artifact_embeddings_vec_insert
+AFTER INSERT ON embeddings
+WHEN NEW.artifact_id IS NOT NULL AND NEW.dimensions = 768
+BEGIN
+    DELETE FROM artifact_embeddings_vec WHERE embedding_id = NEW.id;
+    INSERT INTO artifact_embeddings_vec (embedding_id, embedding)
+    VALUES (NEW.id, NEW.vector);
+END;
+
+CREATE TRIGGER IF NOT EXISTS sync_concept_embeddings_vec_insert
+AFTER INSERT ON embeddings
+WHEN NEW.concept_id IS NOT NULL AND NEW.dimensions = 768
+BEGIN
+    DELETE FROM concept_embeddings_vec WHERE embedding_id = NEW.id;
+    INSERT INTO concept_embeddings_vec (embedding_id, embedding)
+    VALUES (NEW.id, NEW.vector);
+END;
+
+CREATE TRIGGER IF NOT EXISTS sync_embeddings_vec_update
+AFTER UPDATE OF vector, artifact_id, concept_id, dimensions ON embeddings
+BEGIN
+    DELETE FROM artifact_embeddings_vec WHERE embedding_id = OLD.id;
+    DELETE FROM concept_embeddings_vec WHERE embedding_id = OLD.id;
+    INSERT INTO artifact_embeddings_vec (embedding_id, embedding)
+    SELECT NEW.id, NEW.vector
+    WHERE NEW.artifact_id IS NOT NULL AND NEW.dimensions = 768;
+    INSERT INTO concept_embeddings_vec (embedding_id, embedding)
+    SELECT NEW.id, NEW.vector
+    WHERE NEW.concept_id IS NOT NULL AND NEW.dimensions = 768;
+END;
+
+CREATE TRIGGER IF NOT EXISTS sync_embeddings_vec_delete
+AFTER DELETE ON embeddings
+BEGIN
+    DELETE FROM artifact_embeddings_vec WHERE embedding_id = OLD.id;
+    DELETE FROM concept_embeddings_vec WHERE embedding_id = OLD.id;
+END;
@@ -0,0 +1,59 @@
+-- generated: 2026-10-18
+-- System Auto: last updated on: 2026-10-18 10:02:15
+-- Migration: 011_rebuild_reasoning_traces_vec
+-- Description: Rebuilds reasoning_traces_vec for KNN lookup in find_similar_reasoning_traces.
+-- Date: 2026-10-18
+-- Supersedes: DD-002 (direct vec_distance_cosine scan for MVP)
+--
+-- Requires the sqlite-vec extension. Apply with:
+--   python scripts/apply_vec_migration.py haios_etl/migrations/011_rebuild_reasoning_traces_vec.sql
+--
+-- Changes from migration 005:
+--   - distance_metric=cosine so KNN distances match the DD-003 similarity threshold
+--     (005 used the default L2 metric, which is not comparable to 1 - threshold)
+--   - space_id metadata column so the space filter runs inside the KNN query
+--     (vec0 metadata columns reject NULL, so NULL space_id is stored as '')
+--   - triggers DELETE then INSERT: vec0 rejects INSERT OR REPLACE on an existing key,
+--     so the 005 update trigger failed on every embedding update
+--   - delete trigger so removed traces leave the index
+
+DROP TRIGGER IF EXISTS sync_reasoning_traces_vec_insert;
+DROP TRIGGER IF EXISTS sync_reasoning_traces_vec_update;
+DROP TABLE IF EXISTS reasoning_traces_vec;
+
+CREATE VIRTUAL TABLE reasoning_traces_vec USING vec0(
+    trace_id INTEGER PRIMARY KEY,
+    space_id TEXT,
+    query_embedding FLOAT[768] distance_metric=cosine
+);
+
+-- Populate from existing traces that have 768-dim embeddings (768 * 4 bytes)
+INSERT INTO reasoning_traces_vec (trace_id, space_id, query_embedding)
+SELECT id, COALESCE(space_id, ''), query_embedding
+FROM reasoning_traces
+WHERE query_embedding IS NOT NULL
+  AND length(query_embedding) = 3072;
+
+CREATE TRIGGER IF NOT EXISTS sync_reasoning_traces_vec_insert
+AFTER INSERT ON reasoning_traces
+WHEN NEW.query_embedding IS NOT NULL AND length(NEW.query_embedding) = 3072
+BEGIN
+    DELETE FROM reasoning_traces_vec WHERE trace_id = NEW.id;
+    INSERT INTO reasoning_traces_vec (trace_id, space_id, query_embedding)
+    VALUES (NEW.id, COALESCE(NEW.space_id, ''), NEW.query_embedding);
+END;
+
+CREATE TRIGGER IF NOT EXISTS sync_reasoning_traces_vec_update
+AFTER UPDATE OF query_embedding, space_id ON reasoning_traces
+BEGIN
+    DELETE FROM reasoning_traces_vec WHERE trace_id = OLD.id;
+    INSERT INTO reasoning_traces_vec (trace_id, space_id, query_embedding)
+    SELECT NEW.id, COALESCE(NEW.space_id, ''), NEW.query_embedding
+    WHERE NEW.query_embedding IS NOT NULL AND length(NEW.query_embedding) = 3072;
+END;
+
+CREATE TRIGGER IF NOT EXISTS sync_reasoning_traces_vec_delete
+AFTER DELETE ON reasoning_traces
+BEGIN
+    DELETE FROM reasoning_traces_vec WHERE trace_id = OLD.id;
+END;
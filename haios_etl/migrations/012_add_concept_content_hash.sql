@@ -0,0 +1,18 @@
+-- generated: 2026-10-18
+-- System Auto: last updated on: 2026-10-18 11:58:20
+-- Migration: 012_add_concept_content_hash
+-- Description: Adds concepts.content_hash with a unique (type, content_hash) index
+--              so concept dedup lookups use an index instead of scanning content.
+-- Date: 2026-10-18
+--
+-- Apply with:
+--   python scripts/apply_migration.py haios_etl/migrations/012_add_concept_content_hash.sql
+--   python scripts/backfill_concept_hashes.py
+--
+-- content_hash is SHA256(content), computed in Python (SQLite has no sha256()).
+-- Existing rows start NULL; NULLs are distinct in a UNIQUE index, so pre-existing
+-- duplicate (type, content) rows do not block the index. The backfill script
+-- hashes the lowest id of each (type, content) group and leaves duplicates NULL.
+
+ALTER TABLE concepts ADD COLUMN content_hash TEXT;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_concepts_type_content_hash ON concepts(type, content_hash);
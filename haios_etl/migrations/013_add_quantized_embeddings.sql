@@ -0,0 +1,30 @@
+-- generated: 2026-10-18
+-- System Auto: last updated on: 2026-10-18 13:20:44
+-- Migration: 013_add_quantized_embeddings
+-- Description: Adds int8 and binary codes next to each float32 embedding for
+--              coarse-then-rerank search (EmbeddingStore quantization modes).
+-- Date: 2026-10-18
+--
+-- Apply with:
+--   python scripts/apply_migration.py haios_etl/migrations/013_add_quantized_embeddings.sql
+--   python scripts/backfill_quantized_embeddings.py
+--
+-- Codes encode the L2-normalized vector (see haios_etl/quantization.py):
+--   vector_int8       : d signed bytes; v ~= code * vector_int8_scale
+--   vector_binary     : ceil(d / 8) bytes of packed sign bits
+-- The float32 `vector` column stays the source of truth. Codes are computed in
+-- Python, so existing rows start NULL until the backfill runs; readers quantize
+-- NULL-code rows from the float BLOB on load.
+
+ALTER TABLE embeddings ADD COLUMN vector_int8 BLOB;
+ALTER TABLE embeddings ADD COLUMN vector_int8_scale REAL;
+ALTER TABLE embeddings ADD COLUMN vector_binary BLOB;
+
+-- Codes derived from an old vector are wrong; drop them so they get recomputed
+CREATE TRIGGER IF NOT EXISTS clear_embedding_codes_on_vector_update
+AFTER UPDATE OF vector ON embeddings
+BEGIN
+    UPDATE embeddings
+    SET vector_int8 = NULL, vector_int8_scale = NULL, vector_binary = NULL
+    WHERE id = NEW.id;
+END;
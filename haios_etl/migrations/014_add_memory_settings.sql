@@ -0,0 +1,22 @@
+-- generated: 2026-10-18
+-- System Auto: last updated on: 2026-10-18 14:12:30
+-- Migration: 014_add_memory_settings
+-- Description: Adds the memory_settings key/value table. First key:
+--              embeddings_normalized = '1' once every stored vector is unit length.
+-- Date: 2026-10-18
+--
+-- Apply with:
+--   python scripts/apply_migration.py haios_etl/migrations/014_add_memory_settings.sql
+--   python scripts/normalize_embeddings.py
+--
+-- DatabaseManager, SynthesisManager and ReasoningAwareRetrieval store every new
+-- vector L2-normalized. Rows written earlier are normalized by the script above
+-- (SQLite cannot do it in SQL), which sets the flag when it finishes. With the
+-- flag set, scans compare vectors by L2 distance / dot product instead of
+-- recomputing both norms per pair.
+
+CREATE TABLE IF NOT EXISTS memory_settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,68 @@
+-- generated: 2026-10-18
+-- System Auto: last updated on: 2026-10-18 14:58:03
+-- Migration: 015_add_concept_type_to_concept_vec
+-- Description: Rebuilds concept_embeddings_vec with a concept_type metadata column so
+--              search_memories modes filter by type inside the KNN query.
+-- Date: 2026-10-18
+--
+-- Requires the sqlite-vec extension. Apply with:
+--   python scripts/apply_vec_migration.py haios_etl/migrations/015_add_concept_type_to_concept_vec.sql
+--
+-- Changes from migration 010:
+--   - concept_type metadata column (copy of concepts.type; vec0 metadata rejects NULL,
+--     so a missing type is stored as ''). knowledge_lookup KNN uses
+--     `concept_type IN (...)`, session_recovery uses `concept_type != ...`
+--     (vec0 0.1.x mis-handles NOT IN), so excluded rows are never ranked.
+--   - insert/update triggers copy the type from concepts
+--   - a trigger on concepts keeps concept_type current when a concept is retyped
+--     (e.g. refinement upgrading to episteme/techne)
+
+DROP TRIGGER IF EXISTS sync_concept_embeddings_vec_insert;
+DROP TRIGGER IF EXISTS sync_embeddings_vec_update;
+DROP TABLE IF EXISTS concept_embeddings_vec;
+
+CREATE VIRTUAL TABLE concept_embeddings_vec USING vec0(
+    embedding_id INTEGER PRIMARY KEY,
+    embedding FLOAT[768] distance_metric=cosine,
+    concept_type TEXT
+);
+
+INSERT INTO concept_embeddings_vec (embedding_id, embedding, concept_type)
+SELECT e.id, e.vector, COALESCE(c.type, '')
+FROM embeddings e
+JOIN concepts c ON c.id = e.concept_id
+WHERE e.dimensions = 768;
+
+CREATE TRIGGER IF NOT EXISTS sync_concept_embeddings_vec_insert
+AFTER INSERT ON embeddings
+WHEN NEW.concept_id IS NOT NULL AND NEW.dimensions = 768
+BEGIN
+    DELETE FROM concept_embeddings_vec WHERE embedding_id = NEW.id;
+    INSERT INTO concept_embeddings_vec (embedding_id, embedding, concept_type)
+    VALUES (
+        NEW.id, NEW.vector,
+        COALESCE((SELECT type FROM concepts WHERE id = NEW.concept_id), '')
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS sync_embeddings_vec_update
+AFTER UPDATE OF vector, artifact_id, concept_id, dimensions ON embeddings
+BEGIN
+    DELETE FROM artifact_embeddings_vec WHERE embedding_id = OLD.id;
+    DELETE FROM concept_embeddings_vec WHERE embedding_id = OLD.id;
+    INSERT INTO artifact_embeddings_vec (embedding_id, embedding)
+    SELECT NEW.id, NEW.vector
+    WHERE NEW.artifact_id IS NOT NULL AND NEW.dimensions = 768;
+    INSERT INTO concept_embeddings_vec (embedding_id, embedding, concept_type)
+    SELECT NEW.id, NEW.vector, COALESCE(c.type, '')
+    FROM concepts c
+    WHERE c.id = NEW.concept_id AND NEW.dimensions = 768;
+END;
+
+CREATE TRIGGER IF NOT EXISTS sync_concept_embeddings_vec_type
+AFTER UPDATE OF type ON concepts
+BEGIN
+    UPDATE concept_embeddings_vec
+    SET concept_type = COALESCE(NEW.type, '')
+    WHERE embedding_id IN (SELECT id FROM embeddings WHERE concept_id = NEW.id);
+END;
@@ -0,0 +1,17 @@
+-- generated: 2026-10-18
+-- System Auto: last updated on: 2026-10-18 15:40:19
+-- Migration: 016_add_metadata_filter_index
+-- Description: Covering index for search_memories metadata pre-filters.
+-- Date: 2026-10-18
+--
+-- Apply with:
+--   python scripts/apply_migration.py haios_etl/migrations/016_add_metadata_filter_index.sql
+--
+-- search_memories(filters={key: value}) resolves allowed ids with
+--   SELECT memory_id FROM memory_metadata WHERE key = ? AND value IN (...)
+-- idx_metadata_key (migration 004) narrows to one key but still visits every row
+-- carrying it; (key, value, memory_id) answers the lookup from the index alone.
+-- space_id pre-filters use idx_artifacts_space_id (migration 003) and
+-- idx_concept_occurrences_artifact_id.
+
+CREATE INDEX IF NOT EXISTS idx_metadata_key_value ON memory_metadata(key, value, memory_id);
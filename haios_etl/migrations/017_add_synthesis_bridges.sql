@@ -0,0 +1,34 @@
+-- generated: 2026-10-18
+-- System Auto: last updated on: 2026-10-18 16:05:12
+-- Migration: 017_add_synthesis_bridges
+-- Description: One row per bridged (concept_id, trace_id) pair, unique.
+-- Date: 2026-10-18
+--
+-- Apply with:
+--   python scripts/apply_migration.py haios_etl/migrations/017_add_synthesis_bridges.sql
+--
+-- Cross-pollination used to check each candidate pair with a self-join on
+-- synthesis_provenance. SynthesisManager now loads this table once per run into
+-- a set, and store_synthesis claims a pair with INSERT OR IGNORE before
+-- writing the bridge insight, so a pair is never bridged twice.
+-- Existing bridges are backfilled from their provenance rows (concept first,
+-- trace second, as store_synthesis writes them).
+
+CREATE TABLE IF NOT EXISTS synthesis_bridges (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    concept_id INTEGER NOT NULL,
+    trace_id INTEGER NOT NULL,
+    synthesized_concept_id INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (concept_id, trace_id),
+    FOREIGN KEY (synthesized_concept_id) REFERENCES concepts(id) ON DELETE CASCADE
+);
+
+INSERT OR IGNORE INTO synthesis_bridges (concept_id, trace_id, synthesized_concept_id)
+SELECT p1.source_id, p2.source_id, p1.synthesized_concept_id
+FROM synthesis_provenance p1
+JOIN synthesis_provenance p2
+  ON p1.synthesized_concept_id = p2.synthesized_concept_id
+ AND p1.id < p2.id
+WHERE p1.source_type = 'cross'
+  AND p2.source_type = 'cross';
@@ -0,0 +1,41 @@
+-- generated: 2026-10-18
+-- System Auto: last updated on: 2026-10-18 16:48:30
+-- Migration: 018_add_synthesis_runs
+-- Description: Checkpoints for resumable synthesis pipeline runs.
+-- Date: 2026-10-18
+--
+-- Apply with:
+--   python scripts/apply_migration.py haios_etl/migrations/018_add_synthesis_runs.sql
+--
+-- A synthesis run persists its stage 1 clusters and stage 4 candidate pairs
+-- (synthesis_run_items) plus one cursor per stage (synthesis_runs), so
+-- `synthesis run --resume <run_id>` continues after the last committed
+-- cluster or bridge instead of recomputing the clustering.
+-- A stage cursor advances in the same transaction as the insight it stored.
+
+CREATE TABLE IF NOT EXISTS synthesis_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    status TEXT NOT NULL DEFAULT 'running'
+        CHECK(status IN ('running', 'completed', 'failed', 'interrupted')),
+    stage TEXT NOT NULL DEFAULT 'cluster'
+        CHECK(stage IN ('cluster', 'synthesize', 'resynthesize', 'cross', 'done')),
+    options TEXT,                     -- JSON: run_synthesis_pipeline arguments
+    results TEXT,                     -- JSON: pipeline results so far
+    stage_timings TEXT,               -- JSON: {stage: seconds}
+    synthesize_cursor INTEGER NOT NULL DEFAULT 0,  -- clusters handled
+    synthesize_total INTEGER,
+    cross_cursor INTEGER NOT NULL DEFAULT 0,       -- candidate pairs handled
+    cross_total INTEGER,              -- NULL until the overlaps are computed
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS synthesis_run_items (
+    run_id INTEGER NOT NULL,
+    stage TEXT NOT NULL CHECK(stage IN ('synthesize', 'cross')),
+    position INTEGER NOT NULL,
+    payload TEXT NOT NULL,            -- JSON: cluster or [concept_id, trace_id, similarity]
+    PRIMARY KEY (run_id, stage, position),
+    FOREIGN KEY (run_id) REFERENCES synthesis_runs(id) ON DELETE CASCADE
+);
@@ -0,0 +1,26 @@
+-- generated: 2026-10-18
+-- System Auto: last updated on: 2026-10-18 17:20:05
+-- Migration: 019_add_llm_response_cache
+-- Description: Persistent cache of LLM responses keyed by prompt + model hash.
+-- Date: 2026-10-18
+--
+-- Apply with:
+--   python scripts/apply_migration.py haios_etl/migrations/019_add_llm_response_cache.sql
+--
+-- LLMResponseCache (haios_etl/llm_cache.py) sits in front of synthesis LLM
+-- calls and ExtractionManager.extract_strategy, so a prompt already answered
+-- by the same model is not paid for again. Entries expire after a TTL and the
+-- least recently used are evicted beyond a maximum entry count.
+-- Times are unix seconds (REAL) so the TTL check is a plain comparison.
+
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    cache_key TEXT PRIMARY KEY,       -- sha256(model_id, prompt)
+    model_id TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL,
+    hit_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_last_used
+    ON llm_response_cache(last_used_at);
@@ -0,0 +1,27 @@
+-- generated: 2026-10-18
+-- System Auto: last updated on: 2026-10-18 19:48:36
+-- Migration: 020_add_extraction_cache
+-- Description: Content-addressed cache of ExtractionResults + quality_metrics.cache_hit.
+-- Date: 2026-10-18
+--
+-- Apply with:
+--   python scripts/apply_migration.py haios_etl/migrations/020_add_extraction_cache.sql
+--
+-- BatchProcessor looks a file up by the SHA256 of its bytes (artifacts.file_hash)
+-- and ExtractionManager.prompt_version (hash of model, prompt and examples)
+-- before calling the LLM, so identical content at a new path (copied logs,
+-- moved work dirs, archive duplicates) is a local lookup. Changing the prompt,
+-- examples or model changes prompt_version and misses the old entries.
+-- quality_metrics.cache_hit records which files were served from the cache.
+
+CREATE TABLE IF NOT EXISTS extraction_cache (
+    content_hash TEXT NOT NULL,       -- SHA256 of the file bytes
+    prompt_version TEXT NOT NULL,     -- ExtractionManager.prompt_version
+    result TEXT NOT NULL,             -- JSON: ExtractionResult
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    hit_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (content_hash, prompt_version)
+);
+
+ALTER TABLE quality_metrics ADD COLUMN cache_hit INTEGER NOT NULL DEFAULT 0;
@@ -0,0 +1,24 @@
+-- generated: 2026-10-18
+-- System Auto: last updated on: 2026-10-18 20:52:19
+-- Migration: 021_add_file_manifest
+-- Description: Stat manifest so `process` skips unchanged files without reading them.
+-- Date: 2026-10-18
+--
+-- Apply with:
+--   python scripts/apply_migration.py haios_etl/migrations/021_add_file_manifest.sql
+--
+-- BatchProcessor.process_files loads the manifest once per run. A file whose
+-- (size, mtime_ns, inode) matches its row, and whose processing_log status is
+-- 'success' or 'skipped', is skipped with no read, no SHA256 and no DB write.
+-- Any stat change falls back to hashing, so a touched but identical file is
+-- still skipped (and its row refreshed). Rows are written after a file is
+-- stored, in batches; a missing row only costs a re-hash on the next run.
+
+CREATE TABLE IF NOT EXISTS file_manifest (
+    file_path TEXT PRIMARY KEY,
+    size_bytes INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    file_hash TEXT NOT NULL,          -- SHA256 at the time of the stat
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,60 @@
+-- generated: 2026-10-18
+-- System Auto: last updated on: 2026-10-18 21:40:12
+-- Migration: 022_add_embedding_generation
+-- Description: Trigger-maintained counter of embedding rewrites and deletes.
+-- Date: 2026-10-18
+--
+-- Apply with:
+--   python scripts/apply_migration.py haios_etl/migrations/022_add_embedding_generation.sql
+--
+-- EmbeddingStore appends new rows by id, but cannot see rows rewritten in
+-- place (scripts/normalize_embeddings.py) or deleted. These triggers bump
+-- memory_settings.embedding_generation whenever a stored vector, its owner,
+-- a concept's type, a concept or a reasoning trace changes or disappears;
+-- a store seeing a new generation reloads its segments. Plain inserts do not
+-- bump it (they are picked up incrementally).
+-- Requires migration 014 (memory_settings).
+
+INSERT OR IGNORE INTO memory_settings (key, value) VALUES ('embedding_generation', '0');
+
+CREATE TRIGGER IF NOT EXISTS embedding_generation_on_embedding_update
+AFTER UPDATE OF vector, concept_id, artifact_id ON embeddings
+BEGIN
+    UPDATE memory_settings SET value = CAST(value AS INTEGER) + 1, updated_at = CURRENT_TIMESTAMP
+    WHERE key = 'embedding_generation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS embedding_generation_on_embedding_delete
+AFTER DELETE ON embeddings
+BEGIN
+    UPDATE memory_settings SET value = CAST(value AS INTEGER) + 1, updated_at = CURRENT_TIMESTAMP
+    WHERE key = 'embedding_generation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS embedding_generation_on_concept_update
+AFTER UPDATE OF type ON concepts
+BEGIN
+    UPDATE memory_settings SET value = CAST(value AS INTEGER) + 1, updated_at = CURRENT_TIMESTAMP
+    WHERE key = 'embedding_generation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS embedding_generation_on_concept_delete
+AFTER DELETE ON concepts
+BEGIN
+    UPDATE memory_settings SET value = CAST(value AS INTEGER) + 1, updated_at = CURRENT_TIMESTAMP
+    WHERE key = 'embedding_generation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS embedding_generation_on_trace_update
+AFTER UPDATE OF query_embedding ON reasoning_traces
+BEGIN
+    UPDATE memory_settings SET value = CAST(value AS INTEGER) + 1, updated_at = CURRENT_TIMESTAMP
+    WHERE key = 'embedding_generation';
+END;
+
+CREATE TRIGGER IF NOT EXISTS embedding_generation_on_trace_delete
+AFTER DELETE ON reasoning_traces
+BEGIN
+    UPDATE memory_settings SET value = CAST(value AS INTEGER) + 1, updated_at = CURRENT_TIMESTAMP
+    WHERE key = 'embedding_generation';
+END;
@@ -2,10 +2,13 @@ import os
 import hashlib
 import time
 import logging
-from typing import Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from pathlib import Path
 from haios_etl.database import DatabaseManager
-from haios_etl.extraction import ExtractionManager, ExtractionError
+from haios_etl.extraction import ExtractionManager, ExtractionError, ErrorType, ExtractionResult
 
 # Binary file extensions to skip
 BINARY_EXTENSIONS = {
@@ -89,10 +92,47 @@ def compute_file_hash(file_path: str) -> str:
             sha256_hash.update(byte_block)
     return sha256_hash.hexdigest()
 
+def stat_key(file_path: str) -> Optional[Tuple[int, int, int]]:
+    """(size, mtime_ns, inode) compared against file_manifest, or None if stat fails."""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+@dataclass
+class FileOutcome:
+    """Worker result for one file, applied by the single SQLite writer."""
+    file_path: str
+    status: str  # 'success', 'skipped' or 'error'
+    file_hash: Optional[str] = None
+    result: Optional[object] = None  # ExtractionResult on success
+    error: Optional[str] = None
+    processing_time: float = 0.0
+    retryable: bool = False
+    cache_hit: bool = False  # Result came from extraction_cache, no LLM call
+    stat: Optional[Tuple[int, int, int]] = None  # stat_key() taken before hashing
+    unchanged: bool = False  # Stat matched file_manifest: not read, hashed or written
+
 class BatchProcessor:
-    def __init__(self, db_manager: DatabaseManager, extraction_manager: ExtractionManager):
+    MANIFEST_FLUSH_EVERY = 500  # Manifest rows buffered per write in process_files
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        extraction_manager: ExtractionManager,
+        workers: int = 1
+    ):
+        """
+        Args:
+            db_manager: Database the results are written to
+            extraction_manager: ExtractionManager for the LLM calls
+            workers: Concurrent extractions in process_files (1 = sequential)
+        """
         self.db_manager = db_manager
         self.extraction_manager = extraction_manager
+        self.workers = max(1, workers)
+        self._manifest: Dict[str, Tuple[int, int, int, str]] = {}
 
     def process_file(self, file_path: str):
         """
@@ -102,21 +142,160 @@ class BatchProcessor:
         3. Store results.
         4. Update status.
         """
+        return self._apply(self._prepare(file_path))
+
+    def process_files(
+        self,
+        file_paths: Iterable[str],
+        retries: int = 1,
+        on_result: Optional[Callable[[int, FileOutcome], None]] = None
+    ) -> Dict[str, int]:
+        """
+        Process files on `self.workers` extraction threads.
+
+        Workers hash, read and extract (network calls only); this thread is
+        the single SQLite writer and applies outcomes in submission order, so
+        progress and processing_log match a sequential run. Files that fail
+        with a retryable error (rate limit, quota, timeout) are queued again
+        after the pass, up to `retries` more times, before the error is stored.
+
+        The file manifest (migration 021) is loaded once per run. A file whose
+        (size, mtime_ns, inode) matches its manifest row is reported as
+        'skipped' with outcome.unchanged set, without being read, hashed or
+        written; every other stored success/skip refreshes its manifest row.
+
+        Args:
+            file_paths: Files to process
+            retries: Extra passes for files that failed with a retryable error
+            on_result: Called as on_result(index, outcome) for every stored outcome
+
+        Returns:
+            Counts per final status ('success', 'skipped', 'error')
+        """
+        counts = {'success': 0, 'skipped': 0, 'error': 0}
+        queue = list(file_paths)
+        applied = 0
+        self._manifest = self._load_manifest()
+        manifest_rows = []
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='extraction') as pool:
+                for attempt in range(retries + 1):
+                    retry = []
+                    for outcome in self._run_pool(pool, queue):
+                        if outcome.retryable and attempt < retries:
+                            logging.warning(f"[RETRY] {outcome.file_path}: {outcome.error}")
+                            retry.append(outcome.file_path)
+                            continue
+                        if not outcome.unchanged:
+                            self._apply(outcome)
+                            row = self._manifest_row(outcome)
+                            if row is not None:
+                                manifest_rows.append(row)
+                                if len(manifest_rows) >= self.MANIFEST_FLUSH_EVERY:
+                                    self._flush_manifest(manifest_rows)
+                        counts[outcome.status] += 1
+                        applied += 1
+                        if on_result is not None:
+                            on_result(applied, outcome)
+                    if not retry:
+                        break
+                    queue = retry
+        finally:
+            self._flush_manifest(manifest_rows)
+            self._manifest = {}
+        return counts
+
+    def _load_manifest(self) -> Dict[str, Tuple[int, int, int, str]]:
+        """file_manifest rows for this run ({} if unavailable)."""
+        try:
+            return self.db_manager.load_file_manifest()
+        except Exception as e:
+            logging.warning(f"File manifest unavailable, hashing every file: {e}")
+            return {}
+
+    def _unchanged(self, file_path: str) -> Optional[FileOutcome]:
+        """'skipped' outcome if the file's stat matches its manifest row, else None."""
+        entry = self._manifest.get(file_path)
+        if entry is None:
+            return None
+        stat = stat_key(file_path)
+        if stat is None or stat != tuple(entry[:3]):
+            return None
+        return FileOutcome(file_path, "skipped", file_hash=entry[3], stat=stat, unchanged=True)
+
+    @staticmethod
+    def _manifest_row(outcome: FileOutcome) -> Optional[tuple]:
+        """file_manifest row for a stored success/skip (None for errors or unknown stat)."""
+        if outcome.status not in ("success", "skipped") or outcome.stat is None or not outcome.file_hash:
+            return None
+        return (outcome.file_path, *outcome.stat, outcome.file_hash)
+
+    def _flush_manifest(self, rows: list) -> None:
+        """Write buffered manifest rows; a lost row only means a re-hash next run."""
+        if not rows:
+            return
+        try:
+            self.db_manager.record_file_manifest(rows)
+        except Exception as e:
+            logging.warning(f"File manifest update failed: {e}")
+        rows.clear()
+
+    def _run_pool(self, pool: ThreadPoolExecutor, file_paths: List[str]):
+        """Yield outcomes in order, keeping at most 2x workers in flight.
+
+        Files unchanged since the manifest are resolved here with one stat()
+        and never reach a worker.
+        """
+        pending = deque()
+        remaining = iter(file_paths)
+        while True:
+            while len(pending) < self.workers * 2:
+                file_path = next(remaining, None)
+                if file_path is None:
+                    break
+                unchanged = self._unchanged(file_path)
+                pending.append(unchanged if unchanged is not None else pool.submit(self._prepare, file_path))
+            if not pending:
+                return
+            item = pending.popleft()
+            yield item if isinstance(item, FileOutcome) else item.result()
+
+    def _prepare(self, file_path: str) -> FileOutcome:
+        """Worker step: hash, skip check, read and extract. Never writes."""
         try:
             start_time = time.perf_counter()
-            
-            # 1. Compute hash
+
+            # 1. Stat (for the manifest) before hashing, so an edit made while
+            #    reading leaves a stale stat and is re-hashed next run
+            stat = stat_key(file_path)
             current_hash = compute_file_hash(file_path)
             
-            # 2. Check status and hash
-            last_status = self.db_manager.get_processing_status(file_path)
-            last_hash = self.db_manager.get_artifact_hash(file_path) # We added this to DB manager
+            # 2. Check status and hash (manifest hash when loaded, else the DB)
+            entry = self._manifest.get(file_path)
+            if entry is not None:
+                unchanged = entry[3] == current_hash
+            else:
+                last_status = self.db_manager.get_processing_status(file_path)
+                last_hash = self.db_manager.get_artifact_hash(file_path) # We added this to DB manager
+                unchanged = last_status in ("success", "skipped") and last_hash == current_hash
             
-            if last_status in ("success", "skipped") and last_hash == current_hash:
-                # Skipped - file unchanged
+            if unchanged:
+                # Skipped - file unchanged (only its stat moved)
                 logging.info(f"[SKIP] {file_path}")
-                self.db_manager.update_processing_status(file_path, "skipped")
-                return
+                return FileOutcome(file_path, "skipped", file_hash=current_hash, stat=stat)
+
+            # Identical content already extracted (any path, same prompt version)
+            cached = self._cached_result(current_hash)
+            if cached is not None:
+                logging.info(f"[CACHED] {file_path}")
+                return FileOutcome(
+                    file_path, "success",
+                    file_hash=current_hash,
+                    result=cached,
+                    processing_time=time.perf_counter() - start_time,
+                    cache_hit=True,
+                    stat=stat
+                )
 
             # File is new or changed - proceed with extraction
             logging.info(f"[PROCESS] {file_path}")
@@ -125,43 +304,66 @@ class BatchProcessor:
             content = read_file_safely(file_path)
             if content is None:
                 # Binary file or unreadable
-                self.db_manager.update_processing_status(file_path, "skipped", "Binary or unreadable file")
-                return
+                return FileOutcome(
+                    file_path, "skipped",
+                    file_hash=current_hash,
+                    error="Binary or unreadable file",
+                    stat=stat
+                )
                 
             # 4. Extract
             result = self.extraction_manager.extract_from_file(file_path, content)
             
-            # 5. Store
-            file_size = os.path.getsize(file_path)
-            artifact_id = self.db_manager.insert_artifact(file_path, current_hash, file_size)
-            
-            for entity in result.entities:
-                ent_id = self.db_manager.insert_entity(entity.type, entity.value)
-                self.db_manager.record_entity_occurrence(ent_id, artifact_id, None)
-
-            for concept in result.concepts:
-                con_id = self.db_manager.insert_concept(concept.type, concept.content, concept.source_adr)
-                self.db_manager.record_concept_occurrence(con_id, artifact_id, None)
-
-            # 6. Metrics
+            # 5. Metrics
             end_time = time.perf_counter()
             processing_time = end_time - start_time
-            
-            # Assuming 0 tokens for now as we don't have it in result yet
-            tokens_used = 0 
-            
-            self.db_manager.insert_quality_metrics(
-                artifact_id=artifact_id,
-                entities_extracted=len(result.entities),
-                concepts_extracted=len(result.concepts),
+
+            return FileOutcome(
+                file_path, "success",
+                file_hash=current_hash,
+                result=result,
                 processing_time=processing_time,
-                tokens_used=tokens_used
+                stat=stat
             )
 
-            # 7. Update status
-            self.db_manager.update_processing_status(file_path, "success")
+        except Exception as e:
+            retryable = (isinstance(e, ExtractionError)
+                         and self.extraction_manager._classify_error(e) == ErrorType.RETRYABLE)
+            return FileOutcome(file_path, "error", error=str(e), retryable=retryable)
+
+    def _cached_result(self, file_hash: str) -> Optional[ExtractionResult]:
+        """ExtractionResult cached for this content hash (migration 020), or None."""
+        try:
+            cached = self.db_manager.get_cached_extraction(file_hash, self.extraction_manager.prompt_version)
+            return ExtractionResult.from_json(cached) if cached else None
+        except Exception as e:
+            logging.warning(f"Extraction cache lookup failed, extracting instead: {e}")
+            return None
+
+    def _apply(self, outcome: FileOutcome) -> None:
+        """Writer step: store one file's outcome."""
+        try:
+            if outcome.status == "success":
+                # Assuming 0 tokens for now as we don't have it in result yet
+                tokens_used = 0 
+
+                # 6. Store results, metrics and status in one transaction (one commit per file)
+                self.db_manager.ingest_extraction(
+                    file_path=outcome.file_path,
+                    file_hash=outcome.file_hash,
+                    result=outcome.result,
+                    processing_time=outcome.processing_time,
+                    tokens_used=tokens_used,
+                    prompt_version=self.extraction_manager.prompt_version,
+                    cache_hit=outcome.cache_hit
+                )
+            elif outcome.error is None:
+                self.db_manager.update_processing_status(outcome.file_path, outcome.status)
+            else:
+                self.db_manager.update_processing_status(outcome.file_path, outcome.status, outcome.error)
 
         except Exception as e:
             # Log error
-            self.db_manager.update_processing_status(file_path, "error", str(e))
-            pass
+            outcome.status = "error"
+            outcome.error = str(e)
+            self.db_manager.update_processing_status(outcome.file_path, "error", str(e))
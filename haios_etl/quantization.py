@@ -0,0 +1,107 @@
+# generated: 2026-10-18
+# System Auto: last updated on: 2026-10-18 12:52:09
+"""
+Compact embedding codes for coarse vector search (migration 013).
+
+Two encodings of the L2-normalized vector are kept next to the float32 BLOB
+in `embeddings`:
+
+    - int8   : one signed byte per dimension plus a per-row scale (4x smaller).
+               code = round(v / max|v| * 127), v ~= code * scale.
+    - binary : one sign bit per dimension, packed (32x smaller).
+
+Codes are for ranking candidates only. Callers take the top few hundred
+coarse hits and rerank them against the exact float32 vectors.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+INT8 = 'int8'
+BINARY = 'binary'
+MODES = (INT8, BINARY)
+
+# Rows scored per matmul block; bounds the float32 temporary for int8 codes
+SCORE_BLOCK_ROWS = 8192
+
+# Popcount of every byte value, for Hamming distance on packed sign bits
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def quantize_int8(matrix) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode rows as int8 codes.
+
+    Returns:
+        (codes, scales): int8 array (n, d) and float32 array (n,) such that
+        codes[i] * scales[i] approximates the normalized row i.
+    """
+    matrix = _normalize(np.atleast_2d(np.asarray(matrix, dtype=np.float32)))
+    peaks = np.abs(matrix).max(axis=1) if matrix.shape[1] else np.zeros(len(matrix))
+    scales = (peaks / 127.0).astype(np.float32)
+    codes = np.divide(matrix, scales[:, None], out=np.zeros_like(matrix),
+                      where=scales[:, None] > 0)
+    codes = np.clip(np.rint(codes), -127, 127).astype(np.int8)
+    return codes, scales
+
+
+def quantize_binary(matrix) -> np.ndarray:
+    """Encode rows as packed sign bits: uint8 array (n, ceil(d / 8))."""
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+    return np.packbits(matrix > 0, axis=1)
+
+
+def encode_int8(vector) -> Tuple[bytes, float]:
+    """int8 code BLOB and scale for one vector (embeddings.vector_int8 / vector_int8_scale)."""
+    codes, scales = quantize_int8(vector)
+    return codes[0].tobytes(), float(scales[0])
+
+
+def encode_binary(vector) -> bytes:
+    """Packed sign-bit BLOB for one vector (embeddings.vector_binary)."""
+    return quantize_binary(vector)[0].tobytes()
+
+
+def code_size(mode: str, dimensions: int) -> int:
+    """Bytes per row for a code of the given mode."""
+    return dimensions if mode == INT8 else (dimensions + 7) // 8
+
+
+def coarse_scores(mode: str, codes: np.ndarray, query,
+                  scales: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Approximate cosine similarity of `query` against every code row.
+
+    int8 scores are the dequantized dot product with the normalized query.
+    Binary scores are the fraction of agreeing signs mapped to [-1, 1]
+    (1 - 2 * hamming / d); good for ranking, not comparable to cosine.
+    """
+    query = np.asarray(query, dtype=np.float32)
+    norm = np.linalg.norm(query)
+    if norm > 0:
+        query = query / norm
+
+    n = codes.shape[0]
+    scores = np.empty(n, dtype=np.float32)
+    if mode == INT8:
+        for start in range(0, n, SCORE_BLOCK_ROWS):
+            block = codes[start:start + SCORE_BLOCK_ROWS]
+            scores[start:start + len(block)] = block.astype(np.float32) @ query
+        if scales is not None:
+            scores *= scales[:n]
+    elif mode == BINARY:
+        dims = query.shape[0]
+        packed_query = quantize_binary(query)[0]
+        for start in range(0, n, SCORE_BLOCK_ROWS):
+            block = codes[start:start + SCORE_BLOCK_ROWS]
+            hamming = _POPCOUNT[np.bitwise_xor(block, packed_query)].sum(axis=1, dtype=np.int32)
+            scores[start:start + len(block)] = 1.0 - 2.0 * hamming / dims
+    else:
+        raise ValueError(f"Unknown quantization mode: {mode}")
+    return scores
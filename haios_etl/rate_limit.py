@@ -0,0 +1,88 @@
+# generated: 2026-10-18
+# System Auto: last updated on: 2026-10-18 14:22:40
+"""
+Token-bucket rate limiting for LLM and embedding calls.
+
+Concurrent workers (SynthesisManager's pool) share one TokenBucket, so the
+combined request rate stays within the model's requests-per-minute quota no
+matter how many calls are in flight.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at `rate_per_minute / 60` per second up to
+    `capacity`; acquire() blocks until enough tokens are available.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            rate_per_minute: Sustained requests per minute (must be > 0)
+            capacity: Burst size (default: one second's worth, at least 1)
+            clock: Monotonic time source (injectable for tests)
+            sleep: Sleep function (injectable for tests)
+        """
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, self.rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if available right now; never blocks."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def delay(self, tokens: float = 1.0) -> float:
+        """Seconds until `tokens` would be available (0.0 if now); takes nothing."""
+        with self._lock:
+            self._refill()
+            return max(0.0, (tokens - self._tokens) / self.rate)
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        Block until `tokens` are available and take them.
+
+        Returns:
+            True once acquired; False if `timeout` seconds passed first.
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            self._sleep(wait)
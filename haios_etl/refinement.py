@@ -5,6 +5,7 @@ import json
 from typing import List, Dict, Optional
 from dataclasses import dataclass
 from .database import DatabaseManager
+from .llm_gateway import LLMGateway, default_gateway, estimate_tokens
 
 # Optional LLM import (may not be available in all environments)
 try:
@@ -22,9 +23,10 @@ class RefinementResult:
     reasoning: str
 
 class RefinementManager:
-    def __init__(self, db_path: str, api_key: Optional[str] = None):
+    def __init__(self, db_path: str, api_key: Optional[str] = None, gateway: Optional[LLMGateway] = None):
         self.db = DatabaseManager(db_path)
         self.api_key = api_key
+        self.gateway = gateway or default_gateway()
 
     def scan_raw_memories(self, limit: int = 10) -> List[Dict]:
         """
@@ -73,7 +75,7 @@ CONTENT:
 
 Respond with ONLY one word: episteme, techne, or doxa"""
 
-            response = model.generate_content(prompt)
+            response = self.gateway.call(model.generate_content, prompt, tokens=estimate_tokens(prompt))
             result = response.text.strip().lower()
 
             if result in ("episteme", "techne", "doxa"):
@@ -179,11 +181,8 @@ Respond with ONLY one word: episteme, techne, or doxa"""
             return row[0]
 
         # 2. Create New Episteme in concepts table
-        cursor.execute(
-            "INSERT INTO concepts (type, content, source_adr) VALUES (?, ?, ?)",
-            ("Episteme", content, "virtual:episteme")
-        )
-        new_id = cursor.lastrowid
+        # An untagged Episteme with the same content is reused, not duplicated
+        new_id, _ = self.db.insert_concept_row(cursor, "Episteme", content, "virtual:episteme")
 
         self._set_metadata(cursor, new_id, "knowledge_type", "episteme")
         conn.commit()
@@ -3,8 +3,9 @@
 import json
 import logging
 from typing import List, Dict, Optional, Any
-from .database import DatabaseManager
+from .database import DatabaseManager, normalize_vector
 from .extraction import ExtractionManager
+from .vectors import encode_vector
 
 logger = logging.getLogger(__name__)
 
@@ -178,8 +179,12 @@ class ReasoningAwareRetrieval(RetrievalService):
         """
         Find past reasoning attempts for similar queries using vector similarity.
 
-        Design Decision DD-002: Uses direct vec_distance_cosine() on column for MVP.
-        Switch to vec0 indexed search when traces exceed 10k rows.
+        Uses KNN on reasoning_traces_vec (migration 011) with the space_id filter
+        and distance threshold inside the KNN query, so lookup cost does not grow
+        with the trace table. Every search records a new trace, so the table
+        grows without bound. Falls back to a direct vec_distance_cosine() scan
+        (former DD-002 MVP path) when the index is unavailable or the KNN query
+        fails (e.g. an older sqlite-vec without metadata columns).
 
         Design Decision DD-003: Threshold lowered to 0.6 (from 0.8) per Session 30
         gap analysis. Original 0.8 was too strict for experiential learning.
@@ -189,60 +194,37 @@ class ReasoningAwareRetrieval(RetrievalService):
         queries across calls. Threshold of 0.6 allows broader strategy retrieval
         while still maintaining relevance.
         """
-        import struct
-
-        conn = self.db.get_connection()
+        conn = self.db.get_read_connection()
         cursor = conn.cursor()
 
-        # Check if reasoning_traces table has any rows with embeddings
-        cursor.execute("SELECT COUNT(*) FROM reasoning_traces WHERE query_embedding IS NOT NULL")
-        count = cursor.fetchone()[0]
-        if count == 0:
-            return []
-
         # Pack embedding for sqlite-vec
-        vector_bytes = struct.pack(f'{len(query_embedding)}f', *query_embedding)
-
-        # Build query - DD-002: direct column search for MVP
-        # Updated to include strategy columns per ReasoningBank alignment
-        sql = """
-            SELECT
-                rt.id,
-                rt.query,
-                rt.approach_taken,
-                rt.strategy_details,
-                rt.outcome,
-                rt.failure_reason,
-                rt.memories_used,
-                rt.execution_time_ms,
-                vec_distance_cosine(rt.query_embedding, ?) as distance,
-                rt.strategy_title,
-                rt.strategy_description,
-                rt.strategy_content
-            FROM reasoning_traces rt
-            WHERE rt.query_embedding IS NOT NULL
-        """
-
-        params = [vector_bytes]
-
-        if space_id:
-            sql += " AND rt.space_id = ?"
-            params.append(space_id)
-
-        sql += " ORDER BY distance ASC LIMIT 10"
-
-        try:
-            cursor.execute(sql, params)
-            rows = cursor.fetchall()
-        except Exception as e:
-            logger.warning(f"Vector search on reasoning_traces failed: {e}")
-            return []
+        query_embedding = normalize_vector(query_embedding)
+        vector_bytes = encode_vector(query_embedding)
 
         # DD-003: Convert similarity threshold to distance
         # Cosine distance: 0 = identical, 2 = opposite
         # Similarity 0.8 -> max distance 0.2
         max_distance = 1 - threshold
 
+        use_index = (
+            len(query_embedding) == self.db.VEC_DIMENSIONS
+            and self.db.has_vec_index('reasoning_traces_vec')
+        )
+
+        rows = None
+        if use_index:
+            try:
+                rows = self._knn_reasoning_traces(cursor, vector_bytes, space_id, max_distance)
+            except Exception as e:
+                # e.g. sqlite-vec without metadata / distance constraints in KNN
+                logger.warning(f"KNN on reasoning_traces_vec failed, falling back to scan: {e}")
+        if rows is None:
+            try:
+                rows = self._scan_reasoning_traces(cursor, vector_bytes, space_id)
+            except Exception as e:
+                logger.warning(f"Vector search on reasoning_traces failed: {e}")
+                return []
+
         results = []
         for row in rows:
             distance = row[8]
@@ -265,6 +247,79 @@ class ReasoningAwareRetrieval(RetrievalService):
 
         return results
 
+    # Columns returned by both trace lookup paths (distance at index 8)
+    _TRACE_COLUMNS = """
+                rt.id,
+                rt.query,
+                rt.approach_taken,
+                rt.strategy_details,
+                rt.outcome,
+                rt.failure_reason,
+                rt.memories_used,
+                rt.execution_time_ms,
+                {distance} as distance,
+                rt.strategy_title,
+                rt.strategy_description,
+                rt.strategy_content
+    """
+
+    def _knn_reasoning_traces(self, cursor, vector_bytes, space_id, max_distance, k=10):
+        """KNN lookup on reasoning_traces_vec with space and threshold pre-filters."""
+        knn_filters = ""
+        params = [vector_bytes, k]
+        if space_id:
+            # Migration 011 stores NULL space_id as ''
+            knn_filters += " AND space_id = ?"
+            params.append(space_id)
+        knn_filters += " AND distance <= ?"
+        params.append(max_distance)
+
+        sql = f"""
+            WITH knn AS (
+                SELECT trace_id, distance
+                FROM reasoning_traces_vec
+                WHERE query_embedding MATCH ? AND k = ?
+                {knn_filters}
+            )
+            SELECT {self._TRACE_COLUMNS.format(distance='knn.distance')}
+            FROM knn
+            JOIN reasoning_traces rt ON rt.id = knn.trace_id
+            ORDER BY knn.distance ASC
+        """
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+    def _scan_reasoning_traces(self, cursor, vector_bytes, space_id, k=10):
+        """
+        Brute-force lookup over every trace embedding.
+
+        Normalized databases (migration 014) use L2 distance on unit vectors,
+        converted back to cosine distance (l2^2 / 2); otherwise vec_distance_cosine().
+        """
+        normalized = self.db.embeddings_normalized()
+        distance_fn = 'vec_distance_l2' if normalized else 'vec_distance_cosine'
+        sql = f"""
+            SELECT {self._TRACE_COLUMNS.format(distance=f'{distance_fn}(rt.query_embedding, ?)')}
+            FROM reasoning_traces rt
+            WHERE rt.query_embedding IS NOT NULL
+        """
+
+        params = [vector_bytes]
+
+        if space_id:
+            sql += " AND rt.space_id = ?"
+            params.append(space_id)
+
+        sql += " ORDER BY distance ASC LIMIT ?"
+        params.append(k)
+
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        if normalized:
+            # Same order as cosine on unit vectors; convert back to cosine distance
+            rows = [row[:8] + (row[8] * row[8] / 2,) + row[9:] for row in rows]
+        return rows
+
     def _determine_strategy(self, past_attempts: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Determine the best strategy based on past attempts."""
         if not past_attempts:
@@ -308,40 +363,38 @@ class ReasoningAwareRetrieval(RetrievalService):
             error_details=error_details
         )
 
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        import struct
-        vector_bytes = struct.pack(f'{len(query_embedding)}f', *query_embedding)
+        query_embedding = normalize_vector(query_embedding)
+        vector_bytes = encode_vector(query_embedding)
 
         # E2-103: Compute failure_reason for failure/partial_success outcomes
         failure_reason = None
         if outcome in ('failure', 'partial_success') and error_details:
             failure_reason = error_details
 
-        cursor.execute("""
-            INSERT INTO reasoning_traces
-            (query, query_embedding, approach_taken, strategy_details, outcome,
-             memories_used, execution_time_ms, space_id,
-             strategy_title, strategy_description, strategy_content, extraction_model,
-             failure_reason)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            query,
-            vector_bytes,
-            approach,
-            json.dumps(strategy_details),
-            outcome,
-            json.dumps(memories_used),
-            execution_time_ms,
-            space_id,
-            strategy.get('title'),
-            strategy.get('description'),
-            strategy.get('content'),
-            self.extractor.model_id,
-            failure_reason
-        ))
-        conn.commit()
+        # Shared writer: serialize with other threads' writes
+        with self.db.writer() as conn:
+            conn.execute("""
+                INSERT INTO reasoning_traces
+                (query, query_embedding, approach_taken, strategy_details, outcome,
+                 memories_used, execution_time_ms, space_id,
+                 strategy_title, strategy_description, strategy_content, extraction_model,
+                 failure_reason)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                query,
+                vector_bytes,
+                approach,
+                json.dumps(strategy_details),
+                outcome,
+                json.dumps(memories_used),
+                execution_time_ms,
+                space_id,
+                strategy.get('title'),
+                strategy.get('description'),
+                strategy.get('content'),
+                self.extractor.model_id,
+                failure_reason
+            ))
 
         logger.info(f"Recorded trace with strategy: {strategy.get('title')}")
 
@@ -14,13 +14,21 @@ The pipeline has 5 stages:
 
 import logging
 import json
-import struct
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple, Any
+import time
+from dataclasses import asdict, dataclass, field
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 from datetime import datetime
 
-from .database import DatabaseManager
+from .database import DatabaseManager, normalize_vector
 from .extraction import ExtractionManager
+from .llm_cache import LLMResponseCache
+from .llm_gateway import LLMGateway, default_gateway, estimate_tokens
+from .vectors import cosine_similarity, decode_vector, dot, encode_vector, has_values
+
+# End-of-input marker for SynthesisManager._run_pool
+_EXHAUSTED = object()
 
 
 @dataclass
@@ -55,6 +63,15 @@ class SynthesisStats:
     cross_pollination_links: int
 
 
+@dataclass
+class OverlapStats:
+    """Side output of a cross-pollination comparison run."""
+    comparisons: int
+    above_threshold: int
+    max_similarity: float
+    histogram: List[Tuple[float, float, int]] = field(default_factory=list)  # (low, high, count)
+
+
 class SynthesisManager:
     """
     Manages memory consolidation and synthesis.
@@ -72,24 +89,50 @@ class SynthesisManager:
     CROSS_POLLINATION_THRESHOLD = 0.65  # Lower threshold for cross-modal comparison (Empirically verified)
     MIN_CLUSTER_SIZE = 2
     MAX_CLUSTER_SIZE = 20  # DD-007: Balance granularity vs LLM context
+    NEAR_MISS_FLOOR = 0.65  # Cross-pollination pairs below threshold but above this are logged
+    CLUSTER_MODES = ('greedy', 'graph')
+    GRAPH_NEIGHBORS = MAX_CLUSTER_SIZE - 1  # Enough kNN edges to fill one cluster
 
-    def __init__(self, db_path: str, extractor: Optional[ExtractionManager] = None):
+    def __init__(
+        self,
+        db_path: str,
+        extractor: Optional[ExtractionManager] = None,
+        workers: int = 1,
+        llm_cache: Optional[LLMResponseCache] = None,
+        gateway: Optional[LLMGateway] = None
+    ):
         """
         Initialize the SynthesisManager.
 
         Args:
             db_path: Path to the SQLite database
             extractor: ExtractionManager for embeddings and LLM calls
+            workers: Concurrent LLM/embedding calls in the pipeline (1 = sequential)
+            llm_cache: Response cache for synthesis prompts (default: one on
+                this database, active once migration 019 is applied)
+            gateway: Process-wide LLM gateway (default: default_gateway())
         """
         self.db = DatabaseManager(db_path)
         self.extractor = extractor
         self.logger = logging.getLogger(__name__)
+        self.workers = max(1, workers)
+        # Shared with every other LLM caller: global RPM/TPM and 429 cooldown
+        self.gateway = gateway or default_gateway()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._bridge_table: Optional[bool] = None
+        self._run_table: Optional[bool] = None
+        # Workers only read the cache; the apply loop flushes new entries
+        self.llm_cache = llm_cache or LLMResponseCache(self.db, write_through=False)
+        # Shared in-process embedding matrices (None without NumPy)
+        self.store = self.db.attach_embedding_store()
+        # Histogram and counts from the last find_cross_type_overlaps run
+        self.last_overlap_stats: Optional[OverlapStats] = None
 
     # =========================================================================
     # Stage 1: CLUSTERING
     # =========================================================================
 
-    def find_similar_concepts(self, limit: int = 1000) -> List[ClusterInfo]:
+    def find_similar_concepts(self, limit: int = 1000, mode: str = 'greedy') -> List[ClusterInfo]:
         """
         Group concepts by vector similarity.
 
@@ -97,11 +140,21 @@ class SynthesisManager:
         that are semantically similar (>85% cosine similarity).
 
         Args:
-            limit: Maximum number of concepts to consider
+            limit: Maximum number of concepts to consider (greedy mode only)
+            mode: 'greedy' - greedy sweep over the first `limit` concepts by id;
+                  'graph' - kNN-graph components over ALL unsynthesized concepts
 
         Returns:
             List of ClusterInfo objects, each containing member IDs
         """
+        if mode not in self.CLUSTER_MODES:
+            raise ValueError(f"Unknown cluster mode: {mode} (expected one of {self.CLUSTER_MODES})")
+        if mode == 'graph':
+            try:
+                return self._find_concept_graph_clusters()
+            except ImportError:
+                self.logger.warning("numpy not installed. Falling back to greedy clustering.")
+
         conn = self.db.get_connection()
         cursor = conn.cursor()
 
@@ -132,6 +185,145 @@ class SynthesisManager:
         self.logger.info(f"Found {len(clusters)} concept clusters from {len(rows)} concepts")
         return clusters
 
+    def _find_concept_graph_clusters(self) -> List[ClusterInfo]:
+        """
+        Cluster every unsynthesized concept through a kNN similarity graph.
+
+        Each concept is linked to its GRAPH_NEIGHBORS most similar concepts at
+        or above SIMILARITY_THRESHOLD; clusters are the connected components,
+        merged strongest edge first and capped at MAX_CLUSTER_SIZE. Unlike the
+        greedy sweep the result does not depend on id order or a `limit`
+        window. Memory is the float32 matrix, one score block and the edges.
+
+        Vectors come from the attached EmbeddingStore's concept segment; the
+        embeddings BLOBs are only decoded when no store is attached (or the
+        store cannot serve float32 rows).
+        """
+        import time
+        from .clustering import graph_clusters, knn_edges
+
+        ids, matrix = None, None
+        if self.store is not None:
+            try:
+                ids, matrix = self._graph_candidates_from_store()
+            except Exception as e:
+                self.logger.warning(f"Embedding store clustering failed, falling back to BLOB scan: {e}")
+        if ids is None:
+            ids, matrix = self._graph_candidates_from_blobs()
+        if not ids:
+            self.logger.info("No unsynthesized concepts with embeddings found")
+            return []
+
+        # E2-011 Phase 1b: Progress logging for clustering
+        start_time = time.time()
+        last_progress = [start_time]
+        time_interval = 5  # Log every N seconds, and once at the end
+
+        def progress(done: int, total: int) -> None:
+            current_time = time.time()
+            if done < total and (current_time - last_progress[0]) < time_interval:
+                return
+            elapsed = current_time - start_time
+            pct = (done / total) * 100 if total > 0 else 0
+            self.logger.info(f"Clustering progress: {done}/{total} items ({pct:.1f}%) - {elapsed:.1f}s elapsed")
+            last_progress[0] = current_time
+
+        left, right, similarity = knn_edges(matrix, self.GRAPH_NEIGHBORS, self.SIMILARITY_THRESHOLD, progress)
+        components = graph_clusters(len(ids), left, right, similarity, self.MAX_CLUSTER_SIZE)
+
+        clusters = []
+        for rows in components:
+            if len(rows) < self.MIN_CLUSTER_SIZE:
+                continue
+            clusters.append(ClusterInfo(
+                id=len(clusters),  # Temporary ID
+                cluster_type='concept',
+                member_ids=[ids[row] for row in rows],
+                member_count=len(rows),
+                centroid=self._centroid([matrix[row] for row in rows])
+            ))
+
+        self.logger.info(
+            f"Found {len(clusters)} concept clusters from {len(ids)} concepts "
+            f"({len(left)} graph edges >= {self.SIMILARITY_THRESHOLD})"
+        )
+        return clusters
+
+    def _graph_candidates_from_store(self):
+        """
+        (concept ids, normalized matrix) of unsynthesized concepts from the EmbeddingStore.
+
+        The concept segment is already decoded and normalized; only the id
+        filter runs against SQLite. Rows follow concept id order like the
+        BLOB query, first embedding per concept.
+        """
+        import numpy as np
+
+        conn = self.db.get_connection()
+        self.store.refresh(conn, segments=('concept',))
+        seg = self.store.segment('concept')
+
+        # Same candidate filter as the greedy query (E2-FIX-004)
+        candidates = [row[0] for row in conn.execute("""
+            SELECT id FROM concepts
+            WHERE synthesized_at IS NULL
+              AND synthesis_cluster_id IS NULL
+        """)]
+        if seg.skipped:
+            self.logger.warning(f"Graph clustering skipped {seg.skipped} embeddings with mismatched dimensions")
+
+        # Segment rows ascend by embeddings.id, so np.unique keeps the first per concept
+        concept_ids, first_rows = np.unique(seg.ids, return_index=True)
+        rows = first_rows[np.isin(concept_ids, np.fromiter(candidates, dtype=np.int64))]
+        return seg.ids[rows].tolist(), seg.matrix[rows]
+
+    def _graph_candidates_from_blobs(self):
+        """(concept ids, normalized matrix) of unsynthesized concepts decoded from embeddings BLOBs."""
+        import numpy as np
+
+        cursor = self.db.get_connection().cursor()
+
+        # Same candidate filter as the greedy query (E2-FIX-004), without LIMIT
+        cursor.execute("""
+            SELECT c.id, e.vector
+            FROM concepts c
+            JOIN embeddings e ON c.id = e.concept_id
+            WHERE c.synthesized_at IS NULL
+              AND c.synthesis_cluster_id IS NULL
+            ORDER BY c.id, e.id
+        """)
+        ids = []
+        vectors = []
+        seen = set()
+        skipped = 0
+        dims = None
+        for concept_id, blob in cursor:
+            if concept_id in seen:
+                continue  # First embedding per concept
+            if blob is None or len(blob) == 0 or len(blob) % 4:
+                skipped += 1
+                continue
+            vector = decode_vector(blob)
+            if dims is None:
+                dims = len(vector)
+            if len(vector) != dims:
+                skipped += 1
+                continue
+            seen.add(concept_id)
+            ids.append(concept_id)
+            vectors.append(vector)
+
+        if skipped:
+            self.logger.warning(f"Graph clustering skipped {skipped} concepts with unusable or mismatched embeddings")
+        if not ids:
+            return [], None
+
+        matrix = np.vstack(vectors)
+        del vectors
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+        return ids, matrix
+
     def find_similar_traces(self, limit: int = 100) -> List[ClusterInfo]:
         """
         Group reasoning traces by query embedding similarity.
@@ -175,6 +367,117 @@ class SynthesisManager:
         """
         Build clusters from items using greedy similarity grouping.
 
+        Uses the NumPy engine in haios_etl/clustering.py, which yields the same
+        clusters as _build_clusters_python without re-parsing every BLOB per
+        pair. Falls back to the pure-Python loop without NumPy or when the
+        embeddings differ in dimensions.
+
+        Args:
+            items: List of (id, content, embedding) tuples
+            item_type: 'concept' or 'trace'
+
+        Returns:
+            List of ClusterInfo objects
+        """
+        if not items:
+            return []
+
+        try:
+            clusters = self._build_clusters_vectorized(items, item_type)
+        except ImportError:
+            self.logger.warning("numpy not installed. Using pure-Python clustering.")
+            clusters = None
+        if clusters is None:
+            clusters = self._build_clusters_python(items, item_type)
+        return clusters
+
+    def _build_clusters_vectorized(
+        self,
+        items: List[Tuple],
+        item_type: str
+    ) -> Optional[List[ClusterInfo]]:
+        """
+        _build_clusters via blocked matrix products (haios_etl/clustering.py).
+
+        Each BLOB is decoded once. Returns None when the valid embeddings do not
+        share one dimension, so the caller can use the reference loop.
+        """
+        import time
+        import numpy as np
+        from .clustering import greedy_clusters
+
+        valid = [
+            blob is not None and len(blob) > 0 and len(blob) % 4 == 0
+            for _, _, blob in items
+        ]
+        dimensions = {len(blob) // 4 for (_, _, blob), ok in zip(items, valid) if ok}
+        if len(dimensions) > 1:
+            self.logger.warning(
+                f"Embeddings differ in dimensions ({sorted(dimensions)}); using pure-Python clustering"
+            )
+            return None
+        dims = dimensions.pop() if dimensions else 0
+
+        matrix = np.zeros((len(items), dims), dtype=np.float32)
+        for row, ((_, _, blob), ok) in enumerate(zip(items, valid)):
+            if ok:
+                matrix[row] = decode_vector(blob)
+        if not self.db.embeddings_normalized():
+            # Same scores as _similarity: cosine unless stored vectors are unit length
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+        def exact(seed: int, row: int) -> float:
+            # Borderline scores: decide with the reference similarity
+            return self._similarity(self._parse_embedding(items[seed][2]),
+                                    self._parse_embedding(items[row][2]))
+
+        # E2-011 Phase 1b: Progress logging for clustering
+        start_time = time.time()
+        last_progress = [start_time]
+        time_interval = 5  # Log every N seconds, and once at the end
+
+        def progress(done: int, total: int) -> None:
+            current_time = time.time()
+            if done < total and (current_time - last_progress[0]) < time_interval:
+                return
+            elapsed = current_time - start_time
+            pct = (done / total) * 100 if total > 0 else 0
+            self.logger.info(f"Clustering progress: {done}/{total} items ({pct:.1f}%) - {elapsed:.1f}s elapsed")
+            last_progress[0] = current_time
+
+        groups = greedy_clusters(
+            matrix,
+            self.SIMILARITY_THRESHOLD,
+            self.MAX_CLUSTER_SIZE,
+            keys=[item[0] for item in items],
+            valid=valid,
+            exact=exact,
+            progress=progress,
+        )
+
+        clusters = []
+        for rows in groups:
+            if len(rows) < self.MIN_CLUSTER_SIZE:
+                continue
+            member_ids = [items[row][0] for row in rows]
+            clusters.append(ClusterInfo(
+                id=len(clusters),  # Temporary ID
+                cluster_type=item_type,
+                member_ids=member_ids,
+                member_count=len(member_ids),
+                centroid=self._centroid([self._parse_embedding(items[row][2]) for row in rows])
+            ))
+        return clusters
+
+    def _build_clusters_python(
+        self,
+        items: List[Tuple],
+        item_type: str
+    ) -> List[ClusterInfo]:
+        """
+        Reference greedy clustering: O(n^2) pairwise loop in pure Python.
+
         Args:
             items: List of (id, content, embedding) tuples
             item_type: 'concept' or 'trace'
@@ -216,6 +519,7 @@ class SynthesisManager:
             item_embedding = self._parse_embedding(embedding)
             if item_embedding is None:
                 continue
+            member_vectors = [item_embedding]
 
             for j, (other_id, other_content, other_embedding) in enumerate(items):
                 if other_id in clustered:
@@ -227,9 +531,10 @@ class SynthesisManager:
                 if other_vec is None:
                     continue
 
-                similarity = self._cosine_similarity(item_embedding, other_vec)
+                similarity = self._similarity(item_embedding, other_vec)
                 if similarity >= self.SIMILARITY_THRESHOLD:
                     cluster_members.append(other_id)
+                    member_vectors.append(other_vec)
                     clustered.add(other_id)
 
             # Only keep clusters with minimum size
@@ -239,41 +544,124 @@ class SynthesisManager:
                     cluster_type=item_type,
                     member_ids=cluster_members,
                     member_count=len(cluster_members),
-                    centroid=item_embedding  # Use first item as centroid
+                    centroid=self._centroid(member_vectors)
                 ))
 
         return clusters
 
-    def _parse_embedding(self, blob: bytes) -> Optional[List[float]]:
-        """Parse embedding from SQLite BLOB format."""
+    def _parse_embedding(self, blob: bytes) -> Optional[Sequence[float]]:
+        """Parse embedding from SQLite BLOB format (float32 view, see vectors.decode_vector)."""
         if blob is None:
             return None
         try:
-            # Embeddings are stored as packed floats
-            num_floats = len(blob) // 4
-            return list(struct.unpack(f'{num_floats}f', blob))
+            return decode_vector(blob)
         except Exception as e:
             self.logger.warning(f"Failed to parse embedding: {e}")
             return None
 
-    def _cosine_similarity(self, a: List[float], b: List[float]) -> float:
-        """Compute cosine similarity between two vectors."""
-        if len(a) != len(b):
-            return 0.0
+    def _centroid(self, vectors: List[Optional[Sequence[float]]]) -> Optional[List[float]]:
+        """
+        Cluster centroid: L2-normalized mean of the member vectors.
 
-        dot_product = sum(x * y for x, y in zip(a, b))
-        norm_a = sum(x * x for x in a) ** 0.5
-        norm_b = sum(x * x for x in b) ** 0.5
+        Vectors that are missing or differ from the first one's dimensions
+        are ignored. Returns None when no vector is usable.
+        """
+        vectors = [v for v in vectors if has_values(v)]
+        if not vectors:
+            return None
+        dims = len(vectors[0])
+        vectors = [v for v in vectors if len(v) == dims]
+        try:
+            import numpy as np
+            total = np.sum(np.asarray(vectors, dtype=np.float64), axis=0)
+        except ImportError:
+            total = [0.0] * dims
+            for vector in vectors:
+                for i, value in enumerate(vector):
+                    total[i] += value
+        centroid = normalize_vector(total)
+        return centroid if isinstance(centroid, list) else centroid.tolist()
+
+    def _cosine_similarity(self, a: Sequence[float], b: Sequence[float]) -> float:
+        """Compute cosine similarity between two vectors."""
+        return cosine_similarity(a, b)
 
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
+    def _similarity(self, a: Sequence[float], b: Sequence[float]) -> float:
+        """
+        Cosine similarity of two stored vectors.
 
-        return dot_product / (norm_a * norm_b)
+        Once every stored vector is unit length (migration 014) this is a plain
+        dot product; otherwise falls back to _cosine_similarity.
+        """
+        if not self.db.embeddings_normalized():
+            return self._cosine_similarity(a, b)
+        return dot(a, b)
 
     # =========================================================================
     # Stage 2: SYNTHESIS
     # =========================================================================
 
+    def _run_pool(
+        self,
+        items: Iterable,
+        produce: Callable[[Any], Any],
+        apply: Callable[[Any, Any], bool],
+        limit: Optional[int] = None,
+        on_error: Optional[Callable[[Any, Exception], None]] = None
+    ) -> int:
+        """
+        Run produce(item) on `self.workers` threads; apply results on this thread.
+
+        produce() makes the network calls (LLM, embedding) and must not write.
+        apply(item, output) is the single SQLite writer; it runs in submission
+        order, so results land exactly as in a sequential loop. With `limit`,
+        no more items are started than could still be needed to reach `limit`
+        successful applies, so no LLM call is wasted past the cap.
+
+        Returns:
+            Number of apply() calls that returned True
+        """
+        succeeded = 0
+        pending = deque()
+        remaining = iter(items)
+        exhausted = False
+        # One pool per manager: its threads keep their read connections across stages
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='synthesis')
+        pool = self._executor
+        while True:
+            while (not exhausted and len(pending) < self.workers * 2
+                   and (limit is None or succeeded + len(pending) < limit)):
+                item = next(remaining, _EXHAUSTED)
+                if item is _EXHAUSTED:
+                    exhausted = True
+                    break
+                pending.append((item, pool.submit(produce, item)))
+            if not pending:
+                break
+
+            item, future = pending.popleft()
+            try:
+                if apply(item, future.result()):
+                    succeeded += 1
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(item, e)
+            # Persist the workers' new LLM cache entries from this (writer) thread
+            self.llm_cache.flush()
+        return succeeded
+
+    def _synthesize_and_embed(
+        self,
+        cluster: ClusterInfo
+    ) -> Tuple[Optional[SynthesisResult], Optional[List[float]]]:
+        """Worker step: LLM synthesis of a cluster plus the insight's embedding."""
+        result = self.synthesize_cluster(cluster)
+        if result is None:
+            return None, None
+        return result, self._embed_text(f"[{result.title}] {result.content}")
+
     def synthesize_cluster(
         self,
         cluster: ClusterInfo
@@ -321,7 +709,7 @@ class SynthesisManager:
 
     def _get_concept_contents(self, concept_ids: List[int]) -> List[Dict]:
         """Fetch concept content by IDs."""
-        conn = self.db.get_connection()
+        conn = self.db.get_read_connection()
         cursor = conn.cursor()
 
         placeholders = ','.join('?' * len(concept_ids))
@@ -332,7 +720,7 @@ class SynthesisManager:
 
     def _get_trace_contents(self, trace_ids: List[int]) -> List[Dict]:
         """Fetch trace content by IDs."""
-        conn = self.db.get_connection()
+        conn = self.db.get_read_connection()
         cursor = conn.cursor()
 
         placeholders = ','.join('?' * len(trace_ids))
@@ -389,14 +777,22 @@ Output ONLY valid JSON (no markdown):
 {{"title": "Strategy name (max 8 words)", "content": "The meta-strategy (2-3 sentences)", "confidence": 0.0-1.0}}"""
 
     def _call_synthesis_llm(self, prompt: str) -> Optional[Dict]:
-        """Call LLM for synthesis."""
+        """Call LLM for synthesis; a prompt already answered comes from llm_cache."""
+        model_id = self.extractor.model_id
+        cached = self.llm_cache.get(model_id, prompt)
+        if cached is not None:
+            try:
+                return json.loads(cached)
+            except json.JSONDecodeError:
+                pass
+
         import google.generativeai as genai
 
         genai.configure(api_key=self.extractor.api_key)
-        model = genai.GenerativeModel(self.extractor.model_id)
+        model = genai.GenerativeModel(model_id)
 
         try:
-            response = model.generate_content(prompt)
+            response = self.gateway.call(model.generate_content, prompt, tokens=estimate_tokens(prompt))
             text = response.text.strip()
 
             # Clean up markdown code blocks
@@ -406,7 +802,9 @@ Output ONLY valid JSON (no markdown):
                     text = text[:-3]
                 text = text.strip()
 
-            return json.loads(text)
+            parsed = json.loads(text)
+            self.llm_cache.put(model_id, prompt, text)
+            return parsed
         except json.JSONDecodeError as e:
             self.logger.warning(f"Synthesis JSON parse failed: {e}")
             return None
@@ -418,7 +816,11 @@ Output ONLY valid JSON (no markdown):
     # Stage 3: STORAGE
     # =========================================================================
 
-    def store_synthesis(self, result: SynthesisResult) -> Optional[int]:
+    def store_synthesis(
+        self,
+        result: SynthesisResult,
+        embedding: Optional[List[float]] = None
+    ) -> Optional[int]:
         """
         Store synthesized concept with provenance.
 
@@ -427,6 +829,8 @@ Output ONLY valid JSON (no markdown):
 
         Args:
             result: SynthesisResult from synthesis stage
+            embedding: Precomputed embedding of the insight (pipeline workers);
+                computed here via the extractor when None
 
         Returns:
             ID of the new synthesized concept, or None if failed
@@ -435,20 +839,33 @@ Output ONLY valid JSON (no markdown):
         cursor = conn.cursor()
 
         try:
-            # 1. Create new concept
-            cursor.execute("""
-                INSERT INTO concepts (type, content, source_adr,
-                    synthesis_source_count, synthesis_confidence, synthesized_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
+            # 0. Bridges: claim the (concept, trace) pair; a duplicate is a no-op
+            bridge_row = None
+            if result.source_type == 'cross' and len(result.source_ids) == 2 and self._has_bridge_table():
+                cursor.execute("""
+                    INSERT OR IGNORE INTO synthesis_bridges (concept_id, trace_id)
+                    VALUES (?, ?)
+                """, tuple(result.source_ids))
+                if cursor.rowcount == 0:
+                    conn.rollback()
+                    self.logger.info(f"Bridge {tuple(result.source_ids)} already exists, not stored")
+                    return None
+                bridge_row = cursor.lastrowid
+
+            # 1. Create new concept (with content_hash, like every concept insert)
+            new_concept_id, inserted = self.db.insert_concept_row(
+                cursor,
                 'SynthesizedInsight',
                 f"[{result.title}] {result.content}",
                 'virtual:synthesis',
-                len(result.source_ids),
-                result.confidence,
-                datetime.now().isoformat()
-            ))
-            new_concept_id = cursor.lastrowid
+                synthesis_source_count=len(result.source_ids),
+                synthesis_confidence=result.confidence,
+                synthesized_at=datetime.now().isoformat()
+            )
+            if not inserted:
+                conn.rollback()
+                self.logger.info(f"Identical insight already stored as concept {new_concept_id}, not stored")
+                return None
 
             # 2. Save cluster reference
             cluster_id = self._save_cluster(
@@ -464,6 +881,12 @@ Output ONLY valid JSON (no markdown):
                 WHERE id = ?
             """, (cluster_id, new_concept_id))
 
+            if bridge_row is not None:
+                cursor.execute("""
+                    UPDATE synthesis_bridges SET synthesized_concept_id = ?
+                    WHERE id = ?
+                """, (new_concept_id, bridge_row))
+
             # 3. Create provenance links
             for source_id in result.source_ids:
                 cursor.execute("""
@@ -485,25 +908,8 @@ Output ONLY valid JSON (no markdown):
 
             # 5. Generate embedding for the synthesized concept (E2-FIX-001)
             # Without embedding, synthesized concepts are invisible to retrieval
-            if self.extractor:
-                try:
-                    content = f"[{result.title}] {result.content}"
-                    embedding = self.extractor.embed_content(content[:8000])
-                    if embedding:
-                        cursor.execute("""
-                            INSERT INTO embeddings (concept_id, vector, model, dimensions)
-                            VALUES (?, ?, ?, ?)
-                        """, (
-                            new_concept_id,
-                            struct.pack(f'{len(embedding)}f', *embedding),
-                            "gemini-embedding-001",
-                            len(embedding)
-                        ))
-                        conn.commit()
-                        self.logger.info(f"Generated embedding for synthesis {new_concept_id}")
-                except Exception as embed_err:
-                    self.logger.warning(f"Failed to generate embedding for synthesis: {embed_err}")
-                    # Continue without embedding - can be backfilled later
+            self._embed_synthesis(conn, new_concept_id, f"[{result.title}] {result.content}",
+                                  embedding=embedding)
 
             self.logger.info(
                 f"Stored synthesis: {result.title} "
@@ -516,6 +922,72 @@ Output ONLY valid JSON (no markdown):
             self.logger.error(f"Failed to store synthesis: {e}")
             return None
 
+    def _embed_text(self, content: str) -> Optional[List[float]]:
+        """Normalized embedding of a synthesized insight, or None on failure."""
+        if not self.extractor:
+            return None
+        try:
+            embedding = self.extractor.embed_content(content[:8000])
+            return normalize_vector(embedding) if embedding else None
+        except Exception as embed_err:
+            self.logger.warning(f"Failed to generate embedding for synthesis: {embed_err}")
+            # Continue without embedding - can be backfilled later
+            return None
+
+    def _embed_synthesis(
+        self,
+        conn,
+        concept_id: int,
+        content: str,
+        replace: bool = False,
+        embedding: Optional[List[float]] = None
+    ) -> None:
+        """
+        Store the embedding of a synthesized concept.
+
+        Uses `embedding` when the caller already computed it, otherwise embeds
+        `content` via the extractor (no-op without one). With replace=True the
+        concept's previous embedding is deleted first (re-synthesis).
+        """
+        if embedding is None:
+            embedding = self._embed_text(content)
+        if not has_values(embedding):
+            return
+        try:
+            cursor = conn.cursor()
+            if replace:
+                cursor.execute("DELETE FROM embeddings WHERE concept_id = ?", (concept_id,))
+            cursor.execute("""
+                INSERT INTO embeddings (concept_id, vector, model, dimensions)
+                VALUES (?, ?, ?, ?)
+            """, (
+                concept_id,
+                encode_vector(embedding),
+                "gemini-embedding-001",
+                len(embedding)
+            ))
+            conn.commit()
+            self.logger.info(f"Generated embedding for synthesis {concept_id}")
+        except Exception as embed_err:
+            self.logger.warning(f"Failed to store embedding for synthesis: {embed_err}")
+
+    def _member_vectors(self, cursor, member_type: str, member_ids: List[int]) -> Dict[int, List[float]]:
+        """Stored embedding per cluster member (first embedding per concept)."""
+        if not member_ids or member_type not in ('concept', 'trace'):
+            return {}
+        placeholders = ','.join('?' * len(member_ids))
+        if member_type == 'concept':
+            sql = f"SELECT concept_id, vector FROM embeddings WHERE concept_id IN ({placeholders}) ORDER BY id"
+        else:
+            sql = f"SELECT id, query_embedding FROM reasoning_traces WHERE id IN ({placeholders})"
+        vectors = {}
+        for member_id, blob in cursor.execute(sql, list(member_ids)).fetchall():
+            if member_id not in vectors:
+                vector = self._parse_embedding(blob)
+                if has_values(vector):
+                    vectors[member_id] = vector
+        return vectors
+
     def _save_cluster(
         self,
         cursor,
@@ -523,34 +995,345 @@ Output ONLY valid JSON (no markdown):
         member_ids: List[int],
         synthesized_concept_id: int
     ) -> int:
-        """Save cluster record and members."""
+        """Save cluster record and members, with the members' mean as centroid."""
+        vectors = self._member_vectors(cursor, cluster_type, member_ids)
+        centroid = self._centroid(list(vectors.values()))
+
         # Insert cluster
         cursor.execute("""
             INSERT INTO synthesis_clusters
-            (cluster_type, member_count, synthesized_concept_id, status, synthesized_at)
-            VALUES (?, ?, ?, 'synthesized', ?)
-        """, (cluster_type, len(member_ids), synthesized_concept_id, datetime.now().isoformat()))
+            (cluster_type, centroid_embedding, member_count, synthesized_concept_id, status, synthesized_at)
+            VALUES (?, ?, ?, ?, 'synthesized', ?)
+        """, (
+            cluster_type,
+            encode_vector(centroid) if has_values(centroid) else None,
+            len(member_ids),
+            synthesized_concept_id,
+            datetime.now().isoformat()
+        ))
         cluster_id = cursor.lastrowid
 
         # Insert members
         for member_id in member_ids:
+            vector = vectors.get(member_id)
+            similarity = self._cosine_similarity(vector, centroid) if has_values(vector) and has_values(centroid) else None
             cursor.execute("""
                 INSERT INTO synthesis_cluster_members
-                (cluster_id, member_type, member_id)
-                VALUES (?, ?, ?)
-            """, (cluster_id, cluster_type, member_id))
+                (cluster_id, member_type, member_id, similarity_to_centroid)
+                VALUES (?, ?, ?, ?)
+            """, (cluster_id, cluster_type, member_id, similarity))
 
         return cluster_id
 
+    # =========================================================================
+    # Stage 1b/3b: INCREMENTAL (assign to existing clusters, re-synthesize)
+    # =========================================================================
+
+    def assign_to_existing_clusters(self, dry_run: bool = False) -> Dict[int, List[int]]:
+        """
+        Attach new concepts to already-synthesized concept clusters.
+
+        Every unclustered concept (same filter as find_similar_concepts) is
+        compared against the stored cluster centroids; it joins the most
+        similar cluster at or above SIMILARITY_THRESHOLD that still has room
+        (MAX_CLUSTER_SIZE). Clusters that gained members are marked 'pending'
+        with a recomputed centroid, for resynthesize_changed_clusters().
+        Concepts that fit no cluster are left for regular clustering.
+
+        Args:
+            dry_run: Compute assignments without writing them
+
+        Returns:
+            {cluster_id: [new member concept ids]}
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            self.logger.warning("numpy not installed. Skipping assignment to existing clusters.")
+            return {}
+
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        clusters = self._load_cluster_centroids(conn, dry_run=dry_run)
+        if not clusters:
+            return {}
+        dims = len(clusters[0][1])
+        clusters = [c for c in clusters if len(c[1]) == dims]
+        cluster_ids = [c[0] for c in clusters]
+        centroids = np.asarray([c[1] for c in clusters], dtype=np.float32)
+        capacity = [self.MAX_CLUSTER_SIZE - c[2] for c in clusters]
+
+        cursor.execute("""
+            SELECT c.id, e.vector
+            FROM concepts c
+            JOIN embeddings e ON c.id = e.concept_id
+            WHERE c.synthesized_at IS NULL
+              AND c.synthesis_cluster_id IS NULL
+            ORDER BY c.id, e.id
+        """)
+        concept_ids, vectors, seen = [], [], set()
+        for concept_id, blob in cursor.fetchall():
+            if concept_id in seen or blob is None or len(blob) != dims * 4:
+                continue
+            seen.add(concept_id)
+            concept_ids.append(concept_id)
+            vectors.append(decode_vector(blob))
+        if not concept_ids:
+            return {}
+
+        matrix = np.vstack(vectors)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+        # Centroids are fixed for this pass, so assignment follows concept id order only
+        from .clustering import BLOCK_ELEMENTS
+        assignments: Dict[int, List[int]] = {}
+        similarities: Dict[int, float] = {}
+        block_rows = max(1, BLOCK_ELEMENTS // len(cluster_ids))
+        for start in range(0, len(concept_ids), block_rows):
+            scores = matrix[start:start + block_rows] @ centroids.T
+            for row in np.flatnonzero(scores.max(axis=1) >= self.SIMILARITY_THRESHOLD):
+                row_scores = scores[row]
+                for col in np.argsort(-row_scores, kind='stable'):
+                    if row_scores[col] < self.SIMILARITY_THRESHOLD:
+                        break
+                    if capacity[col] > 0:
+                        capacity[col] -= 1
+                        concept_id = concept_ids[start + row]
+                        assignments.setdefault(cluster_ids[col], []).append(concept_id)
+                        similarities[concept_id] = float(row_scores[col])
+                        break
+
+        assigned = sum(len(ids) for ids in assignments.values())
+        self.logger.info(
+            f"Incremental: {assigned} of {len(concept_ids)} new concepts fit "
+            f"{len(assignments)} of {len(cluster_ids)} existing clusters"
+        )
+        if dry_run or not assignments:
+            return assignments
+
+        try:
+            for cluster_id, new_ids in assignments.items():
+                for concept_id in new_ids:
+                    cursor.execute("""
+                        INSERT INTO synthesis_cluster_members
+                        (cluster_id, member_type, member_id, similarity_to_centroid)
+                        VALUES (?, 'concept', ?, ?)
+                    """, (cluster_id, concept_id, similarities[concept_id]))
+                placeholders = ','.join('?' * len(new_ids))
+                cursor.execute(f"""
+                    UPDATE concepts SET synthesis_cluster_id = ?
+                    WHERE id IN ({placeholders})
+                """, [cluster_id] + new_ids)
+                self._refresh_cluster_centroid(cursor, cluster_id, status='pending')
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            self.logger.error(f"Failed to assign concepts to existing clusters: {e}")
+            return {}
+        return assignments
+
+    def _load_cluster_centroids(self, conn, dry_run: bool = False) -> List[Tuple[int, List[float], int]]:
+        """
+        (cluster_id, centroid, member_count) for synthesized concept clusters.
+
+        Clusters stored before centroids were persisted get theirs computed
+        from the members here, once (in memory only when dry_run).
+        """
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT id, centroid_embedding, member_count
+            FROM synthesis_clusters
+            WHERE cluster_type = 'concept'
+              AND status = 'synthesized'
+              AND synthesized_concept_id IS NOT NULL
+            ORDER BY id
+        """)
+        clusters = []
+        for cluster_id, blob, member_count in cursor.fetchall():
+            centroid = self._parse_embedding(blob)
+            if not has_values(centroid):
+                if dry_run:
+                    centroid, member_count = self._compute_cluster_centroid(cursor, cluster_id)
+                else:
+                    centroid = self._refresh_cluster_centroid(cursor, cluster_id)
+            if has_values(centroid):
+                clusters.append((cluster_id, centroid, member_count or 0))
+        if not dry_run:
+            conn.commit()
+        return clusters
+
+    def _compute_cluster_centroid(self, cursor, cluster_id: int) -> Tuple[Optional[List[float]], int]:
+        """(centroid, member_count) of a cluster from its members; no writes."""
+        cursor.execute("""
+            SELECT cluster_type FROM synthesis_clusters WHERE id = ?
+        """, (cluster_id,))
+        cluster_type = cursor.fetchone()[0]
+        cursor.execute("""
+            SELECT member_id FROM synthesis_cluster_members WHERE cluster_id = ?
+        """, (cluster_id,))
+        member_ids = [r[0] for r in cursor.fetchall()]
+
+        vectors = self._member_vectors(cursor, cluster_type, member_ids)
+        return self._centroid(list(vectors.values())), len(member_ids)
+
+    def _refresh_cluster_centroid(self, cursor, cluster_id: int,
+                                  status: Optional[str] = None) -> Optional[List[float]]:
+        """Recompute a cluster's centroid and member_count from its members and store them."""
+        centroid, member_count = self._compute_cluster_centroid(cursor, cluster_id)
+        cursor.execute("""
+            UPDATE synthesis_clusters
+            SET centroid_embedding = ?, member_count = ?, status = COALESCE(?, status)
+            WHERE id = ?
+        """, (
+            encode_vector(centroid) if has_values(centroid) else None,
+            member_count,
+            status,
+            cluster_id
+        ))
+        return centroid
+
+    def resynthesize_changed_clusters(self) -> int:
+        """
+        Re-run the LLM for synthesized clusters whose membership changed.
+
+        Clusters marked 'pending' by assign_to_existing_clusters() keep their
+        SynthesizedInsight concept; its content, provenance and embedding are
+        updated in place. Unchanged clusters cost nothing.
+
+        Returns:
+            Number of clusters re-synthesized
+        """
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT id, synthesized_concept_id, centroid_embedding
+            FROM synthesis_clusters
+            WHERE cluster_type = 'concept'
+              AND status = 'pending'
+              AND synthesized_concept_id IS NOT NULL
+            ORDER BY id
+        """)
+        changed = cursor.fetchall()
+
+        def clusters():
+            for cluster_id, concept_id, centroid in changed:
+                cursor.execute("""
+                    SELECT member_id FROM synthesis_cluster_members WHERE cluster_id = ? ORDER BY id
+                """, (cluster_id,))
+                member_ids = [r[0] for r in cursor.fetchall()]
+                yield concept_id, ClusterInfo(
+                    id=cluster_id,
+                    cluster_type='concept',
+                    member_ids=member_ids,
+                    member_count=len(member_ids),
+                    centroid=self._parse_embedding(centroid)
+                )
+
+        def apply(item, output) -> bool:
+            concept_id, cluster = item
+            result, embedding = output
+            return bool(result) and self._refresh_synthesis(cluster.id, concept_id, result, embedding)
+
+        refreshed = self._run_pool(clusters(), lambda item: self._synthesize_and_embed(item[1]), apply)
+
+        if changed:
+            self.logger.info(f"Re-synthesized {refreshed}/{len(changed)} changed clusters")
+        return refreshed
+
+    def _refresh_synthesis(
+        self,
+        cluster_id: int,
+        concept_id: int,
+        result: SynthesisResult,
+        embedding: Optional[List[float]] = None
+    ) -> bool:
+        """Overwrite a cluster's SynthesizedInsight with a new synthesis result."""
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+        content = f"[{result.title}] {result.content}"
+        now = datetime.now().isoformat()
+
+        try:
+            cursor.execute("""
+                UPDATE concepts
+                SET content = ?, synthesis_source_count = ?, synthesis_confidence = ?, synthesized_at = ?
+                WHERE id = ?
+            """, (content, len(result.source_ids), result.confidence, now, concept_id))
+            if self.db.has_concept_content_hash():
+                # Keep the hash in step with the new content (migration 012)
+                cursor.execute("UPDATE concepts SET content_hash = ? WHERE id = ?",
+                               (self.db.concept_content_hash(content), concept_id))
+
+            cursor.execute("""
+                SELECT source_id FROM synthesis_provenance
+                WHERE synthesized_concept_id = ? AND source_type = ?
+            """, (concept_id, result.source_type))
+            linked = {r[0] for r in cursor.fetchall()}
+            for source_id in result.source_ids:
+                if source_id not in linked:
+                    cursor.execute("""
+                        INSERT INTO synthesis_provenance
+                        (synthesized_concept_id, source_type, source_id)
+                        VALUES (?, ?, ?)
+                    """, (concept_id, result.source_type, source_id))
+
+            cursor.execute("""
+                UPDATE synthesis_clusters SET status = 'synthesized', synthesized_at = ?
+                WHERE id = ?
+            """, (now, cluster_id))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            self.logger.error(f"Failed to refresh synthesis for cluster {cluster_id}: {e}")
+            return False
+
+        self._embed_synthesis(conn, concept_id, content, replace=True, embedding=embedding)
+        self.logger.info(f"Refreshed synthesis: {result.title} (id={concept_id}, sources={len(result.source_ids)})")
+        return True
+
     # =========================================================================
     # Stage 4: CROSS-POLLINATION
     # =========================================================================
 
+    def _has_bridge_table(self) -> bool:
+        """True once migration 017 (synthesis_bridges) is applied; cached."""
+        if self._bridge_table is None:
+            cursor = self.db.get_connection().cursor()
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'synthesis_bridges'"
+            )
+            self._bridge_table = cursor.fetchone() is not None
+        return self._bridge_table
+
+    def _existing_bridges(self) -> Set[Tuple[int, int]]:
+        """
+        All bridged (concept_id, trace_id) pairs, loaded in one query.
+
+        Reads synthesis_bridges (migration 017); before that migration the
+        pairs are derived from 'cross' provenance rows, concept first.
+        """
+        cursor = self.db.get_connection().cursor()
+        if self._has_bridge_table():
+            cursor.execute("SELECT concept_id, trace_id FROM synthesis_bridges")
+        else:
+            cursor.execute("""
+                SELECT p1.source_id, p2.source_id
+                FROM synthesis_provenance p1
+                JOIN synthesis_provenance p2
+                  ON p1.synthesized_concept_id = p2.synthesized_concept_id
+                 AND p1.id < p2.id
+                WHERE p1.source_type = 'cross' AND p2.source_type = 'cross'
+            """)
+        return {(concept_id, trace_id) for concept_id, trace_id in cursor.fetchall()}
+
     def _bridge_exists(self, concept_id: int, trace_id: int) -> bool:
         """
         Check if a bridge insight already exists for this concept-trace pair.
 
         Idempotency guard to prevent duplicate bridge creation on repeated runs.
+        The pipeline uses _existing_bridges() instead of one query per pair.
 
         Args:
             concept_id: The concept ID
@@ -562,6 +1345,13 @@ Output ONLY valid JSON (no markdown):
         conn = self.db.get_connection()
         cursor = conn.cursor()
 
+        if self._has_bridge_table():
+            cursor.execute(
+                "SELECT 1 FROM synthesis_bridges WHERE concept_id = ? AND trace_id = ?",
+                (concept_id, trace_id)
+            )
+            return cursor.fetchone() is not None
+
         # Check if there's a synthesized concept with both this concept and trace as sources
         cursor.execute("""
             SELECT 1 FROM synthesis_provenance p1
@@ -592,8 +1382,16 @@ Output ONLY valid JSON (no markdown):
             trace_sample: Max traces to sample (0 = ALL)
 
         Returns:
-            List of (concept_id, trace_id, similarity) tuples
+            List of (concept_id, trace_id, similarity) tuples. The similarity
+            histogram of the run is left in self.last_overlap_stats.
         """
+        self.last_overlap_stats = None
+        if self.store is not None:
+            try:
+                return self._find_overlaps_with_store(limit, concept_sample, trace_sample)
+            except Exception as e:
+                self.logger.warning(f"Embedding store comparison failed, falling back to BLOB scan: {e}")
+
         conn = self.db.get_connection()
         cursor = conn.cursor()
 
@@ -624,6 +1422,11 @@ Output ONLY valid JSON (no markdown):
             self.logger.info("No concepts or traces available for cross-pollination")
             return []
 
+        try:
+            return self._find_overlaps_from_blobs(concepts, traces, limit)
+        except ImportError:
+            self.logger.warning("numpy not installed. Using pure-Python comparison loop.")
+
         # Find overlaps
         overlaps = []
         max_similarity = 0.0
@@ -651,12 +1454,12 @@ Output ONLY valid JSON (no markdown):
                     continue
 
                 comparisons += 1
-                similarity = self._cosine_similarity(concept_vec, trace_vec)
+                similarity = self._similarity(concept_vec, trace_vec)
                 max_similarity = max(max_similarity, similarity)
 
                 if similarity >= self.CROSS_POLLINATION_THRESHOLD:
                     overlaps.append((concept_id, trace_id, similarity))
-                elif similarity >= 0.65: # Log near misses
+                elif similarity >= self.NEAR_MISS_FLOOR: # Log near misses
                     near_misses.append((concept_id, trace_id, similarity))
 
                 # Progress logging (E2-011)
@@ -680,6 +1483,166 @@ Output ONLY valid JSON (no markdown):
         overlaps.sort(key=lambda x: x[2], reverse=True)
         return overlaps[:limit]
 
+    def _find_overlaps_with_store(
+        self,
+        limit: int,
+        concept_sample: int,
+        trace_sample: int
+    ) -> List[Tuple[int, int, float]]:
+        """
+        find_cross_type_overlaps against the shared EmbeddingStore.
+
+        Vectors are already decoded and normalized; the store matrices are
+        handed to _rank_overlaps without copying.
+        """
+        import numpy as np
+
+        self.store.refresh(self.db.get_connection(), segments=('concept', 'trace'))
+        concept_seg = self.store.segment('concept')
+        trace_seg = self.store.segment('trace')
+
+        concept_rows = np.flatnonzero(self.store.type_mask('concept', exclude=('SynthesizedInsight',)))
+        if concept_sample > 0:
+            concept_rows = concept_rows[:concept_sample]
+        trace_ids = trace_seg.ids
+        trace_matrix = trace_seg.matrix
+        if trace_sample > 0:
+            trace_ids = trace_ids[:trace_sample]
+            trace_matrix = trace_matrix[:trace_sample]
+
+        if len(concept_rows) == 0 or len(trace_ids) == 0:
+            self.logger.info("No concepts or traces available for cross-pollination")
+            return []
+        if concept_seg.dimensions != trace_seg.dimensions:
+            self.logger.warning(
+                f"Concept ({concept_seg.dimensions}d) and trace ({trace_seg.dimensions}d) "
+                f"embeddings differ in dimensions; no overlaps computed"
+            )
+            return []
+
+        return self._rank_overlaps(concept_seg.ids, concept_seg.matrix, trace_ids, trace_matrix,
+                                   limit, concept_rows=concept_rows)
+
+    def _find_overlaps_from_blobs(
+        self,
+        concepts: List[Tuple],
+        traces: List[Tuple],
+        limit: int
+    ) -> List[Tuple[int, int, float]]:
+        """
+        find_cross_type_overlaps for (id, BLOB) rows without an EmbeddingStore.
+
+        Each BLOB is decoded once into a normalized matrix. Rows that fail to
+        parse or differ from the first concept's dimensions are skipped (the
+        pure-Python loop scores them 0.0, below any threshold).
+
+        Raises:
+            ImportError: NumPy is not installed
+        """
+        import numpy as np
+
+        def decode(rows, dims):
+            ids, vectors = [], []
+            for row_id, blob in rows:
+                if blob is None or len(blob) % 4 or (dims is not None and len(blob) // 4 != dims):
+                    continue
+                ids.append(row_id)
+                vectors.append(decode_vector(blob))
+            if not vectors:
+                return np.zeros(0, dtype=np.int64), np.zeros((0, dims or 0), dtype=np.float32)
+            matrix = np.vstack(vectors)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            return np.asarray(ids), np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+        first = next((blob for _, blob in concepts if blob is not None and len(blob) % 4 == 0), None)
+        dims = len(first) // 4 if first is not None else None
+        concept_ids, concept_matrix = decode(concepts, dims)
+        trace_ids, trace_matrix = decode(traces, dims)
+
+        if len(concept_ids) == 0 or len(trace_ids) == 0:
+            self.logger.info("No concepts or traces available for cross-pollination")
+            return []
+
+        return self._rank_overlaps(concept_ids, concept_matrix, trace_ids, trace_matrix, limit)
+
+    def _rank_overlaps(
+        self,
+        concept_ids,
+        concept_matrix,
+        trace_ids,
+        trace_matrix,
+        limit: int,
+        concept_rows=None
+    ) -> List[Tuple[int, int, float]]:
+        """
+        Top `limit` concept/trace pairs via the blocked engine (clustering.top_pairs).
+
+        The trace matrix stays resident while concept blocks stream through it,
+        so memory does not grow with concepts x traces. The similarity histogram
+        and counts are kept in self.last_overlap_stats.
+        """
+        import time
+        from .clustering import HISTOGRAM_BINS, top_pairs
+
+        # Progress tracking (E2-011 Phase 1a)
+        concept_count = len(concept_ids) if concept_rows is None else len(concept_rows)
+        start_time = time.time()
+        last_progress_time = [start_time]
+        progress_interval = 10000  # Log every N comparisons
+        time_interval = 10  # Or every N seconds
+        logged = [0]
+
+        self.logger.info(f"Comparing {concept_count} concepts against {len(trace_ids)} traces (Threshold: {self.CROSS_POLLINATION_THRESHOLD})")
+
+        def progress(comparisons: int, total_comparisons: int) -> None:
+            current_time = time.time()
+            if comparisons // progress_interval > logged[0] // progress_interval or (current_time - last_progress_time[0]) >= time_interval:
+                elapsed = current_time - start_time
+                rate = comparisons / elapsed if elapsed > 0 else 0
+                pct = (comparisons / total_comparisons) * 100 if total_comparisons > 0 else 0
+                eta_sec = (total_comparisons - comparisons) / rate if rate > 0 else 0
+                self.logger.info(f"Progress: {comparisons}/{total_comparisons} ({pct:.1f}%) - {elapsed:.0f}s elapsed - {rate/1000:.1f}k/sec - ETA {eta_sec:.0f}s")
+                last_progress_time[0] = current_time
+                logged[0] = comparisons
+
+        ranked = top_pairs(
+            concept_matrix,
+            trace_matrix,
+            self.CROSS_POLLINATION_THRESHOLD,
+            limit,
+            left_rows=concept_rows,
+            near_floor=self.NEAR_MISS_FLOOR,
+            progress=progress,
+        )
+
+        width = 2.0 / HISTOGRAM_BINS
+        self.last_overlap_stats = OverlapStats(
+            comparisons=ranked['comparisons'],
+            above_threshold=ranked['above_threshold'],
+            max_similarity=ranked['max_similarity'] or 0.0,
+            histogram=[
+                (round(-1.0 + i * width, 2), round(-1.0 + (i + 1) * width, 2), int(count))
+                for i, count in enumerate(ranked['histogram'])
+            ],
+        )
+
+        # Log diagnostics
+        stats = self.last_overlap_stats
+        self.logger.info(
+            f"Cross-pollination stats: {stats.comparisons} comparisons, Max Sim: {stats.max_similarity:.4f}, "
+            f"{stats.above_threshold} pairs >= {self.CROSS_POLLINATION_THRESHOLD}"
+        )
+        self.logger.info("Similarity histogram: " + ", ".join(
+            f"[{low:.2f},{high:.2f}): {count}" for low, high, count in stats.histogram if count
+        ))
+        if not ranked['pairs'] and ranked['near_misses']:
+            self.logger.info(f"Top 3 near misses: {[f'{s:.4f}' for _, _, s in ranked['near_misses']]}")
+
+        return [
+            (int(concept_ids[row]), int(trace_ids[col]), score)
+            for row, col, score in ranked['pairs']
+        ]
+
     def create_bridge_insight(
         self,
         concept_id: int,
@@ -698,7 +1661,7 @@ Output ONLY valid JSON (no markdown):
         if self.extractor is None:
             return None
 
-        conn = self.db.get_connection()
+        conn = self.db.get_read_connection()
         cursor = conn.cursor()
 
         # Get concept
@@ -781,6 +1744,180 @@ Output ONLY valid JSON (no markdown):
     # ORCHESTRATION
     # =========================================================================
 
+    # =========================================================================
+    # Run checkpoints (migration 018)
+    # =========================================================================
+
+    def _has_run_table(self) -> bool:
+        """True once migration 018 (synthesis_runs) is applied; cached."""
+        if self._run_table is None:
+            cursor = self.db.get_connection().cursor()
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'synthesis_runs'"
+            )
+            self._run_table = cursor.fetchone() is not None
+        return self._run_table
+
+    def _start_run(self, options: Dict[str, Any], results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Record a new pipeline run.
+
+        Returns the in-memory run state; its 'id' is None when there is nothing
+        to checkpoint into (dry run, or migration 018 not applied).
+        """
+        run = {
+            'id': None, 'stage': 'cluster', 'results': results, 'stage_timings': {},
+            'synthesize_cursor': 0, 'cross_cursor': 0, 'cross_total': None,
+            'stage_started': time.monotonic(),
+        }
+        if options['dry_run'] or not self._has_run_table():
+            return run
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO synthesis_runs (options, results, stage_timings)
+            VALUES (?, ?, '{}')
+        """, (json.dumps(options), self._results_json(results)))
+        conn.commit()
+        run['id'] = cursor.lastrowid
+        self.logger.info(f"Synthesis run {run['id']} started")
+        return run
+
+    def _load_run(self, run_id: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Load an unfinished run for --resume.
+
+        Returns:
+            (options, run state)
+
+        Raises:
+            ValueError: Unknown or already completed run, or no run table
+        """
+        if not self._has_run_table():
+            raise ValueError("synthesis_runs table not found (apply migration 018)")
+        cursor = self.db.get_connection().cursor()
+        cursor.execute("""
+            SELECT status, stage, options, results, stage_timings,
+                   synthesize_cursor, cross_cursor, cross_total
+            FROM synthesis_runs WHERE id = ?
+        """, (run_id,))
+        row = cursor.fetchone()
+        if row is None:
+            raise ValueError(f"Synthesis run {run_id} not found")
+        if row[0] == 'completed':
+            raise ValueError(f"Synthesis run {run_id} already completed")
+
+        results = json.loads(row[3])
+        if results.get('overlap_stats'):
+            results['overlap_stats'] = OverlapStats(**results['overlap_stats'])
+        run = {
+            'id': run_id, 'stage': row[1], 'results': results,
+            'stage_timings': json.loads(row[4] or '{}'),
+            'synthesize_cursor': row[5], 'cross_cursor': row[6], 'cross_total': row[7],
+            'stage_started': time.monotonic(),
+        }
+        self.logger.info(f"Resuming synthesis run {run_id} at stage '{row[1]}'")
+        return json.loads(row[2]), run
+
+    @staticmethod
+    def _results_json(results: Dict[str, Any]) -> str:
+        stats = results.get('overlap_stats')
+        if stats is not None:
+            results = dict(results, overlap_stats=asdict(stats))
+        return json.dumps(results)
+
+    def _stage_timings(self, run: Dict[str, Any]) -> Dict[str, float]:
+        """Stored stage timings plus the time spent so far in the current stage."""
+        timings = dict(run['stage_timings'])
+        if run['stage'] == 'done':
+            return timings
+        elapsed = time.monotonic() - run['stage_started']
+        timings[run['stage']] = round(timings.get(run['stage'], 0.0) + elapsed, 3)
+        return timings
+
+    def _checkpoint_run(self, run: Dict[str, Any], commit: bool = True, **fields) -> None:
+        """
+        Persist run state: results, timings and the given cursor/status fields.
+
+        With commit=False the UPDATE joins the writer's open transaction, so it
+        commits (or rolls back) together with the store that follows.
+        """
+        run.update(fields)
+        if run['id'] is None:
+            return
+        fields['results'] = self._results_json(run['results'])
+        fields['stage_timings'] = json.dumps(self._stage_timings(run))
+        assignments = ', '.join(f"{column} = ?" for column in fields)
+        conn = self.db.get_connection()
+        conn.execute(
+            f"UPDATE synthesis_runs SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+            list(fields.values()) + [run['id']]
+        )
+        if commit:
+            conn.commit()
+
+    def _advance_run(self, run: Dict[str, Any], stage: str, **fields) -> None:
+        """Close the current stage's timing and move the run to `stage`."""
+        run['stage_timings'] = self._stage_timings(run)
+        run['stage_started'] = time.monotonic()
+        self._checkpoint_run(run, stage=stage, **fields)
+
+    def _save_run_items(self, run: Dict[str, Any], stage: str, payloads: List[Any]) -> None:
+        """Persist a stage's work items (clusters or pairs) in processing order."""
+        if run['id'] is None:
+            return
+        conn = self.db.get_connection()
+        conn.execute("DELETE FROM synthesis_run_items WHERE run_id = ? AND stage = ?", (run['id'], stage))
+        conn.executemany(
+            "INSERT INTO synthesis_run_items (run_id, stage, position, payload) VALUES (?, ?, ?, ?)",
+            [(run['id'], stage, position, json.dumps(payload)) for position, payload in enumerate(payloads)]
+        )
+        conn.commit()
+
+    def _load_run_items(self, run: Dict[str, Any], stage: str) -> List[Any]:
+        cursor = self.db.get_connection().cursor()
+        cursor.execute("""
+            SELECT payload FROM synthesis_run_items
+            WHERE run_id = ? AND stage = ?
+            ORDER BY position
+        """, (run['id'], stage))
+        return [json.loads(row[0]) for row in cursor.fetchall()]
+
+    def list_runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Recent pipeline runs, newest first, with per-stage timings and progress.
+
+        Returns an empty list before migration 018 is applied.
+        """
+        if not self._has_run_table():
+            return []
+        cursor = self.db.get_connection().cursor()
+        cursor.execute("""
+            SELECT id, status, stage, started_at, updated_at, finished_at, stage_timings,
+                   synthesize_cursor, synthesize_total, cross_cursor, cross_total, results
+            FROM synthesis_runs
+            ORDER BY id DESC
+            LIMIT ?
+        """, (limit,))
+        runs = []
+        for row in cursor.fetchall():
+            results = json.loads(row[11] or '{}')
+            runs.append({
+                'id': row[0],
+                'status': row[1],
+                'stage': row[2],
+                'started_at': row[3],
+                'updated_at': row[4],
+                'finished_at': row[5],
+                'stage_timings': json.loads(row[6] or '{}'),
+                'synthesize_progress': (row[7], row[8]),
+                'cross_progress': (row[9], row[10]),
+                'synthesized': results.get('synthesized', 0),
+                'bridge_insights': results.get('bridge_insights', 0),
+                'errors': len(results.get('errors', [])),
+            })
+        return runs
+
     def run_synthesis_pipeline(
         self,
         dry_run: bool = False,
@@ -791,11 +1928,18 @@ Output ONLY valid JSON (no markdown):
         cross_only: bool = False,
         max_bridges: int = 100,
         concept_sample: int = 0,
-        trace_sample: int = 0
+        trace_sample: int = 0,
+        cluster_mode: str = 'greedy',
+        incremental: bool = True,
+        resume_run_id: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Run full synthesis pipeline.
 
+        Each run is checkpointed in synthesis_runs (migration 018): the stage 1
+        clusters and stage 4 candidate pairs are persisted, and a cursor per
+        stage advances with every stored insight.
+
         Args:
             dry_run: If True, preview without database changes
             limit: Maximum items to process
@@ -806,91 +1950,237 @@ Output ONLY valid JSON (no markdown):
             max_bridges: Maximum bridge insights to create (default 100)
             concept_sample: Max concepts to sample for cross-pollination (0 = ALL)
             trace_sample: Max traces to sample for cross-pollination (0 = ALL)
+            cluster_mode: Concept clustering, 'greedy' (first `limit` concepts)
+                or 'graph' (kNN graph over all unsynthesized concepts)
+            incremental: Assign new concepts to existing clusters by centroid and
+                re-synthesize only clusters whose membership changed
+            resume_run_id: Continue an unfinished run after its last committed
+                cluster or bridge; the run's own options replace the ones above
 
         Returns:
-            Dict with pipeline results and statistics
-        """
-        results = {
-            'dry_run': dry_run,
-            'concept_clusters': 0,
-            'trace_clusters': 0,
-            'synthesized': 0,
-            'cross_pollination_pairs': 0,
-            'bridge_insights': 0,
-            'skipped_existing': 0,
-            'errors': []
-        }
-
-        # Skip stages 1-3 if cross_only
-        if not cross_only:
-            # Stage 1: Clustering
-            self.logger.info("Stage 1: Clustering...")
+            Dict with pipeline results and statistics ('run_id' when checkpointed)
 
-            concept_clusters = []
-            trace_clusters = []
-
-            if not traces_only:
-                concept_clusters = self.find_similar_concepts(limit)
-                results['concept_clusters'] = len(concept_clusters)
+        Raises:
+            ValueError: resume_run_id is unknown or already completed
+        """
+        if resume_run_id is not None:
+            options, run = self._load_run(resume_run_id)
+        else:
+            options = {
+                'dry_run': dry_run,
+                'limit': limit,
+                'concepts_only': concepts_only,
+                'traces_only': traces_only,
+                'skip_cross_pollinate': skip_cross_pollinate,
+                'cross_only': cross_only,
+                'max_bridges': max_bridges,
+                'concept_sample': concept_sample,
+                'trace_sample': trace_sample,
+                'cluster_mode': cluster_mode,
+                'incremental': incremental,
+            }
+            run = self._start_run(options, {
+                'dry_run': dry_run,
+                'concept_clusters': 0,
+                'trace_clusters': 0,
+                'synthesized': 0,
+                'assigned_to_existing': 0,
+                'resynthesized': 0,
+                'cross_pollination_pairs': 0,
+                'bridge_insights': 0,
+                'skipped_existing': 0,
+                'errors': []
+            })
 
-            if not concepts_only:
-                trace_clusters = self.find_similar_traces(min(limit, 100))
-                results['trace_clusters'] = len(trace_clusters)
+        try:
+            results = self._run_pipeline_stages(run, **options)
+        except BaseException as e:
+            status = 'interrupted' if isinstance(e, KeyboardInterrupt) else 'failed'
+            try:
+                self.db.get_connection().rollback()
+                self.llm_cache.flush()  # Keep the responses already paid for
+                self._checkpoint_run(run, status=status)
+            except Exception as checkpoint_err:
+                self.logger.error(f"Failed to checkpoint synthesis run: {checkpoint_err}")
+            if run['id'] is not None:
+                self.logger.error(f"Synthesis run {run['id']} {status}; resume with --resume {run['id']}")
+            raise
+
+        if run['id'] is not None:
+            results['run_id'] = run['id']
+        return results
 
-            if dry_run:
-                self.logger.info(f"[DRY RUN] Would process {len(concept_clusters)} concept clusters")
-                self.logger.info(f"[DRY RUN] Would process {len(trace_clusters)} trace clusters")
-                return results
+    def _run_pipeline_stages(
+        self,
+        run: Dict[str, Any],
+        dry_run: bool,
+        limit: int,
+        concepts_only: bool,
+        traces_only: bool,
+        skip_cross_pollinate: bool,
+        cross_only: bool,
+        max_bridges: int,
+        concept_sample: int,
+        trace_sample: int,
+        cluster_mode: str,
+        incremental: bool
+    ) -> Dict[str, Any]:
+        """Run the pipeline stages from run['stage'] on, checkpointing as they go."""
+        results = run['results']
+        all_clusters = None
+        overlaps = None
+
+        # Stage 1: Clustering (skipped if cross_only)
+        if run['stage'] == 'cluster':
+            all_clusters = []
+            if not cross_only:
+                self.logger.info("Stage 1: Clustering...")
+
+                concept_clusters = []
+                trace_clusters = []
+
+                if not traces_only:
+                    if incremental:
+                        assigned = self.assign_to_existing_clusters(dry_run=dry_run)
+                        results['assigned_to_existing'] = sum(len(ids) for ids in assigned.values())
+                    concept_clusters = self.find_similar_concepts(limit, mode=cluster_mode)
+                    results['concept_clusters'] = len(concept_clusters)
+
+                if not concepts_only:
+                    trace_clusters = self.find_similar_traces(min(limit, 100))
+                    results['trace_clusters'] = len(trace_clusters)
+
+                if dry_run:
+                    self.logger.info(f"[DRY RUN] Would process {len(concept_clusters)} concept clusters")
+                    self.logger.info(f"[DRY RUN] Would process {len(trace_clusters)} trace clusters")
+                    return results
+
+                all_clusters = concept_clusters + trace_clusters
+                self._save_run_items(run, 'synthesize', [
+                    {'id': c.id, 'type': c.cluster_type, 'members': c.member_ids} for c in all_clusters
+                ])
+            self._advance_run(run, 'synthesize', synthesize_total=len(all_clusters))
+
+        # Stage 2 & 3: Synthesize and Store
+        if run['stage'] == 'synthesize':
+            if all_clusters is None:
+                all_clusters = [
+                    ClusterInfo(id=item['id'], cluster_type=item['type'],
+                                member_ids=item['members'], member_count=len(item['members']))
+                    for item in self._load_run_items(run, 'synthesize')
+                ]
+            start = run['synthesize_cursor']
+            if all_clusters[start:]:
+                self.logger.info(
+                    f"Stage 2-3: Synthesizing and storing ({len(all_clusters) - start} of {len(all_clusters)} clusters)..."
+                )
 
-            # Stage 2 & 3: Synthesize and Store
-            self.logger.info("Stage 2-3: Synthesizing and storing...")
+            # LLM + embedding calls run on the worker pool; this thread stores.
+            # The cursor UPDATE rides in store_synthesis's transaction, then is
+            # re-applied so it also lands when nothing was stored.
+            def store_cluster(item, output) -> bool:
+                position, cluster = item
+                synthesis_result, embedding = output
+                stored = False
+                if synthesis_result:
+                    results['synthesized'] += 1
+                    self._checkpoint_run(run, commit=False, synthesize_cursor=position + 1)
+                    stored = bool(self.store_synthesis(synthesis_result, embedding))
+                    if not stored:
+                        results['synthesized'] -= 1
+                self._checkpoint_run(run, synthesize_cursor=position + 1)
+                return stored
+
+            def cluster_failed(item, e) -> None:
+                results['errors'].append(str(e))
+                self.logger.error(f"Cluster synthesis failed: {e}")
+                self._checkpoint_run(run, synthesize_cursor=item[0] + 1)
+
+            self._run_pool(
+                ((position, all_clusters[position]) for position in range(start, len(all_clusters))),
+                lambda item: self._synthesize_and_embed(item[1]),
+                store_cluster,
+                on_error=cluster_failed
+            )
+            self._advance_run(run, 'resynthesize')
 
-            all_clusters = concept_clusters + trace_clusters
-            for cluster in all_clusters:
+        # Stage 3b: Re-synthesize existing clusters that gained members
+        # (resumable as is: a cluster stays 'pending' until it is refreshed)
+        if run['stage'] == 'resynthesize':
+            if incremental and not traces_only and not cross_only:
                 try:
-                    synthesis_result = self.synthesize_cluster(cluster)
-                    if synthesis_result:
-                        concept_id = self.store_synthesis(synthesis_result)
-                        if concept_id:
-                            results['synthesized'] += 1
+                    results['resynthesized'] += self.resynthesize_changed_clusters()
                 except Exception as e:
                     results['errors'].append(str(e))
-                    self.logger.error(f"Cluster synthesis failed: {e}")
+                    self.logger.error(f"Cluster re-synthesis failed: {e}")
+            self._advance_run(run, 'cross')
 
         # Stage 4: Cross-pollination
-        if not skip_cross_pollinate:
-            self.logger.info("Stage 4: Cross-pollinating...")
-            try:
-                overlaps = self.find_cross_type_overlaps(
-                    limit=max_bridges * 10,  # Get more overlaps than needed to filter
-                    concept_sample=concept_sample,
-                    trace_sample=trace_sample
-                )
-                results['cross_pollination_pairs'] = len(overlaps)
-
-                bridges_created = 0
-                for i, (concept_id, trace_id, similarity) in enumerate(overlaps):
-                    if bridges_created >= max_bridges:
-                        break
-
-                    # Idempotency check - skip if bridge already exists
-                    if self._bridge_exists(concept_id, trace_id):
-                        results['skipped_existing'] += 1
-                        continue
-
-                    bridge = self.create_bridge_insight(concept_id, trace_id)
-                    if bridge:
-                        bridge_id = self.store_synthesis(bridge)
-                        if bridge_id:
-                            bridges_created += 1
+        if run['stage'] == 'cross':
+            if not skip_cross_pollinate:
+                self.logger.info("Stage 4: Cross-pollinating...")
+                try:
+                    if run['cross_total'] is None:
+                        overlaps = self.find_cross_type_overlaps(
+                            limit=max_bridges * 10,  # Get more overlaps than needed to filter
+                            concept_sample=concept_sample,
+                            trace_sample=trace_sample
+                        )
+                        results['cross_pollination_pairs'] = len(overlaps)
+                        if self.last_overlap_stats is not None:
+                            results['overlap_stats'] = self.last_overlap_stats
+                        self._save_run_items(run, 'cross', [list(pair) for pair in overlaps])
+                        self._checkpoint_run(run, cross_total=len(overlaps))
+                    else:
+                        overlaps = self._load_run_items(run, 'cross')
+
+                    existing = self._existing_bridges()
+
+                    def new_pairs():
+                        for position in range(run['cross_cursor'], len(overlaps)):
+                            concept_id, trace_id, similarity = overlaps[position]
+                            # Idempotency check - skip if bridge already exists
+                            if (concept_id, trace_id) in existing:
+                                results['skipped_existing'] += 1
+                                continue
+                            yield position, (concept_id, trace_id)
+
+                    def make_bridge(item):
+                        bridge = self.create_bridge_insight(*item[1])
+                        if bridge is None:
+                            return None, None
+                        return bridge, self._embed_text(f"[{bridge.title}] {bridge.content}")
+
+                    def store_bridge(item, output) -> bool:
+                        position, pair = item
+                        bridge, embedding = output
+                        stored = False
+                        if bridge:
                             results['bridge_insights'] += 1
+                            self._checkpoint_run(run, commit=False, cross_cursor=position + 1)
+                            stored = bool(self.store_synthesis(bridge, embedding))
+                            if not stored:
+                                results['bridge_insights'] -= 1
+                        self._checkpoint_run(run, cross_cursor=position + 1)
+                        if not stored:
+                            return False
+
+                        # Progress logging every 100 bridges
+                        if results['bridge_insights'] % 100 == 0:
+                            self.logger.info(f"Progress: {results['bridge_insights']}/{max_bridges} bridges created")
+                        return True
+
+                    remaining = max_bridges - results['bridge_insights']
+                    if remaining > 0:
+                        self._run_pool(new_pairs(), make_bridge, store_bridge, limit=remaining)
 
-                            # Progress logging every 100 bridges
-                            if bridges_created % 100 == 0:
-                                self.logger.info(f"Progress: {bridges_created}/{max_bridges} bridges created")
+                except Exception as e:
+                    results['errors'].append(f"Cross-pollination: {e}")
+            self._advance_run(run, 'done')
 
-            except Exception as e:
-                results['errors'].append(f"Cross-pollination: {e}")
+        self.llm_cache.flush()
+        results['llm_cache'] = self.llm_cache.stats()
+        self._checkpoint_run(run, status='completed', finished_at=datetime.now().isoformat())
 
         self.logger.info(f"Synthesis complete: {results['synthesized']} synthesized, {results['bridge_insights']} bridges")
         if results['skipped_existing'] > 0:
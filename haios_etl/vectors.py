@@ -0,0 +1,116 @@
+# generated: 2026-10-18
+# System Auto: last updated on: 2026-10-18 18:02:44
+"""
+Embedding BLOB codec shared by every read and write path.
+
+Embeddings are stored as packed native float32 (the layout sqlite-vec expects).
+Decoding with struct.unpack built a Python float object per dimension (768 per
+row).
+
+    - decode_vector(): np.frombuffer view over the BLOB (no copy, read-only);
+      without NumPy an array('f') (one C copy, no per-float objects)
+    - encode_vector(): ndarray / array('f') dumped with tobytes(); lists
+      keep struct.pack, still the fastest encoder for a list of floats
+    - dot() / cosine_similarity(): vectorized when either side is an ndarray,
+      accumulated in float64 like the pure-Python sums they replace
+    - normalize_vector(): one vectorized pass (norm in float64), returning
+      a float32 ndarray that encode_vector() dumps without conversion
+
+Decoded vectors are sequences, not lists: test them with has_values(), since
+an ndarray has no truth value.
+"""
+
+import math
+import struct
+from array import array
+from typing import Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # Optional: fall back to array('f')
+    np = None
+
+FLOAT32_BYTES = 4
+
+
+def decode_vector(blob: Optional[bytes]) -> Optional[Sequence[float]]:
+    """
+    float32 vector over an embedding BLOB.
+
+    Returns:
+        Read-only ndarray view (NumPy) or array('f'); None for a NULL blob
+
+    Raises:
+        ValueError: blob length is not a multiple of 4 bytes
+    """
+    if blob is None:
+        return None
+    if len(blob) % FLOAT32_BYTES:
+        raise ValueError(f"Embedding blob of {len(blob)} bytes is not packed float32")
+    if np is not None:
+        return np.frombuffer(blob, dtype=np.float32)
+    vector = array('f')
+    vector.frombytes(blob)
+    return vector
+
+
+def encode_vector(vector: Sequence[float]) -> bytes:
+    """
+    Pack a vector as a float32 BLOB.
+
+    ndarrays and array('f') are dumped as is (tobytes, no per-value work).
+    Plain lists go through struct.pack: measured at 768 dims it is ~2x faster
+    than converting the list to an ndarray or array('f') first.
+    """
+    if np is not None and isinstance(vector, np.ndarray):
+        return vector.astype(np.float32, copy=False).tobytes()
+    if isinstance(vector, array) and vector.typecode == 'f':
+        return vector.tobytes()
+    return struct.pack(f'{len(vector)}f', *vector)
+
+
+def normalize_vector(vector: Sequence[float]) -> Sequence[float]:
+    """
+    Scale a vector to unit L2 norm (zero vectors are returned unchanged).
+
+    Embeddings are stored normalized (migration 014), so cosine similarity on
+    stored vectors is a plain dot product.
+
+    Returns:
+        float32 ndarray (NumPy), else a list of floats
+    """
+    if np is not None:
+        values = np.asarray(vector, dtype=np.float64)
+        norm = math.sqrt(float(np.dot(values, values)))
+        if norm == 0:
+            return values.astype(np.float32)
+        return (values / norm).astype(np.float32)
+    norm = math.sqrt(sum(x * x for x in vector))
+    if norm == 0:
+        return list(vector)
+    return [x / norm for x in vector]
+
+
+def has_values(vector: Optional[Sequence[float]]) -> bool:
+    """True for a non-empty vector (safe for ndarrays, unlike `if vector:`)."""
+    return vector is not None and len(vector) > 0
+
+
+def dot(a: Sequence[float], b: Sequence[float]) -> float:
+    """Dot product; 0.0 when the dimensions differ."""
+    if len(a) != len(b):
+        return 0.0
+    if np is not None and (isinstance(a, np.ndarray) or isinstance(b, np.ndarray)):
+        return float(np.dot(np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)))
+    return sum(x * y for x, y in zip(a, b))
+
+
+def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    """Cosine similarity; 0.0 for mismatched dimensions or a zero vector."""
+    if len(a) != len(b):
+        return 0.0
+    norm_a = math.sqrt(dot(a, a))
+    norm_b = math.sqrt(dot(b, b))
+    if norm_a == 0 or norm_b == 0:
+        return 0.0
+    return dot(a, b) / (norm_a * norm_b)
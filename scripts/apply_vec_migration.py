@@ -0,0 +1,65 @@
+# generated: 2026-10-18
+# System Auto: last updated on: 2026-10-18 09:14:02
+"""
+Apply a migration that needs the sqlite-vec extension (vec0 virtual tables).
+
+scripts/apply_migration.py opens a bare sqlite3 connection, so any migration that
+creates or touches vec0 tables fails there with "no such module: vec0". This script
+opens the database through DatabaseManager, which loads sqlite-vec on connect.
+
+Usage:
+    python scripts/apply_vec_migration.py haios_etl/migrations/010_add_embeddings_vec.sql
+"""
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from haios_etl.database import DatabaseManager
+
+DB_PATH = "haios_memory.db"
+
+
+def apply_migration():
+    if len(sys.argv) < 2:
+        print("Usage: python scripts/apply_vec_migration.py <migration_file>")
+        sys.exit(1)
+
+    migration_file = sys.argv[1]
+
+    if not os.path.exists(DB_PATH):
+        print(f"Error: Database {DB_PATH} not found.")
+        sys.exit(1)
+
+    if not os.path.exists(migration_file):
+        print(f"Error: Migration file {migration_file} not found.")
+        sys.exit(1)
+
+    db = DatabaseManager(DB_PATH)
+    conn = db.get_connection()
+
+    try:
+        version = conn.execute("SELECT vec_version()").fetchone()[0]
+        print(f"sqlite-vec loaded: {version}")
+    except Exception as e:
+        print(f"Error: sqlite-vec is not available ({e}). Install with: pip install sqlite-vec")
+        sys.exit(1)
+
+    print(f"Applying migration: {migration_file}...")
+
+    try:
+        with open(migration_file, "r", encoding="utf-8") as f:
+            sql_script = f.read()
+
+        conn.executescript(sql_script)
+        conn.commit()
+        print("Migration applied successfully.")
+
+    except Exception as e:
+        print(f"Migration failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    apply_migration()
@@ -0,0 +1,90 @@
+# generated: 2026-10-18
+# System Auto: last updated on: 2026-10-18 12:14:51
+"""
+Backfill concepts.content_hash (migration 012).
+
+DatabaseManager.insert_concept / ingest_extraction look concepts up by
+(type, content_hash) through a unique index. Rows written before migration 012,
+or by writers that insert concepts directly (synthesis, refinement), have a NULL
+hash and are invisible to that lookup until this script hashes them.
+
+For each (type, content) group only the lowest id is hashed; duplicates keep a
+NULL hash so the unique index is never violated. Safe to re-run.
+
+Usage:
+    python scripts/backfill_concept_hashes.py [--db PATH] [--batch-size N] [--dry-run]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from haios_etl.database import DatabaseManager
+
+
+def backfill(db_path: str, batch_size: int, dry_run: bool) -> int:
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(concepts)")}
+    if "content_hash" not in columns:
+        print("Error: concepts.content_hash missing. Apply migration 012 first:")
+        print("  python scripts/apply_migration.py haios_etl/migrations/012_add_concept_content_hash.sql")
+        sys.exit(1)
+
+    # Hashes already taken, so a NULL row whose twin is hashed stays NULL
+    taken = set(cursor.execute(
+        "SELECT type, content_hash FROM concepts WHERE content_hash IS NOT NULL"
+    ).fetchall())
+
+    cursor.execute("SELECT id, type, content FROM concepts WHERE content_hash IS NULL ORDER BY id")
+    updates = []
+    duplicates = 0
+    for concept_id, concept_type, content in cursor.fetchall():
+        key = (concept_type, DatabaseManager.concept_content_hash(content))
+        if key in taken:
+            duplicates += 1
+            continue
+        taken.add(key)
+        updates.append((key[1], concept_id))
+
+    print(f"Concepts to hash: {len(updates)} (duplicates left NULL: {duplicates})")
+    if dry_run:
+        print("[DRY RUN] No changes made.")
+        return len(updates)
+
+    start = time.time()
+    for i in range(0, len(updates), batch_size):
+        batch = updates[i:i + batch_size]
+        cursor.executemany("UPDATE concepts SET content_hash = ? WHERE id = ?", batch)
+        conn.commit()
+        print(f"  {min(i + batch_size, len(updates))}/{len(updates)} hashed")
+
+    conn.close()
+    print(f"Done in {time.time() - start:.1f}s")
+    return len(updates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill concepts.content_hash (migration 012)")
+    parser.add_argument("--db", default=os.getenv("DB_PATH", "haios_memory.db"), help="Database path")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per commit")
+    parser.add_argument("--dry-run", action="store_true", help="Report counts without writing")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Error: Database {args.db} not found.")
+        sys.exit(1)
+
+    backfill(args.db, args.batch_size, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
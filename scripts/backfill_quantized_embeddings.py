@@ -0,0 +1,112 @@
+# generated: 2026-10-18
+# System Auto: last updated on: 2026-10-18 13:31:05
+"""
+Backfill embeddings.vector_int8 / vector_int8_scale / vector_binary (migration 013).
+
+DatabaseManager writes the codes for new embeddings once migration 013 is
+applied. Rows written before that (or by scripts that insert into embeddings
+directly) have NULL codes; quantized EmbeddingStores then have to read the
+float32 BLOB and quantize on every load. This script fills them in.
+
+Only rows with NULL codes are touched. Safe to re-run.
+
+Usage:
+    python scripts/backfill_quantized_embeddings.py [--db PATH] [--batch-size N] [--dry-run]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from haios_etl.quantization import quantize_binary, quantize_int8
+
+
+def backfill(db_path: str, batch_size: int, dry_run: bool) -> int:
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(embeddings)")}
+    if not {"vector_int8", "vector_int8_scale", "vector_binary"} <= columns:
+        print("Error: quantized columns missing. Apply migration 013 first:")
+        print("  python scripts/apply_migration.py haios_etl/migrations/013_add_quantized_embeddings.sql")
+        sys.exit(1)
+
+    pending = cursor.execute(
+        "SELECT COUNT(*) FROM embeddings WHERE vector_int8 IS NULL OR vector_binary IS NULL"
+    ).fetchone()[0]
+    print(f"Embeddings to quantize: {pending}")
+    if dry_run:
+        print("[DRY RUN] No changes made.")
+        return pending
+
+    start = time.time()
+    done = 0
+    skipped = 0
+    last_id = 0
+    while True:
+        rows = cursor.execute("""
+            SELECT id, vector, dimensions FROM embeddings
+            WHERE id > ? AND (vector_int8 IS NULL OR vector_binary IS NULL)
+            ORDER BY id LIMIT ?
+        """, (last_id, batch_size)).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        # Quantize each dimension group as one matrix
+        by_dims = {}
+        for embedding_id, blob, dims in rows:
+            if blob is None or len(blob) != dims * 4:
+                skipped += 1
+                continue
+            by_dims.setdefault(dims, []).append((embedding_id, blob))
+
+        updates = []
+        for dims, group in by_dims.items():
+            matrix = np.frombuffer(b"".join(blob for _, blob in group), dtype=np.float32)
+            matrix = matrix.reshape(len(group), dims)
+            int8_codes, scales = quantize_int8(matrix)
+            bits = quantize_binary(matrix)
+            for i, (embedding_id, _) in enumerate(group):
+                updates.append((int8_codes[i].tobytes(), float(scales[i]), bits[i].tobytes(), embedding_id))
+
+        cursor.executemany("""
+            UPDATE embeddings SET vector_int8 = ?, vector_int8_scale = ?, vector_binary = ?
+            WHERE id = ?
+        """, updates)
+        conn.commit()
+        done += len(updates)
+        print(f"  {done}/{pending} quantized")
+
+    conn.close()
+    if skipped:
+        print(f"Skipped {skipped} rows whose BLOB size does not match `dimensions`")
+    print(f"Done in {time.time() - start:.1f}s")
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill quantized embedding codes (migration 013)")
+    parser.add_argument("--db", default=os.getenv("DB_PATH", "haios_memory.db"), help="Database path")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per commit")
+    parser.add_argument("--dry-run", action="store_true", help="Report counts without writing")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Error: Database {args.db} not found.")
+        sys.exit(1)
+
+    backfill(args.db, args.batch_size, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
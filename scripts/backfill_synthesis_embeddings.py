@@ -12,15 +12,13 @@ Usage:
 
 Options:
     --dry-run       Show what would be done without making changes
-    --batch-size N  Number of concepts to process per batch (default: 50)
+    --batch-size N  Concepts per embedding request (default: 50)
 """
 
 import os
 import sys
-import struct
 import logging
 import argparse
-import time
 from pathlib import Path
 
 # Add project root to path
@@ -31,8 +29,10 @@ sys.path.insert(0, str(project_root))
 from dotenv import load_dotenv
 load_dotenv(project_root / '.env')
 
-from haios_etl.database import DatabaseManager
+from haios_etl.database import DatabaseManager, normalize_vector
 from haios_etl.extraction import ExtractionManager
+from haios_etl.llm_gateway import configure_gateway
+from haios_etl.vectors import encode_vector
 
 logging.basicConfig(
     level=logging.INFO,
@@ -77,7 +77,7 @@ def backfill_embeddings(
     Args:
         db_path: Path to the SQLite database
         api_key: Google API key for embedding generation
-        batch_size: Number of concepts per batch
+        batch_size: Number of concepts per embedding request
         dry_run: If True, don't make changes
 
     Returns:
@@ -111,6 +111,8 @@ def backfill_embeddings(
         return stats
 
     # Initialize extractor
+    # One batch request every 2s, paced by the LLM gateway
+    configure_gateway(requests_per_minute=30)
     extractor = ExtractionManager(api_key)
     db = DatabaseManager(db_path)
     conn = db.get_connection()
@@ -124,41 +126,41 @@ def backfill_embeddings(
 
         logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch)} concepts)")
 
-        for concept_id, content in batch:
+        # One embedding request per batch; failed items come back as None
+        try:
+            embeddings = extractor.embed_batch([content[:8000] for _, content in batch], batch_size=batch_size)
+        except Exception as e:
+            logger.error(f"Failed to embed batch {batch_num}: {e}")
+            embeddings = [None] * len(batch)
+
+        for (concept_id, content), embedding in zip(batch, embeddings):
             stats['processed'] += 1
 
+            if not embedding:
+                logger.warning(f"No embedding returned for concept {concept_id}")
+                stats['failed'] += 1
+                continue
+
             try:
-                # Generate embedding
-                embedding = extractor.embed_content(content[:8000])
-
-                if embedding:
-                    # Store embedding
-                    cursor.execute("""
-                        INSERT INTO embeddings (concept_id, vector, model, dimensions)
-                        VALUES (?, ?, ?, ?)
-                    """, (
-                        concept_id,
-                        struct.pack(f'{len(embedding)}f', *embedding),
-                        "gemini-embedding-001",
-                        len(embedding)
-                    ))
-                    conn.commit()
-                    stats['success'] += 1
-
-                    if stats['success'] % 10 == 0:
-                        logger.info(f"Progress: {stats['success']}/{stats['total_unembedded']} embedded")
-                else:
-                    logger.warning(f"No embedding returned for concept {concept_id}")
-                    stats['failed'] += 1
+                embedding = normalize_vector(embedding)
+                # Store embedding
+                cursor.execute("""
+                    INSERT INTO embeddings (concept_id, vector, model, dimensions)
+                    VALUES (?, ?, ?, ?)
+                """, (
+                    concept_id,
+                    encode_vector(embedding),
+                    "gemini-embedding-001",
+                    len(embedding)
+                ))
+                stats['success'] += 1
 
             except Exception as e:
-                logger.error(f"Failed to embed concept {concept_id}: {e}")
+                logger.error(f"Failed to store embedding for concept {concept_id}: {e}")
                 stats['failed'] += 1
 
-        # Rate limit between batches
-        if i + batch_size < len(concepts):
-            logger.info("Waiting 2s between batches (rate limiting)...")
-            time.sleep(2)
+        conn.commit()
+        logger.info(f"Progress: {stats['success']}/{stats['total_unembedded']} embedded")
 
     logger.info(f"\nBackfill complete:")
     logger.info(f"  Total unembedded: {stats['total_unembedded']}")
@@ -182,7 +184,7 @@ def main():
         '--batch-size',
         type=int,
         default=50,
-        help='Number of concepts to process per batch (default: 50)'
+        help='Concepts per embedding request (default: 50)'
     )
     parser.add_argument(
         '--db-path',
@@ -0,0 +1,100 @@
+# generated: 2026-10-18
+# System Auto: last updated on: 2026-10-18 13:42:37
+"""
+Recall and latency of quantized embedding search against the exact float32 path.
+
+Loads the concept segment three ways (float32, int8, binary) and runs the same
+queries through each. Queries are stored concept vectors with a little noise, so
+no API calls are needed. Recall@k is the fraction of the exact top-k that the
+quantized two-stage search (coarse pass + float32 rerank) also returns.
+
+Usage:
+    python scripts/benchmark_quantized_recall.py [--db PATH] [--queries N] [--k K]
+                                                 [--candidates N] [--noise SIGMA]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from haios_etl.embedding_store import EmbeddingStore
+
+
+def _segment_bytes(store: EmbeddingStore) -> int:
+    seg = store.segment('concept')
+    if store.quantization:
+        return seg.codes.nbytes + seg.scales.nbytes
+    return seg.matrix.nbytes
+
+
+def run(db_path: str, queries: int, k: int, candidates: int, noise: float, seed: int):
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    rng = np.random.default_rng(seed)
+
+    stores = {"float32": EmbeddingStore()}
+    for mode in ("int8", "binary"):
+        stores[mode] = EmbeddingStore(mode, rerank_candidates=candidates)
+
+    for name, store in stores.items():
+        start = time.time()
+        store.refresh(conn, segments=('concept',))
+        seg = store.segment('concept')
+        print(f"{name:>8}: loaded {seg.size} rows in {time.time() - start:.2f}s, "
+              f"{_segment_bytes(store) / 1e6:.1f} MB")
+
+    exact_store = stores["float32"]
+    exact_seg = exact_store.segment('concept')
+    if exact_seg.size == 0:
+        print("No concept embeddings found.")
+        return
+
+    picks = rng.choice(exact_seg.size, size=min(queries, exact_seg.size), replace=False)
+    query_vectors = exact_seg.matrix[picks] + rng.normal(0, noise, (len(picks), exact_seg.dimensions))
+
+    print(f"\n{len(picks)} queries, k={k}, rerank candidates={candidates}")
+    print(f"{'store':>8} {'recall@k':>9} {'ms/query':>9}")
+    exact_results = []
+    for name, store in stores.items():
+        recalls = []
+        start = time.time()
+        for i, query in enumerate(query_vectors):
+            hits = store.top_k('concept', query, k, conn=conn)
+            ids = {owner_id for owner_id, _ in hits}
+            if name == "float32":
+                exact_results.append(ids)
+            recalls.append(len(ids & exact_results[i]) / max(len(exact_results[i]), 1))
+        elapsed_ms = (time.time() - start) * 1000 / len(query_vectors)
+        print(f"{name:>8} {np.mean(recalls):>9.3f} {elapsed_ms:>9.2f}")
+
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark quantized embedding search recall")
+    parser.add_argument("--db", default=os.getenv("DB_PATH", "haios_memory.db"), help="Database path")
+    parser.add_argument("--queries", type=int, default=200, help="Number of sample queries")
+    parser.add_argument("--k", type=int, default=10, help="Results per query")
+    parser.add_argument("--candidates", type=int, default=EmbeddingStore.RERANK_CANDIDATES,
+                        help="Coarse hits reranked exactly")
+    parser.add_argument("--noise", type=float, default=0.01, help="Gaussian noise added to queries")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Error: Database {args.db} not found.")
+        sys.exit(1)
+
+    run(args.db, args.queries, args.k, args.candidates, args.noise, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,7 @@ Generates embeddings for concepts that don't have them yet.
 Uses a lower threshold (10 chars) to catch short but meaningful concepts.
 
 Usage:
-    python scripts/complete_concept_embeddings.py [--limit N] [--dry-run]
+    python scripts/complete_concept_embeddings.py [--limit N] [--batch-size N] [--dry-run]
 """
 
 import sys
@@ -19,15 +19,17 @@ import logging
 sys.path.insert(0, os.getcwd())
 
 from dotenv import load_dotenv
-from haios_etl.database import DatabaseManager
-from haios_etl.extraction import ExtractionManager
+from haios_etl.database import DatabaseManager, normalize_vector
+from haios_etl.extraction import ExtractionManager, EMBED_BATCH_LIMIT
+from haios_etl.llm_gateway import configure_gateway
+from haios_etl.vectors import encode_vector
 
 load_dotenv()
 
 EMBEDDING_MODEL = "gemini-embedding-001"
 MIN_CONTENT_LENGTH = 10  # Skip obvious junk but keep short meaningful concepts
-RATE_LIMIT_DELAY = 0.5  # Slower rate to avoid quota issues
-BATCH_LOG_INTERVAL = 50
+REQUESTS_PER_MINUTE = 120  # Batch requests through the LLM gateway, to avoid quota issues
+MAX_ERRORS = 10
 
 
 def get_concepts_without_embeddings(db: DatabaseManager, limit: int = None):
@@ -56,9 +58,10 @@ def get_concepts_without_embeddings(db: DatabaseManager, limit: int = None):
 def generate_concept_embeddings(
     db_path: str = "haios_memory.db",
     limit: int = None,
-    dry_run: bool = False
+    dry_run: bool = False,
+    batch_size: int = EMBED_BATCH_LIMIT
 ):
-    """Generate embeddings for concepts without them."""
+    """Generate embeddings for concepts without them, batch_size texts per request."""
 
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
@@ -66,6 +69,7 @@ def generate_concept_embeddings(
         sys.exit(1)
 
     db = DatabaseManager(db_path)
+    configure_gateway(requests_per_minute=REQUESTS_PER_MINUTE)
     extractor = ExtractionManager(api_key=api_key)
 
     concepts = get_concepts_without_embeddings(db, limit)
@@ -86,7 +90,7 @@ def generate_concept_embeddings(
             print(f"  ... and {total - 15} more")
         return
 
-    print(f"\nGenerating embeddings (rate: {1/RATE_LIMIT_DELAY:.1f} req/sec)...")
+    print(f"\nGenerating embeddings ({batch_size} per request, {REQUESTS_PER_MINUTE / 60:.1f} req/sec)...")
     print("-" * 60)
 
     success_count = 0
@@ -96,14 +100,20 @@ def generate_concept_embeddings(
     conn = db.get_connection()
     cursor = conn.cursor()
 
-    for i, (concept_id, ctype, content) in enumerate(concepts, 1):
-        try:
-            # Generate embedding
-            embedding = extractor.embed_content(content)
+    for start in range(0, total, batch_size):
+        batch = concepts[start:start + batch_size]
+        embeddings = extractor.embed_batch([content for _, _, content in batch], batch_size=batch_size)
+
+        for (concept_id, ctype, content), embedding in zip(batch, embeddings):
+            if not embedding:
+                logging.error(f"Embedding failed for concept {concept_id}")
+                error_count += 1
+                continue
+
+            embedding = normalize_vector(embedding)
 
             # Serialize vector (sqlite-vec expects float32 bytes)
-            import struct
-            vector_bytes = struct.pack(f'{len(embedding)}f', *embedding)
+            vector_bytes = encode_vector(embedding)
 
             # Store in database
             cursor.execute(
@@ -111,29 +121,20 @@ def generate_concept_embeddings(
                    VALUES (?, ?, ?, ?, datetime('now'))""",
                 (concept_id, vector_bytes, EMBEDDING_MODEL, len(embedding))
             )
-
             success_count += 1
 
-            # Commit periodically
-            if success_count % 10 == 0:
-                conn.commit()
-
-            # Progress logging
-            if i % BATCH_LOG_INTERVAL == 0 or i == total:
-                elapsed = time.time() - start_time
-                rate = success_count / elapsed if elapsed > 0 else 0
-                print(f"  [{i}/{total}] {success_count} success, {error_count} errors ({rate:.2f}/sec)")
-
-            time.sleep(RATE_LIMIT_DELAY)
+        # Commit per batch
+        conn.commit()
 
-        except Exception as e:
-            logging.error(f"Embedding failed for concept {concept_id}: {e}")
-            error_count += 1
-            if error_count > 10:
-                print("Too many errors, stopping.")
-                break
+        # Progress logging
+        done = min(start + batch_size, total)
+        elapsed = time.time() - start_time
+        rate = success_count / elapsed if elapsed > 0 else 0
+        print(f"  [{done}/{total}] {success_count} success, {error_count} errors ({rate:.2f}/sec)")
 
-    conn.commit()
+        if error_count > MAX_ERRORS:
+            print("Too many errors, stopping.")
+            break
 
     elapsed = time.time() - start_time
     print("-" * 60)
@@ -147,6 +148,8 @@ def generate_concept_embeddings(
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Complete missing concept embeddings")
     parser.add_argument("--limit", type=int, help="Process at most N concepts")
+    parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_LIMIT,
+                        help=f"Texts per embedding request (default: {EMBED_BATCH_LIMIT})")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be processed")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose logging")
 
@@ -155,4 +158,4 @@ if __name__ == "__main__":
     log_level = logging.DEBUG if args.verbose else logging.WARNING
     logging.basicConfig(level=log_level, format="%(levelname)s: %(message)s")
 
-    generate_concept_embeddings(limit=args.limit, dry_run=args.dry_run)
+    generate_concept_embeddings(limit=args.limit, dry_run=args.dry_run, batch_size=args.batch_size)
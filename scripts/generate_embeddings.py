@@ -10,8 +10,9 @@ Usage:
     python scripts/generate_embeddings.py [--limit N] [--dry-run]
 
 Options:
-    --limit N    Process at most N artifacts (default: all)
-    --dry-run    Show what would be processed without making API calls
+    --limit N         Process at most N artifacts (default: all)
+    --batch-size N    Texts per embedding request (default: 100)
+    --dry-run         Show what would be processed without making API calls
 """
 
 import sys
@@ -25,7 +26,8 @@ sys.path.insert(0, os.getcwd())
 
 from dotenv import load_dotenv
 from haios_etl.database import DatabaseManager
-from haios_etl.extraction import ExtractionManager, ExtractionError
+from haios_etl.extraction import ExtractionManager, EMBED_BATCH_LIMIT
+from haios_etl.llm_gateway import configure_gateway
 from haios_etl.processing import read_file_safely
 
 # Load environment variables
@@ -34,8 +36,7 @@ load_dotenv()
 # Configuration
 EMBEDDING_MODEL = "gemini-embedding-001"
 EMBEDDING_DIMENSIONS = 768
-RATE_LIMIT_DELAY = 0.1  # seconds between requests (10 req/sec)
-BATCH_LOG_INTERVAL = 10  # Log progress every N artifacts
+REQUESTS_PER_MINUTE = 600  # batch requests through the LLM gateway (10 req/sec)
 
 
 def get_artifacts_without_embeddings(db: DatabaseManager, limit: int = None):
@@ -73,9 +74,10 @@ def truncate_for_embedding(text: str, max_chars: int = 25000) -> str:
 def generate_embeddings(
     db_path: str = "haios_memory.db",
     limit: int = None,
-    dry_run: bool = False
+    dry_run: bool = False,
+    batch_size: int = EMBED_BATCH_LIMIT
 ):
-    """Generate embeddings for artifacts without them."""
+    """Generate embeddings for artifacts without them, batch_size texts per request."""
 
     # Setup
     api_key = os.getenv("GOOGLE_API_KEY")
@@ -84,6 +86,7 @@ def generate_embeddings(
         sys.exit(1)
 
     db = DatabaseManager(db_path)
+    configure_gateway(requests_per_minute=REQUESTS_PER_MINUTE)
     extractor = ExtractionManager(api_key=api_key)
 
     # Get artifacts to process
@@ -105,7 +108,7 @@ def generate_embeddings(
         return
 
     # Process
-    print(f"\nGenerating embeddings (rate: {1/RATE_LIMIT_DELAY:.1f} req/sec)...")
+    print(f"\nGenerating embeddings ({batch_size} per request, {REQUESTS_PER_MINUTE / 60:.1f} req/sec)...")
     print("-" * 60)
 
     success_count = 0
@@ -113,9 +116,11 @@ def generate_embeddings(
     skip_count = 0
     start_time = time.time()
 
-    for i, (artifact_id, file_path) in enumerate(artifacts, 1):
-        try:
-            # Read file content
+    for start in range(0, total, batch_size):
+        # Read and filter this batch's files
+        batch_ids = []
+        batch_texts = []
+        for artifact_id, file_path in artifacts[start:start + batch_size]:
             content = read_file_safely(file_path)
 
             if content is None:
@@ -128,39 +133,38 @@ def generate_embeddings(
                 skip_count += 1
                 continue
 
-            # Truncate if needed
-            content = truncate_for_embedding(content)
+            batch_ids.append(artifact_id)
+            batch_texts.append(truncate_for_embedding(content))
 
-            # Generate embedding
-            embedding = extractor.embed_content(content)
+        if not batch_ids:
+            continue
 
-            # Store in database
-            db.insert_embedding(
-                artifact_id=artifact_id,
-                vector=embedding,
-                model=EMBEDDING_MODEL,
-                dimensions=len(embedding)
-            )
+        # Generate embeddings (one request per batch; failed items come back as None)
+        embeddings = extractor.embed_batch(batch_texts, batch_size=batch_size)
 
-            success_count += 1
-
-            # Progress logging
-            if i % BATCH_LOG_INTERVAL == 0 or i == total:
-                elapsed = time.time() - start_time
-                rate = success_count / elapsed if elapsed > 0 else 0
-                print(f"  [{i}/{total}] {success_count} success, {error_count} errors, {skip_count} skipped ({rate:.1f}/sec)")
-
-            # Rate limiting
-            time.sleep(RATE_LIMIT_DELAY)
-
-        except ExtractionError as e:
-            logging.error(f"Embedding failed for {artifact_id}: {e}")
-            error_count += 1
-            # Continue with next artifact
-
-        except Exception as e:
-            logging.error(f"Unexpected error for {artifact_id}: {e}")
-            error_count += 1
+        for artifact_id, embedding in zip(batch_ids, embeddings):
+            if not embedding:
+                logging.error(f"Embedding failed for {artifact_id}")
+                error_count += 1
+                continue
+            try:
+                # Store in database
+                db.insert_embedding(
+                    artifact_id=artifact_id,
+                    vector=embedding,
+                    model=EMBEDDING_MODEL,
+                    dimensions=len(embedding)
+                )
+                success_count += 1
+            except Exception as e:
+                logging.error(f"Unexpected error for {artifact_id}: {e}")
+                error_count += 1
+
+        # Progress logging
+        done = min(start + batch_size, total)
+        elapsed = time.time() - start_time
+        rate = success_count / elapsed if elapsed > 0 else 0
+        print(f"  [{done}/{total}] {success_count} success, {error_count} errors, {skip_count} skipped ({rate:.1f}/sec)")
 
     # Summary
     elapsed = time.time() - start_time
@@ -169,12 +173,15 @@ def generate_embeddings(
     print(f"  Success: {success_count}")
     print(f"  Errors:  {error_count}")
     print(f"  Skipped: {skip_count}")
-    print(f"  Rate:    {success_count/elapsed:.2f} embeddings/sec")
+    if elapsed > 0:
+        print(f"  Rate:    {success_count/elapsed:.2f} embeddings/sec")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Generate embeddings for HAIOS artifacts")
     parser.add_argument("--limit", type=int, help="Process at most N artifacts")
+    parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_LIMIT,
+                        help=f"Texts per embedding request (default: {EMBED_BATCH_LIMIT})")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be processed")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose logging")
 
@@ -189,5 +196,6 @@ if __name__ == "__main__":
 
     generate_embeddings(
         limit=args.limit,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        batch_size=args.batch_size
     )
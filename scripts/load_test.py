@@ -1,5 +1,5 @@
 # generated: 2026-02-08
-# System Auto: last updated on: 2026-02-08T23:31:55
+# System Auto: last updated on: 2026-10-18T12:41:07
 import time
 import random
 import concurrent.futures
@@ -22,12 +22,7 @@ class MockExtractionManager(ExtractionManager):
         # Return random 768-dim vector (simulating gemini-embedding-001)
         return [random.random() for _ in range(768)]
 
-def run_query(db_path, query_id):
-    # Create fresh instances per thread/request to avoid SQLite threading issues
-    db = DatabaseManager(db_path)
-    extractor = MockExtractionManager()
-    service = ReasoningAwareRetrieval(db, extractor)
-    
+def run_query(service, query_id):
     start = time.time()
     try:
         # We use a simple query
@@ -45,6 +40,12 @@ def load_test(concurrency=10, total_requests=100):
         return
     
     print(f"Starting load test: {total_requests} requests, concurrency {concurrency}")
+
+    # One shared manager: each worker thread gets its own read-only connection,
+    # writes go through the locked writer connection (no per-request reconnect
+    # or sqlite-vec reload)
+    db = DatabaseManager(db_path)
+    service = ReasoningAwareRetrieval(db, MockExtractionManager())
     
     times = []
     errors = 0
@@ -52,7 +53,7 @@ def load_test(concurrency=10, total_requests=100):
     start_total = time.time()
     
     with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
-        futures = [executor.submit(run_query, db_path, i) for i in range(total_requests)]
+        futures = [executor.submit(run_query, service, i) for i in range(total_requests)]
         
         for future in concurrent.futures.as_completed(futures):
             duration, status = future.result()
@@ -64,6 +65,7 @@ def load_test(concurrency=10, total_requests=100):
                     print(f"Error: {status}")
 
     total_time = time.time() - start_total
+    db.close()
     
     if not times:
         print("No requests completed.")
@@ -0,0 +1,147 @@
+# generated: 2026-10-18
+# System Auto: last updated on: 2026-10-18 14:25:48
+"""
+L2-normalize stored vectors and set the embeddings_normalized flag (migration 014).
+
+New vectors are normalized at write time. This rewrites older rows in
+embeddings.vector and reasoning_traces.query_embedding, recomputes the
+migration 013 codes for rewritten embeddings, and finally sets
+memory_settings.embeddings_normalized = '1' so readers switch to dot product /
+L2 distance. Rows that are already unit length are not touched.
+
+Connects through DatabaseManager so sqlite-vec is loaded: rewriting a vector
+fires the vec0 sync triggers from migrations 010/011. Safe to re-run.
+
+Usage:
+    python scripts/normalize_embeddings.py [--db PATH] [--batch-size N] [--dry-run]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from haios_etl.database import DatabaseManager
+from haios_etl.quantization import quantize_binary, quantize_int8
+
+# |norm - 1| below this counts as already normalized (float32 rounding)
+NORM_TOLERANCE = 1e-4
+
+# (table, vector column, label)
+TARGETS = [
+    ("embeddings", "vector", "embeddings"),
+    ("reasoning_traces", "query_embedding", "reasoning trace embeddings"),
+]
+
+
+def _normalize_table(conn, table, column, batch_size, dry_run, write_codes):
+    """Normalize one table's vectors in id-ordered batches. Returns (rewritten, skipped)."""
+    rewritten = 0
+    skipped = 0
+    last_id = 0
+    while True:
+        rows = conn.execute(f"""
+            SELECT id, {column} FROM {table}
+            WHERE id > ? AND {column} IS NOT NULL
+            ORDER BY id LIMIT ?
+        """, (last_id, batch_size)).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        updates = []
+        for row_id, blob in rows:
+            if len(blob) % 4:
+                skipped += 1
+                continue
+            vector = np.frombuffer(blob, dtype=np.float32)
+            norm = float(np.linalg.norm(vector))
+            if norm == 0 or abs(norm - 1.0) <= NORM_TOLERANCE:
+                continue
+            updates.append((row_id, (vector / norm).astype(np.float32)))
+
+        rewritten += len(updates)
+        if dry_run or not updates:
+            continue
+
+        conn.executemany(
+            f"UPDATE {table} SET {column} = ? WHERE id = ?",
+            [(vector.tobytes(), row_id) for row_id, vector in updates]
+        )
+        if write_codes:
+            # The 013 trigger cleared the old codes; write codes for the new vectors
+            code_rows = []
+            for row_id, vector in updates:
+                int8_codes, scales = quantize_int8(vector)
+                code_rows.append((int8_codes[0].tobytes(), float(scales[0]),
+                                  quantize_binary(vector)[0].tobytes(), row_id))
+            conn.executemany("""
+                UPDATE embeddings SET vector_int8 = ?, vector_int8_scale = ?, vector_binary = ?
+                WHERE id = ?
+            """, code_rows)
+        conn.commit()
+        print(f"  {table}: {rewritten} normalized (through id {last_id})")
+
+    return rewritten, skipped
+
+
+def normalize(db_path: str, batch_size: int, dry_run: bool) -> int:
+    db = DatabaseManager(db_path)
+    conn = db.get_connection()
+
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    if "memory_settings" not in tables:
+        print("Error: memory_settings missing. Apply migration 014 first:")
+        print("  python scripts/apply_migration.py haios_etl/migrations/014_add_memory_settings.sql")
+        sys.exit(1)
+
+    start = time.time()
+    total = 0
+    total_skipped = 0
+    for table, column, label in TARGETS:
+        write_codes = table == "embeddings" and db.has_quantized_embeddings()
+        rewritten, skipped = _normalize_table(conn, table, column, batch_size, dry_run, write_codes)
+        print(f"{label}: {rewritten} to normalize" + (f", {skipped} malformed" if skipped else ""))
+        total += rewritten
+        total_skipped += skipped
+
+    if dry_run:
+        print("[DRY RUN] No changes made.")
+    elif total_skipped:
+        print("Malformed vectors found; embeddings_normalized flag NOT set.")
+    else:
+        conn.execute("""
+            INSERT INTO memory_settings (key, value) VALUES (?, '1')
+            ON CONFLICT(key) DO UPDATE SET value = '1', updated_at = CURRENT_TIMESTAMP
+        """, (DatabaseManager.EMBEDDINGS_NORMALIZED_KEY,))
+        conn.commit()
+        print(f"Set {DatabaseManager.EMBEDDINGS_NORMALIZED_KEY} = 1")
+
+    db.close()
+    print(f"Done in {time.time() - start:.1f}s")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="L2-normalize stored embeddings (migration 014)")
+    parser.add_argument("--db", default=os.getenv("DB_PATH", "haios_memory.db"), help="Database path")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per commit")
+    parser.add_argument("--dry-run", action="store_true", help="Report counts without writing")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Error: Database {args.db} not found.")
+        sys.exit(1)
+
+    normalize(args.db, args.batch_size, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ import sqlite3
 sys.path.append(os.getcwd())
 
 from haios_etl.database import DatabaseManager
+from haios_etl.vectors import encode_vector
 
 def verify_space_id():
     db_path = "haios_memory.db"
@@ -45,9 +46,8 @@ def verify_space_id():
     cursor.execute("SELECT vector FROM embeddings WHERE artifact_id = ?", (artifact_id,))
     if not cursor.fetchone():
         # Insert dummy embedding
-        import struct
         vector = [0.1] * 768
-        vector_bytes = struct.pack(f'{len(vector)}f', *vector)
+        vector_bytes = encode_vector(vector)
         cursor.execute("INSERT INTO embeddings (artifact_id, vector, model, dimensions) VALUES (?, ?, ?, ?)", 
                        (artifact_id, vector_bytes, 'test-model', 768))
         conn.commit()
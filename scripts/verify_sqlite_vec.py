@@ -7,6 +7,7 @@ import logging
 sys.path.append(os.getcwd())
 
 from haios_etl.database import DatabaseManager
+from haios_etl.vectors import encode_vector
 
 def verify_sqlite_vec():
     logging.basicConfig(level=logging.INFO)
@@ -28,13 +29,12 @@ def verify_sqlite_vec():
     # 2. Test vector distance function
     try:
         # Create dummy vectors
-        import struct
         v1 = [1.0, 0.0, 0.0]
         v2 = [0.0, 1.0, 0.0]
         
         # Serialize
-        b1 = struct.pack(f'{len(v1)}f', *v1)
-        b2 = struct.pack(f'{len(v2)}f', *v2)
+        b1 = encode_vector(v1)
+        b2 = encode_vector(v2)
         
         cursor.execute("SELECT vec_distance_cosine(?, ?)", (b1, b2))
         dist = cursor.fetchone()[0]
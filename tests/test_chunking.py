@@ -0,0 +1,70 @@
+# generated: 2026-10-18
+# System Auto: last updated on: 2026-10-18 20:21:07
+"""
+Tests for overlap chunking of large documents (haios_etl/chunking.py).
+"""
+import pytest
+
+from haios_etl.chunking import boundaries, chunk_text
+
+
+def _session(turns, words=30):
+    speakers = ["User", "Gemini"]
+    return "".join(
+        f"{speakers[i % 2]}: turn {i} " + " ".join(f"w{i}-{j}" for j in range(words)) + "\n\n"
+        for i in range(turns)
+    )
+
+
+def test_short_text_is_one_chunk():
+    assert chunk_text("User: hello", max_chars=100) == ["User: hello"]
+
+
+def test_boundaries_find_speakers_and_headings():
+    text = "intro\nUser: a\n**Claude:** b\n## Plan\nnote: not a speaker\n"
+
+    assert boundaries(text) == [text.index("User:"), text.index("**Claude"), text.index("## Plan")]
+
+
+def test_chunks_respect_size_and_cover_everything():
+    text = _session(60)
+    chunks = chunk_text(text, max_chars=1000, overlap=200)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+    for i in range(60):
+        assert any(f"turn {i} " in chunk for chunk in chunks)
+    assert chunks[0] == text[:len(chunks[0])]
+    assert text.endswith(chunks[-1])
+
+
+def test_chunks_split_on_speaker_turns():
+    text = _session(60)
+    chunks = chunk_text(text, max_chars=1000, overlap=0)
+
+    # Without overlap every chunk starts at a turn and they tile the text
+    assert all(chunk.startswith(("User:", "Gemini:")) for chunk in chunks)
+    assert "".join(chunks) == text
+
+
+def test_overlap_repeats_previous_lines():
+    text = "".join(f"line {i:03d}\n" for i in range(300))
+    chunks = chunk_text(text, max_chars=500, overlap=100)
+
+    for previous, chunk in zip(chunks, chunks[1:]):
+        first_line = chunk.split("\n", 1)[0] + "\n"
+        assert first_line in previous  # Starts inside the previous chunk
+        assert chunk.startswith("line ")  # ... at a line start
+
+
+def test_oversized_line_is_hard_cut():
+    text = "x" * 2500
+    chunks = chunk_text(text, max_chars=1000, overlap=100)
+
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+    assert text.endswith(chunks[-1])
+
+
+def test_overlap_must_be_smaller_than_chunk():
+    with pytest.raises(ValueError):
+        chunk_text("a" * 200, max_chars=100, overlap=100)
@@ -174,6 +174,208 @@ def test_duplicate_occurrence_prevention(db_manager):
     assert count == 1, f"Expected 1 concept occurrence, found {count}"
 
 
+# =============================================================================
+# BULK INGEST TESTS (ingest_extraction - one transaction per file)
+# =============================================================================
+
+def _extraction_result():
+    from haios_etl.extraction import ExtractionResult, Entity, Concept
+    return ExtractionResult(
+        entities=[Entity("User", "Ruben"), Entity("Agent", "Gemini"), Entity("User", "Ruben")],
+        concepts=[Concept("Directive", "Do X"), Concept("Decision", "Use Y", "ADR-001")]
+    )
+
+
+def test_ingest_extraction_writes_everything(db_manager):
+    """Artifact, entities, concepts, occurrences, metrics and status in one call."""
+    artifact_id = db_manager.ingest_extraction("test/bulk.md", "hash1", _extraction_result(), 0.5, 42)
+
+    cursor = db_manager.get_connection().cursor()
+    assert cursor.execute("SELECT COUNT(*) FROM entities").fetchone()[0] == 2
+    assert cursor.execute("SELECT COUNT(*) FROM concepts").fetchone()[0] == 2
+    assert cursor.execute(
+        "SELECT COUNT(*) FROM entity_occurrences WHERE artifact_id = ?", (artifact_id,)
+    ).fetchone()[0] == 2
+    assert cursor.execute(
+        "SELECT COUNT(*) FROM concept_occurrences WHERE artifact_id = ?", (artifact_id,)
+    ).fetchone()[0] == 2
+    assert cursor.execute(
+        "SELECT entities_extracted, concepts_extracted, llm_tokens_used FROM quality_metrics WHERE artifact_id = ?",
+        (artifact_id,)
+    ).fetchone() == (3, 2, 42)
+    assert db_manager.get_processing_status("test/bulk.md") == "success"
+    assert db_manager.get_artifact_hash("test/bulk.md") == "hash1"
+    assert not db_manager.get_connection().in_transaction
+
+
+def test_ingest_extraction_reuses_existing_rows(db_manager):
+    """Existing entities/concepts are linked, not duplicated."""
+    entity_id = db_manager.insert_entity("User", "Ruben")
+    concept_id = db_manager.insert_concept("Directive", "Do X", None)
+
+    artifact_id = db_manager.ingest_extraction("test/reuse.md", "hash1", _extraction_result(), 0.1)
+
+    cursor = db_manager.get_connection().cursor()
+    assert cursor.execute("SELECT COUNT(*) FROM entities").fetchone()[0] == 2
+    assert cursor.execute("SELECT COUNT(*) FROM concepts").fetchone()[0] == 2
+    assert cursor.execute(
+        "SELECT 1 FROM entity_occurrences WHERE entity_id = ? AND artifact_id = ?", (entity_id, artifact_id)
+    ).fetchone()
+    assert cursor.execute(
+        "SELECT 1 FROM concept_occurrences WHERE concept_id = ? AND artifact_id = ?", (concept_id, artifact_id)
+    ).fetchone()
+
+
+def test_ingest_extraction_rolls_back_on_error(db_manager):
+    """A failure mid-ingest leaves no partial rows behind."""
+    from haios_etl.extraction import ExtractionResult, Entity
+    bad_result = ExtractionResult(entities=[Entity("User", None)], concepts=[])
+
+    with pytest.raises(sqlite3.IntegrityError):
+        db_manager.ingest_extraction("test/bad.md", "hash1", bad_result, 0.1)
+
+    cursor = db_manager.get_connection().cursor()
+    assert cursor.execute("SELECT COUNT(*) FROM artifacts").fetchone()[0] == 0
+    assert db_manager.get_processing_status("test/bad.md") is None
+
+
+# =============================================================================
+# EXTRACTION CACHE TESTS (migration 020)
+# =============================================================================
+
+def test_ingest_extraction_caches_result_by_content_hash(db_manager):
+    """A fresh extraction is cached under (file hash, prompt version)."""
+    from haios_etl.extraction import ExtractionResult
+    db_manager.ingest_extraction("a/log.md", "hash1", _extraction_result(), 0.5, prompt_version="v1")
+
+    cached = db_manager.get_cached_extraction("hash1", "v1")
+    assert ExtractionResult.from_json(cached) == _extraction_result()
+    assert db_manager.get_cached_extraction("hash1", "v2") is None  # Prompt changed
+    assert db_manager.get_cached_extraction("hash2", "v1") is None
+
+
+def test_ingest_extraction_records_cache_hit(db_manager):
+    """A cached result at a new path counts a hit and flags its quality_metrics row."""
+    db_manager.ingest_extraction("a/log.md", "hash1", _extraction_result(), 0.5, prompt_version="v1")
+    copy_id = db_manager.ingest_extraction(
+        "b/log-copy.md", "hash1", _extraction_result(), 0.01, prompt_version="v1", cache_hit=True
+    )
+
+    cursor = db_manager.get_connection().cursor()
+    assert cursor.execute(
+        "SELECT cache_hit FROM quality_metrics WHERE artifact_id = ?", (copy_id,)
+    ).fetchone()[0] == 1
+    assert cursor.execute("SELECT SUM(cache_hit), COUNT(*) FROM quality_metrics").fetchone() == (1, 2)
+    assert cursor.execute("SELECT hit_count FROM extraction_cache").fetchall() == [(1,)]
+
+
+def test_extraction_cache_absent_before_migration_020(db_manager):
+    """Without the table/column, ingest still works and lookups miss."""
+    conn = db_manager.get_connection()
+    conn.execute("DROP TABLE extraction_cache")
+    conn.execute("ALTER TABLE quality_metrics DROP COLUMN cache_hit")
+    db_manager._extraction_cache_supported = None
+
+    db_manager.ingest_extraction("a/log.md", "hash1", _extraction_result(), 0.5, prompt_version="v1")
+
+    assert not db_manager.has_extraction_cache()
+    assert db_manager.get_cached_extraction("hash1", "v1") is None
+    assert db_manager.get_processing_status("a/log.md") == "success"
+
+
+# =============================================================================
+# ID INTERNING TESTS (LRU caches + concepts.content_hash, migration 012)
+# =============================================================================
+
+def _count_statements(db_manager, action):
+    """Run action() and return the SQL statements it sent to SQLite."""
+    statements = []
+    conn = db_manager.get_connection()
+    conn.set_trace_callback(statements.append)
+    try:
+        action()
+    finally:
+        conn.set_trace_callback(None)
+    return statements
+
+
+def test_insert_entity_repeat_is_interned(db_manager):
+    """Second lookup of the same entity never reaches SQLite."""
+    entity_id = db_manager.insert_entity("User", "Ruben")
+    statements = _count_statements(db_manager, lambda: db_manager.insert_entity("User", "Ruben"))
+    assert statements == []
+    assert db_manager.insert_entity("User", "Ruben") == entity_id
+
+
+def test_insert_concept_sets_content_hash(db_manager):
+    """New concepts carry SHA256(content) and dedupe through the hash index."""
+    import hashlib
+    concept_id = db_manager.insert_concept("Decision", "Use SQLite", "ADR-001")
+
+    cursor = db_manager.get_connection().cursor()
+    cursor.execute("SELECT content_hash FROM concepts WHERE id = ?", (concept_id,))
+    assert cursor.fetchone()[0] == hashlib.sha256(b"Use SQLite").hexdigest()
+
+    db_manager.clear_intern_cache()
+    statements = _count_statements(
+        db_manager, lambda: db_manager.insert_concept("Decision", "Use SQLite", "ADR-001")
+    )
+    assert any("content_hash" in sql for sql in statements)
+    assert not any("content = " in sql for sql in statements)
+    assert cursor.execute("SELECT COUNT(*) FROM concepts").fetchone()[0] == 1
+
+
+def test_insert_concept_row_sets_hash_and_is_reused(db_manager):
+    """Concepts inserted outside ingestion are found by the hash lookup."""
+    import hashlib
+    cursor = db_manager.get_connection().cursor()
+    concept_id, inserted = db_manager.insert_concept_row(
+        cursor, "Episteme", "Shared knowledge", "virtual:episteme", synthesis_confidence=0.5
+    )
+    db_manager.get_connection().commit()
+
+    assert inserted
+    assert cursor.execute("SELECT content_hash, synthesis_confidence FROM concepts WHERE id = ?",
+                          (concept_id,)).fetchone() == (hashlib.sha256(b"Shared knowledge").hexdigest(), 0.5)
+    assert db_manager.insert_concept_row(cursor, "Episteme", "Shared knowledge") == (concept_id, False)
+    assert db_manager.insert_concept("Episteme", "Shared knowledge", "ADR-002") == concept_id
+
+
+def test_insert_concept_without_hash_column_falls_back():
+    """Pre-migration-012 databases still dedupe on (type, content)."""
+    manager = DatabaseManager(":memory:")
+    manager.get_connection().execute(
+        "CREATE TABLE concepts (id INTEGER PRIMARY KEY AUTOINCREMENT, type TEXT NOT NULL, "
+        "content TEXT NOT NULL, source_adr TEXT)"
+    )
+    id1 = manager.insert_concept("Decision", "Use SQLite", None)
+    manager.clear_intern_cache()
+    id2 = manager.insert_concept("Decision", "Use SQLite", None)
+    assert id1 == id2
+    assert manager.has_concept_content_hash() is False
+
+
+def test_intern_cache_is_bounded(db_manager):
+    """Least recently used entries are evicted past the size limit."""
+    db_manager.ENTITY_CACHE_SIZE = 2
+    db_manager.insert_entity("User", "a")
+    db_manager.insert_entity("User", "b")
+    db_manager.insert_entity("User", "a")  # a becomes most recent
+    db_manager.insert_entity("User", "c")
+    assert list(db_manager._entity_ids) == [("User", "a"), ("User", "c")]
+
+
+def test_rolled_back_ingest_is_not_interned(db_manager):
+    """IDs from a failed ingest_extraction transaction are not cached."""
+    from haios_etl.extraction import ExtractionResult, Entity
+    bad_result = ExtractionResult(entities=[Entity("User", "Ruben"), Entity("User", None)], concepts=[])
+
+    with pytest.raises(sqlite3.IntegrityError):
+        db_manager.ingest_extraction("test/bad.md", "hash1", bad_result, 0.1)
+
+    assert ("User", "Ruben") not in db_manager._entity_ids
+
+
 # =============================================================================
 # AGENT REGISTRY TESTS (Session 17 - PLAN-AGENT-ECOSYSTEM-002)
 # =============================================================================
@@ -415,6 +617,329 @@ def test_semantic_mode_backward_compatible(db_with_concepts):
     assert ids_with_mode == ids_default, "Mode='semantic' should match default behavior"
 
 
+# =============================================================================
+# VECTOR INDEX TESTS (migration 010 - KNN search_memories)
+# =============================================================================
+
+def _unit_vector(index, dims=768):
+    """Vector with a dominant component at `index` (distinct but comparable)."""
+    vec = [0.01] * dims
+    vec[index] = 1.0
+    return vec
+
+
+@pytest.fixture
+def db_with_vec_index(db_with_concepts):
+    """db_with_concepts plus concept embeddings and migration 010 applied."""
+    conn = db_with_concepts.get_connection()
+    try:
+        conn.execute("SELECT vec_version()")
+    except sqlite3.OperationalError:
+        pytest.skip("sqlite-vec extension not available")
+
+    migration = Path("haios_etl/migrations/010_add_embeddings_vec.sql")
+    conn.executescript(migration.read_text(encoding="utf-8"))
+
+    cursor = conn.execute("SELECT id FROM concepts ORDER BY id")
+    for i, (concept_id,) in enumerate(cursor.fetchall()):
+        db_with_concepts.insert_concept_embedding(concept_id, _unit_vector(i), "test", 768)
+
+    db_with_concepts._vec_index_cache.clear()
+    return db_with_concepts
+
+
+def test_has_vec_index_false_without_migration(db_manager):
+    """has_vec_index reports False when vec0 tables are absent."""
+    assert db_manager.has_vec_index('concept_embeddings_vec') is False
+
+
+def test_vec_index_triggers_sync_embeddings(db_with_vec_index):
+    """Insert/delete on embeddings is mirrored into concept_embeddings_vec."""
+    conn = db_with_vec_index.get_connection()
+    count = conn.execute("SELECT COUNT(*) FROM concept_embeddings_vec").fetchone()[0]
+    assert count == 12
+
+    conn.execute("DELETE FROM embeddings WHERE id = 1")
+    count = conn.execute("SELECT COUNT(*) FROM concept_embeddings_vec").fetchone()[0]
+    assert count == 11
+
+
+def test_knn_search_matches_full_scan(db_with_vec_index):
+    """KNN path returns the same top-k as the brute-force scan."""
+    query = _unit_vector(3)
+    knn_results = db_with_vec_index.search_memories(query_vector=query, limit=5)
+
+    cursor = db_with_vec_index.get_connection().cursor()
+    import struct
+    from haios_etl.database import normalize_vector
+    # search_memories normalizes the query before either backend sees it
+    query_bytes = struct.pack(f'{len(query)}f', *normalize_vector(query))
+    scan_rows = db_with_vec_index._search_memories_scan(cursor, query_bytes, "", 5)
+
+    # Ties may come back in a different order, so compare scores
+    knn_scores = [round(r['score'], 5) for r in knn_results]
+    scan_scores = [round(1 - row[4], 5) for row in scan_rows]
+    assert knn_scores == scan_scores
+    assert knn_results[0]['id'] == 4  # 4th concept carries component 3
+
+
+def test_knn_search_applies_mode_filter(db_with_vec_index):
+    """Session recovery still excludes SynthesizedInsight on the KNN path."""
+    results = db_with_vec_index.search_memories(
+        query_vector=_unit_vector(0),
+        limit=5,
+        mode='session_recovery'
+    )
+    assert len(results) == 5
+    assert 'SynthesizedInsight' not in [r['type'] for r in results]
+
+
+@pytest.fixture
+def db_with_typed_vec_index(db_with_vec_index):
+    """db_with_vec_index with migration 015 (concept_type metadata column) applied."""
+    conn = db_with_vec_index.get_connection()
+    migration = Path("haios_etl/migrations/015_add_concept_type_to_concept_vec.sql")
+    conn.executescript(migration.read_text(encoding="utf-8"))
+    db_with_vec_index._vec_index_cache.clear()
+    return db_with_vec_index
+
+
+def test_typed_vec_index_copies_concept_type(db_with_typed_vec_index):
+    """Every indexed concept embedding carries its concept's type."""
+    conn = db_with_typed_vec_index.get_connection()
+    mismatched = conn.execute("""
+        SELECT COUNT(*) FROM concept_embeddings_vec v
+        JOIN embeddings e ON e.id = v.embedding_id
+        JOIN concepts c ON c.id = e.concept_id
+        WHERE v.concept_type != c.type
+    """).fetchone()[0]
+
+    assert db_with_typed_vec_index.has_vec_concept_type() is True
+    assert conn.execute("SELECT COUNT(*) FROM concept_embeddings_vec").fetchone()[0] == 12
+    assert mismatched == 0
+
+
+@pytest.mark.parametrize("mode", ["session_recovery", "knowledge_lookup"])
+def test_typed_knn_matches_scan(db_with_typed_vec_index, mode):
+    """Type pre-filtered KNN returns the same rows as the filtered scan."""
+    # Graded weights so no two concepts tie; nearest concept is a SynthesizedInsight
+    query = [0.0] * 768
+    for i in range(12):
+        query[i] = 1.0 / (i + 1)
+    knn_results = db_with_typed_vec_index.search_memories(query_vector=query, limit=4, mode=mode)
+
+    db_with_typed_vec_index._vec_index_cache['concept_embeddings_vec'] = False
+    scan_results = db_with_typed_vec_index.search_memories(query_vector=query, limit=4, mode=mode)
+
+    assert [round(r['score'], 5) for r in knn_results] == [round(r['score'], 5) for r in scan_results]
+    assert [r['id'] for r in knn_results] == [r['id'] for r in scan_results]
+
+
+def test_typed_knn_session_recovery_fills_limit(db_with_typed_vec_index):
+    """Excluded types are filtered inside KNN, so no over-fetch is needed to fill the limit."""
+    db_with_typed_vec_index.KNN_OVERFETCH = 1
+    results = db_with_typed_vec_index.search_memories(
+        query_vector=_unit_vector(0), limit=7, mode='session_recovery'
+    )
+
+    assert len(results) == 7
+    assert 'SynthesizedInsight' not in [r['type'] for r in results]
+
+
+def test_concept_retype_updates_vec_index(db_with_typed_vec_index):
+    """Retyping a concept (e.g. refinement) updates the index metadata."""
+    conn = db_with_typed_vec_index.get_connection()
+    conn.execute("UPDATE concepts SET type = 'episteme' WHERE id = 1")
+    conn.commit()
+
+    row = conn.execute("""
+        SELECT v.concept_type FROM concept_embeddings_vec v
+        JOIN embeddings e ON e.id = v.embedding_id
+        WHERE e.concept_id = 1
+    """).fetchone()
+    assert row[0] == 'episteme'
+
+
+# =============================================================================
+# SCOPED SEARCH TESTS (space_id / metadata pre-filters)
+# =============================================================================
+
+@pytest.fixture
+def db_with_spaces(db_manager):
+    """
+    Two spaces, one artifact and three concepts each, all with embeddings.
+
+    Concept i (ids 1-6) carries component i; concepts 1-3 occur in space 'alpha',
+    4-6 in 'beta'. Concepts 2 and 5 are tagged knowledge_type=episteme.
+    """
+    conn = db_manager.get_connection()
+    # Refinement/synthesis key memory_metadata by concept id despite the artifacts FK
+    conn.execute("PRAGMA foreign_keys = OFF")
+    for space_index, space in enumerate(("alpha", "beta")):
+        artifact_id = db_manager.insert_artifact(f"docs/{space}.md", "hash", 10)
+        conn.execute("UPDATE artifacts SET space_id = ? WHERE id = ?", (space, artifact_id))
+        db_manager.insert_embedding(artifact_id, _unit_vector(10 + space_index), "test", 768)
+        for i in range(3):
+            concept_id = db_manager.insert_concept("Decision", f"{space} {i}", f"{space} content {i}")
+            db_manager.record_concept_occurrence(concept_id, artifact_id, "context")
+            db_manager.insert_concept_embedding(concept_id, _unit_vector(concept_id), "test", 768)
+            if i == 1:
+                conn.execute(
+                    "INSERT INTO memory_metadata (memory_id, key, value) VALUES (?, 'knowledge_type', 'episteme')",
+                    (concept_id,)
+                )
+    conn.commit()
+    conn.execute("PRAGMA foreign_keys = ON")
+    return db_manager
+
+
+def _search_backends(db):
+    """Run the same scoped queries through every available backend."""
+    backends = ["store"]
+    try:
+        db.get_connection().execute("SELECT vec_version()")
+        backends.append("scan")
+    except sqlite3.OperationalError:
+        pass
+    return backends
+
+
+@pytest.fixture(params=["store", "scan"])
+def scoped_db(request, db_with_spaces):
+    if request.param not in _search_backends(db_with_spaces):
+        pytest.skip("sqlite-vec extension not available")
+    if request.param == "store":
+        pytest.importorskip("numpy")
+        from haios_etl.embedding_store import EmbeddingStore
+        db_with_spaces.attach_embedding_store(EmbeddingStore())
+    return db_with_spaces
+
+
+def test_space_filter_limits_results(scoped_db):
+    """Only memories of the requested space are returned."""
+    results = scoped_db.search_memories(query_vector=_unit_vector(4), space_id="alpha", limit=10)
+
+    ids = {(r['type'], r['id']) for r in results}
+    assert ids == {('artifact', 1), ('Decision', 1), ('Decision', 2), ('Decision', 3)}
+
+
+def test_metadata_filter_limits_results(scoped_db):
+    """memory_metadata filters keep only tagged memories."""
+    results = scoped_db.search_memories(
+        query_vector=_unit_vector(1), filters={"knowledge_type": "episteme"}, limit=10
+    )
+
+    # memory_metadata tags concepts; artifacts sharing a tagged id are not matched
+    assert sorted((r['type'], r['id']) for r in results) == [('Decision', 2), ('Decision', 5)]
+
+
+def test_space_and_metadata_filters_intersect(scoped_db):
+    """space_id and filters must both match."""
+    results = scoped_db.search_memories(
+        query_vector=_unit_vector(5), space_id="beta",
+        filters={"knowledge_type": ["episteme", "techne"]}, limit=10
+    )
+
+    assert [(r['type'], r['id']) for r in results] == [('Decision', 5)]
+
+
+def test_unfiltered_search_unchanged(scoped_db):
+    """No scope means every memory is a candidate."""
+    results = scoped_db.search_memories(query_vector=_unit_vector(4), limit=10)
+    assert len(results) == 8
+    assert results[0]['id'] == 4
+
+
+def test_knn_applies_scope_before_ranking(db_with_spaces, caplog):
+    """vec0 KNN with the scope as an embedding_id pre-filter fills the limit from the space."""
+    conn = db_with_spaces.get_connection()
+    try:
+        conn.execute("SELECT vec_version()")
+    except sqlite3.OperationalError:
+        pytest.skip("sqlite-vec extension not available")
+    for migration in ("010_add_embeddings_vec.sql", "015_add_concept_type_to_concept_vec.sql"):
+        conn.executescript(Path(f"haios_etl/migrations/{migration}").read_text(encoding="utf-8"))
+    db_with_spaces._vec_index_cache.clear()
+
+    # Nearest overall are alpha concepts; beta has to come from the pre-filter
+    results = db_with_spaces.search_memories(query_vector=_unit_vector(1), space_id="beta", limit=3)
+
+    assert "KNN search failed" not in caplog.text
+    assert len(results) == 3
+    assert {(r['type'], r['id']) for r in results} <= {
+        ('artifact', 2), ('Decision', 4), ('Decision', 5), ('Decision', 6)}
+
+
+# =============================================================================
+# NORMALIZED EMBEDDINGS TESTS (migration 014)
+# =============================================================================
+
+def test_insert_embedding_stores_unit_vector(db_manager):
+    """Vectors are L2-normalized on write."""
+    import struct
+    artifact_id = db_manager.insert_artifact("docs/n.md", "hash", 10)
+    db_manager.insert_embedding(artifact_id, [3.0, 4.0, 0.0], "test", 3)
+    concept_id = db_manager.insert_concept("Decision", "N", "Normalized")
+    db_manager.insert_concept_embedding(concept_id, [0.0, 0.0, 2.0], "test", 3)
+
+    rows = db_manager.get_connection().execute("SELECT vector FROM embeddings ORDER BY id").fetchall()
+    assert struct.unpack('3f', rows[0][0]) == pytest.approx((0.6, 0.8, 0.0))
+    assert struct.unpack('3f', rows[1][0]) == pytest.approx((0.0, 0.0, 1.0))
+
+
+def test_normalize_vector_leaves_zero_vector():
+    from haios_etl.database import normalize_vector
+    assert list(normalize_vector([0.0, 0.0])) == [0.0, 0.0]
+
+
+def test_new_database_flagged_normalized(db_manager):
+    """A fresh database only ever holds normalized vectors."""
+    assert db_manager.embeddings_normalized() is True
+    assert db_manager.get_setting(DatabaseManager.EMBEDDINGS_NORMALIZED_KEY) == '1'
+
+
+def test_existing_vectors_not_flagged(db_manager):
+    """setup() on a database that already has vectors leaves the flag to the script."""
+    conn = db_manager.get_connection()
+    conn.execute("DELETE FROM memory_settings")
+    artifact_id = db_manager.insert_artifact("docs/old.md", "hash", 10)
+    conn.execute(
+        "INSERT INTO embeddings (artifact_id, vector, model, dimensions) VALUES (?, x'0000803f', 'm', 1)",
+        (artifact_id,)
+    )
+    conn.commit()
+
+    db_manager.setup()
+    assert db_manager.embeddings_normalized() is False
+
+
+def test_get_setting_without_table(db_manager):
+    """Databases without migration 014 report defaults."""
+    conn = db_manager.get_connection()
+    conn.execute("DROP TABLE memory_settings")
+    db_manager._normalized = None
+
+    assert db_manager.get_setting("anything", "fallback") == "fallback"
+    assert db_manager.embeddings_normalized() is False
+
+
+def test_scan_on_normalized_db_matches_cosine(db_with_vec_index):
+    """The L2 scan returns the same rows and cosine distances as vec_distance_cosine."""
+    import struct
+    query = _unit_vector(5)
+    norm = sum(x * x for x in query) ** 0.5
+    query_bytes = struct.pack(f'{len(query)}f', *[x / norm for x in query])
+    cursor = db_with_vec_index.get_connection().cursor()
+
+    assert db_with_vec_index.embeddings_normalized() is True
+    l2_rows = db_with_vec_index._search_memories_scan(cursor, query_bytes, "", 5)
+    db_with_vec_index._normalized = False
+    cosine_rows = db_with_vec_index._search_memories_scan(cursor, query_bytes, "", 5)
+
+    assert [round(r[4], 5) for r in l2_rows] == [round(r[4], 5) for r in cosine_rows]
+    assert l2_rows[0][0] == cosine_rows[0][0] == 6
+
+
 # =============================================================================
 # BUSY_TIMEOUT TESTS (Session 128 - E2-211 / INV-027)
 # =============================================================================
@@ -436,3 +961,86 @@ def test_database_busy_timeout_is_set():
     timeout = cursor.fetchone()[0]
     # Must be at least 30 seconds to handle synthesis operations
     assert timeout >= 30000, f"Expected busy_timeout >= 30000ms, got {timeout}ms"
+
+
+# =============================================================================
+# CONNECTION TESTS (shared writer + per-thread read-only readers)
+# =============================================================================
+
+@pytest.fixture
+def file_db(tmp_path):
+    """File-backed DatabaseManager (readers need a real file under WAL)."""
+    manager = DatabaseManager(str(tmp_path / "memory.db"))
+    manager.setup()
+    yield manager
+    manager.close()
+
+
+def test_haios_etl_busy_timeout_is_set(file_db):
+    """Writer and reader connections wait on locks instead of failing."""
+    for conn in (file_db.get_connection(), file_db.get_read_connection()):
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] >= 30000
+
+
+def test_reader_connection_is_read_only(file_db):
+    """Reader connections reject writes."""
+    reader = file_db.get_read_connection()
+    assert reader is not file_db.get_connection()
+    assert reader.execute("PRAGMA query_only").fetchone()[0] == 1
+    with pytest.raises(sqlite3.OperationalError):
+        reader.execute("INSERT INTO entities (type, value) VALUES ('User', 'x')")
+
+
+def test_reader_sees_committed_writes(file_db):
+    """Reads through the reader observe what the writer committed."""
+    file_db.get_read_connection()  # Open before the write
+    file_db.update_processing_status("a.md", "success")
+    assert file_db.get_processing_status("a.md") == "success"
+
+
+def test_reader_is_per_thread(file_db):
+    """Each thread gets its own reader; a thread reuses its reader."""
+    import threading
+    main_reader = file_db.get_read_connection()
+    assert file_db.get_read_connection() is main_reader
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(file_db.get_read_connection()))
+    thread.start()
+    thread.join()
+    assert other[0] is not main_reader
+
+
+def test_memory_db_reader_is_writer(db_manager):
+    """':memory:' databases cannot be shared, so reads use the writer."""
+    assert db_manager.get_read_connection() is db_manager.get_connection()
+
+
+def test_concurrent_reads_and_writes(file_db):
+    """One shared manager serves many threads without threading errors."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    def work(i):
+        entity_id = file_db.insert_entity("User", f"user-{i % 5}")
+        file_db.update_processing_status(f"file-{i}.md", "success")
+        assert file_db.get_processing_status(f"file-{i}.md") == "success"
+        return entity_id, file_db.get_stats()['entities']
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(work, range(40)))
+
+    assert len({entity_id for entity_id, _ in results}) == 5
+    assert file_db.get_stats()['entities'] == 5
+
+
+def test_writer_context_rolls_back_on_error(file_db):
+    """db.writer() commits on success and rolls back on error."""
+    with pytest.raises(RuntimeError):
+        with file_db.writer() as conn:
+            conn.execute("INSERT INTO entities (type, value) VALUES ('User', 'x')")
+            raise RuntimeError("boom")
+    assert file_db.get_stats()['entities'] == 0
+
+    with file_db.writer() as conn:
+        conn.execute("INSERT INTO entities (type, value) VALUES ('User', 'y')")
+    assert file_db.get_stats()['entities'] == 1
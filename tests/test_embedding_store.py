@@ -0,0 +1,330 @@
+# generated: 2026-10-18
+# System Auto: last updated on: 2026-10-18 11:31:12
+"""
+Tests for the in-process embedding matrix cache (haios_etl/embedding_store.py).
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from haios_etl.database import DatabaseManager
+from haios_etl.embedding_store import EmbeddingStore, get_embedding_store
+
+
+def _vector(index, dims=16):
+    """Vector with a dominant component at `index`."""
+    vec = [0.01] * dims
+    vec[index] = 1.0
+    return vec
+
+
+def _cosine(a, b):
+    a, b = np.asarray(a), np.asarray(b)
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+@pytest.fixture
+def db_manager():
+    manager = DatabaseManager(":memory:")
+    manager.setup()
+    return manager
+
+
+@pytest.fixture
+def db_with_embeddings(db_manager):
+    """Concepts of two types plus one artifact, all with 16-dim embeddings."""
+    for i in range(6):
+        concept_type = "SynthesizedInsight" if i % 2 else "Decision"
+        concept_id = db_manager.insert_concept(concept_type, f"Concept {i}", f"Content {i}")
+        db_manager.insert_concept_embedding(concept_id, _vector(i), "test", 16)
+
+    artifact_id = db_manager.insert_artifact("docs/a.md", "hash", 10)
+    db_manager.insert_embedding(artifact_id, _vector(10), "test", 16)
+    return db_manager
+
+
+class TestRefresh:
+
+    def test_initial_load(self, db_with_embeddings):
+        store = EmbeddingStore()
+        store.refresh(db_with_embeddings.get_connection())
+
+        assert store.segment('concept').size == 6
+        assert store.segment('artifact').size == 1
+        assert store.segment('trace').size == 0
+        assert store.segment('concept').dimensions == 16
+
+    def test_incremental_refresh_loads_only_new_rows(self, db_with_embeddings):
+        conn = db_with_embeddings.get_connection()
+        store = EmbeddingStore()
+        store.refresh(conn)
+        high_water = store.segment('concept').max_source_id
+
+        concept_id = db_with_embeddings.insert_concept("Decision", "New", "New content")
+        db_with_embeddings.insert_concept_embedding(concept_id, _vector(7), "test", 16)
+        store.refresh(conn)
+
+        seg = store.segment('concept')
+        assert seg.size == 7
+        assert seg.max_source_id > high_water
+        assert seg.ids[-1] == concept_id
+
+    def test_delete_triggers_reload(self, db_with_embeddings):
+        conn = db_with_embeddings.get_connection()
+        store = EmbeddingStore()
+        store.refresh(conn)
+
+        conn.execute("DELETE FROM embeddings WHERE concept_id = 1")
+        conn.commit()
+        store.refresh(conn)
+
+        seg = store.segment('concept')
+        assert seg.size == 5
+        assert 1 not in seg.ids.tolist()
+
+    def test_mismatched_dimensions_skipped(self, db_with_embeddings):
+        conn = db_with_embeddings.get_connection()
+        concept_id = db_with_embeddings.insert_concept("Decision", "Odd", "Odd size")
+        db_with_embeddings.insert_concept_embedding(concept_id, [0.5] * 8, "test", 8)
+
+        store = EmbeddingStore()
+        store.refresh(conn)
+        store.refresh(conn)  # Skipped rows must not force a reload loop
+
+        seg = store.segment('concept')
+        assert seg.size == 6
+        assert seg.skipped == 1
+
+    def test_unchanged_refresh_touches_no_tables(self, db_with_embeddings):
+        conn = db_with_embeddings.get_connection()
+        store = EmbeddingStore()
+        store.refresh(conn)
+
+        statements = []
+        conn.set_trace_callback(statements.append)
+        try:
+            store.refresh(conn)
+        finally:
+            conn.set_trace_callback(None)
+
+        assert statements == ["PRAGMA data_version"]
+
+    def test_in_place_rewrite_from_other_connection_reloads(self, tmp_path):
+        import sqlite3
+        from haios_etl.vectors import encode_vector
+        path = str(tmp_path / "memory.db")
+        db = DatabaseManager(path)
+        db.setup()
+        concept_id = db.insert_concept("Decision", "Rewritten", "Rewritten content")
+        db.insert_concept_embedding(concept_id, _vector(0), "test", 16)
+        reader = sqlite3.connect(path)
+        store = EmbeddingStore()
+        store.refresh(reader)
+
+        # Same ids, same count: only the generation counter reveals the rewrite
+        writer = sqlite3.connect(path)
+        writer.execute("UPDATE embeddings SET vector = ?", (encode_vector(_vector(5)),))
+        writer.commit()
+        store.refresh(reader)
+
+        seg = store.segment('concept')
+        assert seg.size == 1
+        assert int(np.argmax(seg.matrix[0])) == 5
+        reader.close()
+        writer.close()
+
+    def test_delete_without_generation_counter_reloads(self, db_with_embeddings):
+        conn = db_with_embeddings.get_connection()
+        conn.execute("DELETE FROM memory_settings WHERE key = 'embedding_generation'")
+        conn.commit()
+        store = EmbeddingStore()
+        store.refresh(conn)
+
+        conn.execute("DELETE FROM embeddings WHERE concept_id = 2")
+        conn.commit()
+        store.refresh(conn)
+
+        assert 2 not in store.segment('concept').ids.tolist()
+
+
+
+class TestTopK:
+
+    def test_top_k_matches_brute_force(self, db_with_embeddings):
+        store = EmbeddingStore()
+        store.refresh(db_with_embeddings.get_connection())
+
+        query = [0.2, 0.9, 0.1, 0.4] + [0.05] * 12
+        hits = store.top_k('concept', query, 3)
+
+        expected = sorted(
+            ((i + 1, _cosine(query, _vector(i))) for i in range(6)),
+            key=lambda x: x[1], reverse=True
+        )[:3]
+        assert [h[0] for h in hits] == [e[0] for e in expected]
+        for (_, score), (_, expected_score) in zip(hits, expected):
+            assert score == pytest.approx(expected_score, abs=1e-5)
+
+    def test_top_k_respects_mask(self, db_with_embeddings):
+        store = EmbeddingStore()
+        store.refresh(db_with_embeddings.get_connection())
+
+        mask = store.type_mask('concept', exclude=('SynthesizedInsight',))
+        hits = store.top_k('concept', _vector(1), 6, mask=mask)
+
+        assert len(hits) == 3
+        assert all(concept_id % 2 == 1 for concept_id, _ in hits)  # Even index -> odd id
+
+    def test_small_mask_scores_subset(self, db_with_embeddings):
+        store = EmbeddingStore()
+        store.refresh(db_with_embeddings.get_connection())
+
+        mask = store.id_mask('concept', [2, 5])
+        hits = store.top_k('concept', _vector(4), 6, mask=mask)
+
+        assert [h[0] for h in hits] == [5, 2]
+        assert hits[0][1] == pytest.approx(1.0, abs=1e-5)
+
+    def test_type_mask_cached_and_extended(self, db_with_embeddings):
+        conn = db_with_embeddings.get_connection()
+        store = EmbeddingStore()
+        store.refresh(conn)
+
+        mask = store.type_mask('concept', include=('Decision',))
+        assert store.type_mask('concept', include=('Decision',)) is mask
+
+        concept_id = db_with_embeddings.insert_concept("Decision", "More", "More content")
+        db_with_embeddings.insert_concept_embedding(concept_id, _vector(8), "test", 16)
+        store.refresh(conn)
+
+        extended = store.type_mask('concept', include=('Decision',))
+        assert len(extended) == 7
+        assert extended.tolist() == [True, False, True, False, True, False, True]
+
+    def test_top_k_dimension_mismatch_returns_none(self, db_with_embeddings):
+        store = EmbeddingStore()
+        store.refresh(db_with_embeddings.get_connection())
+        assert store.top_k('concept', [0.1] * 768, 3) is None
+
+
+class TestSearchMemoriesIntegration:
+
+    def test_search_memories_uses_store(self, db_with_embeddings):
+        db_with_embeddings.attach_embedding_store(EmbeddingStore())
+
+        results = db_with_embeddings.search_memories(query_vector=_vector(2), limit=3)
+
+        assert results[0]['id'] == 3
+        assert results[0]['type'] == 'Decision'
+        assert results[0]['score'] == pytest.approx(1.0, abs=1e-5)
+        assert len(results) == 3
+
+    def test_search_memories_store_mode_filter(self, db_with_embeddings):
+        db_with_embeddings.attach_embedding_store(EmbeddingStore())
+
+        results = db_with_embeddings.search_memories(
+            query_vector=_vector(1), limit=10, mode='session_recovery'
+        )
+
+        types = [r['type'] for r in results]
+        assert 'SynthesizedInsight' not in types
+        assert 'artifact' in types
+
+    def test_search_memories_sees_new_rows(self, db_with_embeddings):
+        db_with_embeddings.attach_embedding_store(EmbeddingStore())
+        db_with_embeddings.search_memories(query_vector=_vector(0), limit=1)
+
+        concept_id = db_with_embeddings.insert_concept("Decision", "Fresh", "Fresh content")
+        db_with_embeddings.insert_concept_embedding(concept_id, _vector(12), "test", 16)
+
+        results = db_with_embeddings.search_memories(query_vector=_vector(12), limit=1)
+        assert results[0]['id'] == concept_id
+
+
+class TestRegistry:
+
+    def test_shared_per_path(self, tmp_path):
+        path = str(tmp_path / "memory.db")
+        DatabaseManager(path).setup()
+
+        assert get_embedding_store(path) is get_embedding_store(path)
+        assert DatabaseManager(path).attach_embedding_store() is get_embedding_store(path)
+
+    def test_memory_databases_not_shared(self):
+        assert get_embedding_store(":memory:") is not get_embedding_store(":memory:")
+
+
+class TestQuantized:
+
+    def test_codes_written_on_insert(self, db_with_embeddings):
+        conn = db_with_embeddings.get_connection()
+        row = conn.execute(
+            "SELECT vector_int8, vector_int8_scale, vector_binary FROM embeddings WHERE concept_id = 1"
+        ).fetchone()
+
+        assert len(row[0]) == 16
+        assert row[1] > 0
+        assert len(row[2]) == 2
+
+    @pytest.mark.parametrize("mode", ["int8", "binary"])
+    def test_quantized_top_k_reranks_exactly(self, db_with_embeddings, mode):
+        store = EmbeddingStore(mode)
+        conn = db_with_embeddings.get_connection()
+        store.refresh(conn)
+
+        query = [0.2, 0.9, 0.1, 0.4] + [0.05] * 12
+        hits = store.top_k('concept', query, 3, conn=conn)
+
+        expected = EmbeddingStore()
+        expected.refresh(conn)
+        for (concept_id, score), (exact_id, exact_score) in zip(hits, expected.top_k('concept', query, 3)):
+            assert concept_id == exact_id
+            assert score == pytest.approx(exact_score, abs=1e-5)
+
+    def test_quantized_segment_holds_codes_only(self, db_with_embeddings):
+        store = EmbeddingStore('int8')
+        store.refresh(db_with_embeddings.get_connection())
+
+        seg = store.segment('concept')
+        assert seg.codes.dtype == np.int8
+        assert seg.codes.shape == (6, 16)
+        with pytest.raises(AttributeError):
+            seg.matrix
+
+    def test_rows_without_codes_quantized_on_load(self, db_with_embeddings):
+        conn = db_with_embeddings.get_connection()
+        conn.execute("UPDATE embeddings SET vector_int8 = NULL, vector_int8_scale = NULL, vector_binary = NULL")
+        conn.commit()
+
+        store = EmbeddingStore('int8')
+        store.refresh(conn)
+
+        assert store.segment('concept').size == 6
+        assert store.segment('concept').skipped == 0
+        assert store.top_k('concept', _vector(4), 1, conn=conn)[0][0] == 5
+
+    def test_vector_update_clears_codes(self, db_with_embeddings):
+        conn = db_with_embeddings.get_connection()
+        conn.execute("UPDATE embeddings SET vector = vector WHERE concept_id = 1")
+        row = conn.execute("SELECT vector_int8, vector_binary FROM embeddings WHERE concept_id = 1").fetchone()
+
+        assert row == (None, None)
+
+    def test_search_memories_with_quantized_store(self, db_with_embeddings):
+        db_with_embeddings.attach_embedding_store(quantization='int8')
+
+        results = db_with_embeddings.search_memories(query_vector=_vector(2), limit=3)
+
+        assert results[0]['id'] == 3
+        assert results[0]['score'] == pytest.approx(1.0, abs=1e-5)
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError):
+            EmbeddingStore('fp16')
+
+    def test_registry_keys_by_mode(self, tmp_path):
+        path = str(tmp_path / "memory.db")
+        DatabaseManager(path).setup()
+
+        assert get_embedding_store(path, 'int8') is get_embedding_store(path, 'int8')
+        assert get_embedding_store(path, 'int8') is not get_embedding_store(path)
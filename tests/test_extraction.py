@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import patch, MagicMock
 from haios_etl.extraction import ExtractionManager, ExtractionResult, ExtractionError
+from haios_etl.llm_gateway import LLMGateway
 
 @pytest.fixture
 def mock_langextract():
@@ -10,7 +11,8 @@ def mock_langextract():
 
 @pytest.fixture
 def extraction_manager():
-    return ExtractionManager(api_key="dummy_key")
+    # Own gateway: a 429 cooldown from one test must not delay the next
+    return ExtractionManager(api_key="dummy_key", gateway=LLMGateway())
 
 def test_extract_from_file_success(extraction_manager, mock_langextract):
     """Verify successful extraction of entities and concepts."""
@@ -99,3 +101,189 @@ def test_extract_with_retry_exhausted(extraction_manager, mock_langextract):
             extraction_manager.extract_from_file("test/file.md", "content")
     
     assert mock_langextract.call_count == 3
+
+def _fake_embed(model, content, task_type, output_dimensionality):
+    """genai.embed_content stand-in: vector [len(text)] per text; 'bad' texts fail."""
+    texts = content if isinstance(content, list) else [content]
+    if any("bad" in text for text in texts):
+        raise Exception("400 Invalid content")
+    vectors = [[float(len(text))] for text in texts]
+    return {'embedding': vectors if isinstance(content, list) else vectors[0]}
+
+def test_embed_batch_packs_requests(extraction_manager):
+    """Verify texts are packed per request and returned in order."""
+    with patch('google.generativeai.embed_content', side_effect=_fake_embed) as mock_embed:
+        vectors = extraction_manager.embed_batch(["a", "bb", "ccc", "dddd", "eeeee"], batch_size=2)
+
+    assert vectors == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+    assert mock_embed.call_count == 3
+
+def test_embed_batch_partial_failure(extraction_manager):
+    """Verify a failed batch is retried per item and only the bad text is lost."""
+    with patch('google.generativeai.embed_content', side_effect=_fake_embed) as mock_embed:
+        vectors = extraction_manager.embed_batch(["one", "bad one", "", "three"])
+
+    assert vectors == [[3.0], None, None, [5.0]]
+    assert mock_embed.call_count == 4  # One packed request + three single retries
+
+def test_embed_batch_rate_limit_retries_batch_not_items(extraction_manager):
+    """A 429 on a packed request retries the batch after the cooldown, never per item."""
+    extraction_manager.gateway = LLMGateway(sleep=lambda seconds: None)
+    with patch('google.generativeai.embed_content',
+               side_effect=Exception("429 Resource exhausted")) as mock_embed:
+        with pytest.raises(ExtractionError, match="rate limited"):
+            extraction_manager.embed_batch(["one", "two", "three"])
+
+    assert mock_embed.call_count == extraction_manager.config.max_retries
+    assert all(isinstance(c.kwargs['content'], list) for c in mock_embed.call_args_list)
+
+def test_embed_batch_recovers_after_rate_limit(extraction_manager):
+    """The retried batch succeeds once the cooldown has passed."""
+    extraction_manager.gateway = LLMGateway(sleep=lambda seconds: None)
+    responses = [Exception("429 Resource exhausted"), {'embedding': [[1.0], [2.0]]}]
+    with patch('google.generativeai.embed_content', side_effect=responses) as mock_embed:
+        vectors = extraction_manager.embed_batch(["a", "bb"])
+
+    assert vectors == [[1.0], [2.0]]
+    assert mock_embed.call_count == 2
+
+def test_extract_strategy_uses_response_cache(extraction_manager):
+    """Verify a repeated strategy prompt is answered from the response cache."""
+    cache = MagicMock()
+    cache.get.side_effect = [None, '{"title": "Cached", "description": "d", "content": "c"}']
+    extraction_manager.response_cache = cache
+
+    with patch('google.generativeai.GenerativeModel') as model:
+        model.return_value.generate_content.return_value.text = '{"title": "Fresh", "description": "d", "content": "c"}'
+        first = extraction_manager.extract_strategy("query", "approach", "success")
+        second = extraction_manager.extract_strategy("query", "approach", "success")
+
+    assert first['title'] == "Fresh"
+    assert second['title'] == "Cached"
+    model.return_value.generate_content.assert_called_once()
+    cache.put.assert_called_once()
+
+def test_extract_rate_limit_uses_gateway_cooldown(mock_langextract):
+    """A 429 pauses the shared gateway instead of sleeping in the extraction loop."""
+    from haios_etl.llm_gateway import LLMGateway
+    pauses = []
+    gateway = LLMGateway(backoff_base=2.0, sleep=pauses.append)
+    manager = ExtractionManager(api_key="dummy_key", gateway=gateway)
+    mock_response = MagicMock()
+    mock_response.extractions = []
+    mock_langextract.side_effect = [Exception("Rate limit exceeded (429)"), mock_response]
+
+    with patch('haios_etl.extraction.time.sleep') as local_sleep:
+        manager.extract_from_file("test/file.md", "content")
+
+    local_sleep.assert_not_called()
+    assert pauses and pauses[0] == pytest.approx(2.0, abs=0.1)
+    assert gateway.stats()['rate_limited'] == 1
+    assert gateway.stats()['calls'] == 2
+
+
+def test_extraction_result_json_roundtrip():
+    from haios_etl.extraction import Entity, Concept
+    result = ExtractionResult(
+        entities=[Entity("User", "Ruben")],
+        concepts=[Concept("Decision", "Use SQLite", "ADR-001"), Concept("Directive", "Do X")]
+    )
+
+    assert ExtractionResult.from_json(result.to_json()) == result
+
+
+def test_prompt_version_tracks_model_and_prompt():
+    a = ExtractionManager(api_key="k1", gateway=LLMGateway())
+    b = ExtractionManager(api_key="k2", gateway=LLMGateway())
+    other_model = ExtractionManager(api_key="k1", model_id="other-model", gateway=LLMGateway())
+
+    assert a.prompt_version == b.prompt_version  # API key does not matter
+    assert a.prompt_version != other_model.prompt_version
+
+
+def _chunk_response(text):
+    """lx.extract stand-in: one entity per chunk part plus the shared header concept."""
+    response = MagicMock()
+    part = text.split("\n", 1)[0]
+    response.extractions = [
+        MagicMock(extraction_class="entity", extraction_text="Ruben", attributes={"entity_type": "User"}),
+        MagicMock(extraction_class="concept", extraction_text=part, attributes={"concept_type": "Directive"}),
+    ]
+    return response
+
+
+def test_large_file_is_extracted_in_chunks(mock_langextract):
+    from haios_etl.extraction import ExtractionConfig
+    config = ExtractionConfig(max_char_buffer=1000, chunk_overlap=100, max_workers=3)
+    manager = ExtractionManager(api_key="dummy_key", config=config, gateway=LLMGateway())
+    content = "".join(f"User: request {i} " + "x" * 200 + "\n\n" for i in range(20))
+    mock_langextract.side_effect = lambda **kwargs: _chunk_response(kwargs["text_or_documents"])
+
+    result = manager.extract_from_file("big/session.md", content)
+
+    calls = mock_langextract.call_count
+    assert calls > 1
+    texts = [c.kwargs["text_or_documents"] for c in mock_langextract.call_args_list]
+    assert all(len(t) <= 1000 + 100 for t in texts)  # Chunk plus "File: ..." header
+    assert any(f"(part 1/{calls})" in t for t in texts)
+    # Entities deduped across chunks; one concept per chunk, in order
+    assert [(e.type, e.value) for e in result.entities] == [("User", "Ruben")]
+    assert [c.content for c in result.concepts] == [
+        f"File: big/session.md (part {i}/{calls})" for i in range(1, calls + 1)
+    ]
+
+
+def test_chunk_failure_fails_the_file(mock_langextract):
+    from haios_etl.extraction import ExtractionConfig
+    config = ExtractionConfig(max_char_buffer=500, chunk_overlap=0, max_retries=1)
+    manager = ExtractionManager(api_key="dummy_key", config=config, gateway=LLMGateway())
+
+    def extract(**kwargs):
+        if "part 2/" in kwargs["text_or_documents"]:
+            raise Exception("400 bad request")
+        return _chunk_response(kwargs["text_or_documents"])
+
+    mock_langextract.side_effect = extract
+
+    with pytest.raises(ExtractionError):
+        manager.extract_from_file("big/session.md", "User: hi\n" * 200)
+
+
+def test_merge_drops_concepts_cut_at_chunk_boundary():
+    from haios_etl.extraction import Concept, Entity, merge_extraction_results
+    whole = "Always run the migration before deploying"
+    first = ExtractionResult(entities=[Entity("User", "Ruben")], concepts=[
+        Concept("Directive", "Use SQLite"), Concept("Directive", "Always run the migration"),
+    ])
+    second = ExtractionResult(entities=[Entity("User", "Ruben"), Entity("ADR", "ADR-001")], concepts=[
+        Concept("Directive", whole), Concept("Directive", "Use SQLite"),
+    ])
+    third = ExtractionResult(entities=[], concepts=[Concept("Decision", "Use SQLite for storage")])
+
+    merged = merge_extraction_results([first, second, third])
+
+    assert [(e.type, e.value) for e in merged.entities] == [("User", "Ruben"), ("ADR", "ADR-001")]
+    # Exact duplicate and boundary fragment dropped; different type kept
+    assert [(c.type, c.content) for c in merged.concepts] == [
+        ("Directive", "Use SQLite"), ("Directive", whole), ("Decision", "Use SQLite for storage"),
+    ]
+
+
+def test_merge_keeps_short_concept_stated_mid_chunk():
+    from haios_etl.extraction import Concept, merge_extraction_results
+    whole = "Always run the migration before deploying"
+    chunks = [
+        "User: Use SQLite. Always run the migration\n",
+        "Always run the migration before deploying.\nUser: Use SQLite here too, it is simple.\nAgent: ok\n",
+        "Agent: ok\nUse SQLite for storage\n",
+    ]
+    first = ExtractionResult(entities=[], concepts=[Concept("Directive", "Always run the migration")])
+    second = ExtractionResult(entities=[], concepts=[
+        Concept("Directive", whole), Concept("Directive", "Use SQLite"),
+    ])
+    third = ExtractionResult(entities=[], concepts=[Concept("Directive", "Use SQLite for storage")])
+
+    merged = merge_extraction_results([first, second, third], chunks, overlap=12)
+
+    # Fragment at the end of chunk 1 dropped; "Use SQLite" sits mid-chunk 2 and stays
+    assert [c.content for c in merged.concepts] == [whole, "Use SQLite", "Use SQLite for storage"]
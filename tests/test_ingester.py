@@ -401,7 +401,8 @@ def test_ingester_uses_memory_store(ingester, db_manager):
 def mock_extractor():
     """Returns a mock ExtractionManager for embedding tests."""
     extractor = MagicMock()
-    extractor.embed_content.return_value = [0.1] * 768  # Mock 768-dim embedding
+    # Mock 768-dim embedding per text, in order
+    extractor.embed_batch.side_effect = lambda texts: [[0.1] * 768 for _ in texts]
     return extractor
 
 
@@ -436,7 +437,7 @@ def test_ingest_creates_embedding(ingester_with_extractor, db_manager, mock_extr
     concept_id = result.concept_ids[0]
 
     # Verify embedding was generated
-    mock_extractor.embed_content.assert_called_once()
+    mock_extractor.embed_batch.assert_called_once()
 
     # Verify embedding was stored in database
     conn = db_manager.get_connection()
@@ -475,7 +476,7 @@ def test_ingest_without_extractor_skips_embedding(ingester, db_manager):
 def test_ingest_handles_embedding_failure(ingester_with_extractor, db_manager, mock_extractor):
     """E2-FIX-002: Verify graceful failure when embedding API fails."""
     # Configure extractor to fail
-    mock_extractor.embed_content.side_effect = Exception("API rate limit exceeded")
+    mock_extractor.embed_batch.side_effect = Exception("API rate limit exceeded")
 
     with patch.object(ingester_with_extractor, '_extract_content') as mock_extract:
         mock_extract.return_value = {
@@ -494,7 +495,7 @@ def test_ingest_handles_embedding_failure(ingester_with_extractor, db_manager, m
     assert len(result.concept_ids) == 1
 
     # Verify embedding call was attempted
-    mock_extractor.embed_content.assert_called_once()
+    mock_extractor.embed_batch.assert_called_once()
 
 
 def test_ingest_creates_embedding_for_each_concept(ingester_with_extractor, db_manager, mock_extractor):
@@ -518,8 +519,10 @@ def test_ingest_creates_embedding_for_each_concept(ingester_with_extractor, db_m
     # Verify all concepts stored
     assert len(result.concept_ids) == 3
 
-    # Verify embed_content called for each concept
-    assert mock_extractor.embed_content.call_count == 3
+    # Verify all concepts embedded in one batched call
+    mock_extractor.embed_batch.assert_called_once_with(
+        ["First concept", "Second concept", "Third concept"]
+    )
 
     # Verify all embeddings stored
     conn = db_manager.get_connection()
@@ -572,3 +575,27 @@ def test_ingester_preserves_full_content_no_truncation(ingester, db_manager):
     stored_content = row[0]
     assert len(stored_content) == 200, f"Content truncated: expected 200 chars, got {len(stored_content)}"
     assert stored_content == long_content, "Content mismatch - stored content differs from input"
+
+
+def test_ingest_skips_failed_items_in_batch(ingester_with_extractor, db_manager, mock_extractor):
+    """Verify a per-item embedding failure only skips that concept's embedding."""
+    mock_extractor.embed_batch.side_effect = lambda texts: [[0.1] * 768, None]
+
+    with patch.object(ingester_with_extractor, '_extract_content') as mock_extract:
+        mock_extract.return_value = {
+            "entities": [],
+            "concepts": [
+                {"type": "Decision", "content": "Embeds fine"},
+                {"type": "Directive", "content": "Fails to embed"}
+            ]
+        }
+
+        result = ingester_with_extractor.ingest(
+            content="Partial embedding failure",
+            source_path="test.md",
+            content_type_hint="episteme"
+        )
+
+    conn = db_manager.get_connection()
+    embedded = [row[0] for row in conn.execute("SELECT concept_id FROM embeddings ORDER BY concept_id")]
+    assert embedded == [result.concept_ids[0]]
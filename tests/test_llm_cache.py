@@ -0,0 +1,93 @@
+# generated: 2026-10-18
+# System Auto: last updated on: 2026-10-18 17:41:19
+"""
+Tests for the persistent LLM response cache (haios_etl/llm_cache.py).
+"""
+import os
+import pytest
+
+from haios_etl.database import DatabaseManager
+from haios_etl.llm_cache import LLMResponseCache
+
+MIGRATION = os.path.join(os.path.dirname(__file__), '..', 'haios_etl', 'migrations',
+                         '019_add_llm_response_cache.sql')
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "memory.db"))
+    with open(MIGRATION, encoding='utf-8') as f:
+        manager.get_connection().executescript(f.read())
+    return manager
+
+
+def _count(db):
+    return db.get_connection().execute("SELECT COUNT(*) FROM llm_response_cache").fetchone()[0]
+
+
+def test_round_trip_keyed_by_model_and_prompt(db):
+    cache = LLMResponseCache(db)
+    cache.put("model-a", "prompt", '{"title": "T"}')
+
+    assert cache.get("model-a", "prompt") == '{"title": "T"}'
+    assert cache.get("model-b", "prompt") is None
+    assert cache.get("model-a", "other prompt") is None
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'hit_rate': 0.3333}
+
+
+def test_ttl_expiry(db):
+    clock = FakeClock()
+    cache = LLMResponseCache(db, ttl_seconds=60, clock=clock)
+    cache.put("m", "p", "r")
+
+    clock.now += 59
+    assert cache.get("m", "p") == "r"
+    clock.now += 2
+    assert cache.get("m", "p") is None
+
+    cache.put("m", "p2", "r2")  # Writing evicts the expired entry
+    assert _count(db) == 1
+
+
+def test_size_eviction_keeps_recently_used(db):
+    clock = FakeClock()
+    cache = LLMResponseCache(db, max_entries=2, clock=clock)
+    cache.put("m", "first", "1")
+    clock.now += 1
+    cache.put("m", "second", "2")
+    clock.now += 1
+    assert cache.get("m", "first") == "1"  # Now more recent than "second"
+    clock.now += 1
+    cache.put("m", "third", "3")
+
+    assert _count(db) == 2
+    assert cache.get("m", "second") is None
+    assert cache.get("m", "first") == "1"
+
+
+def test_buffered_until_flush(db):
+    cache = LLMResponseCache(db, write_through=False)
+    cache.put("m", "p", "r")
+
+    assert _count(db) == 0
+    assert cache.get("m", "p") == "r"  # Served from the buffer
+    assert cache.flush() == 1
+    assert _count(db) == 1
+    hits = db.get_connection().execute("SELECT hit_count FROM llm_response_cache").fetchone()[0]
+    assert hits == 1
+
+
+def test_no_table_is_a_no_op(tmp_path):
+    cache = LLMResponseCache(DatabaseManager(str(tmp_path / "bare.db")))
+    cache.put("m", "p", "r")
+
+    assert cache.get("m", "p") is None
+    assert cache.flush() == 0
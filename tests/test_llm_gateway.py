@@ -0,0 +1,189 @@
+# generated: 2026-10-18
+# System Auto: last updated on: 2026-10-18 19:05:12
+"""
+Tests for the process-wide LLM gateway (haios_etl/llm_gateway.py).
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from haios_etl import llm_gateway
+from haios_etl.llm_gateway import (
+    LLMGateway, Priority, configure_gateway, default_gateway, estimate_tokens,
+    is_rate_limited, lane,
+)
+
+
+class FakeClock:
+    """Manual clock; sleep() advances it."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _raise(message):
+    raise RuntimeError(message)
+
+
+def test_call_returns_result_and_counts():
+    gateway = LLMGateway()
+
+    assert gateway.call(lambda a, b=0: a + b, 1, b=2) == 3
+    assert gateway.stats()['calls'] == 1
+
+
+def test_rate_limit_detection():
+    assert is_rate_limited(Exception("429 Too Many Requests"))
+    assert is_rate_limited(Exception("Quota exceeded for metric"))
+    assert is_rate_limited(Exception("RESOURCE_EXHAUSTED"))
+    assert not is_rate_limited(Exception("400 invalid argument"))
+    assert estimate_tokens("x" * 400) == 100
+    assert estimate_tokens("") == 1
+
+
+def test_429_pauses_every_caller_and_doubles():
+    clock = FakeClock()
+    gateway = LLMGateway(backoff_base=2.0, clock=clock, sleep=clock.sleep)
+
+    with pytest.raises(RuntimeError):
+        gateway.call(_raise, "429 rate limit")
+    gateway_wait = gateway.stats()['backoff_seconds']
+    assert gateway_wait == 2.0
+
+    # The next call (from any caller) waits out the cooldown first
+    with pytest.raises(RuntimeError):
+        gateway.call(_raise, "429 rate limit")
+    assert clock.sleeps == [pytest.approx(2.0)]
+    assert gateway.stats()['backoff_seconds'] == 4.0  # Consecutive 429: doubled
+
+    assert gateway.call(lambda: "ok") == "ok"
+    assert clock.sleeps[1] == pytest.approx(4.0)
+    assert gateway.stats()['backoff_seconds'] == 2.0  # Halved after a success
+    assert gateway.stats()['rate_limited'] == 2
+
+
+def test_backoff_is_capped():
+    clock = FakeClock()
+    gateway = LLMGateway(backoff_base=2.0, max_backoff=5.0, clock=clock, sleep=clock.sleep)
+
+    for _ in range(4):
+        with pytest.raises(RuntimeError):
+            gateway.call(_raise, "429")
+
+    assert gateway.stats()['backoff_seconds'] == 5.0
+
+
+def test_other_errors_do_not_pause():
+    clock = FakeClock()
+    gateway = LLMGateway(clock=clock, sleep=clock.sleep)
+
+    with pytest.raises(RuntimeError):
+        gateway.call(_raise, "400 bad request")
+    gateway.call(lambda: None)
+
+    assert clock.sleeps == []
+    assert gateway.stats()['rate_limited'] == 0
+
+
+def test_rpm_and_tpm_buckets():
+    clock = FakeClock()
+    gateway = LLMGateway(requests_per_minute=60, tokens_per_minute=600, clock=clock, sleep=clock.sleep)
+
+    gateway.call(lambda: None, tokens=600)  # Whole minute of tokens
+    gateway.call(lambda: None, tokens=300)
+
+    # 300 tokens at 10 tokens/second outweighs the 1s request spacing
+    assert sum(clock.sleeps) == pytest.approx(30.0)
+
+
+def test_oversized_prompt_is_clamped_to_one_minute():
+    clock = FakeClock()
+    gateway = LLMGateway(tokens_per_minute=100, clock=clock, sleep=clock.sleep)
+
+    gateway.call(lambda: None, tokens=10_000)
+
+    assert clock.sleeps == []
+
+
+def test_interactive_lane_goes_first():
+    clock = FakeClock()
+    release = threading.Event()
+    lock = threading.Lock()
+
+    def sleep(seconds):
+        release.wait(5)
+        with lock:
+            clock.now += seconds
+
+    gateway = LLMGateway(requests_per_minute=60, clock=clock, sleep=sleep)
+    gateway.call(lambda: None)  # Spend the only token
+    order = []
+
+    def run(name, priority):
+        gateway.call(order.append, name, priority=priority)
+
+    def wait_queued(count):
+        deadline = time.monotonic() + 5
+        while gateway.stats()['waiting'] < count and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    threads = []
+    for count, (name, priority) in enumerate(
+        [("batch-1", Priority.BATCH), ("batch-2", Priority.BATCH), ("mcp", Priority.INTERACTIVE)], 1
+    ):
+        thread = threading.Thread(target=run, args=(name, priority))
+        thread.start()
+        threads.append(thread)
+        wait_queued(count)
+
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert order == ["mcp", "batch-1", "batch-2"]
+
+
+def test_lane_sets_default_priority():
+    gateway = LLMGateway()
+    seen = []
+    gateway._admit = lambda priority, tokens: seen.append(priority)
+
+    gateway.call(lambda: None)
+    with lane(Priority.INTERACTIVE):
+        gateway.call(lambda: None)
+        gateway.call(lambda: None, priority=Priority.BATCH)
+
+    assert seen == [Priority.BATCH, Priority.INTERACTIVE, Priority.BATCH]
+
+
+def test_acall_keeps_lane():
+    gateway = LLMGateway()
+    seen = []
+    gateway._admit = lambda priority, tokens: seen.append(priority)
+
+    async def main():
+        with lane(Priority.INTERACTIVE):
+            return await gateway.acall(lambda x: x * 2, 21)
+
+    assert asyncio.run(main()) == 42
+    assert seen == [Priority.INTERACTIVE]
+
+
+def test_configure_gateway_updates_shared_instance(monkeypatch):
+    monkeypatch.setattr(llm_gateway, "_default_gateway", None)
+    gateway = default_gateway()
+
+    assert configure_gateway(requests_per_minute=30) is gateway
+    assert gateway.requests.rate == pytest.approx(0.5)
+    configure_gateway()
+    assert gateway.requests is None and gateway.tokens is None
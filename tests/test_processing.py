@@ -6,7 +6,9 @@ from haios_etl.extraction import ExtractionResult, Entity, Concept, ExtractionEr
 
 @pytest.fixture
 def mock_db():
-    return MagicMock()
+    db = MagicMock()
+    db.load_file_manifest.return_value = {}
+    return db
 
 @pytest.fixture
 def mock_extractor():
@@ -58,18 +60,17 @@ def test_process_file_success(processor, mock_db, mock_extractor):
     mock_db.get_processing_status.assert_called_with(file_path)
     mock_extractor.extract_from_file.assert_called_with(file_path, content)
     
-    # DB calls
-    mock_db.insert_artifact.assert_called_with(file_path, file_hash, 100)
-    mock_db.insert_entity.assert_called()
-    mock_db.insert_concept.assert_called()
-    mock_db.record_entity_occurrence.assert_called()
-    mock_db.record_concept_occurrence.assert_called()
-    
-    # Quality metrics
-    mock_db.insert_quality_metrics.assert_called()
-    
-    # Status update
-    mock_db.update_processing_status.assert_called_with(file_path, "success")
+    # DB calls: one bulk write per file
+    mock_db.ingest_extraction.assert_called_once()
+    kwargs = mock_db.ingest_extraction.call_args.kwargs
+    assert kwargs["file_path"] == file_path
+    assert kwargs["file_hash"] == file_hash
+    assert kwargs["result"] is mock_extractor.extract_from_file.return_value
+
+    # No per-item writes (each committed separately)
+    mock_db.insert_entity.assert_not_called()
+    mock_db.insert_concept.assert_not_called()
+    mock_db.update_processing_status.assert_not_called()
 
 def test_process_file_skip(processor, mock_db, mock_extractor):
     """Verify skipping of already processed file with same hash."""
@@ -124,8 +125,8 @@ def test_process_file_extraction_error(processor, mock_db, mock_extractor):
     
     # Assertions
     mock_db.update_processing_status.assert_called_with(file_path, "error", "API Error")
-    # Should NOT insert entities
-    mock_db.insert_entity.assert_not_called()
+    # Should NOT store results
+    mock_db.ingest_extraction.assert_not_called()
 
 # Tests for read_file_safely function
 def test_read_file_safely_utf8(tmp_path):
@@ -198,3 +199,216 @@ def test_read_file_safely_empty_file(tmp_path):
     content = read_file_safely(str(test_file_ws))
     assert content is None
 
+
+# Tests for parallel process_files
+from haios_etl.extraction import ErrorType
+import threading
+import time
+
+def _write_files(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"doc{i}.md"
+        path.write_text(f"User: note {i}")
+        paths.append(str(path))
+    return paths
+
+def test_process_files_applies_in_order_on_calling_thread(tmp_path, mock_db, mock_extractor):
+    """Extraction runs on workers; writes happen on the caller thread in input order."""
+    paths = _write_files(tmp_path, 8)
+    mock_db.get_processing_status.return_value = None
+    main_thread = threading.get_ident()
+    extract_threads = set()
+    write_threads = set()
+
+    def extract(file_path, content):
+        extract_threads.add(threading.get_ident())
+        # Later files finish first
+        time.sleep(0.01 * (8 - paths.index(file_path)))
+        return ExtractionResult(entities=[], concepts=[])
+
+    mock_extractor.extract_from_file.side_effect = extract
+    mock_db.ingest_extraction.side_effect = lambda **kwargs: write_threads.add(threading.get_ident())
+
+    seen = []
+    processor = BatchProcessor(mock_db, mock_extractor, workers=4)
+    counts = processor.process_files(paths, on_result=lambda i, outcome: seen.append((i, outcome.file_path)))
+
+    assert counts == {'success': 8, 'skipped': 0, 'error': 0}
+    assert seen == [(i + 1, path) for i, path in enumerate(paths)]
+    assert [c.kwargs["file_path"] for c in mock_db.ingest_extraction.call_args_list] == paths
+    assert write_threads == {main_thread}
+    assert main_thread not in extract_threads
+
+def test_process_files_retries_retryable_errors(tmp_path, mock_db, mock_extractor):
+    """A rate-limited file is retried after the pass; only the final outcome is stored."""
+    paths = _write_files(tmp_path, 3)
+    mock_db.get_processing_status.return_value = None
+    mock_extractor._classify_error.side_effect = (
+        lambda e: ErrorType.RETRYABLE if "429" in str(e) else ErrorType.PERMANENT
+    )
+    attempts = {}
+
+    def extract(file_path, content):
+        attempts[file_path] = attempts.get(file_path, 0) + 1
+        if file_path == paths[0] and attempts[file_path] == 1:
+            raise ExtractionError("429 rate limit")
+        if file_path == paths[1]:
+            raise ExtractionError("400 bad request")
+        return ExtractionResult(entities=[], concepts=[])
+
+    mock_extractor.extract_from_file.side_effect = extract
+
+    processor = BatchProcessor(mock_db, mock_extractor, workers=2)
+    counts = processor.process_files(paths, retries=1)
+
+    assert counts == {'success': 2, 'skipped': 0, 'error': 1}
+    assert attempts == {paths[0]: 2, paths[1]: 1, paths[2]: 1}
+    # Permanent error stored once; the retried file never got an error status
+    mock_db.update_processing_status.assert_called_once_with(paths[1], "error", "400 bad request")
+
+def test_process_files_stores_error_when_retries_exhausted(tmp_path, mock_db, mock_extractor):
+    paths = _write_files(tmp_path, 1)
+    mock_db.get_processing_status.return_value = None
+    mock_extractor._classify_error.return_value = ErrorType.RETRYABLE
+    mock_extractor.extract_from_file.side_effect = ExtractionError("429 rate limit")
+
+    processor = BatchProcessor(mock_db, mock_extractor, workers=2)
+    counts = processor.process_files(paths, retries=2)
+
+    assert counts['error'] == 1
+    assert mock_extractor.extract_from_file.call_count == 3
+    mock_db.update_processing_status.assert_called_once_with(paths[0], "error", "429 rate limit")
+
+def test_process_files_extracts_only_changed_files(tmp_path, mock_db, mock_extractor):
+    """Skipped files never reach the extractor (and so never the LLM gateway)."""
+    paths = _write_files(tmp_path, 3)
+    mock_db.get_processing_status.side_effect = lambda p: "success" if p == paths[2] else None
+    mock_db.get_artifact_hash.side_effect = lambda p: "h" if p == paths[2] else None
+    mock_extractor.extract_from_file.return_value = ExtractionResult(entities=[], concepts=[])
+
+    with patch("haios_etl.processing.compute_file_hash", side_effect=lambda p: "h" if p == paths[2] else p):
+        processor = BatchProcessor(mock_db, mock_extractor, workers=3)
+        counts = processor.process_files(paths)
+
+    assert counts == {'success': 2, 'skipped': 1, 'error': 0}
+    assert mock_extractor.extract_from_file.call_count == 2
+
+def test_process_files_reuses_extraction_for_identical_content(tmp_path):
+    """A copy of an extracted file at a new path is served from extraction_cache."""
+    from haios_etl.database import DatabaseManager
+    db = DatabaseManager(str(tmp_path / "memory.db"))
+    db.setup()
+    extractor = MagicMock()
+    extractor.prompt_version = "v1"
+    extractor.extract_from_file.return_value = ExtractionResult(
+        entities=[Entity("User", "Ruben")], concepts=[Concept("Directive", "Do X")]
+    )
+    original = tmp_path / "work" / "log.md"
+    moved = tmp_path / "archive" / "log.md"
+    for path in (original, moved):
+        path.parent.mkdir()
+        path.write_text("User: Do X")
+
+    outcomes = []
+    processor = BatchProcessor(db, extractor)
+    processor.process_files([str(original)], on_result=lambda i, o: outcomes.append(o))
+    processor.process_files([str(moved)], on_result=lambda i, o: outcomes.append(o))
+
+    extractor.extract_from_file.assert_called_once()
+    assert [o.cache_hit for o in outcomes] == [False, True]
+    assert db.get_processing_status(str(moved)) == "success"
+    cursor = db.get_connection().cursor()
+    assert cursor.execute(
+        "SELECT a.file_path, q.cache_hit, q.concepts_extracted FROM quality_metrics q "
+        "JOIN artifacts a ON a.id = q.artifact_id ORDER BY q.id"
+    ).fetchall() == [(str(original), 0, 1), (str(moved), 1, 1)]
+
+    # A new prompt version misses the old entry
+    extractor.prompt_version = "v2"
+    third = tmp_path / "third.md"
+    third.write_text("User: Do X")
+    processor.process_files([str(third)])
+    assert extractor.extract_from_file.call_count == 2
+
+
+# Tests for the stat manifest fast path (migration 021)
+import os
+
+def _manifest_processor(tmp_path):
+    from haios_etl.database import DatabaseManager
+    db = DatabaseManager(str(tmp_path / "memory.db"))
+    db.setup()
+    extractor = MagicMock()
+    extractor.prompt_version = "v1"
+    extractor.extract_from_file.return_value = ExtractionResult(
+        entities=[Entity("User", "Ruben")], concepts=[Concept("Directive", "Do X")]
+    )
+    return db, extractor, BatchProcessor(db, extractor, workers=2)
+
+def test_process_files_skips_unchanged_files_without_io(tmp_path):
+    """A re-run over unchanged files reads, hashes and writes nothing."""
+    db, extractor, processor = _manifest_processor(tmp_path)
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    paths = _write_files(docs, 5)
+    assert processor.process_files(paths) == {'success': 5, 'skipped': 0, 'error': 0}
+    assert set(db.load_file_manifest()) == set(paths)
+
+    outcomes = []
+    with patch("haios_etl.processing.compute_file_hash") as hasher, \
+         patch("haios_etl.processing.read_file_safely") as reader, \
+         patch.object(db, "get_processing_status") as status_lookup, \
+         patch.object(db, "update_processing_status") as status_write, \
+         patch.object(db, "record_file_manifest") as manifest_write:
+        counts = processor.process_files(paths, on_result=lambda i, o: outcomes.append(o))
+
+    assert counts == {'success': 0, 'skipped': 5, 'error': 0}
+    assert all(o.unchanged for o in outcomes)
+    for mock in (hasher, reader, status_lookup, status_write, manifest_write):
+        mock.assert_not_called()
+    assert extractor.extract_from_file.call_count == 5
+
+def test_process_files_rehashes_when_stat_changes(tmp_path):
+    """A touched file is hashed and skipped; an edited one is extracted again."""
+    db, extractor, processor = _manifest_processor(tmp_path)
+    touched, edited = _write_files(tmp_path, 2)
+    processor.process_files([touched, edited])
+
+    stat = os.stat(touched)
+    os.utime(touched, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    with open(edited, "a") as f:
+        f.write(" and more")
+
+    outcomes = []
+    counts = processor.process_files([touched, edited], on_result=lambda i, o: outcomes.append(o))
+
+    assert counts == {'success': 1, 'skipped': 1, 'error': 0}
+    assert [o.unchanged for o in outcomes] == [False, False]
+    assert extractor.extract_from_file.call_count == 3
+    # Both manifest rows now match the files on disk
+    manifest = db.load_file_manifest()
+    for path in (touched, edited):
+        st = os.stat(path)
+        assert manifest[path][:3] == (st.st_size, st.st_mtime_ns, st.st_ino)
+
+    outcomes.clear()
+    processor.process_files([touched, edited], on_result=lambda i, o: outcomes.append(o))
+    assert [o.unchanged for o in outcomes] == [True, True]
+
+def test_process_files_retries_errors_despite_manifest(tmp_path):
+    """A file whose last status is 'error' is never skipped by stat alone."""
+    db, extractor, processor = _manifest_processor(tmp_path)
+    paths = _write_files(tmp_path, 1)
+    processor.process_files(paths)
+    db.update_processing_status(paths[0], "error", "later failure")
+
+    assert db.load_file_manifest() == {}
+    outcomes = []
+    counts = processor.process_files(paths, on_result=lambda i, o: outcomes.append(o))
+
+    assert counts == {'success': 1, 'skipped': 0, 'error': 0}
+    assert not outcomes[0].unchanged
+    assert outcomes[0].cache_hit  # Same content: served from extraction_cache
+    assert db.get_processing_status(paths[0]) == "success"
+
@@ -0,0 +1,64 @@
+# generated: 2026-10-18
+# System Auto: last updated on: 2026-10-18 13:50:12
+"""
+Tests for the int8 / binary embedding codes (haios_etl/quantization.py).
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from haios_etl import quantization
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(7)
+    return rng.normal(size=(50, 768)).astype(np.float32)
+
+
+def test_int8_roundtrip_is_close(vectors):
+    codes, scales = quantization.quantize_int8(vectors)
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    assert codes.dtype == np.int8 and codes.shape == (50, 768)
+    assert np.abs(codes * scales[:, None] - normalized).max() < scales.max()
+
+
+def test_binary_is_packed_sign_bits(vectors):
+    bits = quantization.quantize_binary(vectors)
+
+    assert bits.shape == (50, 96)
+    assert np.array_equal(np.unpackbits(bits, axis=1)[:, :768].astype(bool), vectors > 0)
+
+
+def test_encode_single_vector_matches_batch(vectors):
+    code, scale = quantization.encode_int8(vectors[3].tolist())
+    codes, scales = quantization.quantize_int8(vectors)
+
+    assert code == codes[3].tobytes()
+    assert scale == pytest.approx(float(scales[3]))
+    assert quantization.encode_binary(vectors[3]) == quantization.quantize_binary(vectors)[3].tobytes()
+
+
+def test_int8_coarse_scores_approximate_cosine(vectors):
+    codes, scales = quantization.quantize_int8(vectors)
+    query = vectors[0] + 0.1
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    exact = normalized @ (query / np.linalg.norm(query))
+
+    scores = quantization.coarse_scores('int8', codes, query, scales)
+
+    assert np.abs(scores - exact).max() < 0.02
+
+
+def test_binary_coarse_scores_rank_self_first(vectors):
+    bits = quantization.quantize_binary(vectors)
+    scores = quantization.coarse_scores('binary', bits, vectors[11])
+
+    assert scores[11] == pytest.approx(1.0)
+    assert int(np.argmax(scores)) == 11
+
+
+def test_unknown_mode_rejected(vectors):
+    with pytest.raises(ValueError):
+        quantization.coarse_scores('fp16', vectors, vectors[0])
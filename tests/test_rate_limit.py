@@ -0,0 +1,99 @@
+# generated: 2026-10-18
+# System Auto: last updated on: 2026-10-18 14:22:40
+"""
+Tests for the shared token-bucket rate limiter (haios_etl/rate_limit.py).
+"""
+import threading
+
+import pytest
+
+from haios_etl.rate_limit import TokenBucket
+
+
+class FakeClock:
+    """Manual clock; sleep() advances it."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_burst_then_sustained_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(60, capacity=3, clock=clock, sleep=clock.sleep)
+
+    for _ in range(3):
+        assert bucket.acquire()
+    assert clock.now == 0.0  # Burst served immediately
+
+    bucket.acquire()
+    assert clock.now == pytest.approx(1.0)  # 60 RPM = one token per second
+
+
+def test_default_capacity_is_one_second_of_tokens():
+    assert TokenBucket(15).capacity == 1.0
+    assert TokenBucket(600).capacity == pytest.approx(10.0)
+
+
+def test_refill_capped_at_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(60, capacity=2, clock=clock, sleep=clock.sleep)
+    bucket.acquire()
+    bucket.acquire()
+
+    clock.now += 100
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+
+def test_acquire_timeout():
+    clock = FakeClock()
+    bucket = TokenBucket(6, capacity=1, clock=clock, sleep=clock.sleep)  # One token per 10s
+    bucket.acquire()
+
+    assert bucket.acquire(timeout=2) is False
+    assert clock.now == pytest.approx(2.0)
+    assert bucket.acquire(timeout=20) is True
+
+
+def test_invalid_rate_rejected():
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+def test_shared_across_threads():
+    bucket = TokenBucket(60 * 1000, capacity=5)  # 1000/s
+    acquired = []
+
+    def worker():
+        for _ in range(20):
+            bucket.acquire()
+            acquired.append(1)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(acquired) == 80
+
+
+def test_delay_reports_wait_without_taking():
+    clock = FakeClock()
+    bucket = TokenBucket(60, capacity=1, clock=clock, sleep=clock.sleep)
+
+    assert bucket.delay() == 0.0
+    assert bucket.try_acquire()
+    assert bucket.delay() == pytest.approx(1.0)
+    assert bucket.delay() == pytest.approx(1.0)  # Nothing taken
+    clock.now += 0.25
+    assert bucket.delay() == pytest.approx(0.75)
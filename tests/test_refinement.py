@@ -95,6 +95,21 @@ class TestGetOrCreateEpisteme:
         assert row[1] == "Idempotency Principle"
         assert row[2] == "virtual:episteme"
 
+    def test_episteme_has_content_hash(self, temp_db):
+        """Episteme rows carry content_hash so later ingestion reuses them."""
+        import hashlib
+        conn = sqlite3.connect(temp_db)
+        conn.execute("ALTER TABLE concepts ADD COLUMN content_hash TEXT")
+        conn.commit()
+        conn.close()
+
+        episteme_id = RefinementManager(temp_db)._get_or_create_episteme("Idempotency Principle")
+
+        conn = sqlite3.connect(temp_db)
+        stored = conn.execute("SELECT content_hash FROM concepts WHERE id = ?", (episteme_id,)).fetchone()[0]
+        conn.close()
+        assert stored == hashlib.sha256(b"Idempotency Principle").hexdigest()
+
     def test_creates_metadata_for_episteme(self, temp_db):
         """Verify metadata is created with knowledge_type=episteme."""
         mgr = RefinementManager(temp_db)
@@ -293,3 +293,79 @@ class TestStrategyExtraction:
         assert result['reasoning']['relevant_strategies'] == []
         # But learned_from should still count the trace
         assert result['reasoning']['learned_from'] == 1
+
+
+# =============================================================================
+# Reasoning trace KNN lookup (migration 011)
+# =============================================================================
+
+def _trace_vector(index, dims=768):
+    """Vector with a dominant component at `index`."""
+    vec = [0.0] * dims
+    vec[index] = 1.0
+    return vec
+
+
+@pytest.fixture
+def db_with_trace_index():
+    """In-memory database with reasoning_traces_vec (requires sqlite-vec)."""
+    import sqlite3
+    import struct
+    from pathlib import Path
+
+    db = DatabaseManager(":memory:")
+    db.setup()
+    conn = db.get_connection()
+    try:
+        conn.execute("SELECT vec_version()")
+    except sqlite3.OperationalError:
+        pytest.skip("sqlite-vec extension not available")
+
+    migration = Path("haios_etl/migrations/011_rebuild_reasoning_traces_vec.sql")
+    conn.executescript(migration.read_text(encoding="utf-8"))
+
+    traces = [
+        ("close query", _trace_vector(0), None),
+        ("close query other space", _trace_vector(0), "space-b"),
+        ("unrelated query", _trace_vector(5), None),
+    ]
+    for query, vec, space in traces:
+        conn.execute("""
+            INSERT INTO reasoning_traces (query, query_embedding, approach_taken, outcome, space_id)
+            VALUES (?, ?, 'default_hybrid', 'success', ?)
+        """, (query, struct.pack(f'{len(vec)}f', *vec), space))
+    conn.commit()
+    return db
+
+
+class TestReasoningTraceKNN:
+    """find_similar_reasoning_traces via the vec0 index."""
+
+    def test_index_is_synced_by_trigger(self, db_with_trace_index):
+        conn = db_with_trace_index.get_connection()
+        count = conn.execute("SELECT COUNT(*) FROM reasoning_traces_vec").fetchone()[0]
+        assert count == 3
+
+    def test_threshold_applied_in_knn(self, db_with_trace_index, mock_extractor):
+        service = ReasoningAwareRetrieval(db_with_trace_index, mock_extractor)
+        results = service.find_similar_reasoning_traces(_trace_vector(0))
+
+        queries = [r['query'] for r in results]
+        assert "unrelated query" not in queries
+        assert len(results) == 2
+        assert results[0]['distance'] == pytest.approx(0.0, abs=1e-6)
+
+    def test_space_filter_applied_in_knn(self, db_with_trace_index, mock_extractor):
+        service = ReasoningAwareRetrieval(db_with_trace_index, mock_extractor)
+        results = service.find_similar_reasoning_traces(_trace_vector(0), space_id="space-b")
+
+        assert [r['query'] for r in results] == ["close query other space"]
+
+    def test_knn_error_falls_back_to_scan(self, db_with_trace_index, mock_extractor):
+        service = ReasoningAwareRetrieval(db_with_trace_index, mock_extractor)
+        with patch.object(
+            service, '_knn_reasoning_traces', side_effect=RuntimeError("no metadata columns")
+        ):
+            results = service.find_similar_reasoning_traces(_trace_vector(0), space_id="space-b")
+
+        assert [r['query'] for r in results] == ["close query other space"]
@@ -11,6 +11,7 @@ Design Decisions:
 - DD-008: Separate concept/trace pipelines
 - DD-009: Bridge insights as new concepts
 """
+import math
 import pytest
 import sqlite3
 import tempfile
@@ -48,7 +49,8 @@ def temp_db():
             synthesis_source_count INTEGER DEFAULT 0,
             synthesis_confidence REAL,
             synthesized_at TIMESTAMP,
-            synthesis_cluster_id INTEGER
+            synthesis_cluster_id INTEGER,
+            content_hash TEXT
         );
 
         CREATE TABLE reasoning_traces (
@@ -96,7 +98,7 @@ def temp_db():
         CREATE TABLE synthesis_cluster_members (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             cluster_id INTEGER NOT NULL,
-            member_type TEXT NOT NULL CHECK(member_type IN ('concept', 'trace')),
+            member_type TEXT NOT NULL CHECK(member_type IN ('concept', 'trace', 'cross')),
             member_id INTEGER NOT NULL,
             similarity_to_centroid REAL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -512,6 +514,25 @@ class TestSynthesisStorage:
         assert row[0] == 'SynthesizedInsight'
         assert 'Meta Pattern' in row[1]
 
+    def test_store_synthesis_sets_content_hash(self, temp_db):
+        """Insights carry content_hash, so ingestion dedupes against them."""
+        import hashlib
+        manager = SynthesisManager(temp_db)
+        result = SynthesisResult(title='Hashed', content='Insight.', confidence=0.9,
+                                 source_ids=[1, 2], source_type='concept')
+
+        concept_id = manager.store_synthesis(result)
+        duplicate = manager.store_synthesis(SynthesisResult(
+            title='Hashed', content='Insight.', confidence=0.8, source_ids=[3, 4], source_type='concept'))
+
+        conn = sqlite3.connect(temp_db)
+        stored = conn.execute("SELECT content_hash FROM concepts WHERE id = ?", (concept_id,)).fetchone()[0]
+        count = conn.execute("SELECT COUNT(*) FROM concepts WHERE type = 'SynthesizedInsight'").fetchone()[0]
+        conn.close()
+        assert stored == hashlib.sha256(b"[Hashed] Insight.").hexdigest()
+        assert duplicate is None
+        assert count == 1
+
     def test_store_synthesis_creates_provenance(self, temp_db):
         """Provenance links created in synthesis_provenance."""
         manager = SynthesisManager(temp_db)
@@ -1124,6 +1145,19 @@ class TestHelperFunctions:
         assert abs(manager._cosine_similarity(a, b) + 1.0) < 0.001
 
 
+    def test_similarity_uses_dot_product_when_normalized(self, temp_db):
+        """Normalized databases (migration 014) compare by plain dot product."""
+        manager = SynthesisManager(temp_db)
+        a = [2.0, 0.0]
+        b = [1.0, 0.0]
+
+        manager.db._normalized = False
+        assert abs(manager._similarity(a, b) - 1.0) < 0.001
+
+        manager.db._normalized = True
+        assert abs(manager._similarity(a, b) - 2.0) < 0.001
+
+
 class TestSynthesisEmbedding:
     """Tests for embedding generation in store_synthesis (E2-FIX-001)."""
 
@@ -1453,3 +1487,742 @@ class TestSchemaConstraints:
         assert row is not None, "'cross' source_type must be accepted per DD-011"
 
         conn.close()
+
+
+class TestVectorizedClustering:
+    """NumPy clustering must reproduce the reference greedy loop exactly."""
+
+    @staticmethod
+    def _items(vectors, ids=None):
+        ids = ids or list(range(1, len(vectors) + 1))
+        return [
+            (item_id, f"Item {item_id}", create_embedding(vec) if vec is not None else None)
+            for item_id, vec in zip(ids, vectors)
+        ]
+
+    @staticmethod
+    def _summary(clusters):
+        return [(c.member_ids, c.centroid) for c in clusters]
+
+    @pytest.mark.parametrize("normalized", [False, True])
+    def test_matches_reference_on_random_embeddings(self, temp_db, normalized):
+        np = pytest.importorskip("numpy")
+        rng = np.random.default_rng(7)
+        # A few tight groups plus noise, so clusters form and some hit MAX_CLUSTER_SIZE
+        centers = rng.normal(size=(5, 16))
+        vectors = [
+            (centers[i % 5] + rng.normal(scale=0.15, size=16)).tolist() if i % 4 else rng.normal(size=16).tolist()
+            for i in range(300)
+        ]
+        if normalized:
+            vectors = [(v / np.linalg.norm(v)).tolist() for v in np.asarray(vectors)]
+        items = self._items(vectors)
+        manager = SynthesisManager(temp_db)
+        manager.db._normalized = normalized
+
+        expected = manager._build_clusters_python(items, 'concept')
+        actual = manager._build_clusters(items, 'concept')
+
+        assert len(expected) > 5
+        assert any(c.member_count == manager.MAX_CLUSTER_SIZE for c in expected)
+        assert self._summary(actual) == self._summary(expected)
+
+    def test_invalid_and_duplicate_ids_match_reference(self, temp_db):
+        vectors = [[1.0, 0.0], None, [0.99, 0.05], [1.0, 0.01], [0.0, 1.0], [0.01, 1.0], [1.0, 0.0]]
+        items = self._items(vectors, ids=[1, 2, 3, 3, 4, 5, 2])
+        items.append((6, "Bad", b"\x00\x01\x02"))
+        manager = SynthesisManager(temp_db)
+
+        expected = manager._build_clusters_python(items, 'concept')
+        actual = manager._build_clusters_vectorized(items, 'concept')
+
+        assert self._summary(actual) == self._summary(expected)
+
+    def test_threshold_ties_decided_exactly(self, temp_db):
+        """Scores at the threshold are re-decided with _similarity, not float32."""
+        manager = SynthesisManager(temp_db)
+        manager.db._normalized = False
+        threshold = manager.SIMILARITY_THRESHOLD
+        angle = math.acos(threshold)
+        tilted = [math.cos(angle), math.sin(angle)]
+        items = self._items([[1.0, 0.0], tilted, [tilted[0] - 1e-6, tilted[1] + 1e-6]])
+
+        expected = manager._build_clusters_python(items, 'concept')
+        actual = manager._build_clusters_vectorized(items, 'concept')
+
+        assert self._summary(actual) == self._summary(expected)
+
+    def test_mixed_dimensions_fall_back(self, temp_db):
+        items = self._items([[1.0, 0.0], [1.0, 0.0, 0.0], [0.99, 0.01]])
+        manager = SynthesisManager(temp_db)
+
+        assert manager._build_clusters_vectorized(items, 'concept') is None
+        assert self._summary(manager._build_clusters(items, 'concept')) == \
+            self._summary(manager._build_clusters_python(items, 'concept'))
+
+    def test_blocks_smaller_than_input(self, temp_db, monkeypatch):
+        np = pytest.importorskip("numpy")
+        from haios_etl import clustering
+        monkeypatch.setattr(clustering, "MAX_BLOCK_SEEDS", 3)
+        rng = np.random.default_rng(3)
+        base = rng.normal(size=8)
+        items = self._items([(base + rng.normal(scale=0.2, size=8)).tolist() for _ in range(40)])
+        manager = SynthesisManager(temp_db)
+
+        assert self._summary(manager._build_clusters_vectorized(items, 'concept')) == \
+            self._summary(manager._build_clusters_python(items, 'concept'))
+
+
+class TestGraphClustering:
+    """kNN-graph clustering over the whole unsynthesized corpus."""
+
+    @staticmethod
+    def _insert(db_path, vectors):
+        conn = sqlite3.connect(db_path)
+        ids = []
+        for i, vec in enumerate(vectors):
+            cursor = conn.execute(
+                "INSERT INTO concepts (type, content) VALUES (?, ?)", ("Directive", f"Graph concept {i}")
+            )
+            ids.append(cursor.lastrowid)
+            conn.execute(
+                "INSERT INTO embeddings (concept_id, vector) VALUES (?, ?)", (cursor.lastrowid, create_embedding(vec))
+            )
+        conn.commit()
+        conn.close()
+        return ids
+
+    def test_graph_mode_ignores_id_window(self, temp_db):
+        """Similar concepts far apart in id order still meet."""
+        pytest.importorskip("numpy")
+        filler = [[1.0 if d == i + 1 else 0.0 for d in range(12)] for i in range(10)]
+        head = [1.0] + [0.0] * 11
+        tail = [0.99, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.05]
+        ids = self._insert(temp_db, [head] + filler + [tail])
+        manager = SynthesisManager(temp_db)
+
+        assert manager.find_similar_concepts(limit=5) == []
+        clusters = manager.find_similar_concepts(limit=5, mode='graph')
+
+        assert [c.member_ids for c in clusters] == [[ids[0], ids[-1]]]
+        assert clusters[0].cluster_type == 'concept'
+
+    def test_graph_clusters_capped_at_max_size(self, temp_db):
+        np = pytest.importorskip("numpy")
+        rng = np.random.default_rng(11)
+        base = rng.normal(size=8)
+        self._insert(temp_db, [(base + rng.normal(scale=0.05, size=8)).tolist() for _ in range(50)])
+        manager = SynthesisManager(temp_db)
+
+        clusters = manager.find_similar_concepts(mode='graph')
+
+        assert clusters
+        assert all(manager.MIN_CLUSTER_SIZE <= c.member_count <= manager.MAX_CLUSTER_SIZE for c in clusters)
+        members = [m for c in clusters for m in c.member_ids]
+        assert len(members) == len(set(members))
+
+    def test_graph_mode_reads_vectors_from_store(self, temp_db):
+        pytest.importorskip("numpy")
+        head = [1.0, 0.0, 0.0, 0.0]
+        ids = self._insert(temp_db, [head, [0.99, 0.05, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0],
+                                     [0.0, 0.98, 0.1, 0.0], [0.97, 0.0, 0.1, 0.0]])
+        conn = sqlite3.connect(temp_db)
+        conn.execute("UPDATE concepts SET synthesis_cluster_id = 1 WHERE id = ?", (ids[4],))
+        conn.commit()
+        conn.close()
+        with_store = SynthesisManager(temp_db)
+        without_store = SynthesisManager(temp_db)
+        without_store.store = None
+
+        writer = with_store.db.get_connection()
+        with_store.store.refresh(writer, segments=('concept',))
+        statements = []
+        writer.set_trace_callback(statements.append)
+        try:
+            clusters = with_store.find_similar_concepts(mode='graph')
+        finally:
+            writer.set_trace_callback(None)
+
+        assert not any('vector' in sql for sql in statements)
+        assert [c.member_ids for c in clusters] == [[ids[0], ids[1]], [ids[2], ids[3]]]
+        expected = without_store.find_similar_concepts(mode='graph')
+        assert [c.member_ids for c in clusters] == [c.member_ids for c in expected]
+        for got, want in zip(clusters, expected):
+            assert got.centroid == pytest.approx(want.centroid, abs=1e-6)
+
+    def test_knn_edges_match_brute_force(self):
+        np = pytest.importorskip("numpy")
+        from haios_etl import clustering
+        rng = np.random.default_rng(5)
+        matrix = rng.normal(size=(60, 6)).astype(np.float32)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+
+        left, right, sim = clustering.knn_edges(matrix, 3, 0.5)
+
+        scores = matrix @ matrix.T
+        np.fill_diagonal(scores, -np.inf)
+        expected = set()
+        for i in range(60):
+            for j in np.argsort(-scores[i])[:3]:
+                if scores[i, j] >= 0.5:
+                    expected.add((min(i, int(j)), max(i, int(j))))
+        assert set(zip(left.tolist(), right.tolist())) == expected
+        assert np.allclose(sim, scores[left, right], atol=1e-6)
+
+    def test_unknown_mode_rejected(self, temp_db):
+        manager = SynthesisManager(temp_db)
+        with pytest.raises(ValueError):
+            manager.find_similar_concepts(mode='dbscan')
+
+    def test_pipeline_passes_cluster_mode(self, temp_db):
+        manager = SynthesisManager(temp_db)
+        with patch.object(manager, 'find_similar_concepts', return_value=[]) as find:
+            manager.run_synthesis_pipeline(dry_run=True, concepts_only=True, cluster_mode='graph')
+        find.assert_called_once_with(1000, mode='graph')
+
+
+class TestBlockedOverlapEngine:
+    """Cross-pollination via clustering.top_pairs (block-streamed, bounded heap)."""
+
+    def test_top_pairs_matches_brute_force(self, monkeypatch):
+        np = pytest.importorskip("numpy")
+        from haios_etl import clustering
+        monkeypatch.setattr(clustering, "BLOCK_ELEMENTS", 50)  # Many small blocks
+        rng = np.random.default_rng(2)
+        left = rng.normal(size=(40, 4)).astype(np.float32)
+        right = rng.normal(size=(15, 4)).astype(np.float32)
+        left /= np.linalg.norm(left, axis=1, keepdims=True)
+        right /= np.linalg.norm(right, axis=1, keepdims=True)
+        right[7] = right[3]  # Exact ties keep the earlier pair first
+        rows = np.arange(0, 40, 2)
+
+        ranked = clustering.top_pairs(left, right, 0.5, 12, left_rows=rows, near_floor=0.3)
+
+        scores = left[rows] @ right.T
+        expected = sorted(
+            ((int(rows[i]), j, float(scores[i, j])) for i in range(len(rows)) for j in range(15)
+             if scores[i, j] >= 0.5),
+            key=lambda p: -p[2]
+        )
+        assert ranked['pairs'] == expected[:12]
+        assert ranked['above_threshold'] == len(expected)
+        assert ranked['comparisons'] == len(rows) * 15
+        assert int(ranked['histogram'].sum()) == len(rows) * 15
+        assert ranked['max_similarity'] == pytest.approx(float(scores.max()))
+        assert all(0.3 <= s < 0.5 for _, _, s in ranked['near_misses'])
+
+    def _seed(self, temp_db):
+        conn = sqlite3.connect(temp_db)
+        for i in range(30):
+            cid = conn.execute(
+                "INSERT INTO concepts (type, content) VALUES (?, ?)", ("Directive", f"Concept {i}")
+            ).lastrowid
+            conn.execute("INSERT INTO embeddings (concept_id, vector) VALUES (?, ?)",
+                         (cid, create_embedding([1.0, i * 0.05, 0.2])))
+        for i in range(10):
+            conn.execute("INSERT INTO reasoning_traces (query, query_embedding) VALUES (?, ?)",
+                         (f"query {i}", create_embedding([1.0, 0.1 * i, 0.0])))
+        conn.commit()
+        conn.close()
+
+    def test_blob_path_matches_store_path(self, temp_db):
+        pytest.importorskip("numpy")
+        self._seed(temp_db)
+        with_store = SynthesisManager(temp_db)
+        without_store = SynthesisManager(temp_db)
+        without_store.store = None
+
+        expected = with_store.find_cross_type_overlaps(limit=25)
+        actual = without_store.find_cross_type_overlaps(limit=25)
+
+        assert len(expected) == 25
+        assert [(c, t) for c, t, _ in actual] == [(c, t) for c, t, _ in expected]
+        for (_, _, a), (_, _, b) in zip(actual, expected):
+            assert a == pytest.approx(b, abs=1e-5)
+
+    def test_overlap_stats_reported(self, temp_db):
+        pytest.importorskip("numpy")
+        self._seed(temp_db)
+        manager = SynthesisManager(temp_db)
+
+        overlaps = manager.find_cross_type_overlaps(limit=5)
+
+        stats = manager.last_overlap_stats
+        assert len(overlaps) == 5
+        assert stats.comparisons == 300
+        assert sum(count for _, _, count in stats.histogram) == 300
+        assert stats.above_threshold >= 5
+        assert stats.histogram[0][:2] == (-1.0, -0.95)
+
+
+class TestIncrementalSynthesis:
+    """Persisted centroids, assignment to existing clusters, targeted re-synthesis."""
+
+    @staticmethod
+    def _concepts(db_path, vectors):
+        conn = sqlite3.connect(db_path)
+        ids = []
+        for i, vec in enumerate(vectors):
+            cid = conn.execute(
+                "INSERT INTO concepts (type, content) VALUES (?, ?)", ("Directive", f"Incremental concept {i}")
+            ).lastrowid
+            conn.execute("INSERT INTO embeddings (concept_id, vector) VALUES (?, ?)", (cid, create_embedding(vec)))
+            ids.append(cid)
+        conn.commit()
+        conn.close()
+        return ids
+
+    @staticmethod
+    def _synthesized_cluster(manager, member_ids):
+        concept_id = manager.store_synthesis(SynthesisResult(
+            title='Seed', content=f'Seed insight {member_ids}', confidence=0.9,
+            source_ids=member_ids, source_type='concept'
+        ))
+        conn = sqlite3.connect(manager.db.db_path)
+        cluster_id = conn.execute(
+            "SELECT id FROM synthesis_clusters WHERE synthesized_concept_id = ?", (concept_id,)
+        ).fetchone()[0]
+        conn.close()
+        return concept_id, cluster_id
+
+    def test_store_synthesis_persists_mean_centroid(self, temp_db):
+        ids = self._concepts(temp_db, [[1.0, 0.0], [0.0, 1.0]])
+        manager = SynthesisManager(temp_db)
+
+        _, cluster_id = self._synthesized_cluster(manager, ids)
+
+        conn = sqlite3.connect(temp_db)
+        blob = conn.execute("SELECT centroid_embedding FROM synthesis_clusters WHERE id = ?", (cluster_id,)).fetchone()[0]
+        sims = [r[0] for r in conn.execute(
+            "SELECT similarity_to_centroid FROM synthesis_cluster_members WHERE cluster_id = ?", (cluster_id,))]
+        conn.close()
+        centroid = struct.unpack('2f', blob)
+        assert centroid == pytest.approx((math.sqrt(0.5), math.sqrt(0.5)), abs=1e-6)
+        assert sims == pytest.approx([math.sqrt(0.5)] * 2, abs=1e-6)
+
+    def test_build_clusters_centroid_is_member_mean(self, temp_db):
+        manager = SynthesisManager(temp_db)
+        items = [(1, "a", create_embedding([1.0, 0.0])), (2, "b", create_embedding([0.9, 0.3]))]
+
+        cluster = manager._build_clusters(items, 'concept')[0]
+
+        assert cluster.centroid == pytest.approx(manager._centroid([[1.0, 0.0], [0.9, 0.3]]))
+        assert cluster.centroid != pytest.approx([1.0, 0.0])
+
+    def test_new_concepts_join_existing_cluster(self, temp_db):
+        pytest.importorskip("numpy")
+        members = self._concepts(temp_db, [[1.0, 0.0, 0.0], [0.98, 0.1, 0.0]])
+        manager = SynthesisManager(temp_db)
+        _, cluster_id = self._synthesized_cluster(manager, members)
+        near, far = self._concepts(temp_db, [[0.97, 0.05, 0.05], [0.0, 0.0, 1.0]])
+
+        assignments = manager.assign_to_existing_clusters()
+
+        assert assignments == {cluster_id: [near]}
+        conn = sqlite3.connect(temp_db)
+        status, count = conn.execute(
+            "SELECT status, member_count FROM synthesis_clusters WHERE id = ?", (cluster_id,)).fetchone()
+        cluster_of = dict(conn.execute("SELECT id, synthesis_cluster_id FROM concepts WHERE id IN (?, ?)", (near, far)))
+        conn.close()
+        assert (status, count) == ('pending', 3)
+        assert cluster_of == {near: cluster_id, far: None}
+
+    def test_assignment_dry_run_and_capacity(self, temp_db):
+        pytest.importorskip("numpy")
+        members = self._concepts(temp_db, [[1.0, 0.0], [0.99, 0.05]])
+        manager = SynthesisManager(temp_db)
+        manager.MAX_CLUSTER_SIZE = 3
+        _, cluster_id = self._synthesized_cluster(manager, members)
+        newcomers = self._concepts(temp_db, [[0.98, 0.02], [0.97, 0.03]])
+
+        preview = manager.assign_to_existing_clusters(dry_run=True)
+
+        assert preview == {cluster_id: [newcomers[0]]}  # Only one free slot
+        conn = sqlite3.connect(temp_db)
+        assert conn.execute("SELECT status FROM synthesis_clusters").fetchone()[0] == 'synthesized'
+        conn.close()
+
+    def test_only_changed_clusters_resynthesized(self, temp_db, mock_extractor):
+        pytest.importorskip("numpy")
+        mock_extractor.embed_content.return_value = None
+        changed = self._concepts(temp_db, [[1.0, 0.0, 0.0], [0.98, 0.1, 0.0]])
+        untouched = self._concepts(temp_db, [[0.0, 1.0, 0.0], [0.1, 0.98, 0.0]])
+        manager = SynthesisManager(temp_db, mock_extractor)
+        concept_id, cluster_id = self._synthesized_cluster(manager, changed)
+        self._synthesized_cluster(manager, untouched)
+        (newcomer,) = self._concepts(temp_db, [[0.97, 0.05, 0.05]])
+
+        with patch.object(manager, '_call_synthesis_llm') as mock_llm:
+            mock_llm.return_value = {'title': 'Grown', 'content': 'Now three members', 'confidence': 0.8}
+            results = manager.run_synthesis_pipeline(concepts_only=True, skip_cross_pollinate=True)
+
+        assert results['assigned_to_existing'] == 1
+        assert results['resynthesized'] == 1
+        assert results['synthesized'] == 0
+        assert mock_llm.call_count == 1
+        conn = sqlite3.connect(temp_db)
+        content, count = conn.execute(
+            "SELECT content, synthesis_source_count FROM concepts WHERE id = ?", (concept_id,)).fetchone()
+        status = conn.execute("SELECT status FROM synthesis_clusters WHERE id = ?", (cluster_id,)).fetchone()[0]
+        sources = {r[0] for r in conn.execute(
+            "SELECT source_id FROM synthesis_provenance WHERE synthesized_concept_id = ?", (concept_id,))}
+        conn.close()
+        assert content == '[Grown] Now three members'
+        assert count == 3
+        assert status == 'synthesized'
+        assert sources == set(changed) | {newcomer}
+
+    def test_legacy_cluster_centroid_backfilled(self, temp_db):
+        pytest.importorskip("numpy")
+        members = self._concepts(temp_db, [[1.0, 0.0], [0.98, 0.1]])
+        manager = SynthesisManager(temp_db)
+        _, cluster_id = self._synthesized_cluster(manager, members)
+        conn = sqlite3.connect(temp_db)
+        conn.execute("UPDATE synthesis_clusters SET centroid_embedding = NULL")
+        conn.commit()
+        conn.close()
+        (newcomer,) = self._concepts(temp_db, [[0.99, 0.05]])
+
+        assert manager.assign_to_existing_clusters() == {cluster_id: [newcomer]}
+        conn = sqlite3.connect(temp_db)
+        assert conn.execute("SELECT centroid_embedding FROM synthesis_clusters").fetchone()[0] is not None
+        conn.close()
+
+
+    def test_legacy_cluster_dry_run_writes_nothing(self, temp_db):
+        pytest.importorskip("numpy")
+        members = self._concepts(temp_db, [[1.0, 0.0], [0.98, 0.1]])
+        manager = SynthesisManager(temp_db)
+        _, cluster_id = self._synthesized_cluster(manager, members)
+        conn = sqlite3.connect(temp_db)
+        conn.execute("UPDATE synthesis_clusters SET centroid_embedding = NULL, member_count = 0")
+        conn.commit()
+        conn.close()
+        (newcomer,) = self._concepts(temp_db, [[0.99, 0.05]])
+
+        # Centroid computed in memory for the preview only
+        assert manager.assign_to_existing_clusters(dry_run=True) == {cluster_id: [newcomer]}
+        conn = sqlite3.connect(temp_db)
+        assert conn.execute(
+            "SELECT centroid_embedding, member_count, status FROM synthesis_clusters").fetchone() == (None, 0, 'synthesized')
+        conn.close()
+
+
+class TestConcurrentSynthesis:
+    """Worker pool for LLM/embedding calls with a single SQLite writer."""
+
+    @staticmethod
+    def _clusters(n):
+        return [ClusterInfo(id=i, cluster_type='trace', member_ids=[2 * i + 1, 2 * i + 2], member_count=2)
+                for i in range(n)]
+
+    def test_pool_overlaps_calls_and_keeps_order(self, temp_db, mock_extractor):
+        import time
+        mock_extractor.embed_content.return_value = [0.6, 0.8]
+        manager = SynthesisManager(temp_db, mock_extractor, workers=4)
+        clusters = self._clusters(8)
+
+        def slow_synthesis(cluster):
+            time.sleep(0.1)
+            return SynthesisResult(title=f"T{cluster.id}", content="c", confidence=0.5,
+                                   source_ids=cluster.member_ids, source_type='trace')
+
+        with patch.object(manager, 'synthesize_cluster', side_effect=slow_synthesis), \
+                patch.object(manager, 'find_similar_traces', return_value=clusters):
+            start = time.time()
+            results = manager.run_synthesis_pipeline(traces_only=True, skip_cross_pollinate=True)
+            elapsed = time.time() - start
+
+        assert results['synthesized'] == 8
+        assert elapsed < 0.6  # 8 x 0.1s calls on 4 workers, not 0.8s sequential
+        conn = sqlite3.connect(temp_db)
+        titles = [r[0] for r in conn.execute(
+            "SELECT content FROM concepts WHERE type = 'SynthesizedInsight' ORDER BY id")]
+        embedded = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        conn.close()
+        assert titles == [f"[T{i}] c" for i in range(8)]  # Stored in submission order
+        assert embedded == 8
+        assert mock_extractor.embed_content.call_count == 8  # Embedded by workers only
+
+    def test_bridge_cap_not_exceeded(self, temp_db, mock_extractor):
+        mock_extractor.embed_content.return_value = None
+        manager = SynthesisManager(temp_db, mock_extractor, workers=4)
+        pairs = [(i, 100 + i, 0.9) for i in range(20)]
+
+        def bridge(concept_id, trace_id):
+            return SynthesisResult(title="B", content="b", confidence=0.5,
+                                   source_ids=[concept_id, trace_id], source_type='cross')
+
+        with patch.object(manager, 'find_cross_type_overlaps', return_value=pairs), \
+                patch.object(manager, 'create_bridge_insight', side_effect=bridge) as make, \
+                patch.object(manager, 'store_synthesis', return_value=1):
+            results = manager.run_synthesis_pipeline(cross_only=True, max_bridges=5)
+
+        assert results['bridge_insights'] == 5
+        assert make.call_count == 5  # No LLM calls past the cap
+
+    def test_failed_items_do_not_count_toward_cap(self, temp_db, mock_extractor):
+        manager = SynthesisManager(temp_db, mock_extractor, workers=3)
+        pairs = [(i, 100 + i, 0.9) for i in range(10)]
+
+        def bridge(concept_id, trace_id):
+            if concept_id % 2:
+                return None
+            return SynthesisResult(title="B", content="b", confidence=0.5,
+                                   source_ids=[concept_id, trace_id], source_type='cross')
+
+        with patch.object(manager, 'find_cross_type_overlaps', return_value=pairs), \
+                patch.object(manager, 'create_bridge_insight', side_effect=bridge), \
+                patch.object(manager, '_embed_text', return_value=None), \
+                patch.object(manager, 'store_synthesis', return_value=1) as store:
+            results = manager.run_synthesis_pipeline(cross_only=True, max_bridges=3)
+
+        assert results['bridge_insights'] == 3
+        assert [call.args[0].source_ids[0] for call in store.call_args_list] == [0, 2, 4]
+
+    def test_llm_calls_are_limited_by_gateway_only(self, temp_db, mock_extractor):
+        gateway = MagicMock()
+        gateway.call.return_value.text = '{"content": "x"}'
+        manager = SynthesisManager(temp_db, mock_extractor, workers=2, gateway=gateway)
+
+        with patch.dict('sys.modules', {'google': MagicMock(), 'google.generativeai': MagicMock()}):
+            manager._call_synthesis_llm("prompt")
+
+        gateway.call.assert_called_once()
+        assert not hasattr(manager, 'rate_limiter')
+
+
+class TestBridgeTable:
+    """Set-based bridge idempotency (migration 017 synthesis_bridges)."""
+
+    MIGRATION = os.path.join(os.path.dirname(__file__), '..', 'haios_etl', 'migrations',
+                             '017_add_synthesis_bridges.sql')
+
+    @staticmethod
+    def _provenance_bridge(db_path, concept_id, trace_id):
+        conn = sqlite3.connect(db_path)
+        bridge_id = conn.execute(
+            "INSERT INTO concepts (type, content) VALUES ('SynthesizedInsight', 'Old bridge')").lastrowid
+        for source_id in (concept_id, trace_id):
+            conn.execute("""
+                INSERT INTO synthesis_provenance (synthesized_concept_id, source_type, source_id)
+                VALUES (?, 'cross', ?)
+            """, (bridge_id, source_id))
+        conn.commit()
+        conn.close()
+        return bridge_id
+
+    def _migrate(self, db_path):
+        conn = sqlite3.connect(db_path)
+        with open(self.MIGRATION, encoding='utf-8') as f:
+            conn.executescript(f.read())
+        conn.close()
+
+    @staticmethod
+    def _bridge(concept_id, trace_id):
+        return SynthesisResult(title='Bridge', content=f'b {concept_id}-{trace_id}', confidence=0.7,
+                               source_ids=[concept_id, trace_id], source_type='cross')
+
+    def test_migration_backfills_existing_bridges(self, temp_db):
+        bridge_id = self._provenance_bridge(temp_db, 10, 20)
+        self._migrate(temp_db)
+        self._migrate(temp_db)  # Re-runnable
+
+        conn = sqlite3.connect(temp_db)
+        rows = conn.execute("SELECT concept_id, trace_id, synthesized_concept_id FROM synthesis_bridges").fetchall()
+        conn.close()
+        assert rows == [(10, 20, bridge_id)]
+
+    def test_existing_bridges_loaded_once(self, temp_db):
+        self._provenance_bridge(temp_db, 10, 20)
+        manager = SynthesisManager(temp_db)
+        assert manager._existing_bridges() == {(10, 20)}  # Provenance fallback
+
+        self._migrate(temp_db)
+        manager = SynthesisManager(temp_db)
+        assert manager._existing_bridges() == {(10, 20)}
+        assert manager._bridge_exists(10, 20) is True
+        assert manager._bridge_exists(20, 10) is False
+
+    def test_store_synthesis_claims_pair_once(self, temp_db):
+        self._migrate(temp_db)
+        manager = SynthesisManager(temp_db)
+
+        first = manager.store_synthesis(self._bridge(1, 2))
+        second = manager.store_synthesis(self._bridge(1, 2))
+
+        conn = sqlite3.connect(temp_db)
+        bridges = conn.execute("SELECT concept_id, trace_id, synthesized_concept_id FROM synthesis_bridges").fetchall()
+        insights = conn.execute("SELECT COUNT(*) FROM concepts WHERE type = 'SynthesizedInsight'").fetchone()[0]
+        conn.close()
+        assert first is not None
+        assert second is None
+        assert bridges == [(1, 2, first)]
+        assert insights == 1
+
+    def test_pipeline_filters_with_set_not_per_pair_queries(self, temp_db, mock_extractor):
+        self._migrate(temp_db)
+        self._provenance_bridge(temp_db, 1, 101)
+        self._migrate(temp_db)
+        manager = SynthesisManager(temp_db, mock_extractor)
+        pairs = [(i, 100 + i, 0.9) for i in range(1, 4)]
+
+        with patch.object(manager, 'find_cross_type_overlaps', return_value=pairs), \
+                patch.object(manager, '_bridge_exists', side_effect=AssertionError("per-pair query")), \
+                patch.object(manager, 'create_bridge_insight', side_effect=self._bridge), \
+                patch.object(manager, '_embed_text', return_value=None):
+            results = manager.run_synthesis_pipeline(cross_only=True, max_bridges=10)
+
+        assert results['skipped_existing'] == 1
+        assert results['bridge_insights'] == 2
+        assert manager._existing_bridges() == {(1, 101), (2, 102), (3, 103)}
+
+
+class TestRunCheckpoints:
+    """Resumable pipeline runs (migration 018 synthesis_runs)."""
+
+    MIGRATION = os.path.join(os.path.dirname(__file__), '..', 'haios_etl', 'migrations',
+                             '018_add_synthesis_runs.sql')
+
+    @pytest.fixture
+    def run_db(self, temp_db):
+        conn = sqlite3.connect(temp_db)
+        with open(self.MIGRATION, encoding='utf-8') as f:
+            conn.executescript(f.read())
+        conn.close()
+        return temp_db
+
+    @staticmethod
+    def _clusters(n):
+        return [ClusterInfo(id=i, cluster_type='trace', member_ids=[2 * i + 1, 2 * i + 2], member_count=2)
+                for i in range(n)]
+
+    @staticmethod
+    def _synthesis(cluster):
+        return SynthesisResult(title=f"T{cluster.id}", content="c", confidence=0.5,
+                               source_ids=cluster.member_ids, source_type='trace')
+
+    @staticmethod
+    def _titles(db_path):
+        conn = sqlite3.connect(db_path)
+        titles = [r[0] for r in conn.execute(
+            "SELECT content FROM concepts WHERE type = 'SynthesizedInsight' ORDER BY id")]
+        conn.close()
+        return titles
+
+    def test_completed_run_recorded(self, run_db, mock_extractor):
+        manager = SynthesisManager(run_db, mock_extractor)
+
+        with patch.object(manager, 'find_similar_traces', return_value=self._clusters(3)), \
+                patch.object(manager, 'synthesize_cluster', side_effect=self._synthesis), \
+                patch.object(manager, '_embed_text', return_value=None):
+            results = manager.run_synthesis_pipeline(traces_only=True, skip_cross_pollinate=True)
+
+        [run] = manager.list_runs()
+        assert run['id'] == results['run_id']
+        assert run['status'] == 'completed'
+        assert run['stage'] == 'done'
+        assert run['synthesize_progress'] == (3, 3)
+        assert run['synthesized'] == 3
+        assert set(run['stage_timings']) == {'cluster', 'synthesize', 'resynthesize', 'cross'}
+
+    def test_resume_continues_after_last_committed_cluster(self, run_db, mock_extractor):
+        manager = SynthesisManager(run_db, mock_extractor)
+
+        def interrupted(cluster):
+            if cluster.id == 2:
+                raise KeyboardInterrupt
+            return self._synthesis(cluster)
+
+        with patch.object(manager, 'find_similar_traces', return_value=self._clusters(4)), \
+                patch.object(manager, 'synthesize_cluster', side_effect=interrupted), \
+                patch.object(manager, '_embed_text', return_value=None):
+            with pytest.raises(KeyboardInterrupt):
+                manager.run_synthesis_pipeline(traces_only=True, skip_cross_pollinate=True)
+
+        [run] = manager.list_runs()
+        assert run['status'] == 'interrupted'
+        assert run['synthesize_progress'] == (2, 4)
+
+        resumed = SynthesisManager(run_db, mock_extractor)
+        with patch.object(resumed, 'find_similar_traces', side_effect=AssertionError("re-clustered")), \
+                patch.object(resumed, 'synthesize_cluster', side_effect=self._synthesis), \
+                patch.object(resumed, '_embed_text', return_value=None):
+            results = resumed.run_synthesis_pipeline(resume_run_id=run['id'])
+
+        assert results['synthesized'] == 4
+        assert results['trace_clusters'] == 4
+        assert self._titles(run_db) == [f"[T{i}] c" for i in range(4)]
+        assert resumed.list_runs()[0]['status'] == 'completed'
+
+    def test_resume_cross_stage_reuses_candidate_pairs(self, run_db, mock_extractor):
+        manager = SynthesisManager(run_db, mock_extractor)
+        pairs = [(i, 100 + i, 0.9) for i in range(4)]
+
+        def bridge(concept_id, trace_id):
+            if concept_id == 2:
+                raise KeyboardInterrupt
+            return SynthesisResult(title=f"B{concept_id}", content="b", confidence=0.5,
+                                   source_ids=[concept_id, trace_id], source_type='cross')
+
+        with patch.object(manager, 'find_cross_type_overlaps', return_value=pairs), \
+                patch.object(manager, 'create_bridge_insight', side_effect=bridge), \
+                patch.object(manager, '_embed_text', return_value=None):
+            with pytest.raises(KeyboardInterrupt):
+                manager.run_synthesis_pipeline(cross_only=True, max_bridges=3)
+
+        run_id = manager.list_runs()[0]['id']
+        assert manager.list_runs()[0]['cross_progress'] == (2, 4)
+
+        with patch.object(manager, 'find_cross_type_overlaps', side_effect=AssertionError("recomputed")), \
+                patch.object(manager, 'create_bridge_insight', side_effect=lambda c, t: bridge(c + 10, t)), \
+                patch.object(manager, '_embed_text', return_value=None):
+            results = manager.run_synthesis_pipeline(resume_run_id=run_id)
+
+        assert results['bridge_insights'] == 3  # Cap counts bridges from both attempts
+        assert self._titles(run_db) == ["[B0] b", "[B1] b", "[B12] b"]
+
+    def test_resume_rejects_completed_or_unknown_run(self, run_db, mock_extractor):
+        manager = SynthesisManager(run_db, mock_extractor)
+        results = manager.run_synthesis_pipeline(cross_only=True, skip_cross_pollinate=True)
+
+        with pytest.raises(ValueError):
+            manager.run_synthesis_pipeline(resume_run_id=results['run_id'])
+        with pytest.raises(ValueError):
+            manager.run_synthesis_pipeline(resume_run_id=999)
+
+    def test_runs_without_migration(self, temp_db, mock_extractor):
+        manager = SynthesisManager(temp_db, mock_extractor)
+        results = manager.run_synthesis_pipeline(cross_only=True, skip_cross_pollinate=True)
+
+        assert 'run_id' not in results
+        assert manager.list_runs() == []
+
+
+class TestLLMResponseCaching:
+    """Synthesis prompts answered once are served from llm_response_cache (migration 019)."""
+
+    MIGRATION = os.path.join(os.path.dirname(__file__), '..', 'haios_etl', 'migrations',
+                             '019_add_llm_response_cache.sql')
+
+    def test_repeated_prompt_skips_llm_call(self, temp_db, mock_extractor):
+        conn = sqlite3.connect(temp_db)
+        with open(self.MIGRATION, encoding='utf-8') as f:
+            conn.executescript(f.read())
+        conn.close()
+
+        genai = MagicMock()
+        generate = genai.GenerativeModel.return_value.generate_content
+        generate.return_value.text = '```json\n{"title": "T", "content": "c", "confidence": 0.9}\n```'
+
+        with patch.dict('sys.modules', {'google': MagicMock(generativeai=genai), 'google.generativeai': genai}):
+            first = SynthesisManager(temp_db, mock_extractor)
+            assert first._call_synthesis_llm("prompt")['title'] == "T"
+            first.llm_cache.flush()
+
+            second = SynthesisManager(temp_db, mock_extractor)
+            assert second._call_synthesis_llm("prompt")['title'] == "T"
+            results = second.run_synthesis_pipeline(cross_only=True, skip_cross_pollinate=True)
+
+        assert generate.call_count == 1
+        assert results['llm_cache'] == {'hits': 1, 'misses': 0, 'hit_rate': 1.0}
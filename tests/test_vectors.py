@@ -0,0 +1,83 @@
+# generated: 2026-10-18
+# System Auto: last updated on: 2026-10-18 18:20:37
+"""
+Tests for the embedding BLOB codec (haios_etl/vectors.py).
+"""
+import struct
+from array import array
+
+import pytest
+
+from haios_etl import vectors
+from haios_etl.vectors import cosine_similarity, decode_vector, dot, encode_vector, has_values, normalize_vector
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    """Run each test with NumPy and with the array('f') fallback."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(vectors, "np", None)
+    return request.param
+
+
+def test_encode_matches_struct_layout(backend):
+    values = [0.1, -2.5, 3.0]
+    assert encode_vector(values) == struct.pack('3f', *values)
+
+
+def test_round_trip(backend):
+    decoded = decode_vector(encode_vector([1.0, 0.5, -0.25]))
+
+    assert list(decoded) == [1.0, 0.5, -0.25]
+    assert encode_vector(decoded) == encode_vector([1.0, 0.5, -0.25])
+
+
+def test_numpy_decode_is_a_view():
+    np = pytest.importorskip("numpy")
+    blob = struct.pack('4f', 1.0, 2.0, 3.0, 4.0)
+    decoded = decode_vector(blob)
+
+    assert isinstance(decoded, np.ndarray)
+    assert decoded.dtype == np.float32
+    assert not decoded.flags.owndata  # Shares the BLOB's memory
+    assert not decoded.flags.writeable
+
+
+def test_array_fallback_type(monkeypatch):
+    monkeypatch.setattr(vectors, "np", None)
+    decoded = decode_vector(struct.pack('2f', 1.0, 2.0))
+
+    assert isinstance(decoded, array) and decoded.typecode == 'f'
+
+
+def test_decode_rejects_bad_blobs(backend):
+    assert decode_vector(None) is None
+    with pytest.raises(ValueError):
+        decode_vector(b"\x00" * 6)
+
+
+def test_has_values(backend):
+    assert has_values(decode_vector(encode_vector([0.0])))
+    assert not has_values(decode_vector(b""))
+    assert not has_values(None)
+
+
+def test_similarity_helpers(backend):
+    a = decode_vector(encode_vector([3.0, 4.0]))
+    b = [4.0, 3.0]
+
+    assert dot(a, b) == pytest.approx(24.0)
+    assert cosine_similarity(a, b) == pytest.approx(0.96)
+    assert cosine_similarity(a, [0.0, 0.0]) == 0.0
+    assert dot(a, [1.0]) == 0.0
+
+
+def test_normalize_vector(backend):
+    unit = normalize_vector([3.0, 4.0, 0.0])
+    assert list(unit) == pytest.approx([0.6, 0.8, 0.0], abs=1e-6)
+    assert list(normalize_vector([0.0, 0.0])) == [0.0, 0.0]
+    # Normalized output encodes to the stored float32 layout
+    assert encode_vector(unit) == struct.pack('3f', *unit)
+